@@ -3,6 +3,10 @@ Capitovo Aktien-Scoring-System
 
 Ein rechtssicheres, erklärbares Scoring-Modell für Aktienanalyse.
 Fokus auf Score, Branchenvergleich und Einordnung - keine Anlageberatung.
+
+Die Untermodule werden erst beim ersten Zugriff auf einen ihrer Namen
+geladen (z.B. `from scoring import score_company`); `import scoring`
+allein lädt weder Daten noch NumPy.
 """
 
 __version__ = "1.0.0"
@@ -10,3 +14,34 @@ __author__ = "Capitovo"
 
 # Globaler Disclaimer
 DISCLAIMER = "Die Bewertung basiert auf einem quantitativen Modell und stellt keine Anlageberatung dar."
+
+# Öffentliche Namen -> Untermodul, das sie definiert
+_LAZY_EXPORTS = {
+    "ScoringAPI": "api",
+    "get_scoring_api": "api",
+    "score_company": "api",
+    "score_company_json": "api",
+    "CompanyFinancials": "data_loader",
+    "DataLoader": "data_loader",
+    "get_data_loader": "data_loader",
+    "Scorer": "scorer",
+    "ScoreResult": "scorer",
+    "SectorRanker": "sector_ranker",
+}
+
+__all__ = ["DISCLAIMER", *_LAZY_EXPORTS]
+
+
+def __getattr__(name):
+    """Lädt das Untermodul eines öffentlichen Namens beim ersten Zugriff."""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
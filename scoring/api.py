@@ -8,19 +8,31 @@ WICHTIG: Diese API gibt NUR qualitative Bewertungen aus,
 KEINE Finanzkennzahlen!
 """
 
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from dataclasses import dataclass, asdict, replace
 import json
 from datetime import datetime
 
-from .data_loader import DataLoader, get_data_loader
+from .data_loader import DataLoader, CompanyFinancials, get_data_loader
 from .scorer import Scorer, ScoreResult, get_scorer
-from .sector_ranker import SectorRanker, get_sector_ranker
+from .sector_ranker import (
+    GroupRanker, SectorRanker, SectorRanking, ScoreChange, get_sector_ranker, rank_sector_results
+)
+from .peer_groups import PeerGroupDefinition
 from .text_generator import TextGenerator, get_text_generator, get_traffic_light
-from .config import DISCLAIMER
+from .config import DISCLAIMER, SENSITIVITY_CONFIG
 
+if TYPE_CHECKING:
+    # history importiert parallel, das wiederum api importiert
+    from .history import SnapshotStore
+    # Optionale Auswertungen erst bei Bedarf laden (kurze CLI-Aufrufe, Kaltstarts)
+    from .changes import ChangeLog, ChangeSet
+    from .leaderboard import GlobalLeaderboard
+    from .screener import Screener
+    from .scenarios import SweepResult, RatingSensitivity
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class ScoringOutput:
     """
     Das finale Output-Format für das Frontend.
@@ -52,6 +64,55 @@ class ScoringOutput:
     interpretation_valuation: str = "—"
 
 
+def build_scoring_output(
+    score_result: ScoreResult,
+    sector_ranking: Optional[SectorRanking],
+    text_generator: TextGenerator
+) -> Dict[str, Any]:
+    """
+    Erstellt das finale Output-Dict aus einem berechneten Score.
+    
+    Args:
+        score_result: Die berechneten Scores
+        sector_ranking: Optional, das Sektor-Ranking
+        text_generator: TextGenerator für Labels und Texte
+    
+    Returns:
+        Dict im definierten Output-Format (siehe ScoringOutput)
+    """
+    # Qualitative Labels generieren
+    labels = text_generator.generate_score_labels(score_result)
+    
+    # Interpretationen generieren
+    interpretations = text_generator.generate_interpretations(score_result)
+    
+    # Beschreibungstext generieren
+    summary = text_generator.generate_summary(score_result, sector_ranking)
+    
+    # Ampelfarbe bestimmen
+    traffic_light = get_traffic_light(score_result.total_score)
+    
+    # Output erstellen
+    output = ScoringOutput(
+        symbol=score_result.symbol,
+        sector=score_result.sector,
+        score_total=int(round(score_result.total_score)),
+        score_quality=labels["quality"],
+        score_growth=labels["growth"],
+        score_stability=labels["stability"],
+        score_valuation=labels["valuation"],
+        sector_percentile=int(score_result.sector_percentile),
+        traffic_light=traffic_light,
+        summary_text=summary,
+        interpretation_quality=interpretations["interpretation_quality"],
+        interpretation_growth=interpretations["interpretation_growth"],
+        interpretation_stability=interpretations["interpretation_stability"],
+        interpretation_valuation=interpretations["interpretation_valuation"]
+    )
+    
+    return asdict(output)
+
+
 class ScoringAPI:
     """
     Haupt-API für das Capitovo Scoring-System.
@@ -80,8 +141,18 @@ class ScoringAPI:
         """
         self._loader = data_loader or get_data_loader(use_mock=use_mock_data)
         self._scorer = scorer or get_scorer()
-        self._ranker = sector_ranker or get_sector_ranker()
+        if sector_ranker is not None:
+            self._ranker = sector_ranker
+        elif data_loader is None and scorer is None:
+            self._ranker = get_sector_ranker()
+        else:
+            # Eigene Komponenten auch für das Ranking verwenden
+            self._ranker = SectorRanker(data_loader=self._loader, scorer=self._scorer)
         self._text_gen = text_generator or get_text_generator()
+        self._peer_rankers: Dict[str, GroupRanker] = {}
+        self._leaderboard: Optional["GlobalLeaderboard"] = None
+        self._screener: Optional["Screener"] = None
+        self._changes: Optional["ChangeLog"] = None
     
     def get_company_score(self, symbol: str) -> Optional[Dict[str, Any]]:
         """
@@ -112,48 +183,15 @@ class ScoringAPI:
         if not company:
             return None
         
-        # Sektor-Unternehmen laden
-        sector_companies = self._loader.get_sector_companies(company.sector)
-        if not sector_companies:
+        # Scores berechnen (gesamter Sektor in einem Durchlauf, gecacht)
+        score_result = self._ranker.get_sector_scores(company.sector).get(company.symbol)
+        if not score_result:
             return None
         
-        # Scores berechnen
-        score_result = self._scorer.score_company(company, sector_companies)
-        
         # Sektor-Ranking ermitteln
         sector_ranking = self._ranker.get_sector_ranking(symbol.upper())
         
-        # Qualitative Labels generieren
-        labels = self._text_gen.generate_score_labels(score_result)
-        
-        # Interpretationen generieren
-        interpretations = self._text_gen.generate_interpretations(score_result)
-        
-        # Beschreibungstext generieren
-        summary = self._text_gen.generate_summary(score_result, sector_ranking)
-        
-        # Ampelfarbe bestimmen
-        traffic_light = get_traffic_light(score_result.total_score)
-        
-        # Output erstellen
-        output = ScoringOutput(
-            symbol=company.symbol,
-            sector=company.sector,
-            score_total=int(round(score_result.total_score)),
-            score_quality=labels["quality"],
-            score_growth=labels["growth"],
-            score_stability=labels["stability"],
-            score_valuation=labels["valuation"],
-            sector_percentile=int(score_result.sector_percentile),
-            traffic_light=traffic_light,
-            summary_text=summary,
-            interpretation_quality=interpretations["interpretation_quality"],
-            interpretation_growth=interpretations["interpretation_growth"],
-            interpretation_stability=interpretations["interpretation_stability"],
-            interpretation_valuation=interpretations["interpretation_valuation"]
-        )
-        
-        return asdict(output)
+        return build_scoring_output(score_result, sector_ranking, self._text_gen)
     
     def get_company_score_json(self, symbol: str) -> str:
         """
@@ -184,36 +222,487 @@ class ScoringAPI:
     
     def get_available_symbols(self) -> List[str]:
         """Gibt alle verfügbaren Aktien-Symbole zurück."""
-        return self._loader._source.get_available_symbols()
+        return self._loader.get_available_symbols()
     
     def get_available_sectors(self) -> List[str]:
         """Gibt alle verfügbaren Sektoren zurück."""
-        return self._loader._source.get_available_sectors()
+        return list(self._loader.get_available_sectors())
     
-    def batch_score(self, symbols: List[str]) -> List[Dict[str, Any]]:
+    def batch_score(self, symbols: List[str], workers: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Berechnet Scores für mehrere Unternehmen.
         
         Args:
             symbols: Liste von Aktiensymbolen
+            workers: Optional, Anzahl Prozesse; > 1 verteilt die Sektoren
+                     auf einen Prozess-Pool (für große Universen)
         
         Returns:
             Liste von Score-Dicts
         """
-        results = []
+        if workers and workers > 1:
+            return self._batch_score_parallel(symbols, workers)
+        
+        # Symbole gesammelt auflösen, dann jeden Sektor genau einmal berechnen
+        resolved, requested = self._group_by_sector(symbols)
+        
+        outputs = {}
+        for sector, wanted in requested.items():
+            results = self._ranker.get_sector_scores(sector)
+            rankings = rank_sector_results(results)
+            for symbol in wanted:
+                if symbol in results:
+                    outputs[symbol] = build_scoring_output(results[symbol], rankings[symbol], self._text_gen)
+        
+        return [outputs[symbol] for symbol in resolved if symbol in outputs]
+    
+    def _batch_score_parallel(self, symbols: List[str], workers: int) -> List[Dict[str, Any]]:
+        """Verteilt batch_score() sektorweise auf einen Prozess-Pool."""
+        resolved, requested = self._group_by_sector(symbols)
+        
+        outputs = {
+            output["symbol"]: output
+            for output in self._iter_sector_outputs(requested.items(), workers)
+        }
+        
+        return [outputs[symbol] for symbol in resolved if symbol in outputs]
+    
+    def _group_by_sector(self, symbols: List[str]) -> Tuple[List[str], Dict[str, List[str]]]:
+        """
+        Löst Symbole mit einem get_companies()-Aufruf auf und gruppiert sie nach Sektor.
+        
+        Returns:
+            (gefundene Symbole in Eingabereihenfolge, Sektor -> Symbole)
+        """
+        symbols = [symbol.upper() for symbol in symbols]
+        companies = self._loader.get_companies(symbols)
+        requested: Dict[str, List[str]] = {}
+        resolved: List[str] = []
         for symbol in symbols:
-            score = self.get_company_score(symbol)
-            if score:
-                results.append(score)
-        return results
+            company = companies.get(symbol)
+            if not company:
+                continue
+            resolved.append(company.symbol)
+            requested.setdefault(company.sector, []).append(company.symbol)
+        return resolved, requested
+    
+    def iter_scores(
+        self,
+        symbols: Optional[List[str]] = None,
+        workers: Optional[int] = None,
+        sectors: Optional[Iterable[str]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Liefert Score-Dicts Sektor für Sektor als Generator.
+        
+        Es wird immer nur ein Sektor (bzw. bei Prozess-Pool nur wenige
+        Sektoren) gleichzeitig im Speicher gehalten; der Speicherbedarf
+        richtet sich nach dem größten Sektor, nicht nach dem Universum.
+        Der Sektor-Cache des Rankers wird dabei nicht befüllt.
+        
+        Args:
+            symbols: Optional, Aktiensymbole; None = alle Unternehmen
+            workers: Optional, Anzahl Prozesse für die Sektor-Berechnung
+            sectors: Optional, nur diese Sektoren (z.B. aus changes_since());
+                nicht mehr vorhandene Sektoren werden übersprungen
+        
+        Yields:
+            Score-Dicts im Output-Format von get_company_score()
+        """
+        if symbols is None:
+            groups = [(sector, None) for sector in sorted(self.get_available_sectors())]
+        else:
+            groups = list(self._group_by_sector(symbols)[1].items())
+        if sectors is not None:
+            wanted = set(sectors)
+            groups = [group for group in groups if group[0] in wanted]
+        
+        yield from self._iter_sector_outputs(groups, workers)
+    
+    def _iter_sector_outputs(
+        self,
+        groups: Iterable[Tuple[str, Optional[List[str]]]],
+        workers: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Berechnet Outputs je Sektor, sequentiell oder im Prozess-Pool.
+        
+        Args:
+            groups: (Sektor, angeforderte Symbole oder None = alle)
+            workers: Optional, Anzahl Prozesse
+        """
+        table = self._loader.get_financials_table()
+        
+        if workers and workers > 1:
+            from .parallel import build_sector_payload, build_table_payload, score_sectors_parallel
+            
+            def payloads():
+                for sector, wanted in groups:
+                    if table is not None:
+                        yield build_table_payload(table, sector, wanted)
+                        continue
+                    companies = self._loader.get_sector_companies(sector)
+                    if wanted is None:
+                        wanted = [c.symbol for c in companies]
+                    yield build_sector_payload(self._scorer, sector, companies, wanted)
+            
+            for sector_outputs in score_sectors_parallel(payloads(), workers, self._scorer, self._text_gen):
+                yield from sector_outputs
+            return
+        
+        for sector, wanted in groups:
+            if table is not None:
+                results = self._scorer.score_table(table, sector)
+            else:
+                results = self._scorer.score_sector(self._loader.get_sector_companies(sector))
+            rankings = rank_sector_results(results)
+            for symbol in (wanted if wanted is not None else results):
+                if symbol in results:
+                    yield build_scoring_output(results[symbol], rankings[symbol], self._text_gen)
+    
+    def score_history(
+        self,
+        store: "SnapshotStore",
+        symbols: List[str],
+        dates: Optional[List[Any]] = None,
+        workers: Optional[int] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Score-Verlauf für die Analyse-Seiten (Point-in-Time je Stichtag).
+        
+        Args:
+            store: SnapshotStore mit einem Datenstand je Stichtag
+            symbols: Liste von Aktien-Symbolen
+            dates: Optional, Stichtage (date oder ISO-String); None = alle Snapshots
+            workers: Optional, Anzahl Prozesse für die Berechnung
+        
+        Returns:
+            Dict mit Symbol -> Liste von {"as_of", "score_total",
+            "sector_percentile", "traffic_light"}
+        """
+        from .history import HistoricalScorer
+        
+        history = HistoricalScorer(store, self._scorer).score_history(symbols, dates, workers)
+        return {
+            symbol: [
+                {
+                    "as_of": as_of.isoformat(),
+                    "score_total": int(round(result.total_score)),
+                    "sector_percentile": int(result.sector_percentile),
+                    "traffic_light": get_traffic_light(result.total_score),
+                }
+                for as_of, result in points
+            ]
+            for symbol, points in history.items()
+        }
+    
+    def weight_sweep(
+        self,
+        weight_sets: Sequence[Any],
+        sectors: Optional[Sequence[str]] = None
+    ) -> "SweepResult":
+        """
+        Bewertet alternative Gewichtungen der Teil-Scores in einem Schritt.
+        
+        Die Teil-Scores werden nicht neu berechnet, nur Gesamt-Score,
+        Ampel und Sektor-Perzentil je Gewichtung.
+        
+        Args:
+            weight_sets: Gewichtungen (Dicts wie SCORE_WEIGHTS oder 4er-Sequenzen)
+            sectors: Optional, Sektoren; None = alle verfügbaren
+        
+        Returns:
+            SweepResult (Zeilen = Gewichtungen, Spalten = Unternehmen)
+        """
+        from .scenarios import WeightSweep
+        return WeightSweep(self._ranker, use_numpy=self._scorer.use_numpy).evaluate(
+            weight_sets, sectors
+        )
+    
+    def weight_sensitivity(
+        self,
+        samples: int = SENSITIVITY_CONFIG["samples"],
+        spread: float = SENSITIVITY_CONFIG["spread"],
+        seed: Optional[int] = None
+    ) -> Dict[str, "RatingSensitivity"]:
+        """
+        Prüft, wie robust Ampel und Sektor-Rang gegenüber Gewichtungsänderungen sind.
+        
+        Vor der Veröffentlichung lassen sich so fragile Ratings erkennen
+        (siehe RatingSensitivity.is_fragile()).
+        
+        Args:
+            samples: Anzahl zufälliger Gewichtungen
+            spread: Relative Störung je Gewicht
+            seed: Optional, Startwert für reproduzierbare Ergebnisse
+        
+        Returns:
+            Dict mit Symbol -> RatingSensitivity
+        """
+        from .scenarios import WeightSweep
+        return WeightSweep(self._ranker, use_numpy=self._scorer.use_numpy).sensitivity(
+            samples, spread, seed
+        )
+    
+    def add_peer_groups(self, definition: PeerGroupDefinition) -> GroupRanker:
+        """
+        Registriert zusätzliche Vergleichsgruppen (z.B. Region oder Größenklasse).
+        
+        Eine Definition gleichen Namens wird ersetzt.
+        
+        Args:
+            definition: Definition der Vergleichsgruppen
+        
+        Returns:
+            GroupRanker der Definition (cacht Index und Scores je Gruppe)
+        """
+        ranker = GroupRanker(definition, data_loader=self._loader, scorer=self._scorer)
+        self._peer_rankers[definition.name] = ranker
+        return ranker
+    
+    def get_peer_group_scores(self, symbol: str) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Scoring eines Unternehmens in allen registrierten Vergleichsgruppen.
+        
+        Teil-Scores, Gesamt-Score und Perzentil beziehen sich jeweils auf
+        die Vergleichsgruppe, "sector" bleibt der Sektor des Unternehmens.
+        
+        Args:
+            symbol: Aktiensymbol
+        
+        Returns:
+            Dict mit Definitionsname -> Liste von Output-Dicts (eines je
+            Gruppe, mit zusätzlichem Feld "peer_group")
+        """
+        company = self._loader.get_company_data(symbol.upper())
+        if not company:
+            return {}
+        
+        outputs = {}
+        for name, ranker in self._peer_rankers.items():
+            outputs[name] = []
+            for group in ranker.get_groups_of(company):
+                score_result = ranker.get_group_scores(group).get(company.symbol)
+                if not score_result:
+                    continue
+                ranking = ranker.get_group_ranking(company.symbol, group)
+                output = build_scoring_output(
+                    replace(score_result, sector=company.sector), ranking, self._text_gen
+                )
+                output["peer_group"] = group
+                outputs[name].append(output)
+        return outputs
+    
+    def get_leaderboard(self, limit: int = 10, bottom: bool = False) -> List[Dict[str, Any]]:
+        """
+        Globales Ranking über alle Sektoren (z.B. für den Aktien-Monitor).
+        
+        Die Sortierung wird einmal aufgebaut und nur für neu berechnete
+        Sektoren aktualisiert (siehe GlobalLeaderboard).
+        
+        Args:
+            limit: Anzahl Einträge
+            bottom: Wenn True, die schwächsten statt der besten Unternehmen
+        
+        Returns:
+            Liste von {"rank", "symbol", "sector", "score_total",
+            "sector_percentile", "traffic_light"}, nach Rang aufsteigend
+        """
+        leaderboard = self._get_leaderboard()
+        entries = leaderboard.bottom(limit) if bottom else leaderboard.top(limit)
+        return [
+            {
+                "rank": entry.rank,
+                "symbol": entry.symbol,
+                "sector": entry.sector,
+                "score_total": int(round(entry.total_score)),
+                "sector_percentile": int(entry.sector_percentile),
+                "traffic_light": get_traffic_light(entry.total_score),
+            }
+            for entry in entries
+        ]
+    
+    def get_global_rank(self, symbol: str) -> Optional[int]:
+        """
+        Globale Platzierung eines Unternehmens über alle Sektoren.
+        
+        Args:
+            symbol: Aktiensymbol
+        
+        Returns:
+            Rang (1 = beste) oder None wenn nicht gefunden
+        """
+        return self._get_leaderboard().rank(symbol)
+    
+    def _get_leaderboard(self) -> "GlobalLeaderboard":
+        """Globales Leaderboard, beim ersten Zugriff aufgebaut."""
+        if self._leaderboard is None:
+            from .leaderboard import GlobalLeaderboard
+            self._leaderboard = GlobalLeaderboard(self._ranker)
+        return self._leaderboard
+    
+    def screen(
+        self,
+        sector: Optional[str] = None,
+        traffic_light: Optional[str] = None,
+        min_quality: Optional[str] = None,
+        min_growth: Optional[str] = None,
+        min_stability: Optional[str] = None,
+        min_valuation: Optional[str] = None,
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """
+        Screener: beste Unternehmen nach Gesamt-Score mit Filtern.
+        
+        Beispiel:
+            api.screen(traffic_light="green", min_quality="hoch", limit=20)
+        
+        Args:
+            sector: Optional, nur dieser Sektor
+            traffic_light: Optional, "green", "yellow" oder "red"
+            min_quality, min_growth, min_stability: Optional, Mindest-Label
+                (z.B. "hoch" = "hoch", "sehr hoch" oder "hervorragend")
+            min_valuation: Optional, Mindest-Label der Bewertung (z.B. "fair")
+            limit: Maximale Anzahl Treffer
+        
+        Returns:
+            Liste von {"symbol", "sector", "score_total", "score_quality",
+            "score_growth", "score_stability", "score_valuation",
+            "sector_percentile", "traffic_light"}
+        
+        Raises:
+            ValueError: Bei unbekannter Ampelfarbe oder unbekanntem Label
+        """
+        if self._screener is None:
+            from .screener import Screener
+            self._screener = Screener(self._ranker, self._text_gen)
+        min_labels = {
+            dim: label
+            for dim, label in (
+                ("quality", min_quality),
+                ("growth", min_growth),
+                ("stability", min_stability),
+                ("valuation", min_valuation),
+            )
+            if label is not None
+        }
+        hits = []
+        for result in self._screener.screen(sector, traffic_light, min_labels, limit):
+            labels = self._text_gen.generate_score_labels(result)
+            hits.append({
+                "symbol": result.symbol,
+                "sector": result.sector,
+                "score_total": int(round(result.total_score)),
+                "score_quality": labels["quality"],
+                "score_growth": labels["growth"],
+                "score_stability": labels["stability"],
+                "score_valuation": labels["valuation"],
+                "sector_percentile": int(result.sector_percentile),
+                "traffic_light": get_traffic_light(result.total_score),
+            })
+        return hits
     
     def get_disclaimer(self) -> str:
         """Gibt den rechtlichen Disclaimer zurück."""
         return DISCLAIMER
     
+    def update_company(self, company: CompanyFinancials) -> List[ScoreChange]:
+        """
+        Übernimmt aktualisierte Kennzahlen (z.B. nach einer neuen Meldung).
+        
+        Nur der betroffene Sektor wird neu berechnet. Die zurückgegebenen
+        alten und neuen Ergebnisse erlauben es, Exporte gezielt zu patchen.
+        
+        Args:
+            company: Unternehmen mit aktualisierten Kennzahlen
+        
+        Returns:
+            Liste der geänderten Score-Ergebnisse
+        """
+        previous = self._loader.get_company_data(company.symbol)
+        changes = self._ranker.update_company(company)
+        for ranker in self._peer_rankers.values():
+            ranker.invalidate_for(previous, company)
+        sectors = {company.sector} | ({previous.sector} if previous else set())
+        self._get_change_log().record([company.symbol], [], sectors)
+        return changes
+    
+    @property
+    def data_version(self) -> int:
+        """Aktuelle Datenversion (steigt mit jeder übernommenen Änderung)."""
+        return self._get_change_log().version
+    
+    def apply_changes(self, changes: "ChangeSet") -> int:
+        """
+        Übernimmt Upserts und Löschungen als eine neue Datenversion.
+        
+        Verworfen werden nur Index und Scores der betroffenen Sektoren (alter
+        und neuer Sektor jedes geänderten Unternehmens) sowie deren Einträge
+        in Leaderboard, Screener und Vergleichsgruppen. Neu berechnet wird
+        erst beim nächsten Zugriff, jeder Sektor also höchstens einmal je Satz.
+        
+        Args:
+            changes: Upserts und Löschungen
+        
+        Returns:
+            Die neue Datenversion (unverändert, wenn der Satz nichts ändert,
+            z.B. nur unbekannte Symbole löscht)
+        
+        Raises:
+            ValueError: Wenn ein Symbol mehrfach im Satz vorkommt
+            NotImplementedError: Wenn die Datenquelle keine Aktualisierungen unterstützt
+        """
+        previous = self._loader.get_companies(changes.symbols())
+        for company in changes.upserts:
+            self._loader.upsert_company(company)
+        deleted = [symbol.upper() for symbol in changes.deletes if self._loader.delete_company(symbol)]
+        if not changes.upserts and not deleted:
+            return self._get_change_log().version
+        
+        stale = [*previous.values(), *changes.upserts]
+        self._ranker.invalidate_for(*stale)
+        for ranker in self._peer_rankers.values():
+            ranker.invalidate_for(*stale)
+        return self._get_change_log().record(
+            [company.symbol for company in changes.upserts], deleted,
+            {company.sector for company in stale}
+        )
+    
+    def changes_since(self, version: int) -> Dict[str, Any]:
+        """
+        Was sich seit einer Datenversion geändert hat (für inkrementelle Exporte).
+        
+        Args:
+            version: Zuletzt verarbeitete Version (0 = alle Änderungen)
+        
+        Returns:
+            Dict mit "since", "version" (aktueller Stand), "upserted",
+            "deleted" und "sectors" (Sektoren mit geänderten Scores)
+        
+        Raises:
+            ValueError: Bei negativer oder noch nicht vergebener Version
+        """
+        feed = self._get_change_log().changes_since(version)
+        return {
+            "since": feed.since,
+            "version": feed.version,
+            "upserted": list(feed.upserted),
+            "deleted": list(feed.deleted),
+            "sectors": list(feed.sectors),
+        }
+    
+    def _get_change_log(self) -> "ChangeLog":
+        """Änderungsprotokoll, beim ersten Zugriff angelegt."""
+        if self._changes is None:
+            from .changes import ChangeLog
+            self._changes = ChangeLog()
+        return self._changes
+    
     def refresh_cache(self):
         """Aktualisiert alle gecachten Daten."""
         self._ranker.clear_cache()
+        for ranker in self._peer_rankers.values():
+            ranker.clear_cache()
 
 
 # Singleton-Instanz
@@ -276,37 +765,100 @@ def main():
         python -m scoring.api AAPL
         python -m scoring.api AAPL MSFT GOOGL
         python -m scoring.api --all
+        python -m scoring.api --all --workers 8
+        python -m scoring.api --all --ndjson
         python -m scoring.api --sector Technology
+        python -m scoring.api --sensitivity 2000
+        python -m scoring.api --leaderboard 20
+        python -m scoring.api --screen traffic_light=green min_quality=hoch limit=20
     """
     import sys
     
     api = get_scoring_api(use_mock=True)
     
-    if len(sys.argv) < 2:
+    # Optionale Anzahl Worker-Prozesse für Batch-Scoring
+    argv = list(sys.argv)
+    workers = None
+    if "--workers" in argv:
+        pos = argv.index("--workers")
+        if pos + 1 >= len(argv) or not argv[pos + 1].isdigit():
+            print("Fehler: Anzahl Worker angeben")
+            return
+        workers = int(argv[pos + 1])
+        del argv[pos:pos + 2]
+    
+    # NDJSON: eine Zeile pro Unternehmen, sofort geschrieben
+    ndjson = "--ndjson" in argv
+    if ndjson:
+        argv.remove("--ndjson")
+    
+    if len(argv) < 2:
         print("Verwendung:")
         print("  python -m scoring.api <SYMBOL>")
         print("  python -m scoring.api <SYMBOL1> <SYMBOL2> ...")
-        print("  python -m scoring.api --all")
+        print("  python -m scoring.api --all [--workers N] [--ndjson]")
         print("  python -m scoring.api --sector <SECTOR>")
+        print("  python -m scoring.api --sensitivity [SAMPLES]")
+        print("  python -m scoring.api --leaderboard [N] [--bottom]")
+        print("  python -m scoring.api --screen [sector=...] [traffic_light=...] [min_quality=...] [limit=N]")
         print("  python -m scoring.api --list-symbols")
         print("  python -m scoring.api --list-sectors")
         return
     
-    arg = sys.argv[1]
+    arg = argv[1]
+    
+    if ndjson and arg not in (
+        "--sector", "--sensitivity", "--leaderboard", "--screen",
+        "--list-symbols", "--list-sectors", "--disclaimer"
+    ):
+        symbols = None if arg == "--all" else argv[1:]
+        for result in api.iter_scores(symbols, workers=workers):
+            sys.stdout.write(json.dumps(result, ensure_ascii=False) + "\n")
+            sys.stdout.flush()
     
-    if arg == "--all":
+    elif arg == "--all":
         symbols = api.get_available_symbols()
-        results = api.batch_score(symbols)
+        results = api.batch_score(symbols, workers=workers)
         print(json.dumps(results, ensure_ascii=False, indent=2))
     
     elif arg == "--sector":
-        if len(sys.argv) < 3:
+        if len(argv) < 3:
             print("Fehler: Sektor angeben")
             return
-        sector = sys.argv[2]
+        sector = argv[2]
         overview = api.get_sector_overview(sector)
         print(json.dumps(overview, ensure_ascii=False, indent=2))
     
+    elif arg == "--sensitivity":
+        samples = int(argv[2]) if len(argv) > 2 else SENSITIVITY_CONFIG["samples"]
+        report = api.weight_sensitivity(samples)
+        # Fragilste Ratings zuerst
+        entries = sorted(
+            report.values(),
+            key=lambda r: max(r.traffic_light_flip_rate, r.rank_flip_rate),
+            reverse=True
+        )
+        output = [dict(asdict(entry), fragile=entry.is_fragile()) for entry in entries]
+        print(json.dumps(output, ensure_ascii=False, indent=2))
+    
+    elif arg == "--leaderboard":
+        bottom = "--bottom" in argv
+        if bottom:
+            argv.remove("--bottom")
+        limit = int(argv[2]) if len(argv) > 2 else 10
+        print(json.dumps(api.get_leaderboard(limit, bottom=bottom), ensure_ascii=False, indent=2))
+    
+    elif arg == "--screen":
+        filters = dict(option.split("=", 1) for option in argv[2:] if "=" in option)
+        if "limit" in filters:
+            filters["limit"] = int(filters["limit"])
+        try:
+            hits = api.screen(**filters)
+        except (TypeError, ValueError) as error:
+            print(f"Fehler: {error}")
+            return
+        print(json.dumps(hits, ensure_ascii=False, indent=2))
+    
     elif arg == "--list-symbols":
         symbols = api.get_available_symbols()
         print("\n".join(sorted(symbols)))
@@ -320,7 +872,7 @@ def main():
     
     else:
         # Ein oder mehrere Symbole
-        symbols = sys.argv[1:]
+        symbols = argv[1:]
         if len(symbols) == 1:
             result = api.get_company_score(symbols[0])
             if result:
@@ -328,7 +880,7 @@ def main():
             else:
                 print(f"Symbol '{symbols[0]}' nicht gefunden.")
         else:
-            results = api.batch_score(symbols)
+            results = api.batch_score(symbols, workers=workers)
             print(json.dumps(results, ensure_ascii=False, indent=2))
 
 
@@ -0,0 +1,185 @@
+"""
+Async Source Modul
+
+Asynchrone Datenquellen für Backends mit einer Anfrage pro Symbol.
+
+Eine synchrone Datenquelle arbeitet die Symbole eines Sektors
+nacheinander ab; bei einem entfernten Backend summieren sich die
+Latenzen. AsyncDataSourceBase lädt dagegen alle Symbole einer Abfrage
+nebenläufig (begrenzt durch max_concurrency), ein kalter Sektor kostet
+damit ungefähr die Dauer der langsamsten Einzelanfrage.
+
+AsyncSourceAdapter macht eine asynchrone Quelle als normale
+DataSourceBase nutzbar (DataLoader, SectorRanker, ScoringAPI). Die
+Coroutinen laufen dabei in einer eigenen Event-Loop in einem
+Hintergrund-Thread, der Adapter funktioniert also auch aus Code heraus,
+der selbst in einer Event-Loop läuft.
+"""
+
+from typing import Any, Awaitable, Dict, Iterable, List, Optional
+from abc import ABC, abstractmethod
+import asyncio
+import concurrent.futures
+import threading
+
+from .config import DATA_SOURCE_CONFIG
+from .data_loader import CompanyFinancials, DataSourceBase
+
+
+class AsyncDataSourceBase(ABC):
+    """
+    Abstrakte Basisklasse für asynchrone Datenquellen.
+
+    Implementierungen liefern einzelne Unternehmen, die Symbole eines
+    Sektors und die Sektorliste; Mengenabfragen (get_companies(),
+    get_sector_companies(), get_all_companies()) bauen darauf auf.
+    """
+
+    # Maximale Anzahl gleichzeitiger Anfragen je Mengenabfrage
+    max_concurrency: int = DATA_SOURCE_CONFIG["max_concurrency"]
+
+    @abstractmethod
+    async def get_company_data(self, symbol: str) -> Optional[CompanyFinancials]:
+        """Lädt Daten für ein einzelnes Unternehmen."""
+        pass
+
+    @abstractmethod
+    async def get_sector_symbols(self, sector: str) -> List[str]:
+        """Symbole aller Unternehmen eines Sektors."""
+        pass
+
+    @abstractmethod
+    async def get_available_sectors(self) -> List[str]:
+        """Gibt alle verfügbaren Sektoren zurück."""
+        pass
+
+    async def get_companies(self, symbols: Iterable[str]) -> Dict[str, CompanyFinancials]:
+        """
+        Lädt mehrere Unternehmen nebenläufig.
+
+        Args:
+            symbols: Aktiensymbole
+
+        Returns:
+            Dict Symbol -> CompanyFinancials (unbekannte Symbole fehlen)
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch(symbol: str) -> Optional[CompanyFinancials]:
+            async with semaphore:
+                return await self.get_company_data(symbol)
+
+        unique = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        companies = await asyncio.gather(*(fetch(symbol) for symbol in unique))
+        return {company.symbol: company for company in companies if company is not None}
+
+    async def get_sector_companies(self, sector: str) -> List[CompanyFinancials]:
+        """Lädt alle Unternehmen eines Sektors nebenläufig."""
+        return list((await self.get_companies(await self.get_sector_symbols(sector))).values())
+
+    async def get_available_symbols(self) -> List[str]:
+        """Gibt alle verfügbaren Symbole zurück."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch(sector: str) -> List[str]:
+            async with semaphore:
+                return await self.get_sector_symbols(sector)
+
+        sectors = await self.get_available_sectors()
+        per_sector = await asyncio.gather(*(fetch(sector) for sector in sectors))
+        return [symbol for symbols in per_sector for symbol in symbols]
+
+    async def get_all_companies(self) -> List[CompanyFinancials]:
+        """Lädt alle verfügbaren Unternehmen nebenläufig."""
+        return list((await self.get_companies(await self.get_available_symbols())).values())
+
+    async def aclose(self):
+        """Gibt Ressourcen der Quelle frei (z.B. offene Verbindungen)."""
+        pass
+
+
+class AsyncSourceAdapter(DataSourceBase):
+    """
+    Synchrone Sicht auf eine AsyncDataSourceBase.
+
+    Verwendung:
+        source = AsyncSourceAdapter(MyAsyncSource())
+        api = ScoringAPI(data_loader=DataLoader(data_source=source))
+        ...
+        source.close()
+    """
+
+    def __init__(self, source: AsyncDataSourceBase, timeout: Optional[float] = None):
+        """
+        Startet die Event-Loop des Adapters.
+
+        Args:
+            source: Asynchrone Datenquelle
+            timeout: Maximale Dauer je Abfrage in Sekunden
+                (Standard: DATA_SOURCE_CONFIG["request_timeout_s"])
+        """
+        self._source = source
+        self._timeout = DATA_SOURCE_CONFIG["request_timeout_s"] if timeout is None else timeout
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="capitovo-async-source", daemon=True
+        )
+        self._thread.start()
+
+    def __enter__(self) -> "AsyncSourceAdapter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def source(self) -> AsyncDataSourceBase:
+        """Die umschlossene asynchrone Quelle."""
+        return self._source
+
+    def _run(self, coroutine: Awaitable[Any]) -> Any:
+        """Führt eine Coroutine in der Event-Loop des Adapters aus und wartet."""
+        if self._loop.is_closed():
+            # Die bereits erzeugte Coroutine schließen, sonst warnt Python
+            # beim Aufräumen über eine nie abgewartete Coroutine.
+            coroutine.close()
+            raise RuntimeError("AsyncSourceAdapter ist bereits geschlossen")
+        future = asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+        try:
+            return future.result(self._timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def close(self):
+        """Schließt die Quelle und beendet die Event-Loop."""
+        if self._loop.is_closed():
+            return
+        self._run(self._source.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def get_company_data(self, symbol: str) -> Optional[CompanyFinancials]:
+        """Lädt Daten für ein einzelnes Unternehmen."""
+        return self._run(self._source.get_company_data(symbol))
+
+    def get_companies(self, symbols: Iterable[str]) -> Dict[str, CompanyFinancials]:
+        """Lädt mehrere Unternehmen nebenläufig."""
+        return self._run(self._source.get_companies(symbols))
+
+    def get_sector_companies(self, sector: str) -> List[CompanyFinancials]:
+        """Lädt alle Unternehmen eines Sektors nebenläufig."""
+        return self._run(self._source.get_sector_companies(sector))
+
+    def get_all_companies(self) -> List[CompanyFinancials]:
+        """Lädt alle verfügbaren Unternehmen nebenläufig."""
+        return self._run(self._source.get_all_companies())
+
+    def get_available_symbols(self) -> List[str]:
+        """Gibt alle verfügbaren Symbole zurück."""
+        return self._run(self._source.get_available_symbols())
+
+    def get_available_sectors(self) -> List[str]:
+        """Gibt alle verfügbaren Sektoren zurück."""
+        return self._run(self._source.get_available_sectors())
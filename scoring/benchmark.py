@@ -0,0 +1,823 @@
+"""
+Benchmark Modul
+
+Mess-Werkzeuge für Speicherbedarf und Laufzeit des Scoring-Systems.
+
+Verwendung:
+    python -m scoring.benchmark memory [ANZAHL]
+    python -m scoring.benchmark sensitivity [ANZAHL] [STICHPROBEN]
+    python -m scoring.benchmark history [ANZAHL] [STICHTAGE]
+    python -m scoring.benchmark sketch [ANZAHL] [FEHLER]
+    python -m scoring.benchmark leaderboard [ANZAHL] [UPDATES]
+    python -m scoring.benchmark screen [ANZAHL] [ABFRAGEN]
+    python -m scoring.benchmark load [ANZAHL]
+    python -m scoring.benchmark startup [ANZAHL]
+    python -m scoring.benchmark coldstart [WIEDERHOLUNGEN]
+    python -m scoring.benchmark scale [ANZAHL]
+"""
+
+from typing import Any, Callable, Dict, List, Tuple
+from dataclasses import fields, make_dataclass, field as dc_field, replace, MISSING
+from datetime import date
+import csv
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from .config import VALID_SECTORS
+from .data_loader import (
+    DataLoader, CompanyFinancials, FileDataSource, FinancialsTable, MockDataSource, METRIC_FIELDS
+)
+from .mmap_store import MMAP_EXTENSION, MmapDataSource, write_mmap_file
+from .scorer import Scorer, ScoreResult
+from .sector_ranker import SectorRanker, SectorRanking
+from .scenarios import WeightSweep
+from .synthetic import SyntheticDataSource
+from .history import SnapshotStore, HistoricalScorer
+from .sketch import KLLSketch
+from .leaderboard import GlobalLeaderboard
+from .screener import Screener
+from .text_generator import get_text_generator, get_traffic_light
+from .api import ScoringOutput
+
+
+def _retained_bytes(build: Callable[[], Any]) -> int:
+    """Misst den Speicher, den das Ergebnis von build() belegt (tracemalloc)."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return after - before
+
+
+def _bytes_per_instance(factory: Callable[[int], Any], count: int) -> float:
+    """Speicher pro erzeugtem Objekt (inkl. Listeneintrag)."""
+    return _retained_bytes(lambda: [factory(i) for i in range(count)]) / count
+
+
+def _dict_based_variant(cls: type) -> type:
+    """Erzeugt eine klassische @dataclass-Variante mit __dict__ als Vergleich."""
+    spec = []
+    for f in fields(cls):
+        if f.default is not MISSING:
+            spec.append((f.name, f.type, dc_field(default=f.default)))
+        else:
+            spec.append((f.name, f.type))
+    return make_dataclass(cls.__name__ + "Dict", spec)
+
+
+def _record_values(count: int) -> Dict[type, Callable[[int], Dict[str, Any]]]:
+    """
+    Liefert je Typ eine Funktion, die die Feldwerte des i-ten Datensatzes erzeugt.
+
+    Die Werte (Strings, Floats) entstehen bei jedem Aufruf neu, damit sie
+    innerhalb der Messung angelegt und wie beim echten Laden mitgezählt werden.
+    """
+    rng = random.Random(42)
+    return {
+        CompanyFinancials: lambda i: dict(
+            symbol=f"SYM{i}", name=f"Company {i}", sector="Technology",
+            last_updated=None, **{m: rng.random() for m in METRIC_FIELDS}
+        ),
+        ScoreResult: lambda i: dict(
+            symbol=f"SYM{i}", sector="Technology",
+            quality_score=rng.random(), growth_score=rng.random(),
+            stability_score=rng.random(), valuation_score=rng.random(),
+            total_score=rng.random(), sector_percentile=rng.random()
+        ),
+        SectorRanking: lambda i: dict(
+            symbol=f"SYM{i}", sector="Technology", rank=i + 1,
+            total_in_sector=count, percentile=rng.random(),
+            position_description="obere Hälfte"
+        ),
+        ScoringOutput: lambda i: dict(
+            symbol=f"SYM{i}", sector="Technology", score_total=50,
+            score_quality="hoch", score_growth="solide", score_stability="hoch",
+            score_valuation="fair", sector_percentile=50, traffic_light="yellow",
+            summary_text="—"
+        ),
+    }
+
+
+def memory_benchmark(count: int = 10000) -> Dict[str, Dict[str, float]]:
+    """
+    Vergleicht den Speicherbedarf pro Unternehmen vor und nach __slots__.
+
+    Gemessen werden frisch erzeugte Datensätze einschließlich ihrer
+    Feldwerte; die spaltenorientierte Tabelle wird aus ebenso frischen
+    Datensätzen aufgebaut, die danach wieder freigegeben werden.
+
+    Args:
+        count: Anzahl der erzeugten Objekte je Typ
+
+    Returns:
+        Dict mit Typname -> {"dict": Bytes, "slots": Bytes}
+    """
+    report: Dict[str, Dict[str, float]] = {}
+    for cls, values in _record_values(count).items():
+        legacy = _dict_based_variant(cls)
+        report[cls.__name__] = {
+            "dict": _bytes_per_instance(lambda i: legacy(**values(i)), count),
+            "slots": _bytes_per_instance(lambda i: cls(**values(i)), count),
+        }
+
+    values = _record_values(count)[CompanyFinancials]
+    report["FinancialsTable"] = {
+        "columnar": _retained_bytes(lambda: FinancialsTable.from_companies(
+            [CompanyFinancials(**values(i)) for i in range(count)]
+        )) / count
+    }
+    return report
+
+
+def _synthetic_loader(count: int, seed: int = 42) -> DataLoader:
+    """DataLoader mit count zufälligen Unternehmen über alle Sektoren."""
+    rng = random.Random(seed)
+    loader = DataLoader(use_mock=True)
+    for i in range(count):
+        loader.upsert_company(CompanyFinancials(
+            symbol=f"SYN{i}", name=f"Synthetic {i}", sector=rng.choice(VALID_SECTORS),
+            last_updated=None, **{m: rng.uniform(-20, 60) for m in METRIC_FIELDS}
+        ))
+    return loader
+
+
+def sensitivity_benchmark(count: int = 10000, samples: int = 2000) -> Dict[str, float]:
+    """
+    Misst die Monte-Carlo-Sensitivitätsanalyse über ein synthetisches Universum.
+
+    Args:
+        count: Anzahl zusätzlicher synthetischer Unternehmen
+        samples: Anzahl zufälliger Gewichtungen
+
+    Returns:
+        Dict mit Laufzeiten in Sekunden und Anzahl fragiler Ratings
+    """
+    ranker = SectorRanker(data_loader=_synthetic_loader(count), scorer=Scorer())
+    sweep = WeightSweep(ranker)
+
+    start = time.perf_counter()
+    for sector in ranker.get_available_sectors():
+        sweep.get_sub_scores(sector)
+    sub_scores_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    report = sweep.sensitivity(samples, seed=0)
+    sampling_time = time.perf_counter() - start
+
+    return {
+        "companies": len(report),
+        "sub_scores_s": sub_scores_time,
+        "sampling_s": sampling_time,
+        "fragile": sum(entry.is_fragile() for entry in report.values()),
+    }
+
+
+def history_benchmark(count: int = 5000, dates: int = 40, changed_sectors: int = 3) -> Dict[str, float]:
+    """
+    Vergleicht Score-Historien mit und ohne Wiederverwendung unveränderter Sektoren.
+
+    Pro Quartal ändern sich die Kennzahlen in changed_sectors zufälligen Sektoren.
+
+    Args:
+        count: Anzahl synthetischer Unternehmen
+        dates: Anzahl der Stichtage (Quartale)
+        changed_sectors: Geänderte Sektoren je Quartal
+
+    Returns:
+        Dict mit Laufzeiten in Sekunden und Anzahl berechneter Sektor-Zustände
+    """
+    rng = random.Random(7)
+    companies = _synthetic_loader(count).get_all_companies()
+    store = SnapshotStore()
+    for quarter in range(dates):
+        if quarter:
+            changed = set(rng.sample(VALID_SECTORS, changed_sectors))
+            companies = [
+                replace(c, roic=c.roic * rng.uniform(0.8, 1.2)) if c.sector in changed else c
+                for c in companies
+            ]
+        store.add_snapshot(date(2015 + quarter // 4, 3 * (quarter % 4) + 1, 1), companies)
+
+    symbols = [c.symbol for c in companies]
+    scorer = Scorer()
+
+    start = time.perf_counter()
+    for as_of in store.dates():
+        table = store.table(as_of)
+        for sector in set(table.sectors):
+            scorer.score_table(table, sector)
+    full_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    historical = HistoricalScorer(store, scorer)
+    historical.score_history(symbols)
+    reuse_time = time.perf_counter() - start
+
+    return {
+        "full_s": full_time,
+        "reuse_s": reuse_time,
+        "sector_states": historical.sector_states,
+    }
+
+
+def _synthetic_universe(count: int, seed: int = 11) -> List[CompanyFinancials]:
+    """Eine große Vergleichsgruppe mit schiefen Verteilungen und Ausreißern."""
+    rng = random.Random(seed)
+    companies = []
+    for i in range(count):
+        metrics = {}
+        for j, field in enumerate(METRIC_FIELDS):
+            value = rng.lognormvariate(1 + j % 3, 0.6) - 2
+            if rng.random() < 0.02:
+                value *= rng.choice([-20, 20])
+            metrics[field] = value
+        companies.append(CompanyFinancials(
+            symbol=f"SYN{i}", name=f"Synthetic {i}", sector="Global", **metrics
+        ))
+    return companies
+
+
+def sketch_accuracy(count: int = 50000, error: float = 0.01, shards: int = 4) -> Dict[str, float]:
+    """
+    Vergleicht näherungsweise Perzentile (KLL-Sketches) mit der exakten Berechnung.
+
+    Die Sketches werden auf shards Teilmengen aufgebaut und zusammengeführt,
+    wie bei verteilter Ingestion.
+
+    Args:
+        count: Größe der synthetischen Vergleichsgruppe
+        error: Relativer Rangfehler der Sketches
+        shards: Anzahl der zusammengeführten Teil-Sketches
+
+    Returns:
+        Dict mit Fehlerkennzahlen (Ränge und Scores in Punkten 0-100)
+
+    Hinweis: Liegt ein Wert zwischen exakter und geschätzter unterer
+    Winsorizing-Grenze, springt sein Rang um bis zu WINSORIZE_PERCENTILES
+    ["lower"] Punkte. Der Maximalfehler ist daher kaum kleiner als 5,
+    das 99%-Quantil und der Mittelwert folgen der Fehlerschranke.
+    """
+    companies = _synthetic_universe(count)
+    scorer = Scorer()
+
+    start = time.perf_counter()
+    index = scorer.build_sector_index(companies)
+    exact = scorer.score_index(index)
+    exact_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sketches = scorer.build_metric_sketches(companies[0::shards], error)
+    for shard in range(1, shards):
+        sketches.merge(scorer.build_metric_sketches(companies[shard::shards], error))
+    # Zweiter Durchlauf: Verteilung der Gesamt-Scores für das Sektor-Perzentil
+    totals = KLLSketch(error)
+    totals.extend(scorer.score_against_sketch(c, sketches).total_score for c in companies)
+    approx = [scorer.score_against_sketch(c, sketches, totals) for c in companies]
+    sketch_time = time.perf_counter() - start
+
+    rank_errors = [
+        abs(a - e)
+        for row, exact_ranks in zip(scorer.extract_metric_matrix(companies), index.ranks)
+        for a, e in zip(sketches.rank_row(row), exact_ranks)
+    ]
+    total_errors = [abs(a.total_score - exact[a.symbol].total_score) for a in approx]
+    percentile_errors = [abs(a.sector_percentile - exact[a.symbol].sector_percentile) for a in approx]
+    same_light = sum(
+        get_traffic_light(a.total_score) == get_traffic_light(exact[a.symbol].total_score)
+        for a in approx
+    )
+
+    return {
+        "rank_error_max": max(rank_errors),
+        "rank_error_p99": sorted(rank_errors)[int(len(rank_errors) * 0.99)],
+        "rank_error_mean": sum(rank_errors) / len(rank_errors),
+        "total_error_max": max(total_errors),
+        "total_error_mean": sum(total_errors) / len(total_errors),
+        "percentile_error_max": max(percentile_errors),
+        "traffic_light_agreement": same_light / count,
+        "retained_per_metric": sketches.sketches[0].retained,
+        "exact_s": exact_time,
+        "sketch_s": sketch_time,
+    }
+
+
+def leaderboard_benchmark(count: int = 10000, updates: int = 200) -> Dict[str, float]:
+    """
+    Vergleicht das materialisierte Leaderboard mit einer Sortierung je Abfrage.
+
+    Args:
+        count: Anzahl zusätzlicher synthetischer Unternehmen
+        updates: Anzahl Einzel-Aktualisierungen (update_company)
+
+    Returns:
+        Dict mit Laufzeiten in Sekunden
+    """
+    loader = _synthetic_loader(count)
+    ranker = SectorRanker(data_loader=loader, scorer=Scorer())
+    leaderboard = GlobalLeaderboard(ranker)
+    sectors = ranker.get_available_sectors()
+
+    start = time.perf_counter()
+    leaderboard.refresh()
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    all_results = [r for sector in sectors for r in ranker.get_sector_scores(sector).values()]
+    naive = sorted(all_results, key=lambda r: (-r.total_score, r.symbol))[:10]
+    naive_top_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    top = leaderboard.top(10)
+    top_time = time.perf_counter() - start
+    assert [e.symbol for e in top] == [r.symbol for r in naive]
+
+    symbols = [r.symbol for r in all_results]
+    start = time.perf_counter()
+    for symbol in symbols:
+        leaderboard.rank(symbol)
+    rank_time = (time.perf_counter() - start) / len(symbols)
+
+    rng = random.Random(1)
+    updated = [
+        replace(loader.get_company_data(rng.choice(symbols)), roic=rng.uniform(-20, 60))
+        for _ in range(updates)
+    ]
+    start = time.perf_counter()
+    for company in updated:
+        ranker.update_company(company)
+        leaderboard.top(10)
+    update_time = (time.perf_counter() - start) / updates
+
+    return {
+        "companies": len(leaderboard),
+        "build_s": build_time,
+        "naive_top10_s": naive_top_time,
+        "top10_s": top_time,
+        "rank_lookup_us": rank_time * 1e6,
+        "update_company_s": update_time,
+    }
+
+
+def screen_benchmark(count: int = 50000, queries: int = 300) -> Dict[str, float]:
+    """
+    Misst zufällige Screener-Abfragen gegen Filtern und Sortieren je Abfrage.
+
+    Args:
+        count: Anzahl zusätzlicher synthetischer Unternehmen
+        queries: Anzahl zufälliger Abfragen (Sektor, Ampel, Mindest-Labels, Limit)
+
+    Returns:
+        Dict mit Laufzeiten in Millisekunden (Aufbau in Sekunden)
+    """
+    ranker = SectorRanker(data_loader=_synthetic_loader(count), scorer=Scorer())
+    sectors = ranker.get_available_sectors()
+    results = [r for sector in sectors for r in ranker.get_sector_scores(sector).values()]
+    screener = Screener(ranker)
+
+    start = time.perf_counter()
+    screener.refresh()
+    build_time = time.perf_counter() - start
+
+    rng = random.Random(3)
+    labels = ["hervorragend", "sehr hoch", "hoch", "solide", "moderat"]
+    specs = []
+    for _ in range(queries):
+        min_labels = {
+            dim: rng.choice(labels)
+            for dim in ("quality", "growth", "stability")
+            if rng.random() < 0.4
+        }
+        specs.append((
+            rng.choice([None] + sectors),
+            rng.choice([None, "green", "yellow", "red"]),
+            min_labels,
+            rng.choice([5, 20, 100])
+        ))
+
+    timings = []
+    for spec in specs:
+        start = time.perf_counter()
+        screener.screen(*spec)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+
+    # Vergleich: Labels je Abfrage erzeugen, filtern und komplett sortieren
+    text_gen = get_text_generator()
+    start = time.perf_counter()
+    for sector, light, min_labels, limit in specs[:20]:
+        hits = [
+            r for r in results
+            if (sector is None or r.sector == sector)
+            and (light is None or get_traffic_light(r.total_score) == light)
+            and text_gen.generate_score_labels(r)
+        ]
+        sorted(hits, key=lambda r: (-r.total_score, r.symbol))[:limit]
+    naive_time = (time.perf_counter() - start) / 20
+
+    return {
+        "companies": len(results),
+        "build_s": build_time,
+        "median_ms": timings[len(timings) // 2] * 1e3,
+        "p95_ms": timings[int(len(timings) * 0.95)] * 1e3,
+        "max_ms": timings[-1] * 1e3,
+        "naive_ms": naive_time * 1e3,
+    }
+
+
+def load_benchmark(count: int = 100000) -> Dict[str, float]:
+    """
+    Misst das Laden einer CSV- und einer JSONL-Datei mit FileDataSource.
+
+    Verglichen wird mit dem naiven Weg über csv.DictReader und ein
+    CompanyFinancials-Objekt pro Zeile.
+
+    Args:
+        count: Anzahl Zeilen je Datei
+
+    Returns:
+        Dict mit Ladezeiten in Sekunden
+    """
+    rng = random.Random(5)
+    header = ["symbol", "name", "sector"] + METRIC_FIELDS + ["last_updated"]
+    rows = [
+        [f"SYN{i}", f"Synthetic {i}", rng.choice(VALID_SECTORS)]
+        + [round(rng.uniform(-20, 60), 4) for _ in METRIC_FIELDS] + ["2024-01-01"]
+        for i in range(count)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        csv_path = os.path.join(tmpdir, "financials.csv")
+        jsonl_path = os.path.join(tmpdir, "financials.jsonl")
+        with open(csv_path, "w", newline="", encoding="utf-8") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(header)
+            writer.writerows(rows)
+        with open(jsonl_path, "w", encoding="utf-8") as handle:
+            for row in rows:
+                handle.write(json.dumps(dict(zip(header, row))) + "\n")
+
+        start = time.perf_counter()
+        FileDataSource(csv_path)
+        csv_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        FileDataSource(jsonl_path)
+        jsonl_time = time.perf_counter() - start
+
+        # Vergleich: Dict und CompanyFinancials pro Zeile
+        start = time.perf_counter()
+        with open(csv_path, newline="", encoding="utf-8") as handle:
+            FinancialsTable.from_companies(
+                CompanyFinancials(
+                    symbol=record["symbol"], name=record["name"], sector=record["sector"],
+                    last_updated=record["last_updated"] or None,
+                    **{m: float(record[m]) for m in METRIC_FIELDS}
+                )
+                for record in csv.DictReader(handle)
+            )
+        naive_time = time.perf_counter() - start
+
+    return {
+        "rows": count,
+        "csv_s": csv_time,
+        "jsonl_s": jsonl_time,
+        "naive_csv_s": naive_time,
+    }
+
+
+def startup_benchmark(count: int = 100000, repeats: int = 20) -> Dict[str, float]:
+    """
+    Misst den Start einer Datenquelle: mmap-Datei gegen Neuaufbau.
+
+    Args:
+        count: Anzahl synthetischer Unternehmen in der Datei
+        repeats: Wiederholungen für das Öffnen (Median)
+
+    Returns:
+        Dict mit Zeiten in Millisekunden
+    """
+    rng = random.Random(9)
+    table = FinancialsTable()
+    for i in range(count):
+        table.append_row(
+            f"SYN{i}", f"Synthetic {i}", rng.choice(VALID_SECTORS),
+            [rng.uniform(-20, 60) for _ in METRIC_FIELDS], "2024-01-01"
+        )
+    symbols = rng.sample(table.symbols, min(1000, count))
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "financials" + MMAP_EXTENSION)
+        start = time.perf_counter()
+        write_mmap_file(path, table)
+        write_time = time.perf_counter() - start
+
+        open_times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            source = MmapDataSource(path)
+            open_times.append(time.perf_counter() - start)
+            source.close()
+        open_times.sort()
+
+        with MmapDataSource(path) as source:
+            start = time.perf_counter()
+            for symbol in symbols:
+                source.get_company_data(symbol)
+            lookup_time = (time.perf_counter() - start) / len(symbols)
+
+            start = time.perf_counter()
+            source.get_sector_companies(VALID_SECTORS[0])
+            sector_time = time.perf_counter() - start
+
+    # Vergleich: Mock-Daten erzeugen und die Tabelle aus Objekten neu aufbauen
+    start = time.perf_counter()
+    MockDataSource()
+    mock_time = time.perf_counter() - start
+
+    companies = [table.company(row) for row in range(count)]
+    start = time.perf_counter()
+    FinancialsTable.from_companies(companies)
+    rebuild_time = time.perf_counter() - start
+
+    return {
+        "companies": count,
+        "write_ms": write_time * 1e3,
+        "open_ms": open_times[len(open_times) // 2] * 1e3,
+        "lookup_us": lookup_time * 1e6,
+        "sector_ms": sector_time * 1e3,
+        "mock_init_ms": mock_time * 1e3,
+        "rebuild_ms": rebuild_time * 1e3,
+    }
+
+
+# Kurze Aufrufe für den Kaltstart-Benchmark: Name -> Interpreter-Argumente
+COLD_START_COMMANDS = {
+    "python -c pass": ["-c", "pass"],
+    "import scoring": ["-c", "import scoring"],
+    "import scoring.api": ["-c", "import scoring.api"],
+    "api --disclaimer": ["-m", "scoring.api", "--disclaimer"],
+    "api --list-sectors": ["-m", "scoring.api", "--list-sectors"],
+    "api AAPL": ["-m", "scoring.api", "AAPL"],
+}
+
+
+def _import_times(stderr: str) -> Tuple[int, Dict[str, int]]:
+    """
+    Wertet die Ausgabe von -X importtime aus.
+
+    Returns:
+        (Summe der Importzeiten der obersten Ebene in µs, Modul -> Eigenzeit in µs)
+    """
+    total = 0
+    self_times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        if not own.strip().isdigit():
+            continue
+        if not name.startswith("  "):
+            total += int(cumulative)
+        self_times[name.strip()] = int(own)
+    return total, self_times
+
+
+def cold_start_benchmark(repeats: int = 5) -> Dict[str, Dict[str, Any]]:
+    """
+    Misst kurze Aufrufe in jeweils frischen Interpreter-Prozessen (-X importtime).
+
+    Pro Befehl füllt ein Aufwärmlauf den Bytecode-Cache; gemessen werden
+    Wandzeit und Importzeit (Median) sowie ob NumPy geladen wurde.
+
+    Args:
+        repeats: Messläufe je Befehl
+
+    Returns:
+        Dict Befehl -> {"wall_ms", "import_ms", "slowest", "numpy"};
+        slowest ist das Modul mit der höchsten Eigenzeit im letzten Lauf
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [root, env.get("PYTHONPATH")]))
+    # Kaltstarts im Betrieb laufen mit Bytecode-Cache
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+
+    results = {}
+    for name, arguments in COLD_START_COMMANDS.items():
+        command = [sys.executable, "-X", "importtime", *arguments]
+        subprocess.run(command, env=env, cwd=root, capture_output=True, check=True)
+        walls, imports = [], []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            run = subprocess.run(command, env=env, cwd=root, capture_output=True, text=True, check=True)
+            walls.append(time.perf_counter() - start)
+            total, self_times = _import_times(run.stderr)
+            imports.append(total)
+        walls.sort()
+        imports.sort()
+        results[name] = {
+            "wall_ms": walls[len(walls) // 2] * 1e3,
+            "import_ms": imports[len(imports) // 2] / 1e3,
+            "slowest": max(self_times, key=self_times.get) if self_times else "",
+            "numpy": "numpy" in self_times,
+        }
+    return results
+
+
+def scale_benchmark(count: int = 100000, lookups: int = 1000) -> Dict[str, float]:
+    """
+    Misst ein synthetisches Universum: Erzeugung, Einzelabfragen und Scoring.
+
+    Args:
+        count: Anzahl synthetischer Unternehmen
+        lookups: Anzahl Einzelabfragen innerhalb eines bereits erzeugten Blocks
+
+    Returns:
+        Dict mit Laufzeiten in Sekunden bzw. Mikrosekunden
+    """
+    source = SyntheticDataSource(count)
+    start = time.perf_counter()
+    for _ in source.iter_chunks():
+        pass
+    stream_time = time.perf_counter() - start
+
+    # Erste Abfrage erzeugt den Block, weitere im selben Block nicht
+    rng = random.Random(3)
+    fresh = SyntheticDataSource(count)
+    block = min(count, fresh.chunk_size)
+    symbols = [fresh.symbol(rng.randrange(block)) for _ in range(lookups)] if count else []
+    start = time.perf_counter()
+    fresh.get_company_data(fresh.symbol(0))
+    first_lookup_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for symbol in symbols:
+        fresh.get_company_data(symbol)
+    lookup_time = time.perf_counter() - start
+
+    # Ein Sektor auf einem frischen Universum erzeugt nur dessen Blöcke
+    sector_ranker = SectorRanker(data_loader=DataLoader(data_source=fresh), scorer=Scorer())
+    sectors = sector_ranker.get_available_sectors()
+    start = time.perf_counter()
+    if sectors:
+        sector_ranker.get_sector_scores(sectors[-1])
+    sector_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    source.materialize()
+    materialize_time = time.perf_counter() - start
+
+    ranker = SectorRanker(data_loader=DataLoader(data_source=source), scorer=Scorer())
+    start = time.perf_counter()
+    for sector in ranker.get_available_sectors():
+        ranker.get_sector_scores(sector)
+    scoring_time = time.perf_counter() - start
+
+    return {
+        "companies": count,
+        "stream_s": stream_time,
+        "first_lookup_ms": first_lookup_time * 1e3,
+        "lookup_us": lookup_time / max(lookups, 1) * 1e6,
+        "sector_s": sector_time,
+        "materialize_s": materialize_time,
+        "scoring_s": scoring_time,
+    }
+
+
+def main():
+    """Kommandozeilen-Interface für die Benchmarks."""
+    if len(sys.argv) < 2:
+        print("Verwendung:")
+        print("  python -m scoring.benchmark memory [ANZAHL]")
+        print("  python -m scoring.benchmark sensitivity [ANZAHL] [STICHPROBEN]")
+        print("  python -m scoring.benchmark history [ANZAHL] [STICHTAGE]")
+        print("  python -m scoring.benchmark sketch [ANZAHL] [FEHLER]")
+        print("  python -m scoring.benchmark leaderboard [ANZAHL] [UPDATES]")
+        print("  python -m scoring.benchmark screen [ANZAHL] [ABFRAGEN]")
+        print("  python -m scoring.benchmark load [ANZAHL]")
+        print("  python -m scoring.benchmark startup [ANZAHL]")
+        print("  python -m scoring.benchmark coldstart [WIEDERHOLUNGEN]")
+        print("  python -m scoring.benchmark scale [ANZAHL]")
+        return
+
+    command = sys.argv[1]
+
+    if command == "memory":
+        count = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+        print(f"Bytes pro Objekt ({count} Objekte je Typ)")
+        for name, values in memory_benchmark(count).items():
+            line = "  ".join(f"{key}: {value:8.1f}" for key, value in values.items())
+            print(f"  {name:<20} {line}")
+
+    elif command == "sensitivity":
+        count = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+        samples = int(sys.argv[3]) if len(sys.argv) > 3 else 2000
+        result = sensitivity_benchmark(count, samples)
+        print(f"Sensitivität: {result['companies']} Unternehmen, {samples} Gewichtungen")
+        print(f"  Teil-Scores:  {result['sub_scores_s']:.3f} s")
+        print(f"  Stichproben:  {result['sampling_s']:.3f} s")
+        print(f"  Fragil:       {result['fragile']}")
+
+    elif command == "history":
+        count = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+        dates = int(sys.argv[3]) if len(sys.argv) > 3 else 40
+        result = history_benchmark(count, dates)
+        print(f"Score-Historie: {count} Unternehmen, {dates} Stichtage")
+        print(f"  Jeder Stichtag komplett:     {result['full_s']:.3f} s")
+        print(f"  Mit Sektor-Wiederverwendung: {result['reuse_s']:.3f} s")
+        print(f"  Berechnete Sektor-Zustände:  {result['sector_states']}")
+
+    elif command == "sketch":
+        count = int(sys.argv[2]) if len(sys.argv) > 2 else 50000
+        errors = [float(sys.argv[3])] if len(sys.argv) > 3 else [0.05, 0.01, 0.005]
+        print(f"Genauigkeit KLL-Sketch vs. exakt ({count} Unternehmen, 4 Shards)")
+        for error in errors:
+            result = sketch_accuracy(count, error)
+            print(f"  Fehlerschranke {error:.3f}:")
+            for key, value in result.items():
+                print(f"    {key:<24} {value:10.4f}")
+
+    elif command == "leaderboard":
+        count = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+        updates = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+        result = leaderboard_benchmark(count, updates)
+        print(f"Globales Leaderboard: {result['companies']} Unternehmen")
+        print(f"  Aufbau:                     {result['build_s']:.3f} s")
+        print(f"  Top 10 per Sortierung:      {result['naive_top10_s']:.6f} s")
+        print(f"  Top 10 materialisiert:      {result['top10_s']:.6f} s")
+        print(f"  Rang-Abfrage:               {result['rank_lookup_us']:.2f} µs")
+        print(f"  update_company + Top 10:    {result['update_company_s']:.4f} s")
+
+    elif command == "screen":
+        count = int(sys.argv[2]) if len(sys.argv) > 2 else 50000
+        queries = int(sys.argv[3]) if len(sys.argv) > 3 else 300
+        result = screen_benchmark(count, queries)
+        print(f"Screener: {result['companies']} Unternehmen, {queries} Abfragen")
+        print(f"  Aufbau der Sortierungen:  {result['build_s']:.3f} s")
+        print(f"  Median:                   {result['median_ms']:.3f} ms")
+        print(f"  95. Perzentil:            {result['p95_ms']:.3f} ms")
+        print(f"  Maximum:                  {result['max_ms']:.3f} ms")
+        print(f"  Filtern + Sortieren:      {result['naive_ms']:.1f} ms")
+
+    elif command == "load":
+        count = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+        result = load_benchmark(count)
+        print(f"Datei laden: {result['rows']} Zeilen")
+        print(f"  CSV (FileDataSource):       {result['csv_s']:.3f} s")
+        print(f"  JSONL (FileDataSource):     {result['jsonl_s']:.3f} s")
+        print(f"  CSV per DictReader/Objekt:  {result['naive_csv_s']:.3f} s")
+        print(f"  Faktor CSV / JSONL:         {result['naive_csv_s'] / result['csv_s']:.1f}x"
+              f" / {result['naive_csv_s'] / result['jsonl_s']:.1f}x")
+
+    elif command == "startup":
+        counts = [int(sys.argv[2])] if len(sys.argv) > 2 else [1000, 10000, 100000]
+        print("Start einer Datenquelle (mmap-Datei vs. Neuaufbau)")
+        for count in counts:
+            result = startup_benchmark(count)
+            print(f"  {result['companies']} Unternehmen:")
+            print(f"    Datei schreiben:            {result['write_ms']:10.2f} ms")
+            print(f"    MmapDataSource öffnen:      {result['open_ms']:10.3f} ms")
+            print(f"    Symbol-Abfrage:             {result['lookup_us']:10.2f} µs")
+            print(f"    Sektor laden:               {result['sector_ms']:10.2f} ms")
+            print(f"    MockDataSource():           {result['mock_init_ms']:10.2f} ms")
+            print(f"    Tabelle aus Objekten:       {result['rebuild_ms']:10.2f} ms")
+
+    elif command == "coldstart":
+        repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+        print(f"Kaltstart in frischen Prozessen (Median aus {repeats} Läufen)")
+        print(f"  {'Befehl':<22} {'gesamt':>10} {'Importe':>10}  langsamster Import")
+        for name, result in cold_start_benchmark(repeats).items():
+            numpy = " (NumPy geladen)" if result["numpy"] else ""
+            print(
+                f"  {name:<22} {result['wall_ms']:7.1f} ms {result['import_ms']:7.1f} ms"
+                f"  {result['slowest']}{numpy}"
+            )
+
+    elif command == "scale":
+        counts = [int(sys.argv[2])] if len(sys.argv) > 2 else [1000, 10000, 100000]
+        print("Synthetisches Universum (SyntheticDataSource)")
+        for count in counts:
+            result = scale_benchmark(count)
+            print(f"  {result['companies']} Unternehmen:")
+            print(f"    Blockweise erzeugen:        {result['stream_s']:10.3f} s")
+            print(f"    Erste Abfrage (ein Block):  {result['first_lookup_ms']:10.2f} ms")
+            print(f"    Abfrage im selben Block:    {result['lookup_us']:10.1f} µs")
+            print(f"    Ein Sektor scoren:          {result['sector_s']:10.3f} s")
+            print(f"    Tabelle aufbauen:           {result['materialize_s']:10.3f} s")
+            print(f"    Alle Sektoren scoren:       {result['scoring_s']:10.3f} s")
+
+    else:
+        print(f"Unbekannter Benchmark '{command}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Changes Modul
+
+Delta-Übernahme von Kennzahlen mit versioniertem Änderungs-Feed.
+
+Ein ChangeSet bündelt Upserts und Löschungen, die gemeinsam übernommen
+werden (ScoringAPI.apply_changes()). Jede übernommene Änderung erhält eine
+fortlaufende Datenversion; das ChangeLog merkt sich je Symbol und je Sektor
+die Version der letzten Änderung. Abnehmer (Exporte, Caches) fragen nur ab,
+was seit ihrem letzten Stand neu ist:
+
+    feed = api.changes_since(last_version)
+    for output in api.iter_scores(sectors=feed["sectors"]):
+        ...
+    last_version = feed["version"]
+
+Perzentile hängen von allen Unternehmen eines Sektors ab: ändert sich ein
+Unternehmen, ändern sich die Scores seines ganzen Sektors. Der Feed nennt
+deshalb neben den Symbolen die betroffenen Sektoren (bei einem
+Sektorwechsel den alten und den neuen).
+
+Gespeichert wird nur der letzte Stand je Symbol, kein Verlauf je Version:
+der Speicherbedarf wächst mit der Anzahl geänderter Symbole, und jede
+bereits vergebene Version bleibt abfragbar.
+"""
+
+from typing import Dict, Iterable, List, Sequence, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from .data_loader import CompanyFinancials
+
+
+@dataclass(frozen=True, slots=True)
+class ChangeSet:
+    """Upserts und Löschungen, die gemeinsam übernommen werden."""
+    upserts: Sequence[CompanyFinancials] = ()
+    deletes: Sequence[str] = ()
+
+    def symbols(self) -> List[str]:
+        """
+        Alle Symbole des Satzes (Upserts, dann Löschungen), in Großbuchstaben.
+
+        Raises:
+            ValueError: Wenn ein Symbol mehrfach vorkommt (die Reihenfolge
+                innerhalb eines Satzes ist nicht definiert)
+        """
+        symbols = [company.symbol.upper() for company in self.upserts]
+        symbols += [symbol.upper() for symbol in self.deletes]
+        if len(set(symbols)) != len(symbols):
+            seen = set()
+            duplicates = sorted({symbol for symbol in symbols if symbol in seen or seen.add(symbol)})
+            raise ValueError(f"Symbole mehrfach im ChangeSet: {', '.join(duplicates)}")
+        return symbols
+
+    def __len__(self) -> int:
+        return len(self.upserts) + len(self.deletes)
+
+
+@dataclass(frozen=True, slots=True)
+class ChangeFeed:
+    """Änderungen zwischen zwei Datenversionen."""
+    since: int                   # Angefragte Version (nicht enthalten)
+    version: int                 # Aktuelle Version (enthalten)
+    upserted: Tuple[str, ...]    # Symbole mit neuen Kennzahlen (jetzt vorhanden)
+    deleted: Tuple[str, ...]     # Entfernte Symbole (jetzt nicht mehr vorhanden)
+    sectors: Tuple[str, ...]     # Sektoren mit geänderten Scores
+
+
+class ChangeLog:
+    """
+    Fortlaufende Datenversion mit der letzten Änderung je Symbol und Sektor.
+
+    Symbole werden nach Version sortiert gehalten; changes_since() läuft
+    von der neuesten Änderung rückwärts und kostet nur so viele Schritte,
+    wie seit der angefragten Version Symbole geändert wurden.
+    """
+
+    def __init__(self):
+        self._version = 0
+        # Symbol -> (Version, gelöscht), aufsteigend nach Version
+        self._symbols: "OrderedDict[str, Tuple[int, bool]]" = OrderedDict()
+        self._sectors: Dict[str, int] = {}
+
+    @property
+    def version(self) -> int:
+        """Aktuelle Datenversion (0 = noch keine Änderung übernommen)."""
+        return self._version
+
+    def record(self, upserted: Iterable[str], deleted: Iterable[str], sectors: Iterable[str]) -> int:
+        """
+        Vergibt die nächste Version für eine übernommene Änderung.
+
+        Args:
+            upserted: Symbole mit neuen Kennzahlen
+            deleted: Entfernte Symbole
+            sectors: Sektoren, deren Scores sich dadurch ändern
+
+        Returns:
+            Die neue Version
+        """
+        self._version += 1
+        version = self._version
+        for symbols, is_deleted in ((upserted, False), (deleted, True)):
+            for symbol in symbols:
+                key = symbol.upper()
+                self._symbols[key] = (version, is_deleted)
+                self._symbols.move_to_end(key)
+        for sector in sectors:
+            self._sectors[sector] = version
+        return version
+
+    def changes_since(self, version: int) -> ChangeFeed:
+        """
+        Alles, was sich nach der angegebenen Version geändert hat.
+
+        Je Symbol zählt der letzte Stand: ein seitdem eingefügtes und wieder
+        entferntes Symbol erscheint nur unter deleted.
+
+        Args:
+            version: Zuletzt verarbeitete Version (0 = alle Änderungen)
+
+        Returns:
+            ChangeFeed mit Symbolen in Reihenfolge ihrer letzten Änderung
+
+        Raises:
+            ValueError: Bei negativer oder noch nicht vergebener Version
+        """
+        if not 0 <= version <= self._version:
+            raise ValueError(f"Unbekannte Datenversion {version} (aktuell {self._version})")
+        upserted, deleted = [], []
+        for symbol in reversed(self._symbols):
+            changed, is_deleted = self._symbols[symbol]
+            if changed <= version:
+                break
+            (deleted if is_deleted else upserted).append(symbol)
+        upserted.reverse()
+        deleted.reverse()
+        sectors = sorted(sector for sector, changed in self._sectors.items() if changed > version)
+        return ChangeFeed(version, self._version, tuple(upserted), tuple(deleted), tuple(sectors))
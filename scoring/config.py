@@ -4,6 +4,8 @@ Konfiguration für das Capitovo Scoring-System
 Enthält alle Konstanten, Gewichtungen und Schwellenwerte.
 """
 
+import os
+
 # ============================================================================
 # SCORE-GEWICHTUNGEN
 # ============================================================================
@@ -15,6 +17,37 @@ SCORE_WEIGHTS = {
     "valuation": 0.20     # Bewertung: 20%
 }
 
+# ============================================================================
+# KENNZAHLEN JE TEIL-SCORE
+# ============================================================================
+
+# Reihenfolge entspricht den Spalten der Kennzahlen-Matrix eines Sektors.
+# True = invers (niedriger ist besser)
+SCORE_METRICS = {
+    "quality": [
+        ("operating_margin", False),
+        ("net_margin", False),
+        ("roic", False),
+        ("fcf_margin", False),
+    ],
+    "growth": [
+        ("revenue_growth_3y", False),
+        ("earnings_growth_3y", False),
+        ("fcf_growth_3y", False),
+    ],
+    "stability": [
+        ("debt_to_equity", True),
+        ("interest_coverage", False),
+        ("cashflow_volatility", True),
+        ("earnings_stability", False),
+    ],
+    "valuation": [
+        ("pe_ratio", True),
+        ("ev_ebitda", True),
+        ("fcf_multiple", True),
+    ],
+}
+
 # ============================================================================
 # AMPEL-SCHWELLENWERTE
 # ============================================================================
@@ -66,6 +99,36 @@ WINSORIZE_PERCENTILES = {
     "upper": 95   # Obere Grenze: 95. Perzentil
 }
 
+# ============================================================================
+# SENSITIVITÄTSANALYSE
+# ============================================================================
+
+SENSITIVITY_CONFIG = {
+    "samples": 2000,           # Anzahl zufälliger Gewichtungen
+    "spread": 0.2,             # Relative Störung je Gewicht (±20%)
+    "fragile_flip_rate": 0.1,  # Ab 10% Ampel- oder Rangwechseln gilt ein Rating als fragil
+    "chunk_size": 256,         # Gewichtungen je Rechenschritt (begrenzt den Speicher)
+}
+
+# ============================================================================
+# NÄHERUNGSWEISE PERZENTILE (Quantil-Sketches)
+# ============================================================================
+
+SKETCH_CONFIG = {
+    "error": 0.01,  # Relativer Rangfehler: 1% der Gruppengröße
+}
+
+# ============================================================================
+# VERGLEICHSGRUPPEN (Größenklassen nach Marktkapitalisierung in USD)
+# ============================================================================
+
+MARKET_CAP_BANDS = [
+    ("Small Cap", 0.0),
+    ("Mid Cap", 2e9),
+    ("Large Cap", 10e9),
+    ("Mega Cap", 200e9),
+]
+
 # ============================================================================
 # SEKTOREN
 # ============================================================================
@@ -99,5 +162,46 @@ DISCLAIMER = (
 
 DATA_SOURCE_CONFIG = {
     "use_mock": True,  # Für Entwicklung/Tests auf True setzen
-    "cache_ttl_hours": 24,  # Cache-Gültigkeit in Stunden
+    "cache_ttl_hours": 24,  # Cache-Gültigkeit in Stunden (CachingDataSource)
+    "cache_max_entries": 4096,  # Maximale Einträge je CachingDataSource (LRU)
+    "max_concurrency": 16,  # Gleichzeitige Anfragen asynchroner Quellen
+    "request_timeout_s": 30.0,  # Maximale Dauer einer Abfrage in Sekunden
+    # CSV/JSONL-Datei (FileDataSource) oder .capsnap-Datei (MmapDataSource)
+    # für DataLoader(use_mock=False)
+    "file_path": os.environ.get("CAPITOVO_FINANCIALS_FILE"),
+    # Basis-URL einer Markt-API für DataLoader(use_mock=False), siehe HttpDataSource
+    "base_url": os.environ.get("CAPITOVO_MARKET_API_URL"),
+}
+
+# Verbindungen, Batching, Rate-Limit und Wiederholungen der HttpDataSource
+HTTP_SOURCE_CONFIG = {
+    "pool_size": 8,            # Keep-Alive-Verbindungen je Host
+    "batch_size": 50,          # Symbole je Sammelanfrage
+    "rate_per_second": 20.0,   # Token-Bucket: Anfragen pro Sekunde im Mittel
+    "burst": 20,               # Token-Bucket: maximale Anfragen auf einmal
+    "max_retries": 3,          # Wiederholungen bei 429, 5xx und Verbindungsfehlern
+    "backoff_s": 0.2,          # Basis-Wartezeit, verdoppelt je Versuch (mit Jitter)
+    "backoff_max_s": 10.0,     # Obergrenze einer Wartezeit (auch für Retry-After)
+    "timeout_s": 10.0,         # Zeitlimit je HTTP-Anfrage
+}
+
+# Synthetische Universen für Last- und Skalierungstests (SyntheticDataSource)
+SYNTHETIC_CONFIG = {
+    "seed": 0,                 # Gleicher Startwert = identische Daten
+    "chunk_size": 10000,       # Unternehmen je erzeugtem Block
+    "outlier_rate": 0.01,      # Anteil Unternehmen mit einem extremen Kennzahlen-Wert
+    # Anteil der Unternehmen je Sektor (grob wie bei börsennotierten Unternehmen)
+    "sector_mix": {
+        "Technology": 0.14,
+        "Healthcare": 0.12,
+        "Financials": 0.14,
+        "Consumer Discretionary": 0.11,
+        "Consumer Staples": 0.06,
+        "Industrials": 0.15,
+        "Energy": 0.05,
+        "Materials": 0.07,
+        "Real Estate": 0.06,
+        "Utilities": 0.04,
+        "Communication Services": 0.06,
+    },
 }
@@ -8,15 +8,29 @@ WICHTIG: Die geladenen Kennzahlen werden NUR intern verwendet
 und NIEMALS im Frontend angezeigt.
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from math import isfinite
+from itertools import islice, repeat
+from operator import itemgetter
+import csv
 import json
 import os
+import time
 from datetime import datetime
 
+from .config import DATA_SOURCE_CONFIG, SCORE_METRICS
 
-@dataclass
+
+# Kennzahlen-Felder von CompanyFinancials in Spaltenreihenfolge der Kennzahlen-Matrix
+METRIC_FIELDS = [field for metrics in SCORE_METRICS.values() for field, _ in metrics]
+
+
+@dataclass(slots=True)
 class CompanyFinancials:
     """
     Interne Datenstruktur für Finanzkennzahlen.
@@ -52,6 +66,284 @@ class CompanyFinancials:
     last_updated: Optional[str] = None
 
 
+class FinancialsTable:
+    """
+    Spaltenorientierte Ablage von Finanzkennzahlen (Struct of Arrays).
+    
+    Pro Metrik eine zusammenhängende array('d')-Spalte, dazu Spalten für
+    Symbol, Name, Sektor und Zeitstempel. Symbol -> Zeile und
+    Sektor -> Zeilen werden bei jeder Änderung mitgeführt, Abfragen
+    darauf kosten O(1).
+    Benötigt nur einen Bruchteil des Speichers einzelner
+    CompanyFinancials-Objekte und lässt sich direkt vom Scorer verarbeiten.
+    """
+    
+    def __init__(self):
+        self.symbols: List[str] = []
+        self.names: List[str] = []
+        self.sectors: List[str] = []
+        self.last_updated: List[Optional[str]] = []
+        self.columns: Dict[str, array] = {field: array("d") for field in METRIC_FIELDS}
+        self._rows: Dict[str, int] = {}
+        # Sektor -> aufsteigende Zeilen; unveränderliche Sichten werden gecacht
+        self._sector_rows: Dict[str, List[int]] = {}
+        self._sector_views: Dict[str, Tuple[int, ...]] = {}
+        self._sector_names: Optional[Tuple[str, ...]] = None
+    
+    @classmethod
+    def from_companies(cls, companies: Iterable[CompanyFinancials]) -> "FinancialsTable":
+        """Erstellt eine Tabelle aus CompanyFinancials-Objekten."""
+        table = cls()
+        for company in companies:
+            table.upsert(company)
+        return table
+    
+    def __len__(self) -> int:
+        return len(self.symbols)
+    
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.upper() in self._rows
+    
+    def row_of(self, symbol: str) -> Optional[int]:
+        """Zeile eines Symbols (None wenn nicht vorhanden)."""
+        return self._rows.get(symbol.upper())
+    
+    def append_row(
+        self,
+        symbol: str,
+        name: str,
+        sector: str,
+        metrics: Sequence[float],
+        last_updated: Optional[str] = None
+    ) -> int:
+        """
+        Hängt eine Zeile an, ohne ein CompanyFinancials-Objekt zu erzeugen.
+        
+        Args:
+            symbol, name, sector: Stammdaten
+            metrics: Kennzahlen in METRIC_FIELDS-Reihenfolge
+            last_updated: Optionaler Zeitstempel
+        
+        Returns:
+            Index der neuen Zeile
+        """
+        row = len(self.symbols)
+        self.symbols.append(symbol)
+        self.names.append(name)
+        self.sectors.append(sector)
+        self.last_updated.append(last_updated)
+        for field, value in zip(METRIC_FIELDS, metrics):
+            self.columns[field].append(value)
+        key = symbol.upper()
+        # Bereits großgeschriebene Symbole nicht doppelt speichern
+        self._rows[symbol if key == symbol else key] = row
+        self._add_to_sector(sector, row)
+        return row
+    
+    def extend_rows(
+        self,
+        symbols: Sequence[str],
+        names: Sequence[str],
+        sectors: Sequence[str],
+        buffer: array,
+        last_updated: Optional[Sequence[Optional[str]]] = None
+    ) -> int:
+        """
+        Hängt viele neue Zeilen auf einmal an (Gegenstück zu metric_buffer()).
+        
+        Die Symbole dürfen noch nicht in der Tabelle vorkommen.
+        
+        Args:
+            symbols, names, sectors: Stammdaten je Zeile
+            buffer: Kennzahlen zeilenweise, len(symbols) × len(METRIC_FIELDS) Werte
+            last_updated: Optionale Zeitstempel je Zeile
+        
+        Returns:
+            Index der ersten neuen Zeile
+        """
+        n_fields = len(METRIC_FIELDS)
+        if len(buffer) != n_fields * len(symbols):
+            raise ValueError("Puffergröße passt nicht zur Anzahl der Zeilen")
+        columns = [buffer[j::n_fields] for j in range(n_fields)]
+        return self.extend_columns(symbols, names, sectors, columns, last_updated)
+    
+    def extend_columns(
+        self,
+        symbols: Sequence[str],
+        names: Sequence[str],
+        sectors: Sequence[str],
+        columns: Sequence[array],
+        last_updated: Optional[Sequence[Optional[str]]] = None
+    ) -> int:
+        """
+        Hängt viele neue Zeilen spaltenweise an (eine array('d') je Metrik).
+        
+        Die Symbole dürfen noch nicht in der Tabelle vorkommen.
+        
+        Args:
+            symbols, names, sectors: Stammdaten je Zeile
+            columns: Kennzahlen in METRIC_FIELDS-Reihenfolge, je len(symbols) Werte
+            last_updated: Optionale Zeitstempel je Zeile
+        
+        Returns:
+            Index der ersten neuen Zeile
+        """
+        if len(columns) != len(METRIC_FIELDS) or any(len(c) != len(symbols) for c in columns):
+            raise ValueError("Spalten passen nicht zur Anzahl der Zeilen")
+        first = len(self.symbols)
+        for field, column in zip(METRIC_FIELDS, columns):
+            self.columns[field].extend(column)
+        self.symbols.extend(symbols)
+        self.names.extend(names)
+        self.sectors.extend(sectors)
+        self.last_updated.extend(last_updated if last_updated is not None else [None] * len(symbols))
+        rows = self._rows
+        keys = list(map(str.upper, symbols))
+        if keys == symbols:
+            # Bereits großgeschriebene Symbole nicht doppelt speichern
+            rows.update(zip(symbols, range(first, first + len(symbols))))
+        else:
+            for row, symbol, key in zip(range(first, first + len(symbols)), symbols, keys):
+                rows[symbol if key == symbol else key] = row
+        # Neue Zeilen liegen hinter allen bisherigen: je Sektor anhängen
+        added: Dict[str, List[int]] = {}
+        for row, sector in enumerate(sectors, start=first):
+            sector_rows = added.get(sector)
+            if sector_rows is None:
+                added[sector] = [row]
+            else:
+                sector_rows.append(row)
+        for sector, new_rows in added.items():
+            sector_rows = self._sector_rows.get(sector)
+            if sector_rows is None:
+                self._sector_rows[sector] = new_rows
+                self._sector_names = None
+            else:
+                sector_rows.extend(new_rows)
+            self._sector_views.pop(sector, None)
+        return first
+    
+    def upsert(self, company: CompanyFinancials) -> int:
+        """Fügt ein Unternehmen hinzu oder überschreibt dessen Zeile."""
+        metrics = [getattr(company, field) for field in METRIC_FIELDS]
+        row = self.row_of(company.symbol)
+        if row is None:
+            return self.append_row(
+                company.symbol, company.name, company.sector, metrics, company.last_updated
+            )
+        
+        if self.sectors[row] != company.sector:
+            self._remove_from_sector(self.sectors[row], row)
+            self._add_to_sector(company.sector, row)
+        self.symbols[row] = company.symbol
+        self.names[row] = company.name
+        self.sectors[row] = company.sector
+        self.last_updated[row] = company.last_updated
+        for field, value in zip(METRIC_FIELDS, metrics):
+            self.columns[field][row] = value
+        return row
+    
+    def delete(self, symbol: str) -> bool:
+        """
+        Entfernt ein Unternehmen.
+        
+        Die letzte Zeile rückt an die frei gewordene Stelle (O(1) statt
+        alle folgenden Zeilen zu verschieben); Zeilennummern sind danach
+        also nicht mehr stabil.
+        
+        Returns:
+            True wenn das Symbol vorhanden war
+        """
+        row = self._rows.pop(symbol.upper(), None)
+        if row is None:
+            return False
+        last = len(self.symbols) - 1
+        self._remove_from_sector(self.sectors[row], row)
+        if row != last:
+            moved_sector = self.sectors[last]
+            self._remove_from_sector(moved_sector, last)
+            self._add_to_sector(moved_sector, row)
+            self._rows[self.symbols[last].upper()] = row
+            for column in (self.symbols, self.names, self.sectors, self.last_updated):
+                column[row] = column[last]
+            for column in self.columns.values():
+                column[row] = column[last]
+        for column in (self.symbols, self.names, self.sectors, self.last_updated):
+            column.pop()
+        for column in self.columns.values():
+            column.pop()
+        return True
+    
+    def _add_to_sector(self, sector: str, row: int):
+        rows = self._sector_rows.get(sector)
+        if rows is None:
+            self._sector_rows[sector] = [row]
+            self._sector_names = None
+        elif rows[-1] < row:
+            rows.append(row)
+        else:
+            insort(rows, row)
+        self._sector_views.pop(sector, None)
+    
+    def _remove_from_sector(self, sector: str, row: int):
+        rows = self._sector_rows[sector]
+        del rows[bisect_left(rows, row)]
+        if not rows:
+            del self._sector_rows[sector]
+            self._sector_names = None
+        self._sector_views.pop(sector, None)
+    
+    def company(self, row: int) -> CompanyFinancials:
+        """Erzeugt bei Bedarf ein CompanyFinancials-Objekt für eine Zeile."""
+        metrics = {field: self.columns[field][row] for field in METRIC_FIELDS}
+        return CompanyFinancials(
+            symbol=self.symbols[row],
+            name=self.names[row],
+            sector=self.sectors[row],
+            last_updated=self.last_updated[row],
+            **metrics
+        )
+    
+    def get(self, symbol: str) -> Optional[CompanyFinancials]:
+        """Lädt ein Unternehmen per Symbol."""
+        row = self.row_of(symbol)
+        return None if row is None else self.company(row)
+    
+    def sector_rows(self, sector: str) -> Tuple[int, ...]:
+        """Zeilen aller Unternehmen eines Sektors (aufsteigend, unveränderlich)."""
+        view = self._sector_views.get(sector)
+        if view is None:
+            view = self._sector_views[sector] = tuple(self._sector_rows.get(sector, ()))
+        return view
+    
+    def available_sectors(self) -> Tuple[str, ...]:
+        """Alle Sektoren in Reihenfolge ihres ersten Auftretens (unveränderlich)."""
+        if self._sector_names is None:
+            self._sector_names = tuple(self._sector_rows)
+        return self._sector_names
+    
+    def metric_buffer(self, rows: Sequence[int]) -> array:
+        """
+        Kennzahlen ausgewählter Zeilen als zeilenweiser float64-Puffer.
+        
+        Args:
+            rows: Zeilenindizes
+        
+        Returns:
+            array('d') mit len(rows) × len(METRIC_FIELDS) Werten
+        """
+        n_fields = len(METRIC_FIELDS)
+        buffer = array("d", bytes(8 * n_fields * len(rows)))
+        if not rows:
+            return buffer
+        # Spaltenweise sammeln (itemgetter läuft in C) und verschränkt schreiben
+        gather = itemgetter(*rows)
+        for j, field in enumerate(METRIC_FIELDS):
+            values = gather(self.columns[field])
+            buffer[j::n_fields] = array("d", values if len(rows) > 1 else (values,))
+        return buffer
+
+
 class DataSourceBase(ABC):
     """Abstrakte Basisklasse für Datenquellen."""
     
@@ -69,19 +361,115 @@ class DataSourceBase(ABC):
     def get_all_companies(self) -> List[CompanyFinancials]:
         """Lädt alle verfügbaren Unternehmen."""
         pass
+    
+    def get_companies(self, symbols: Iterable[str]) -> Dict[str, CompanyFinancials]:
+        """
+        Lädt mehrere Unternehmen in einem Aufruf.
+        
+        Standard: ein get_company_data() je (eindeutigem) Symbol. Quellen
+        mit Index oder Sammel-Endpunkt überschreiben die Methode.
+        
+        Args:
+            symbols: Aktiensymbole (Duplikate werden nur einmal geladen)
+        
+        Returns:
+            Dict Symbol -> CompanyFinancials (unbekannte Symbole fehlen)
+        """
+        companies = {}
+        for symbol in dict.fromkeys(symbol.upper() for symbol in symbols):
+            company = self.get_company_data(symbol)
+            if company is not None:
+                companies[company.symbol] = company
+        return companies
+    
+    def upsert_company(self, company: CompanyFinancials) -> None:
+        """Fügt ein Unternehmen hinzu oder ersetzt dessen Kennzahlen."""
+        raise NotImplementedError(f"{type(self).__name__} unterstützt keine Aktualisierungen")
+    
+    def delete_company(self, symbol: str) -> bool:
+        """Entfernt ein Unternehmen (True wenn es vorhanden war)."""
+        raise NotImplementedError(f"{type(self).__name__} unterstützt keine Aktualisierungen")
+    
+    def get_financials_table(self) -> Optional[FinancialsTable]:
+        """
+        Spaltenorientierte Sicht auf alle Unternehmen, falls die Quelle eine führt.
+        
+        Returns:
+            FinancialsTable oder None (Standard: nicht unterstützt)
+        """
+        return None
+    
+    def close(self):
+        """Gibt Verbindungen, Threads oder Abbildungen frei (Standard: nichts zu tun)."""
+        pass
+
+
+class TableDataSource(DataSourceBase):
+    """
+    Basisklasse für Datenquellen, die ihre Daten in einer FinancialsTable halten.
+    
+    Symbol- und Sektor-Index der Tabelle werden bei jedem Einfügen und
+    Löschen mitgeführt: Sektor-Abfragen und die Sektorliste kosten keinen
+    Durchlauf über alle Unternehmen.
+    """
+    
+    def __init__(self, table: Optional[FinancialsTable] = None):
+        self._table = table if table is not None else FinancialsTable()
+    
+    def get_company_data(self, symbol: str) -> Optional[CompanyFinancials]:
+        """Lädt Daten für ein einzelnes Unternehmen."""
+        return self._table.get(symbol)
+    
+    def get_companies(self, symbols: Iterable[str]) -> Dict[str, CompanyFinancials]:
+        """Lädt mehrere Unternehmen über den Symbol-Index."""
+        table = self._table
+        rows = (table.row_of(symbol) for symbol in symbols)
+        return {table.symbols[row]: table.company(row) for row in dict.fromkeys(rows) if row is not None}
+    
+    def get_sector_companies(self, sector: str) -> List[CompanyFinancials]:
+        """Lädt alle Unternehmen eines Sektors (über den Sektor-Index)."""
+        company = self._table.company
+        return [company(row) for row in self._table.sector_rows(sector)]
+    
+    def get_all_companies(self) -> List[CompanyFinancials]:
+        """Lädt alle verfügbaren Unternehmen."""
+        company = self._table.company
+        return [company(row) for row in range(len(self._table))]
+    
+    def get_available_symbols(self) -> List[str]:
+        """Gibt alle verfügbaren Symbole zurück."""
+        return list(self._table.symbols)
+    
+    def get_available_sectors(self) -> Sequence[str]:
+        """Gibt alle verfügbaren Sektoren zurück (gecachtes, unveränderliches Tupel)."""
+        return self._table.available_sectors()
+    
+    def upsert_company(self, company: CompanyFinancials) -> None:
+        """Fügt ein Unternehmen hinzu oder ersetzt dessen Kennzahlen."""
+        self._table.upsert(company)
+    
+    def delete_company(self, symbol: str) -> bool:
+        """Entfernt ein Unternehmen (True wenn es vorhanden war)."""
+        return self._table.delete(symbol)
+    
+    def get_financials_table(self) -> Optional[FinancialsTable]:
+        """Die Daten werden spaltenorientiert gehalten."""
+        return self._table
 
 
-class MockDataSource(DataSourceBase):
+class MockDataSource(TableDataSource):
     """
     Mock-Datenquelle für Entwicklung und Tests.
     Enthält realistische Beispieldaten für verschiedene Sektoren.
     """
     
     def __init__(self):
-        self._companies = self._generate_mock_data()
+        super().__init__(FinancialsTable.from_companies(self._generate_mock_data().values()))
     
     def _generate_mock_data(self) -> Dict[str, CompanyFinancials]:
         """Generiert realistische Mock-Daten."""
+        # Ein Zeitstempel für alle Datensätze
+        now = datetime.now().isoformat()
         mock_data = {
             # Technology Sektor
             "AAPL": CompanyFinancials(
@@ -90,7 +478,7 @@ class MockDataSource(DataSourceBase):
                 revenue_growth_3y=0.08, earnings_growth_3y=0.10, fcf_growth_3y=0.12,
                 debt_to_equity=1.5, interest_coverage=25.0, cashflow_volatility=0.15, earnings_stability=0.90,
                 pe_ratio=28.0, ev_ebitda=20.0, fcf_multiple=25.0,
-                last_updated=datetime.now().isoformat()
+                last_updated=now
             ),
             "MSFT": CompanyFinancials(
                 symbol="MSFT", name="Microsoft Corporation", sector="Technology",
@@ -98,7 +486,7 @@ class MockDataSource(DataSourceBase):
                 revenue_growth_3y=0.14, earnings_growth_3y=0.18, fcf_growth_3y=0.20,
                 debt_to_equity=0.5, interest_coverage=40.0, cashflow_volatility=0.10, earnings_stability=0.95,
                 pe_ratio=32.0, ev_ebitda=22.0, fcf_multiple=28.0,
-                last_updated=datetime.now().isoformat()
+                last_updated=now
             ),
             "GOOGL": CompanyFinancials(
                 symbol="GOOGL", name="Alphabet Inc.", sector="Technology",
@@ -106,7 +494,7 @@ class MockDataSource(DataSourceBase):
                 revenue_growth_3y=0.12, earnings_growth_3y=0.15, fcf_growth_3y=0.14,
                 debt_to_equity=0.3, interest_coverage=50.0, cashflow_volatility=0.12, earnings_stability=0.88,
                 pe_ratio=25.0, ev_ebitda=16.0, fcf_multiple=22.0,
-                last_updated=datetime.now().isoformat()
+                last_updated=now
             ),
             "NVDA": CompanyFinancials(
                 symbol="NVDA", name="NVIDIA Corporation", sector="Technology",
@@ -114,7 +502,7 @@ class MockDataSource(DataSourceBase):
                 revenue_growth_3y=0.50, earnings_growth_3y=0.70, fcf_growth_3y=0.55,
                 debt_to_equity=0.4, interest_coverage=60.0, cashflow_volatility=0.25, earnings_stability=0.75,
                 pe_ratio=55.0, ev_ebitda=40.0, fcf_multiple=50.0,
-                last_updated=datetime.now().isoformat()
+                last_updated=now
             ),
             "META": CompanyFinancials(
                 symbol="META", name="Meta Platforms Inc.", sector="Technology",
@@ -122,7 +510,7 @@ class MockDataSource(DataSourceBase):
                 revenue_growth_3y=0.10, earnings_growth_3y=0.08, fcf_growth_3y=0.12,
                 debt_to_equity=0.2, interest_coverage=80.0, cashflow_volatility=0.20, earnings_stability=0.82,
                 pe_ratio=22.0, ev_ebitda=14.0, fcf_multiple=20.0,
-                last_updated=datetime.now().isoformat()
+                last_updated=now
             ),
             "ORCL": CompanyFinancials(
                 symbol="ORCL", name="Oracle Corporation", sector="Technology",
@@ -130,7 +518,7 @@ class MockDataSource(DataSourceBase):
                 revenue_growth_3y=0.06, earnings_growth_3y=0.08, fcf_growth_3y=0.07,
                 debt_to_equity=3.0, interest_coverage=8.0, cashflow_volatility=0.18, earnings_stability=0.85,
                 pe_ratio=18.0, ev_ebitda=12.0, fcf_multiple=16.0,
-                last_updated=datetime.now().isoformat()
+                last_updated=now
             ),
             "CRM": CompanyFinancials(
                 symbol="CRM", name="Salesforce Inc.", sector="Technology",
@@ -138,7 +526,7 @@ class MockDataSource(DataSourceBase):
                 revenue_growth_3y=0.18, earnings_growth_3y=0.25, fcf_growth_3y=0.22,
                 debt_to_equity=0.3, interest_coverage=15.0, cashflow_volatility=0.22, earnings_stability=0.78,
                 pe_ratio=45.0, ev_ebitda=25.0, fcf_multiple=30.0,
-                last_updated=datetime.now().isoformat()
+                last_updated=now
             ),
             "ADBE": CompanyFinancials(
                 symbol="ADBE", name="Adobe Inc.", sector="Technology",
@@ -146,7 +534,7 @@ class MockDataSource(DataSourceBase):
                 revenue_growth_3y=0.12, earnings_growth_3y=0.14, fcf_growth_3y=0.15,
                 debt_to_equity=0.4, interest_coverage=35.0, cashflow_volatility=0.12, earnings_stability=0.92,
                 pe_ratio=35.0, ev_ebitda=24.0, fcf_multiple=28.0,
-                last_updated=datetime.now().isoformat()
+                last_updated=now
             ),
             "INTC": CompanyFinancials(
                 symbol="INTC", name="Intel Corporation", sector="Technology",
@@ -154,7 +542,7 @@ class MockDataSource(DataSourceBase):
                 revenue_growth_3y=-0.10, earnings_growth_3y=-0.25, fcf_growth_3y=-0.20,
                 debt_to_equity=0.5, interest_coverage=5.0, cashflow_volatility=0.40, earnings_stability=0.50,
                 pe_ratio=80.0, ev_ebitda=15.0, fcf_multiple=60.0,
-                last_updated=datetime.now().isoformat()
+                last_updated=now
             ),
             "IBM": CompanyFinancials(
                 symbol="IBM", name="IBM Corporation", sector="Technology",
@@ -162,7 +550,7 @@ class MockDataSource(DataSourceBase):
                 revenue_growth_3y=0.02, earnings_growth_3y=0.04, fcf_growth_3y=0.03,
                 debt_to_equity=2.5, interest_coverage=10.0, cashflow_volatility=0.15, earnings_stability=0.88,
                 pe_ratio=15.0, ev_ebitda=10.0, fcf_multiple=12.0,
-                last_updated=datetime.now().isoformat()
+                last_updated=now
             ),
             
             # Healthcare Sektor
@@ -172,7 +560,7 @@ class MockDataSource(DataSourceBase):
                 revenue_growth_3y=0.05, earnings_growth_3y=0.06, fcf_growth_3y=0.04,
                 debt_to_equity=0.4, interest_coverage=30.0, cashflow_volatility=0.10, earnings_stability=0.95,
                 pe_ratio=16.0, ev_ebitda=12.0, fcf_multiple=18.0,
-                last_updated=datetime.now().isoformat()
+                last_updated=now
             ),
             "UNH": CompanyFinancials(
                 symbol="UNH", name="UnitedHealth Group", sector="Healthcare",
@@ -180,7 +568,7 @@ class MockDataSource(DataSourceBase):
                 revenue_growth_3y=0.12, earnings_growth_3y=0.14, fcf_growth_3y=0.10,
                 debt_to_equity=0.7, interest_coverage=15.0, cashflow_volatility=0.12, earnings_stability=0.90,
                 pe_ratio=20.0, ev_ebitda=14.0, fcf_multiple=22.0,
-                last_updated=datetime.now().isoformat()
+                last_updated=now
             ),
             "PFE": CompanyFinancials(
                 symbol="PFE", name="Pfizer Inc.", sector="Healthcare",
@@ -188,7 +576,7 @@ class MockDataSource(DataSourceBase):
                 revenue_growth_3y=-0.05, earnings_growth_3y=-0.10, fcf_growth_3y=-0.08,
                 debt_to_equity=0.6, interest_coverage=12.0, cashflow_volatility=0.30, earnings_stability=0.65,
                 pe_ratio=12.0, ev_ebitda=8.0, fcf_multiple=10.0,
-                last_updated=datetime.now().isoformat()
+                last_updated=now
             ),
             "LLY": CompanyFinancials(
                 symbol="LLY", name="Eli Lilly and Company", sector="Healthcare",
@@ -196,7 +584,7 @@ class MockDataSource(DataSourceBase):
                 revenue_growth_3y=0.20, earnings_growth_3y=0.30, fcf_growth_3y=0.25,
                 debt_to_equity=1.2, interest_coverage=20.0, cashflow_volatility=0.18, earnings_stability=0.85,
                 pe_ratio=65.0, ev_ebitda=45.0, fcf_multiple=55.0,
-                last_updated=datetime.now().isoformat()
+                last_updated=now
             ),
             "ABBV": CompanyFinancials(
                 symbol="ABBV", name="AbbVie Inc.", sector="Healthcare",
@@ -204,7 +592,7 @@ class MockDataSource(DataSourceBase):
                 revenue_growth_3y=0.04, earnings_growth_3y=0.02, fcf_growth_3y=0.05,
                 debt_to_equity=4.0, interest_coverage=8.0, cashflow_volatility=0.20, earnings_stability=0.80,
                 pe_ratio=14.0, ev_ebitda=10.0, fcf_multiple=12.0,
-                last_updated=datetime.now().isoformat()
+                last_updated=now
             ),
             
             # Consumer Discretionary
@@ -214,7 +602,7 @@ class MockDataSource(DataSourceBase):
                 revenue_growth_3y=0.12, earnings_growth_3y=0.40, fcf_growth_3y=0.30,
                 debt_to_equity=0.6, interest_coverage=15.0, cashflow_volatility=0.25, earnings_stability=0.75,
                 pe_ratio=45.0, ev_ebitda=18.0, fcf_multiple=35.0,
-                last_updated=datetime.now().isoformat()
+                last_updated=now
             ),
             "TSLA": CompanyFinancials(
                 symbol="TSLA", name="Tesla Inc.", sector="Consumer Discretionary",
@@ -222,7 +610,7 @@ class MockDataSource(DataSourceBase):
                 revenue_growth_3y=0.30, earnings_growth_3y=0.25, fcf_growth_3y=0.20,
                 debt_to_equity=0.2, interest_coverage=25.0, cashflow_volatility=0.35, earnings_stability=0.65,
                 pe_ratio=70.0, ev_ebitda=35.0, fcf_multiple=60.0,
-                last_updated=datetime.now().isoformat()
+                last_updated=now
             ),
             "NKE": CompanyFinancials(
                 symbol="NKE", name="Nike Inc.", sector="Consumer Discretionary",
@@ -230,7 +618,7 @@ class MockDataSource(DataSourceBase):
                 revenue_growth_3y=0.05, earnings_growth_3y=0.03, fcf_growth_3y=0.04,
                 debt_to_equity=0.8, interest_coverage=18.0, cashflow_volatility=0.18, earnings_stability=0.85,
                 pe_ratio=28.0, ev_ebitda=18.0, fcf_multiple=25.0,
-                last_updated=datetime.now().isoformat()
+                last_updated=now
             ),
             "MCD": CompanyFinancials(
                 symbol="MCD", name="McDonald's Corporation", sector="Consumer Discretionary",
@@ -238,7 +626,7 @@ class MockDataSource(DataSourceBase):
                 revenue_growth_3y=0.08, earnings_growth_3y=0.10, fcf_growth_3y=0.08,
                 debt_to_equity=5.0, interest_coverage=10.0, cashflow_volatility=0.12, earnings_stability=0.92,
                 pe_ratio=24.0, ev_ebitda=18.0, fcf_multiple=22.0,
-                last_updated=datetime.now().isoformat()
+                last_updated=now
             ),
             "SBUX": CompanyFinancials(
                 symbol="SBUX", name="Starbucks Corporation", sector="Consumer Discretionary",
@@ -246,7 +634,7 @@ class MockDataSource(DataSourceBase):
                 revenue_growth_3y=0.10, earnings_growth_3y=0.08, fcf_growth_3y=0.06,
                 debt_to_equity=6.0, interest_coverage=8.0, cashflow_volatility=0.15, earnings_stability=0.88,
                 pe_ratio=22.0, ev_ebitda=15.0, fcf_multiple=20.0,
-                last_updated=datetime.now().isoformat()
+                last_updated=now
             ),
             
             # Financials
@@ -256,7 +644,7 @@ class MockDataSource(DataSourceBase):
                 revenue_growth_3y=0.08, earnings_growth_3y=0.12, fcf_growth_3y=0.10,
                 debt_to_equity=1.2, interest_coverage=5.0, cashflow_volatility=0.20, earnings_stability=0.85,
                 pe_ratio=12.0, ev_ebitda=8.0, fcf_multiple=10.0,
-                last_updated=datetime.now().isoformat()
+                last_updated=now
             ),
             "V": CompanyFinancials(
                 symbol="V", name="Visa Inc.", sector="Financials",
@@ -264,7 +652,7 @@ class MockDataSource(DataSourceBase):
                 revenue_growth_3y=0.10, earnings_growth_3y=0.12, fcf_growth_3y=0.14,
                 debt_to_equity=0.5, interest_coverage=30.0, cashflow_volatility=0.08, earnings_stability=0.95,
                 pe_ratio=28.0, ev_ebitda=22.0, fcf_multiple=26.0,
-                last_updated=datetime.now().isoformat()
+                last_updated=now
             ),
             "MA": CompanyFinancials(
                 symbol="MA", name="Mastercard Inc.", sector="Financials",
@@ -272,7 +660,7 @@ class MockDataSource(DataSourceBase):
                 revenue_growth_3y=0.12, earnings_growth_3y=0.14, fcf_growth_3y=0.15,
                 debt_to_equity=1.5, interest_coverage=25.0, cashflow_volatility=0.10, earnings_stability=0.93,
                 pe_ratio=32.0, ev_ebitda=25.0, fcf_multiple=30.0,
-                last_updated=datetime.now().isoformat()
+                last_updated=now
             ),
             "BAC": CompanyFinancials(
                 symbol="BAC", name="Bank of America Corp.", sector="Financials",
@@ -280,7 +668,7 @@ class MockDataSource(DataSourceBase):
                 revenue_growth_3y=0.05, earnings_growth_3y=0.08, fcf_growth_3y=0.06,
                 debt_to_equity=1.0, interest_coverage=4.0, cashflow_volatility=0.25, earnings_stability=0.80,
                 pe_ratio=10.0, ev_ebitda=6.0, fcf_multiple=8.0,
-                last_updated=datetime.now().isoformat()
+                last_updated=now
             ),
             
             # Consumer Staples
@@ -290,7 +678,7 @@ class MockDataSource(DataSourceBase):
                 revenue_growth_3y=0.04, earnings_growth_3y=0.06, fcf_growth_3y=0.05,
                 debt_to_equity=0.6, interest_coverage=20.0, cashflow_volatility=0.08, earnings_stability=0.95,
                 pe_ratio=26.0, ev_ebitda=18.0, fcf_multiple=24.0,
-                last_updated=datetime.now().isoformat()
+                last_updated=now
             ),
             "KO": CompanyFinancials(
                 symbol="KO", name="The Coca-Cola Company", sector="Consumer Staples",
@@ -298,7 +686,7 @@ class MockDataSource(DataSourceBase):
                 revenue_growth_3y=0.06, earnings_growth_3y=0.08, fcf_growth_3y=0.07,
                 debt_to_equity=1.5, interest_coverage=12.0, cashflow_volatility=0.10, earnings_stability=0.92,
                 pe_ratio=24.0, ev_ebitda=20.0, fcf_multiple=22.0,
-                last_updated=datetime.now().isoformat()
+                last_updated=now
             ),
             "PEP": CompanyFinancials(
                 symbol="PEP", name="PepsiCo Inc.", sector="Consumer Staples",
@@ -306,7 +694,7 @@ class MockDataSource(DataSourceBase):
                 revenue_growth_3y=0.08, earnings_growth_3y=0.06, fcf_growth_3y=0.05,
                 debt_to_equity=2.0, interest_coverage=10.0, cashflow_volatility=0.12, earnings_stability=0.90,
                 pe_ratio=22.0, ev_ebitda=16.0, fcf_multiple=20.0,
-                last_updated=datetime.now().isoformat()
+                last_updated=now
             ),
             "WMT": CompanyFinancials(
                 symbol="WMT", name="Walmart Inc.", sector="Consumer Staples",
@@ -314,7 +702,7 @@ class MockDataSource(DataSourceBase):
                 revenue_growth_3y=0.05, earnings_growth_3y=0.08, fcf_growth_3y=0.10,
                 debt_to_equity=0.6, interest_coverage=12.0, cashflow_volatility=0.15, earnings_stability=0.88,
                 pe_ratio=28.0, ev_ebitda=14.0, fcf_multiple=30.0,
-                last_updated=datetime.now().isoformat()
+                last_updated=now
             ),
             
             # Industrials
@@ -324,7 +712,7 @@ class MockDataSource(DataSourceBase):
                 revenue_growth_3y=0.12, earnings_growth_3y=0.18, fcf_growth_3y=0.15,
                 debt_to_equity=1.8, interest_coverage=15.0, cashflow_volatility=0.22, earnings_stability=0.80,
                 pe_ratio=16.0, ev_ebitda=12.0, fcf_multiple=14.0,
-                last_updated=datetime.now().isoformat()
+                last_updated=now
             ),
             "HON": CompanyFinancials(
                 symbol="HON", name="Honeywell International", sector="Industrials",
@@ -332,7 +720,7 @@ class MockDataSource(DataSourceBase):
                 revenue_growth_3y=0.05, earnings_growth_3y=0.08, fcf_growth_3y=0.06,
                 debt_to_equity=1.2, interest_coverage=18.0, cashflow_volatility=0.15, earnings_stability=0.88,
                 pe_ratio=22.0, ev_ebitda=16.0, fcf_multiple=20.0,
-                last_updated=datetime.now().isoformat()
+                last_updated=now
             ),
             "UPS": CompanyFinancials(
                 symbol="UPS", name="United Parcel Service", sector="Industrials",
@@ -340,7 +728,7 @@ class MockDataSource(DataSourceBase):
                 revenue_growth_3y=0.03, earnings_growth_3y=0.02, fcf_growth_3y=0.01,
                 debt_to_equity=1.5, interest_coverage=12.0, cashflow_volatility=0.18, earnings_stability=0.82,
                 pe_ratio=18.0, ev_ebitda=10.0, fcf_multiple=16.0,
-                last_updated=datetime.now().isoformat()
+                last_updated=now
             ),
             
             # Energy
@@ -350,7 +738,7 @@ class MockDataSource(DataSourceBase):
                 revenue_growth_3y=0.08, earnings_growth_3y=0.10, fcf_growth_3y=0.12,
                 debt_to_equity=0.2, interest_coverage=30.0, cashflow_volatility=0.35, earnings_stability=0.70,
                 pe_ratio=12.0, ev_ebitda=6.0, fcf_multiple=10.0,
-                last_updated=datetime.now().isoformat()
+                last_updated=now
             ),
             "CVX": CompanyFinancials(
                 symbol="CVX", name="Chevron Corporation", sector="Energy",
@@ -358,40 +746,578 @@ class MockDataSource(DataSourceBase):
                 revenue_growth_3y=0.06, earnings_growth_3y=0.08, fcf_growth_3y=0.10,
                 debt_to_equity=0.15, interest_coverage=35.0, cashflow_volatility=0.38, earnings_stability=0.68,
                 pe_ratio=14.0, ev_ebitda=5.0, fcf_multiple=12.0,
-                last_updated=datetime.now().isoformat()
+                last_updated=now
             ),
         }
         return mock_data
+
+
+@dataclass(frozen=True, slots=True)
+class LoadError:
+    """Zeile einer Datei, die beim Laden übersprungen wurde."""
+    line: int        # Zeilennummer in der Datei (1-basiert)
+    message: str
+
+
+# Stammdaten-Felder einer Datenzeile (last_updated ist optional)
+RECORD_FIELDS = ["symbol", "name", "sector"]
+
+# Zeilen pro Block beim Einlesen von Dateien
+_LOAD_CHUNK_ROWS = 65536
+
+# Geparste Zeile: (Zeilennummer, Symbol, Name, Sektor, Kennzahlen, last_updated)
+_Record = Tuple[int, str, str, str, Tuple[float, ...], Optional[str]]
+
+# Geparster Block: (Zeilennummern, Symbole, Namen, Sektoren,
+# Kennzahlen-Spalten in METRIC_FIELDS-Reihenfolge, last_updated)
+_Block = Tuple[Sequence[int], List[str], List[str], List[str], List[array], List[Optional[str]]]
+
+
+def _field_positions(columns: Sequence[str]) -> Tuple[List[int], List[int], Optional[int]]:
+    """
+    Positionen der Stammdaten, Kennzahlen und von last_updated in einer Zeile.
+    
+    Args:
+        columns: Spaltennamen in Zeilenreihenfolge
+    
+    Returns:
+        (Positionen von RECORD_FIELDS, Positionen von METRIC_FIELDS,
+        Position von last_updated oder None)
+    
+    Raises:
+        ValueError: Wenn Pflichtfelder fehlen
+    """
+    positions = {column: i for i, column in enumerate(columns)}
+    missing = [field for field in RECORD_FIELDS + METRIC_FIELDS if field not in positions]
+    if missing:
+        raise ValueError(f"Fehlende Felder: {', '.join(missing)}")
+    return (
+        [positions[field] for field in RECORD_FIELDS],
+        [positions[field] for field in METRIC_FIELDS],
+        positions.get("last_updated"),
+    )
+
+
+def _block_from_records(records: Iterable[_Record]) -> _Block:
+    """Fasst zeilenweise geparste Datensätze zu einem Block zusammen."""
+    lines, symbols, names, sectors, metrics, updated = [], [], [], [], [], []
+    for line, symbol, name, sector, values, last_updated in records:
+        lines.append(line)
+        symbols.append(symbol)
+        names.append(name)
+        sectors.append(sector)
+        metrics.append(values)
+        updated.append(last_updated)
+    columns = [array("d", column) for column in zip(*metrics)] if metrics else [array("d") for _ in METRIC_FIELDS]
+    return lines, symbols, names, sectors, columns, updated
+
+
+def _block_records(block: _Block) -> Iterator[_Record]:
+    """Zerlegt einen Block wieder in einzelne Datensätze."""
+    lines, symbols, names, sectors, columns, updated = block
+    return zip(lines, symbols, names, sectors, zip(*columns), updated)
+
+
+class FileDataSource(TableDataSource):
+    """
+    Datenquelle aus einer CSV- oder JSONL-Datei mit Finanzkennzahlen.
+    
+    Die Datei wird in Blöcken von _LOAD_CHUNK_ROWS Zeilen gelesen und
+    spaltenweise geparst: CSV-Felder per str.split() über den ganzen
+    Block, JSONL-Blöcke mit einem einzigen json.loads(), Kennzahlen je
+    Spalte mit map(float, ...) direkt in array('d'). Fehlerfreie Blöcke
+    gehen ohne CompanyFinancials-Objekte in die FinancialsTable; nur
+    Blöcke mit Auffälligkeiten (Anführungszeichen, falsche Spaltenzahl,
+    ungültige Werte, Duplikate) werden Zeile für Zeile verarbeitet.
+    Fehlerhafte Zeilen werden übersprungen und in errors gemeldet.
+    
+    Erwartete Felder: symbol, name, sector, alle METRIC_FIELDS und
+    optional last_updated (CSV: Kopfzeile, JSONL: ein Objekt pro Zeile).
+    Kommt ein Symbol mehrfach vor, gilt die letzte Zeile.
+    
+    Verwendung:
+        source = FileDataSource("data/financials.csv")
+        source.errors   # [LoadError(line=17, message="..."), ...]
+        loader = DataLoader(data_source=source)
+    """
+    
+    def __init__(self, path: str, file_format: Optional[str] = None, encoding: str = "utf-8"):
+        """
+        Lädt die Datei vollständig.
+        
+        Args:
+            path: Pfad zur CSV- oder JSONL-Datei
+            file_format: "csv" oder "jsonl"; None = anhand der Dateiendung
+            encoding: Zeichenkodierung der Datei
+        
+        Raises:
+            ValueError: Bei unbekanntem Format oder fehlenden CSV-Spalten
+        """
+        if file_format is None:
+            extension = os.path.splitext(path)[1].lower()
+            file_format = "jsonl" if extension in (".jsonl", ".ndjson") else extension.lstrip(".")
+        if file_format not in ("csv", "jsonl"):
+            raise ValueError(f"Unbekanntes Dateiformat '{file_format}' (csv oder jsonl)")
+        
+        super().__init__()
+        self.path = path
+        self.errors: List[LoadError] = []
+        with open(path, newline="", encoding=encoding) as handle:
+            blocks = self._read_csv(handle) if file_format == "csv" else self._read_jsonl(handle)
+            for block in blocks:
+                self._ingest(block)
+    
+    def _read_csv(self, handle: TextIO) -> Iterator[_Block]:
+        """Liest eine CSV-Datei mit Kopfzeile blockweise."""
+        header_line = handle.readline()
+        if not header_line:
+            return
+        header = next(csv.reader([header_line]), [])
+        try:
+            layout = _field_positions([c.strip() for c in header])
+        except ValueError as error:
+            raise ValueError(f"{error} in {self.path}") from None
+        width = len(header)
+        
+        line = 2
+        while True:
+            lines = list(islice(handle, _LOAD_CHUNK_ROWS))
+            if not lines:
+                return
+            text = "".join(lines)
+            quotes = text.count('"')
+            # Ein Feld in Anführungszeichen darf Zeilenumbrüche enthalten:
+            # der Block endet erst, wenn alle Anführungszeichen geschlossen sind
+            while quotes % 2:
+                extra = handle.readline()
+                if not extra:
+                    break
+                lines.append(extra)
+                quotes += extra.count('"')
+            block = None if quotes else self._split_csv_block(text, len(lines), width, layout, line)
+            if block is None:
+                reader = csv.reader(lines)
+                block = _block_from_records(self._csv_records(reader, width, layout, line - 1))
+            yield block
+            line += len(lines)
+    
+    @staticmethod
+    def _split_csv_block(
+        text: str, n_lines: int, width: int, layout: Tuple[List[int], List[int], Optional[int]], line: int
+    ) -> Optional[_Block]:
+        """
+        Parst einen Block ohne Anführungszeichen spaltenweise.
+        
+        Returns:
+            Block oder None, wenn er Zeile für Zeile geparst werden muss
+        """
+        rows = text.splitlines()
+        if len(rows) != n_lines:
+            return None
+        if any(map((width - 1).__ne__, map(str.count, rows, repeat(",")))):
+            return None
+        fields = ",".join(rows).split(",")
+        record_pos, metric_pos, updated_pos = layout
+        try:
+            columns = [array("d", map(float, fields[pos::width])) for pos in metric_pos]
+        except ValueError:
+            return None
+        symbol_pos, name_pos, sector_pos = record_pos
+        updated = (
+            [value or None for value in fields[updated_pos::width]]
+            if updated_pos is not None else [None] * len(rows)
+        )
+        return (
+            range(line, line + len(rows)),
+            list(map(str.strip, fields[symbol_pos::width])),
+            fields[name_pos::width],
+            list(map(str.strip, fields[sector_pos::width])),
+            columns,
+            updated,
+        )
+    
+    def _csv_records(
+        self, reader: Any, width: int, layout: Tuple[List[int], List[int], Optional[int]], offset: int
+    ) -> Iterator[_Record]:
+        """Parst CSV-Zeilen einzeln und meldet fehlerhafte Zeilen."""
+        record_pos, metric_pos, updated_pos = layout
+        get_record, get_metrics = itemgetter(*record_pos), itemgetter(*metric_pos)
+        for row in reader:
+            if not row:
+                continue
+            line = offset + reader.line_num
+            try:
+                if len(row) != width:
+                    raise ValueError(f"{len(row)} statt {width} Spalten")
+                metrics = tuple(map(float, get_metrics(row)))
+            except ValueError as error:
+                self.errors.append(LoadError(line, f"Ungültige Zeile: {error}"))
+                continue
+            symbol, name, sector = get_record(row)
+            last_updated = row[updated_pos] or None if updated_pos is not None else None
+            yield line, symbol.strip(), name, sector.strip(), metrics, last_updated
+    
+    def _read_jsonl(self, handle: TextIO) -> Iterator[_Block]:
+        """Liest eine JSONL-Datei (ein JSON-Objekt pro Zeile) blockweise."""
+        line = 1
+        while True:
+            lines = list(islice(handle, _LOAD_CHUNK_ROWS))
+            if not lines:
+                return
+            block = self._decode_jsonl_block(lines, line)
+            if block is None:
+                block = _block_from_records(self._jsonl_records(lines, line))
+            yield block
+            line += len(lines)
+    
+    @staticmethod
+    def _decode_jsonl_block(lines: List[str], line: int) -> Optional[_Block]:
+        """
+        Dekodiert einen Block mit einem json.loads() und liest ihn spaltenweise.
+        
+        Returns:
+            Block oder None, wenn er Zeile für Zeile geparst werden muss
+        """
+        try:
+            objects = json.loads("[" + ",".join(lines) + "]")
+            # Je Zeile genau ein Objekt (leere Zeilen scheitern schon beim Dekodieren)
+            if len(objects) != len(lines) or set(map(type, objects)) != {dict}:
+                return None
+            # JSON-Zahlen sind bereits float/int; Texte wie "1.5" parst der zeilenweise Weg
+            columns = [array("d", map(itemgetter(field), objects)) for field in METRIC_FIELDS]
+            symbols, names, sectors = (list(map(itemgetter(field), objects)) for field in RECORD_FIELDS)
+        except (ValueError, TypeError, KeyError):
+            return None
+        if set(map(type, symbols)) | set(map(type, sectors)) != {str}:
+            return None
+        if set(map(type, names)) != {str}:
+            names = [name if isinstance(name, str) else str(name or "") for name in names]
+        return (
+            range(line, line + len(lines)),
+            list(map(str.strip, symbols)),
+            names,
+            list(map(str.strip, sectors)),
+            columns,
+            list(map(dict.get, objects, repeat("last_updated"))),
+        )
+    
+    def _jsonl_records(self, lines: List[str], first_line: int) -> Iterator[_Record]:
+        """Dekodiert JSONL-Zeilen einzeln und meldet fehlerhafte Zeilen."""
+        for line_number, line in enumerate(lines, start=first_line):
+            if not line.strip():
+                continue
+            try:
+                values = json.loads(line)
+                if not isinstance(values, dict) or not values:
+                    raise ValueError("kein JSON-Objekt mit Feldern")
+                missing = [field for field in RECORD_FIELDS + METRIC_FIELDS if field not in values]
+                if missing:
+                    raise ValueError(f"Fehlende Felder: {', '.join(missing)}")
+                symbol, name, sector = (values[field] for field in RECORD_FIELDS)
+                if not isinstance(symbol, str) or not isinstance(sector, str):
+                    raise ValueError("symbol und sector müssen Texte sein")
+                metrics = tuple(float(values[field]) for field in METRIC_FIELDS)
+            except (ValueError, TypeError) as error:
+                self.errors.append(LoadError(line_number, f"Ungültige Zeile: {error}"))
+                continue
+            yield line_number, symbol.strip(), str(name or ""), sector.strip(), metrics, values.get("last_updated")
+    
+    def _ingest(self, block: _Block):
+        """
+        Übernimmt einen geparsten Block in die Tabelle.
+        
+        Ein fehlerfreier Block (Symbol und Sektor gesetzt, alle Kennzahlen
+        endlich, keine bekannten oder doppelten Symbole) wird spaltenweise
+        mit FinancialsTable.extend_columns() angehängt, alle anderen
+        Zeile für Zeile geprüft.
+        """
+        lines, symbols, names, sectors, columns, updated = block
+        keys = list(map(str.upper, symbols))
+        if (
+            all(symbols) and all(sectors)
+            # Summe nicht endlich: mindestens ein Wert nicht endlich (oder Überlauf)
+            and all(isfinite(sum(column)) for column in columns)
+            and len(set(keys)) == len(keys)
+            and not (len(self._table) and any(map(self._table.__contains__, keys)))
+        ):
+            if symbols:
+                self._table.extend_columns(symbols, names, sectors, columns, updated)
+            return
+        self._ingest_records(_block_records(block))
+    
+    def _ingest_records(self, records: Iterable[_Record]):
+        """
+        Prüft geparste Zeilen einzeln und schreibt sie blockweise in die Tabelle.
+        
+        Kennzahlen werden zeilenweise in einen float64-Puffer gesammelt und
+        pro Block mit FinancialsTable.extend_rows() in die Spalten übertragen.
+        """
+        n_fields = len(METRIC_FIELDS)
+        symbols: List[str] = []
+        names: List[str] = []
+        sectors: List[str] = []
+        updated: List[Optional[str]] = []
+        buffer = array("d")
+        pending: Dict[str, int] = {}   # Symbol (groß) -> Position im Block
+        
+        for line, symbol, name, sector, metrics, last_updated in records:
+            if not symbol:
+                self.errors.append(LoadError(line, "Symbol fehlt"))
+                continue
+            if not sector:
+                self.errors.append(LoadError(line, f"Sektor fehlt für '{symbol}'"))
+                continue
+            if not all(map(isfinite, metrics)):
+                self.errors.append(LoadError(line, f"Nicht-endliche Kennzahl für '{symbol}'"))
+                continue
+            
+            # Kommt ein Symbol mehrfach vor, überschreibt die spätere Zeile
+            key = symbol.upper()
+            pos = pending.get(key)
+            if pos is not None:
+                names[pos], sectors[pos], updated[pos] = name, sector, last_updated
+                buffer[pos * n_fields:(pos + 1) * n_fields] = array("d", metrics)
+                continue
+            if key in self._table:
+                self.upsert_company(CompanyFinancials(
+                    symbol=symbol, name=name, sector=sector, last_updated=last_updated,
+                    **dict(zip(METRIC_FIELDS, metrics))
+                ))
+                continue
+            
+            pending[key] = len(symbols)
+            symbols.append(symbol)
+            names.append(name)
+            sectors.append(sector)
+            updated.append(last_updated)
+            buffer.extend(metrics)
+            if len(symbols) >= _LOAD_CHUNK_ROWS:
+                self._flush(symbols, names, sectors, updated, buffer)
+                symbols, names, sectors, updated = [], [], [], []
+                buffer = array("d")
+                pending.clear()
+        
+        self._flush(symbols, names, sectors, updated, buffer)
+    
+    def _flush(
+        self,
+        symbols: List[str],
+        names: List[str],
+        sectors: List[str],
+        updated: List[Optional[str]],
+        buffer: array
+    ):
+        """Überträgt einen Block in die Tabelle (inkl. Sektor-Index)."""
+        self._table.extend_rows(symbols, names, sectors, buffer, updated)
+
+
+@dataclass(frozen=True, slots=True)
+class CacheStats:
+    """Zähler eines CachingDataSource."""
+    hits: int
+    misses: int
+    evictions: int      # wegen der Größenbegrenzung verdrängte Einträge
+    expirations: int    # wegen abgelaufener TTL verworfene Einträge
+    size: int
+
+
+# Markiert einen Cache-Fehltreffer (None ist ein gültiger, negativer Eintrag)
+_MISSING = object()
+
+
+class CachingDataSource(DataSourceBase):
+    """
+    Cache vor einer beliebigen Datenquelle (z.B. einer langsamen API).
+    
+    Ergebnisse werden je Schlüssel (Symbol, Sektor, Gesamtlisten) bis zum
+    Ablauf der TTL gehalten; die Quelle wird pro Schlüssel also höchstens
+    einmal je TTL-Fenster abgefragt. Die Anzahl der Einträge ist begrenzt,
+    bei Überlauf wird der am längsten nicht genutzte Eintrag verdrängt (LRU).
+    Unbekannte Symbole werden optional ebenfalls gecacht (negativer Cache).
+    
+    Verwendung:
+        source = CachingDataSource(MyAPIDataSource())
+        loader = DataLoader(data_source=source)
+        source.stats   # CacheStats(hits=..., misses=..., ...)
+    """
+    
+    def __init__(
+        self,
+        source: DataSourceBase,
+        ttl_hours: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        negative_cache: bool = True,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            source: Eigentliche Datenquelle
+            ttl_hours: Gültigkeit in Stunden (Standard: DATA_SOURCE_CONFIG)
+            max_entries: Maximale Anzahl Einträge (Standard: DATA_SOURCE_CONFIG)
+            negative_cache: Wenn True, werden unbekannte Symbole ebenfalls gecacht
+            clock: Zeitquelle in Sekunden (für Tests austauschbar)
+        """
+        if ttl_hours is None:
+            ttl_hours = DATA_SOURCE_CONFIG["cache_ttl_hours"]
+        if max_entries is None:
+            max_entries = DATA_SOURCE_CONFIG["cache_max_entries"]
+        if max_entries <= 0:
+            raise ValueError("max_entries muss größer als 0 sein")
+        self._source = source
+        self._ttl = ttl_hours * 3600.0
+        self._max_entries = max_entries
+        self._negative_cache = negative_cache
+        self._clock = clock
+        # Schlüssel -> (Ablaufzeitpunkt, Wert), älteste Nutzung zuerst
+        self._entries: "OrderedDict[Tuple[str, ...], Tuple[float, Any]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+    
+    @property
+    def stats(self) -> CacheStats:
+        """Aktuelle Zähler."""
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            expirations=self._expirations,
+            size=len(self._entries)
+        )
+    
+    def _lookup(self, key: Tuple[str, ...]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > self._clock():
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[1]
+            del self._entries[key]
+            self._expirations += 1
+        self._misses += 1
+        return _MISSING
+    
+    def _store(self, key: Tuple[str, ...], value: Any):
+        self._entries[key] = (self._clock() + self._ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+    
+    def _cached(self, key: Tuple[str, ...], load: Callable[[], Any]) -> Any:
+        value = self._lookup(key)
+        if value is _MISSING:
+            value = load()
+            self._store(key, value)
+        return value
     
     def get_company_data(self, symbol: str) -> Optional[CompanyFinancials]:
-        """Lädt Daten für ein einzelnes Unternehmen."""
-        return self._companies.get(symbol.upper())
+        """Lädt Daten für ein einzelnes Unternehmen (gecacht)."""
+        key = ("symbol", symbol.upper())
+        company = self._lookup(key)
+        if company is _MISSING:
+            company = self._source.get_company_data(symbol)
+            if company is not None or self._negative_cache:
+                self._store(key, company)
+        return company
+    
+    def get_companies(self, symbols: Iterable[str]) -> Dict[str, CompanyFinancials]:
+        """
+        Lädt mehrere Unternehmen (gecacht).
+        
+        Nicht gecachte Symbole werden gesammelt mit einem einzigen
+        get_companies()-Aufruf an die Quelle nachgeladen.
+        """
+        companies = {}
+        missing = []
+        for symbol in dict.fromkeys(symbol.upper() for symbol in symbols):
+            company = self._lookup(("symbol", symbol))
+            if company is _MISSING:
+                missing.append(symbol)
+            elif company is not None:
+                companies[company.symbol] = company
+        if missing:
+            loaded = self._source.get_companies(missing)
+            for symbol in missing:
+                company = loaded.get(symbol)
+                if company is not None or self._negative_cache:
+                    self._store(("symbol", symbol), company)
+            companies.update(loaded)
+        return companies
     
     def get_sector_companies(self, sector: str) -> List[CompanyFinancials]:
-        """Lädt alle Unternehmen eines Sektors."""
-        return [c for c in self._companies.values() if c.sector == sector]
+        """Lädt alle Unternehmen eines Sektors (gecacht)."""
+        source = self._source
+        return list(self._cached(("sector", sector), lambda: tuple(source.get_sector_companies(sector))))
     
     def get_all_companies(self) -> List[CompanyFinancials]:
-        """Lädt alle verfügbaren Unternehmen."""
-        return list(self._companies.values())
+        """Lädt alle verfügbaren Unternehmen (gecacht)."""
+        return list(self._cached(("all",), lambda: tuple(self._source.get_all_companies())))
     
     def get_available_symbols(self) -> List[str]:
-        """Gibt alle verfügbaren Symbole zurück."""
-        return list(self._companies.keys())
+        """Gibt alle verfügbaren Symbole zurück (gecacht)."""
+        return list(self._cached(("symbols",), lambda: tuple(self._source.get_available_symbols())))
     
     def get_available_sectors(self) -> List[str]:
-        """Gibt alle verfügbaren Sektoren zurück."""
-        return list(set(c.sector for c in self._companies.values()))
+        """Gibt alle verfügbaren Sektoren zurück (gecacht)."""
+        return list(self._cached(("sectors",), lambda: tuple(self._source.get_available_sectors())))
+    
+    def upsert_company(self, company: CompanyFinancials) -> None:
+        """Schreibt in die Quelle und verwirft alle betroffenen Einträge."""
+        self._source.upsert_company(company)
+        self._invalidate_lists(company.symbol)
+    
+    def delete_company(self, symbol: str) -> bool:
+        """Entfernt ein Unternehmen in der Quelle und verwirft alle betroffenen Einträge."""
+        deleted = self._source.delete_company(symbol)
+        self._invalidate_lists(symbol)
+        return deleted
+    
+    def _invalidate_lists(self, symbol: str):
+        # Der bisherige Sektor ist nicht zwingend bekannt: alle Sektorlisten verwerfen
+        stale = [key for key in self._entries if key[0] != "symbol" or key[1] == symbol.upper()]
+        for key in stale:
+            del self._entries[key]
+    
+    def get_financials_table(self) -> Optional[FinancialsTable]:
+        """Spaltenorientierte Sicht der Quelle (nicht gecacht)."""
+        return self._source.get_financials_table()
+    
+    def close(self):
+        """Schließt die umschlossene Quelle."""
+        self._source.close()
+    
+    def invalidate(self, symbol: Optional[str] = None):
+        """
+        Verwirft Cache-Einträge.
+        
+        Args:
+            symbol: Optional, nur dieses Symbol; None = alles
+        """
+        if symbol is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(("symbol", symbol.upper()), None)
 
 
 class DataLoader:
     """
     Haupt-Datenloader mit austauschbarer Datenquelle.
     
+    Die konfigurierte Quelle wird erst beim ersten Zugriff aufgebaut
+    (Mock-Daten erzeugen, Datei laden, Verbindung öffnen); Aufrufe, die
+    keine Daten brauchen, zahlen dafür nichts.
+    
     Verwendung:
         loader = DataLoader(use_mock=True)
         company = loader.get_company_data("AAPL")
         sector_companies = loader.get_sector_companies("Technology")
+    
+    Quellen mit Verbindungen (Markt-API) oder Dateiabbildungen werden mit
+    close() bzw. als Kontextmanager wieder freigegeben:
+        with DataLoader(use_mock=False) as loader:
+            ...
     """
     
     def __init__(self, use_mock: bool = True, data_source: Optional[DataSourceBase] = None):
@@ -401,26 +1327,88 @@ class DataLoader:
         Args:
             use_mock: Wenn True, werden Mock-Daten verwendet
             data_source: Optionale eigene Datenquelle
+        
+        Raises:
+            NotImplementedError: Wenn use_mock=False und keine Quelle konfiguriert ist
         """
-        if data_source:
-            self._source = data_source
-        elif use_mock:
-            self._source = MockDataSource()
-        else:
-            # Hier könnte später eine echte API-Datenquelle eingebunden werden
-            raise NotImplementedError("Echte Datenquellen sind noch nicht implementiert")
+        self._source = data_source
+        self._factory: Optional[Callable[[], DataSourceBase]] = None
+        if data_source is None:
+            self._factory = self._configured_source(use_mock)
+    
+    @staticmethod
+    def _configured_source(use_mock: bool) -> Callable[[], DataSourceBase]:
+        """Wählt die Quelle aus der Konfiguration, ohne sie schon aufzubauen."""
+        if use_mock:
+            return MockDataSource
+        if DATA_SOURCE_CONFIG.get("file_path"):
+            path = DATA_SOURCE_CONFIG["file_path"]
+            from .mmap_store import MMAP_EXTENSION, MmapDataSource
+            if path.endswith(MMAP_EXTENSION):
+                return lambda: MmapDataSource(path)
+            return lambda: FileDataSource(path)
+        if DATA_SOURCE_CONFIG.get("base_url"):
+            base_url = DATA_SOURCE_CONFIG["base_url"]
+            from .async_source import AsyncSourceAdapter
+            from .http_source import HttpDataSource
+            return lambda: CachingDataSource(AsyncSourceAdapter(HttpDataSource(base_url)))
+        raise NotImplementedError(
+            "Keine Datenquelle konfiguriert (DATA_SOURCE_CONFIG['file_path'] oder ['base_url'])"
+        )
+    
+    @property
+    def source(self) -> DataSourceBase:
+        """Die Datenquelle (beim ersten Zugriff aufgebaut)."""
+        if self._source is None:
+            self._source = self._factory()
+        return self._source
+    
+    def __enter__(self) -> "DataLoader":
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def close(self):
+        """Schließt die Datenquelle (eine noch nicht aufgebaute wird nicht erst geöffnet)."""
+        if self._source is not None:
+            self._source.close()
     
     def get_company_data(self, symbol: str) -> Optional[CompanyFinancials]:
         """Lädt Finanzdaten für ein Unternehmen."""
-        return self._source.get_company_data(symbol)
+        return self.source.get_company_data(symbol)
+    
+    def get_companies(self, symbols: Iterable[str]) -> Dict[str, CompanyFinancials]:
+        """Lädt Finanzdaten für mehrere Unternehmen (Symbol -> Daten)."""
+        return self.source.get_companies(symbols)
     
     def get_sector_companies(self, sector: str) -> List[CompanyFinancials]:
         """Lädt alle Unternehmen eines Sektors."""
-        return self._source.get_sector_companies(sector)
+        return self.source.get_sector_companies(sector)
     
     def get_all_companies(self) -> List[CompanyFinancials]:
         """Lädt alle verfügbaren Unternehmen."""
-        return self._source.get_all_companies()
+        return self.source.get_all_companies()
+    
+    def get_available_sectors(self) -> Sequence[str]:
+        """Gibt alle verfügbaren Sektoren zurück."""
+        return self.source.get_available_sectors()
+    
+    def get_available_symbols(self) -> List[str]:
+        """Gibt alle verfügbaren Aktien-Symbole zurück."""
+        return self.source.get_available_symbols()
+    
+    def upsert_company(self, company: CompanyFinancials) -> None:
+        """Schreibt aktualisierte Kennzahlen in die Datenquelle."""
+        self.source.upsert_company(company)
+    
+    def delete_company(self, symbol: str) -> bool:
+        """Entfernt ein Unternehmen aus der Datenquelle."""
+        return self.source.delete_company(symbol)
+    
+    def get_financials_table(self) -> Optional[FinancialsTable]:
+        """Spaltenorientierte Sicht der Datenquelle (falls unterstützt)."""
+        return self.source.get_financials_table()
 
 
 # Singleton-Instanz für einfachen Zugriff
@@ -0,0 +1,316 @@
+"""
+Scoring-Engine Modul
+
+Berechnet die winsorisierten Perzentil-Ränge einer kompletten
+Kennzahlen-Matrix (Unternehmen × Metriken) eines Sektors in einem Schritt.
+
+Ist NumPy installiert, wird die Matrix spaltenweise mit np.sort und
+np.searchsorted verarbeitet. Ohne NumPy greift eine reine
+Python-Implementierung, die dieselben Ergebnisse liefert wie
+calculate_percentile_score() und winsorize() aus scorer.py.
+
+NumPy wird erst bei der ersten Berechnung geladen; der Import des
+Pakets (und kurze CLI-Aufrufe wie --disclaimer) zahlen dafür nichts.
+Die Namen HAS_NUMPY und np lösen den Import beim ersten Zugriff aus.
+"""
+
+from typing import Any, List, Optional, Sequence, Tuple
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+from math import fsum
+
+from .config import WINSORIZE_PERCENTILES
+
+
+@lru_cache(maxsize=None)
+def numpy_module() -> Any:
+    """
+    Importiert NumPy beim ersten Aufruf und merkt sich das Ergebnis.
+
+    Returns:
+        Modul oder None, wenn NumPy fehlt oder sich nicht importieren lässt
+        (dann rechnet die reine Python-Engine)
+    """
+    try:
+        import numpy
+    except ImportError:  # NumPy ist optional
+        return None
+    return numpy
+
+
+def has_numpy() -> bool:
+    """Ob die NumPy-Engine verfügbar ist (importiert NumPy beim ersten Aufruf)."""
+    return numpy_module() is not None
+
+
+def __getattr__(name: str) -> Any:
+    if name == "np":
+        return numpy_module()
+    if name == "HAS_NUMPY":
+        return has_numpy()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def is_ndarray(value: Any) -> bool:
+    """Ob value ein NumPy-Array ist; Listen und array('d') laden NumPy dafür nicht."""
+    if isinstance(value, (list, tuple, array)):
+        return False
+    np = numpy_module()
+    return np is not None and isinstance(value, np.ndarray)
+
+
+def _use_numpy(use_numpy: Optional[bool]) -> bool:
+    """Löst die Engine-Auswahl auf (None = NumPy, falls verfügbar)."""
+    if use_numpy is None:
+        return has_numpy()
+    if use_numpy and not has_numpy():
+        raise ImportError("NumPy ist nicht installiert")
+    return use_numpy
+
+
+def winsorize_indices(
+    n: int,
+    lower_pct: int = WINSORIZE_PERCENTILES["lower"],
+    upper_pct: int = WINSORIZE_PERCENTILES["upper"]
+) -> Tuple[int, int]:
+    """
+    Positionen der Winsorizing-Grenzen in einer sortierten Gruppe der Größe n.
+
+    Entspricht exakt der Indexberechnung in winsorize().
+    """
+    lower_idx = int(n * lower_pct / 100)
+    upper_idx = int(n * upper_pct / 100) - 1
+    return max(0, lower_idx), min(n - 1, upper_idx)
+
+
+def percentile_ranks(values: Sequence[float], inverse: bool = False) -> List[float]:
+    """
+    Reine Python-Variante: Perzentil-Ränge aller Werte einer Spalte.
+
+    Args:
+        values: Alle Werte der Vergleichsgruppe
+        inverse: Wenn True, ist ein niedrigerer Wert besser
+
+    Returns:
+        Perzentil-Ränge (0-100) in der Reihenfolge von values
+    """
+    if len(values) < 2:
+        return [50.0] * len(values)
+    (column,), (lower_bound,), (upper_bound,) = winsorized_columns(
+        [[v] for v in values], use_numpy=False
+    )
+    return [rank_value(column, lower_bound, upper_bound, v, inverse) for v in values]
+
+
+def winsorized_columns(matrix: Any, use_numpy: Optional[bool] = None) -> Tuple[Any, Any, Any]:
+    """
+    Sortiert und winsorisiert jede Spalte einer Kennzahlen-Matrix.
+
+    Args:
+        matrix: Zeilen = Unternehmen, Spalten = Metriken
+                (Liste von Listen oder NumPy-Array)
+        use_numpy: None = automatisch, True/False erzwingt die Engine
+
+    Returns:
+        (Spalten, untere Grenzen, obere Grenzen); jede Spalte ist aufsteigend
+        sortiert und auf die Winsorizing-Grenzen begrenzt
+    """
+    if _use_numpy(use_numpy):
+        np = numpy_module()
+        values = np.asarray(matrix, dtype=np.float64)
+        n = values.shape[0]
+        if n == 0:
+            return np.empty((values.shape[1] if values.ndim == 2 else 0, 0)), [], []
+        # Transponiert sortieren: jede Metrik liegt zusammenhängend im Speicher
+        sorted_vals = np.sort(values.T, axis=1)
+        lower_idx, upper_idx = winsorize_indices(n)
+        lower_bounds = sorted_vals[:, lower_idx].copy()
+        upper_bounds = sorted_vals[:, upper_idx].copy()
+        columns = np.minimum(
+            np.maximum(sorted_vals, lower_bounds[:, None]), upper_bounds[:, None]
+        )
+        return columns, lower_bounds, upper_bounds
+
+    columns, lower_bounds, upper_bounds = [], [], []
+    for column in zip(*matrix):
+        sorted_vals = sorted(column)
+        lower_idx, upper_idx = winsorize_indices(len(sorted_vals))
+        lower_bound = sorted_vals[lower_idx]
+        upper_bound = sorted_vals[upper_idx]
+        # Begrenzen erhält die Sortierung, daher genügt eine Sortierung
+        columns.append([max(lower_bound, min(upper_bound, v)) for v in sorted_vals])
+        lower_bounds.append(lower_bound)
+        upper_bounds.append(upper_bound)
+    return columns, lower_bounds, upper_bounds
+
+
+def rank_against(
+    columns: Any,
+    lower_bounds: Any,
+    upper_bounds: Any,
+    matrix: Any,
+    inverse_flags: Sequence[bool],
+    use_numpy: Optional[bool] = None
+) -> Any:
+    """
+    Rankt die Zeilen einer Matrix gegen bereits winsorisierte Spalten.
+
+    Args:
+        columns, lower_bounds, upper_bounds: Ergebnis von winsorized_columns()
+        matrix: Zu rankende Werte (Zeilen = Unternehmen)
+        inverse_flags: Pro Spalte, ob ein niedrigerer Wert besser ist
+        use_numpy: None = automatisch, True/False erzwingt die Engine
+
+    Returns:
+        Matrix mit Perzentil-Rängen (0-100); NumPy-Array bei
+        NumPy-Engine, sonst Liste von Zeilen
+    """
+    if _use_numpy(use_numpy):
+        np = numpy_module()
+        values = np.asarray(matrix, dtype=np.float64).reshape(-1, len(inverse_flags))
+        n = columns.shape[1]
+        if n < 2:
+            return np.full(values.shape, 50.0)
+        bounded = np.minimum(np.maximum(values, lower_bounds), upper_bounds)
+        ranks = np.empty(values.shape)
+        for j in range(values.shape[1]):
+            counts = np.searchsorted(columns[j], bounded[:, j], side="left")
+            ranks[:, j] = (counts / n) * 100
+        inverse = np.asarray(inverse_flags, dtype=bool)
+        ranks[:, inverse] = 100 - ranks[:, inverse]
+        return ranks
+
+    ranks = []
+    for row in matrix:
+        ranks.append([
+            rank_value(column, lower, upper, value, inverse)
+            for column, lower, upper, value, inverse
+            in zip(columns, lower_bounds, upper_bounds, row, inverse_flags)
+        ])
+    return ranks
+
+
+def rank_value(
+    column: Sequence[float],
+    lower_bound: float,
+    upper_bound: float,
+    value: float,
+    inverse: bool = False
+) -> float:
+    """
+    Perzentil-Rang eines einzelnen Wertes per Binärsuche (O(log n)).
+
+    Args:
+        column: Sortierte, winsorisierte Werte der Vergleichsgruppe
+        lower_bound, upper_bound: Winsorizing-Grenzen der Spalte
+        value: Der zu bewertende Wert
+        inverse: Wenn True, ist ein niedrigerer Wert besser
+
+    Returns:
+        Perzentil-Rang (0-100)
+    """
+    n = len(column)
+    if n < 2:
+        return 50.0
+    bounded_value = max(lower_bound, min(upper_bound, value))
+    percentile = (bisect_left(column, bounded_value) / n) * 100
+    if inverse:
+        percentile = 100 - percentile
+    return float(percentile)
+
+
+def rank_matrix(
+    matrix: Any,
+    inverse_flags: Sequence[bool],
+    use_numpy: Optional[bool] = None
+) -> Any:
+    """
+    Berechnet alle winsorisierten Perzentil-Ränge einer Kennzahlen-Matrix.
+
+    Args:
+        matrix: Zeilen = Unternehmen, Spalten = Metriken
+                (Liste von Listen oder NumPy-Array)
+        inverse_flags: Pro Spalte, ob ein niedrigerer Wert besser ist
+        use_numpy: None = automatisch, True/False erzwingt die Engine
+
+    Returns:
+        Matrix gleicher Form mit Perzentil-Rängen (0-100); NumPy-Array
+        bei NumPy-Engine, sonst Liste von Zeilen
+    """
+    columns, lower_bounds, upper_bounds = winsorized_columns(matrix, use_numpy)
+    return rank_against(
+        columns, lower_bounds, upper_bounds, matrix, inverse_flags, use_numpy
+    )
+
+
+def matrix_from_buffer(buffer: Any, n_columns: int, use_numpy: Optional[bool] = None) -> Any:
+    """
+    Interpretiert einen zeilenweisen float64-Puffer als Kennzahlen-Matrix.
+
+    Args:
+        buffer: array('d'), bytes oder memoryview mit n × n_columns Werten
+        n_columns: Anzahl der Metriken je Zeile
+        use_numpy: None = automatisch, True/False erzwingt die Engine
+
+    Returns:
+        NumPy-Array ohne Kopie bei NumPy-Engine, sonst Liste von Zeilen
+    """
+    if _use_numpy(use_numpy):
+        np = numpy_module()
+        return np.frombuffer(buffer, dtype=np.float64).reshape(-1, n_columns)
+    values = buffer if isinstance(buffer, array) else array("d", bytes(buffer))
+    return [values[i:i + n_columns] for i in range(0, len(values), n_columns)]
+
+
+def exact_mean(values: Sequence[float]) -> float:
+    """
+    Korrekt gerundeter Mittelwert, bitgleich mit statistics.mean().
+
+    fsum(values) / n rundet zweimal (Summe, dann Division) und weicht
+    dadurch in der letzten Stelle ab; der exakt berechnete Rest der
+    Division korrigiert das, ohne über Brüche zu rechnen.
+    """
+    n = len(values)
+    mean = fsum(values) / n
+    residual = fsum([*values, *[-mean] * n])
+    return mean + residual / n
+
+
+def group_means(ranks: Any, groups: Sequence[Tuple[int, int]]) -> List[List[float]]:
+    """
+    Mittelt die Ränge je Spaltengruppe (z.B. je Teil-Score).
+
+    Beide Engines mitteln mit exact_mean() und liefern damit dieselben
+    Werte wie statistics.mean() in calculate_*_score().
+
+    Args:
+        ranks: Ergebnis von rank_matrix()
+        groups: (start, stop)-Spaltenbereiche je Gruppe
+
+    Returns:
+        Pro Gruppe eine Liste mit einem Mittelwert je Zeile
+    """
+    if is_ndarray(ranks):
+        ranks = ranks.tolist()
+    return [
+        [exact_mean(row[start:stop]) for row in ranks]
+        for start, stop in groups
+    ]
+
+
+def round_like_python(values: Any, ndigits: int) -> Any:
+    """
+    Rundet ein NumPy-Array exakt wie Pythons round(x, ndigits).
+
+    np.round skaliert vor dem Runden und kann bei Werten knapp neben
+    einer ,5-Grenze anders runden; diese Fälle werden einzeln mit
+    round() nachgerechnet.
+    """
+    np = numpy_module()
+    rounded = np.round(values, ndigits)
+    scaled = values * 10 ** ndigits
+    ambiguous = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if ambiguous.any():
+        rounded[ambiguous] = [round(float(v), ndigits) for v in values[ambiguous]]
+    return rounded
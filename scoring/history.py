@@ -0,0 +1,234 @@
+"""
+History Modul
+
+Point-in-Time-Scoring über viele Stichtage.
+
+Pro Stichtag wird eine eigene FinancialsTable gespeichert. Für jeden
+abgefragten Stichtag gilt der jüngste Snapshot, der nicht nach diesem
+Datum liegt - spätere Daten fließen nie in eine historische Bewertung ein.
+
+Perzentile sind sektorintern, daher ist ein Sektor-Zustand (Symbole und
+Kennzahlen) die kleinste Einheit der Berechnung. Sektoren, die sich
+zwischen zwei Stichtagen nicht verändert haben, werden nicht erneut
+berechnet; alle übrigen werden optional parallel ausgewertet.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from bisect import bisect_right, insort
+from datetime import date, datetime
+import hashlib
+
+from .data_loader import CompanyFinancials, FinancialsTable
+from .scorer import Scorer, ScoreResult, get_scorer
+from .parallel import SectorPayload, score_payload_results, score_sectors_parallel
+
+
+AsOf = Union[date, str]
+
+
+def to_date(value: AsOf) -> date:
+    """
+    Wandelt einen Stichtag in ein date-Objekt um.
+
+    Args:
+        value: date, datetime oder ISO-String ("2024-03-31")
+
+    Returns:
+        date
+    """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(value[:10])
+
+
+class SnapshotStore:
+    """
+    Finanzkennzahlen aller Unternehmen je Stichtag.
+
+    Verwendung:
+        store = SnapshotStore()
+        store.add_snapshot("2024-03-31", companies_q1)
+        store.add_snapshot("2024-06-30", companies_q2)
+        store.table_as_of("2024-05-15")   # Snapshot vom 31.03.
+    """
+
+    def __init__(self):
+        self._tables: Dict[date, FinancialsTable] = {}
+        self._dates: List[date] = []
+
+    def __len__(self) -> int:
+        return len(self._dates)
+
+    def __contains__(self, as_of: AsOf) -> bool:
+        return to_date(as_of) in self._tables
+
+    def dates(self) -> List[date]:
+        """Alle Stichtage in aufsteigender Reihenfolge."""
+        return list(self._dates)
+
+    def add_snapshot(
+        self,
+        as_of: AsOf,
+        data: Union[FinancialsTable, Iterable[CompanyFinancials]]
+    ) -> FinancialsTable:
+        """
+        Speichert den Datenstand eines Stichtags (ersetzt einen vorhandenen).
+
+        Args:
+            as_of: Stichtag
+            data: FinancialsTable oder CompanyFinancials-Objekte
+
+        Returns:
+            Die gespeicherte FinancialsTable
+        """
+        table = data if isinstance(data, FinancialsTable) else FinancialsTable.from_companies(data)
+        key = to_date(as_of)
+        if key not in self._tables:
+            insort(self._dates, key)
+        self._tables[key] = table
+        return table
+
+    def table(self, as_of: AsOf) -> Optional[FinancialsTable]:
+        """Snapshot genau dieses Stichtags (None wenn nicht vorhanden)."""
+        return self._tables.get(to_date(as_of))
+
+    def snapshot_as_of(self, as_of: AsOf) -> Optional[date]:
+        """
+        Jüngster Stichtag, der nicht nach as_of liegt.
+
+        Returns:
+            Stichtag des gültigen Snapshots oder None, wenn es keinen gibt
+        """
+        pos = bisect_right(self._dates, to_date(as_of))
+        return self._dates[pos - 1] if pos else None
+
+    def table_as_of(self, as_of: AsOf) -> Optional[FinancialsTable]:
+        """Point-in-Time-Datenstand zu einem beliebigen Datum."""
+        snapshot = self.snapshot_as_of(as_of)
+        return None if snapshot is None else self._tables[snapshot]
+
+
+def _sector_payloads(table: FinancialsTable, sectors: Iterable[str]) -> Dict[str, SectorPayload]:
+    """Payloads der angegebenen Sektoren mit einem Durchlauf über die Tabelle."""
+    wanted = set(sectors)
+    rows: Dict[str, List[int]] = {sector: [] for sector in wanted}
+    for row, sector in enumerate(table.sectors):
+        if sector in wanted:
+            rows[sector].append(row)
+    return {
+        sector: SectorPayload(
+            sector,
+            [table.symbols[row] for row in sector_rows],
+            table.metric_buffer(sector_rows),
+            []
+        )
+        for sector, sector_rows in rows.items()
+    }
+
+
+def _fingerprint(payload: SectorPayload) -> bytes:
+    """Eindeutiger Schlüssel eines Sektor-Zustands (Sektor, Symbole, Kennzahlen)."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(payload.sector.encode())
+    digest.update(b"\0")
+    digest.update(b"\0".join(symbol.encode() for symbol in payload.symbols))
+    digest.update(b"\0")
+    digest.update(payload.metrics.tobytes())
+    return digest.digest()
+
+
+class HistoricalScorer:
+    """
+    Berechnet Score-Historien über die Snapshots eines SnapshotStore.
+
+    Die Ergebnisse je Sektor-Zustand werden gecacht, auch über mehrere
+    Aufrufe von score_history() hinweg.
+    """
+
+    def __init__(self, store: SnapshotStore, scorer: Optional[Scorer] = None):
+        """
+        Initialisiert den HistoricalScorer.
+
+        Args:
+            store: Snapshots der Finanzkennzahlen
+            scorer: Optional, Scorer-Instanz
+        """
+        self._store = store
+        self._scorer = scorer or get_scorer()
+        self._sector_cache: Dict[bytes, Dict[str, ScoreResult]] = {}
+
+    @property
+    def sector_states(self) -> int:
+        """Anzahl der bisher berechneten, unterschiedlichen Sektor-Zustände."""
+        return len(self._sector_cache)
+
+    def score_history(
+        self,
+        symbols: Sequence[str],
+        dates: Optional[Sequence[AsOf]] = None,
+        workers: Optional[int] = None
+    ) -> Dict[str, List[Tuple[date, ScoreResult]]]:
+        """
+        Bewertet Unternehmen zu mehreren Stichtagen.
+
+        Args:
+            symbols: Liste von Aktien-Symbolen
+            dates: Optional, Stichtage; None = alle Snapshots
+            workers: Optional, Anzahl Prozesse für neue Sektor-Zustände
+
+        Returns:
+            Dict mit Symbol -> [(Stichtag, ScoreResult), ...] in
+            aufsteigender Reihenfolge; Stichtage ohne Daten fehlen
+        """
+        wanted = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        as_of_dates = sorted({to_date(d) for d in dates}) if dates is not None else self._store.dates()
+
+        # Planung: gültiger Snapshot und Sektor-Zustände je Stichtag
+        plan: List[Tuple[date, List[Tuple[str, str, bytes]]]] = []
+        located_by_table: Dict[int, List[Tuple[str, str, bytes]]] = {}
+        pending: Dict[bytes, SectorPayload] = {}
+        for as_of in as_of_dates:
+            table = self._store.table_as_of(as_of)
+            if table is None:
+                continue
+            located = located_by_table.get(id(table))
+            if located is None:
+                rows = [(symbol, table.row_of(symbol)) for symbol in wanted]
+                rows = [(symbol, row) for symbol, row in rows if row is not None]
+                keys = {}
+                sectors = {table.sectors[row] for _, row in rows}
+                for sector, payload in _sector_payloads(table, sectors).items():
+                    keys[sector] = _fingerprint(payload)
+                    if keys[sector] not in self._sector_cache:
+                        pending.setdefault(keys[sector], payload)
+                # (angefragtes Symbol, Symbol in der Tabelle, Sektor-Zustand)
+                located = [
+                    (symbol, table.symbols[row], keys[table.sectors[row]]) for symbol, row in rows
+                ]
+                located_by_table[id(table)] = located
+            plan.append((as_of, located))
+
+        self._score_pending(pending, workers)
+
+        history: Dict[str, List[Tuple[date, ScoreResult]]] = {symbol: [] for symbol in wanted}
+        for as_of, located in plan:
+            for symbol, table_symbol, key in located:
+                history[symbol].append((as_of, self._sector_cache[key][table_symbol]))
+        return history
+
+    def _score_pending(self, pending: Dict[bytes, SectorPayload], workers: Optional[int]):
+        """Berechnet alle noch nicht gecachten Sektor-Zustände."""
+        if workers and workers > 1 and len(pending) > 1:
+            results = score_sectors_parallel(
+                pending.values(), workers, scorer=self._scorer, task=score_payload_results
+            )
+        else:
+            results = (score_payload_results(payload, self._scorer) for payload in pending.values())
+        for key, sector_results in zip(pending, results):
+            self._sector_cache[key] = sector_results
+
+    def clear_cache(self):
+        """Verwirft alle gecachten Sektor-Ergebnisse."""
+        self._sector_cache.clear()
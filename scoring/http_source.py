@@ -0,0 +1,445 @@
+"""
+HTTP Source Modul
+
+Datenquelle für eine Markt-API über HTTP/1.1 (nur Standardbibliothek).
+
+Erwartete Endpunkte relativ zur Basis-URL (Antworten als JSON):
+
+    GET /sectors                      ["Technology", ...]
+    GET /sectors/{sector}             ["AAPL", "MSFT", ...]
+    GET /companies?symbols=AAPL,MSFT  [{"symbol": "AAPL", ...}, ...]
+
+Unbekannte Symbole fehlen in der Antwort, unbekannte Sektoren liefern 404.
+
+Die Quelle hält einen Pool von Keep-Alive-Verbindungen, fasst Symbole zu
+Sammelanfragen zusammen, begrenzt die Anfragerate mit einem Token-Bucket
+und wiederholt 429-, 5xx- und Verbindungsfehler mit exponentiellem
+Backoff und Jitter. Latenzen werden je Endpunkt in Histogrammen erfasst.
+
+Verwendung (synchron über den Adapter):
+    source = AsyncSourceAdapter(HttpDataSource("https://api.example.com/v1"))
+    loader = DataLoader(data_source=CachingDataSource(source))
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from dataclasses import dataclass, fields
+from bisect import bisect_left
+from urllib.parse import quote, urlsplit
+import asyncio
+import json
+import random
+import ssl
+import time
+
+from .config import HTTP_SOURCE_CONFIG
+from .async_source import AsyncDataSourceBase
+from .data_loader import CompanyFinancials
+
+
+_COMPANY_FIELDS = [f.name for f in fields(CompanyFinancials)]
+
+# Statuscodes, bei denen eine Wiederholung sinnvoll ist
+_RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# Fehler beim Verbindungsaufbau oder Lesen einer Antwort
+_TRANSPORT_ERRORS = (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError)
+
+# Fehler, mit denen sich eine vom Server geschlossene ruhende Verbindung zeigt
+_STALE_ERRORS = (ConnectionError, asyncio.IncompleteReadError)
+
+
+def _option(value: Any, key: str) -> Any:
+    """Parameter oder Standardwert aus HTTP_SOURCE_CONFIG."""
+    return HTTP_SOURCE_CONFIG[key] if value is None else value
+
+
+class HttpSourceError(Exception):
+    """Anfrage an die Markt-API ist (auch nach Wiederholungen) fehlgeschlagen."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass(frozen=True, slots=True)
+class HttpStats:
+    """Zähler einer HttpDataSource."""
+    requests: int        # HTTP-Anfragen inkl. Wiederholungen
+    retries: int
+    rate_limited: int    # Antworten mit Status 429
+    failures: int        # endgültig fehlgeschlagene Abfragen
+    connections: int     # insgesamt geöffnete Verbindungen
+
+
+class LatencyHistogram:
+    """
+    Latenzen in festen, logarithmisch gestuften Buckets (Millisekunden).
+
+    Perzentile werden als Obergrenze des Buckets angegeben, in dem der
+    gesuchte Rang liegt (bzw. als Maximum im Überlauf-Bucket).
+    """
+
+    BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+    def __init__(self):
+        self.buckets = [0] * (len(self.BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, ms: float):
+        """Erfasst eine Latenz."""
+        self.buckets[bisect_left(self.BOUNDS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, q: float) -> float:
+        """Näherungsweises q-Perzentil (0-100) in Millisekunden."""
+        if not self.count:
+            return 0.0
+        rank = max(1, round(q / 100 * self.count))
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return min(self.BOUNDS_MS[i], self.max_ms) if i < len(self.BOUNDS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Zusammenfassung für Logs und Monitoring."""
+        labels = [f"<={bound}" for bound in self.BOUNDS_MS] + [f">{self.BOUNDS_MS[-1]}"]
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": self.max_ms,
+            "buckets": {label: n for label, n in zip(labels, self.buckets) if n},
+        }
+
+
+class TokenBucket:
+    """
+    Token-Bucket-Ratenbegrenzung: im Mittel rate Anfragen pro Sekunde,
+    kurzfristig bis zu burst auf einmal.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate muss > 0 und burst >= 1 sein")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def acquire(self):
+        """Wartet, bis ein Token verfügbar ist, und verbraucht es."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+@dataclass(slots=True)
+class _Response:
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    keep_alive: bool
+
+
+class _ConnectionPool:
+    """Keep-Alive-Verbindungen zu einem Host, höchstens size gleichzeitig."""
+
+    def __init__(self, host: str, port: int, ssl_context: Optional[ssl.SSLContext], size: int):
+        self._host = host
+        self._port = port
+        self._ssl = ssl_context
+        self._slots = asyncio.Semaphore(size)
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self.opened = 0
+
+    async def _open(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        connection = await asyncio.open_connection(self._host, self._port, ssl=self._ssl)
+        self.opened += 1
+        return connection
+
+    async def request(self, target: str, headers: Dict[str, str], timeout: float) -> _Response:
+        """
+        Sendet ein GET über eine freie (oder neue) Verbindung.
+
+        Eine Verbindung kommt nur nach einer vollständigen Keep-Alive-Antwort
+        zurück in den Pool; bei Fehlern, Timeouts und Abbruch (CancelledError)
+        wird sie geschlossen.
+        """
+        async with self._slots:
+            reused = bool(self._idle)
+            connection = self._idle.pop() if reused else await asyncio.wait_for(self._open(), timeout)
+            pooled = False
+            try:
+                try:
+                    response = await asyncio.wait_for(self._exchange(connection, target, headers), timeout)
+                except _STALE_ERRORS:
+                    if not reused:
+                        raise
+                    # Der Server hat eine ruhende Verbindung geschlossen: einmal neu verbinden
+                    # (Timeouts nicht: die äußeren Wiederholungen entscheiden mit Backoff)
+                    connection[1].close()
+                    connection = await asyncio.wait_for(self._open(), timeout)
+                    response = await asyncio.wait_for(self._exchange(connection, target, headers), timeout)
+                if response.keep_alive:
+                    self._idle.append(connection)
+                    pooled = True
+                return response
+            finally:
+                if not pooled:
+                    connection[1].close()
+
+    async def _exchange(
+        self,
+        connection: Tuple[asyncio.StreamReader, asyncio.StreamWriter],
+        target: str,
+        headers: Dict[str, str]
+    ) -> _Response:
+        reader, writer = connection
+        lines = [f"GET {target} HTTP/1.1", f"Host: {self._host}"]
+        lines.extend(f"{key}: {value}" for key, value in headers.items())
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise asyncio.IncompleteReadError(b"", None)
+        version, status = status_line.decode("latin-1").split(None, 2)[:2]
+        response_headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            response_headers[key.strip().lower()] = value.strip()
+
+        keep_alive = version == "HTTP/1.1" and response_headers.get("connection", "").lower() != "close"
+        if response_headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            body = b"".join(chunks)
+        elif "content-length" in response_headers:
+            body = await reader.readexactly(int(response_headers["content-length"]))
+        else:
+            body = await reader.read()
+            keep_alive = False
+        return _Response(int(status), response_headers, body, keep_alive)
+
+    async def close(self):
+        """Schließt alle ruhenden Verbindungen."""
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+
+class HttpDataSource(AsyncDataSourceBase):
+    """
+    Asynchrone Datenquelle für eine Markt-API (Endpunkte siehe Modul-Docstring).
+
+    Nicht angegebene Parameter kommen aus HTTP_SOURCE_CONFIG. Synchron
+    nutzbar über AsyncSourceAdapter.
+
+    Verwendung:
+        source = HttpDataSource("https://api.example.com/v1", headers={"X-Api-Key": "..."})
+        companies = await source.get_companies(["AAPL", "MSFT"])
+        source.latency["companies"].to_dict()
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        headers: Optional[Dict[str, str]] = None,
+        pool_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        rate_per_second: Optional[float] = None,
+        burst: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        backoff_s: Optional[float] = None,
+        timeout_s: Optional[float] = None
+    ):
+        """
+        Args:
+            base_url: Basis-URL der API (http oder https)
+            headers: Zusätzliche Header je Anfrage (z.B. API-Schlüssel)
+            pool_size: Maximale Anzahl Verbindungen
+            batch_size: Symbole je Sammelanfrage
+            rate_per_second, burst: Token-Bucket-Parameter
+            max_retries: Wiederholungen je Anfrage
+            backoff_s: Basis-Wartezeit zwischen Wiederholungen
+            timeout_s: Zeitlimit je HTTP-Anfrage
+
+        Raises:
+            ValueError: Bei ungültiger URL
+        """
+        url = urlsplit(base_url)
+        if url.scheme not in ("http", "https") or not url.hostname:
+            raise ValueError(f"Ungültige Basis-URL '{base_url}' (http oder https erwartet)")
+
+        self._host = url.hostname
+        self._port = url.port or (443 if url.scheme == "https" else 80)
+        self._ssl = ssl.create_default_context() if url.scheme == "https" else None
+        self._base_path = url.path.rstrip("/")
+        self._headers = {
+            "Accept": "application/json",
+            "Connection": "keep-alive",
+            "User-Agent": "capitovo-scoring",
+            **(headers or {}),
+        }
+        self._pool_size = _option(pool_size, "pool_size")
+        self._batch_size = _option(batch_size, "batch_size")
+        self._max_retries = _option(max_retries, "max_retries")
+        self._backoff = _option(backoff_s, "backoff_s")
+        self._backoff_max = HTTP_SOURCE_CONFIG["backoff_max_s"]
+        self._timeout = _option(timeout_s, "timeout_s")
+        self._bucket = TokenBucket(_option(rate_per_second, "rate_per_second"), _option(burst, "burst"))
+        # Sammelanfragen nebenläufig, höchstens so viele wie Verbindungen
+        self.max_concurrency = self._pool_size
+        self._pool: Optional[_ConnectionPool] = None
+
+        self.latency: Dict[str, LatencyHistogram] = {}
+        self._requests = 0
+        self._retries = 0
+        self._rate_limited = 0
+        self._failures = 0
+
+    @property
+    def stats(self) -> HttpStats:
+        """Aktuelle Zähler."""
+        return HttpStats(
+            requests=self._requests,
+            retries=self._retries,
+            rate_limited=self._rate_limited,
+            failures=self._failures,
+            connections=self._pool.opened if self._pool else 0
+        )
+
+    def _retry_delay(self, attempt: int, retry_after: Optional[float]) -> float:
+        """Exponentieller Backoff mit vollem Jitter; Retry-After als Untergrenze."""
+        delay = random.uniform(0, min(self._backoff_max, self._backoff * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self._backoff_max))
+        return delay
+
+    async def _get_json(self, endpoint: str, path: str) -> Any:
+        """
+        GET mit Rate-Limit und Wiederholungen.
+
+        Args:
+            endpoint: Name für das Latenz-Histogramm
+            path: Pfad relativ zur Basis-URL (inkl. Query)
+
+        Returns:
+            Dekodiertes JSON oder None bei 404
+
+        Raises:
+            HttpSourceError: Bei anderen Fehlern bzw. nach der letzten Wiederholung
+        """
+        if self._pool is None:
+            self._pool = _ConnectionPool(self._host, self._port, self._ssl, self._pool_size)
+        histogram = self.latency.setdefault(endpoint, LatencyHistogram())
+        target = self._base_path + path
+
+        for attempt in range(self._max_retries + 1):
+            await self._bucket.acquire()
+            self._requests += 1
+            retry_after = None
+            start = time.perf_counter()
+            try:
+                response = await self._pool.request(target, self._headers, self._timeout)
+            except _TRANSPORT_ERRORS as error:
+                failure = HttpSourceError(f"GET {target}: {error!r}")
+            else:
+                histogram.record((time.perf_counter() - start) * 1e3)
+                if response.status == 200:
+                    return json.loads(response.body)
+                if response.status == 404:
+                    return None
+                failure = HttpSourceError(f"GET {target}: Status {response.status}", response.status)
+                if response.status not in _RETRY_STATUS:
+                    self._failures += 1
+                    raise failure
+                if response.status == 429:
+                    self._rate_limited += 1
+                    try:
+                        retry_after = float(response.headers.get("retry-after", ""))
+                    except ValueError:
+                        retry_after = None
+
+            if attempt < self._max_retries:
+                self._retries += 1
+                await asyncio.sleep(self._retry_delay(attempt, retry_after))
+
+        self._failures += 1
+        raise failure
+
+    async def get_companies(self, symbols: Iterable[str]) -> Dict[str, CompanyFinancials]:
+        """
+        Lädt mehrere Unternehmen über Sammelanfragen (batch_size Symbole je Anfrage).
+
+        Args:
+            symbols: Aktiensymbole
+
+        Returns:
+            Dict Symbol -> CompanyFinancials (unbekannte Symbole fehlen)
+        """
+        unique = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        batches = [unique[i:i + self._batch_size] for i in range(0, len(unique), self._batch_size)]
+        responses = await asyncio.gather(*(
+            self._get_json("companies", "/companies?symbols=" + quote(",".join(batch), safe=","))
+            for batch in batches
+        ))
+        companies: Dict[str, CompanyFinancials] = {}
+        for records in responses:
+            for record in records or []:
+                try:
+                    company = CompanyFinancials(**{
+                        name: record[name] for name in _COMPANY_FIELDS if name in record
+                    })
+                except TypeError as error:
+                    raise HttpSourceError(f"Ungültiger Datensatz: {error}") from None
+                companies[company.symbol] = company
+        return companies
+
+    async def get_company_data(self, symbol: str) -> Optional[CompanyFinancials]:
+        """Lädt Daten für ein einzelnes Unternehmen."""
+        companies = await self.get_companies([symbol])
+        return next(iter(companies.values()), None)
+
+    async def get_sector_symbols(self, sector: str) -> List[str]:
+        """Symbole aller Unternehmen eines Sektors."""
+        return await self._get_json("sector_symbols", "/sectors/" + quote(sector, safe="")) or []
+
+    async def get_available_sectors(self) -> List[str]:
+        """Gibt alle verfügbaren Sektoren zurück."""
+        return await self._get_json("sectors", "/sectors") or []
+
+    async def aclose(self):
+        """Schließt alle ruhenden Verbindungen."""
+        if self._pool is not None:
+            await self._pool.close()
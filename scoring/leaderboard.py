@@ -0,0 +1,181 @@
+"""
+Leaderboard Modul
+
+Globales Ranking über alle Sektoren hinweg ("Beste über alle Sektoren"
+im Aktien-Monitor).
+
+Die Gesamt-Scores aller Unternehmen werden einmal sortiert vorgehalten und
+nur für die Sektoren aktualisiert, die der SectorRanker neu berechnet oder
+verwirft. Rang-Abfragen kosten eine Binärsuche, Top-k und Bottom-k ein
+Slice der sortierten Liste.
+"""
+
+from typing import Dict, List, Optional, Set, Tuple
+from dataclasses import dataclass
+from bisect import bisect_left, insort
+
+from .scorer import ScoreResult
+from .sector_ranker import GroupRanker, get_sector_ranker
+
+
+# Bis zu dieser Anzahl geänderter Einträge wird einzeln einsortiert,
+# darüber die Liste mit einem Merge neu aufgebaut
+_INCREMENTAL_LIMIT = 64
+
+
+@dataclass(frozen=True, slots=True)
+class LeaderboardEntry:
+    """Platzierung eines Unternehmens im globalen Ranking."""
+    rank: int                    # Platzierung über alle Sektoren (1 = beste)
+    symbol: str
+    sector: str
+    total_score: float
+    sector_percentile: float
+
+
+def _key(result: ScoreResult) -> Tuple[float, str]:
+    """Sortierschlüssel: höchster Score zuerst, bei Gleichstand nach Symbol."""
+    return (-result.total_score, result.symbol)
+
+
+class GlobalLeaderboard:
+    """
+    Materialisiertes Ranking aller Unternehmen nach Gesamt-Score.
+
+    Hängt sich als Beobachter an einen SectorRanker (bzw. GroupRanker mit
+    überschneidungsfreien Gruppen). Neu berechnete Sektoren werden sofort
+    übernommen, verworfene Sektoren bei der nächsten Abfrage nachgeladen.
+
+    Verwendung:
+        leaderboard = GlobalLeaderboard(get_sector_ranker())
+        leaderboard.top(10)
+        leaderboard.rank("AAPL")
+    """
+
+    def __init__(self, sector_ranker: Optional[GroupRanker] = None):
+        """
+        Initialisiert das Leaderboard (berechnet wird erst bei der ersten Abfrage).
+
+        Args:
+            sector_ranker: Optional, SectorRanker mit Score-Cache
+        """
+        self._ranker = sector_ranker or get_sector_ranker()
+        self._keys: List[Tuple[float, str]] = []
+        self._results: Dict[str, ScoreResult] = {}
+        self._sector_symbols: Dict[str, Set[str]] = {}
+        self._dirty: Set[str] = set()
+        self._complete = False
+        self._ranker.add_listener(self._on_scores)
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self._keys)
+
+    def _on_scores(self, sector: Optional[str], results: Optional[Dict[str, ScoreResult]]):
+        """Listener des Rankers (siehe GroupRanker.add_listener())."""
+        if sector is None:
+            self._keys = []
+            self._results.clear()
+            self._sector_symbols.clear()
+            self._dirty.clear()
+            self._complete = False
+        elif results is None:
+            self._dirty.add(sector)
+        else:
+            self._replace_sector(sector, results)
+
+    def _replace_sector(self, sector: str, results: Dict[str, ScoreResult]):
+        """Ersetzt die Einträge eines Sektors; unveränderte Scores bleiben liegen."""
+        self._dirty.discard(sector)
+        old_symbols = self._sector_symbols.pop(sector, set())
+        removed: List[Tuple[float, str]] = []
+        added: List[Tuple[float, str]] = []
+
+        for symbol in old_symbols - results.keys():
+            removed.append(_key(self._results.pop(symbol)))
+
+        for symbol, result in results.items():
+            previous = self._results.get(symbol)
+            self._results[symbol] = result
+            if previous is not None:
+                if previous.sector != sector:
+                    # Sektorwechsel: Eintrag aus dem alten Sektor übernehmen
+                    self._sector_symbols[previous.sector].discard(symbol)
+                elif previous.total_score == result.total_score:
+                    continue
+                removed.append(_key(previous))
+            added.append(_key(result))
+
+        if results:
+            self._sector_symbols[sector] = set(results)
+        self._apply(removed, added)
+
+    def _apply(self, removed: List[Tuple[float, str]], added: List[Tuple[float, str]]):
+        """Überträgt entfernte und neue Schlüssel in die sortierte Liste."""
+        if len(removed) + len(added) <= _INCREMENTAL_LIMIT:
+            for key in removed:
+                del self._keys[bisect_left(self._keys, key)]
+            for key in added:
+                insort(self._keys, key)
+            return
+        stale = set(removed)
+        keys = [key for key in self._keys if key not in stale]
+        # Zwei sortierte Läufe: sort() führt sie in linearer Zeit zusammen
+        added.sort()
+        keys.extend(added)
+        keys.sort()
+        self._keys = keys
+
+    def refresh(self):
+        """Lädt fehlende und verworfene Sektoren aus dem Ranker nach."""
+        if not self._complete:
+            for sector in self._ranker.get_groups():
+                if sector not in self._sector_symbols:
+                    self._dirty.add(sector)
+            self._complete = True
+        while self._dirty:
+            sector = next(iter(self._dirty))
+            # Neu berechnete Sektoren kommen zusätzlich über den Listener an;
+            # der zweite Abgleich findet dann keine Änderungen mehr
+            self._replace_sector(sector, self._ranker.get_group_scores(sector))
+
+    def _entry(self, position: int) -> LeaderboardEntry:
+        result = self._results[self._keys[position][1]]
+        return LeaderboardEntry(
+            rank=position + 1,
+            symbol=result.symbol,
+            sector=result.sector,
+            total_score=result.total_score,
+            sector_percentile=result.sector_percentile
+        )
+
+    def rank(self, symbol: str) -> Optional[int]:
+        """
+        Globale Platzierung eines Unternehmens (O(log n)).
+
+        Bei gleichem Gesamt-Score entscheidet das Symbol.
+
+        Returns:
+            Rang (1 = beste) oder None wenn unbekannt
+        """
+        self.refresh()
+        result = self._results.get(symbol.upper())
+        if result is None:
+            return None
+        return bisect_left(self._keys, _key(result)) + 1
+
+    def entry(self, symbol: str) -> Optional[LeaderboardEntry]:
+        """Platzierung eines Unternehmens als LeaderboardEntry."""
+        rank = self.rank(symbol)
+        return None if rank is None else self._entry(rank - 1)
+
+    def top(self, k: int) -> List[LeaderboardEntry]:
+        """Die k besten Unternehmen über alle Sektoren (O(k))."""
+        self.refresh()
+        return [self._entry(position) for position in range(min(max(k, 0), len(self._keys)))]
+
+    def bottom(self, k: int) -> List[LeaderboardEntry]:
+        """Die k schwächsten Unternehmen, schwächstes zuletzt (O(k))."""
+        self.refresh()
+        n = len(self._keys)
+        return [self._entry(position) for position in range(max(n - max(k, 0), 0), n)]
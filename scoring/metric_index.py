@@ -0,0 +1,153 @@
+"""
+Sector Metric Index Modul
+
+Vorberechneter Index aller Kennzahlen eines Sektors.
+
+Pro Metrik werden die winsorisierten Werte einmal sortiert und die
+Winsorizing-Grenzen gespeichert. Der Rang eines beliebigen Wertes ist
+danach eine einzelne Binärsuche (O(log n)) - sowohl für die Unternehmen
+des Sektors als auch für hypothetische Was-wäre-wenn-Abfragen.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+from .engine import is_ndarray, numpy_module, winsorized_columns, rank_against, rank_value
+
+
+class SectorMetricIndex:
+    """
+    Sortierte, winsorisierte Kennzahlen eines Sektors.
+
+    Ändern sich die Kennzahlen eines enthaltenen Unternehmens, aktualisiert
+    update_row() nur die betroffenen Metriken. Bei neuen oder entfernten
+    Unternehmen wird der Index verworfen und neu aufgebaut
+    (siehe SectorRanker.invalidate_sector).
+    """
+
+    def __init__(
+        self,
+        sector: str,
+        symbols: Sequence[str],
+        matrix: Any,
+        inverse_flags: Sequence[bool],
+        use_numpy: Optional[bool] = None
+    ):
+        """
+        Baut den Index auf.
+
+        Args:
+            sector: Name des Sektors
+            symbols: Symbole in Zeilenreihenfolge der Matrix
+            matrix: Kennzahlen-Matrix (Zeilen = Unternehmen, Spalten = Metriken)
+            inverse_flags: Pro Metrik, ob ein niedrigerer Wert besser ist
+            use_numpy: None = automatisch, True/False erzwingt die Engine
+        """
+        self.sector = sector
+        self.symbols: List[str] = list(symbols)
+        self.inverse_flags: List[bool] = list(inverse_flags)
+        self._use_numpy = use_numpy
+        self._rows: Dict[str, int] = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+        self.columns, self.lower_bounds, self.upper_bounds = winsorized_columns(
+            matrix, use_numpy
+        )
+        self._numpy = is_ndarray(self.columns)
+
+        # Rohwerte für spätere Teil-Aktualisierungen
+        if self._numpy:
+            np = numpy_module()
+            self._matrix = np.array(matrix, dtype=np.float64).reshape(-1, len(self.inverse_flags))
+        else:
+            self._matrix = [list(row) for row in matrix]
+        # Ränge der Sektor-Unternehmen selbst (Zeilen wie in matrix)
+        self.ranks = rank_against(
+            self.columns, self.lower_bounds, self.upper_bounds,
+            matrix, self.inverse_flags, use_numpy
+        )
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._rows
+
+    def row_of(self, symbol: str) -> Optional[int]:
+        """Gibt die Zeile eines Symbols zurück (None wenn nicht im Index)."""
+        return self._rows.get(symbol)
+
+    def rank(self, metric: int, value: float) -> float:
+        """
+        Perzentil-Rang eines Wertes für eine Metrik (O(log n)).
+
+        Args:
+            metric: Spaltenindex der Metrik
+            value: Der zu bewertende Wert
+
+        Returns:
+            Perzentil-Rang (0-100)
+        """
+        if len(self.symbols) < 2:
+            return 50.0
+        return rank_value(
+            self.columns[metric],
+            self.lower_bounds[metric],
+            self.upper_bounds[metric],
+            value,
+            self.inverse_flags[metric]
+        )
+
+    def rank_row(self, values: Sequence[float]) -> List[float]:
+        """Perzentil-Ränge einer kompletten Kennzahlen-Zeile."""
+        return [self.rank(metric, value) for metric, value in enumerate(values)]
+
+    def rank_rows(self, matrix: Any) -> Any:
+        """Perzentil-Ränge mehrerer Kennzahlen-Zeilen in einem Schritt."""
+        return rank_against(
+            self.columns, self.lower_bounds, self.upper_bounds,
+            matrix, self.inverse_flags, self._use_numpy
+        )
+
+    def update_row(self, symbol: str, values: Sequence[float]) -> List[int]:
+        """
+        Aktualisiert die Kennzahlen eines enthaltenen Unternehmens.
+
+        Nur Metriken mit geänderten Werten werden neu sortiert,
+        winsorisiert und für alle Zeilen neu gerankt.
+
+        Args:
+            symbol: Symbol des Unternehmens (muss im Index enthalten sein)
+            values: Neue Kennzahlen-Zeile
+
+        Returns:
+            Spaltenindizes der geänderten Metriken
+        """
+        row = self._rows[symbol]
+        changed = [j for j, value in enumerate(values) if self._matrix[row][j] != value]
+
+        for j in changed:
+            self._matrix[row][j] = values[j]
+            self._rebuild_metric(j)
+
+        return changed
+
+    def _rebuild_metric(self, metric: int):
+        """Baut Spalte, Grenzen und Ränge einer einzelnen Metrik neu auf."""
+        if self._numpy:
+            column_matrix = self._matrix[:, metric:metric + 1]
+        else:
+            column_matrix = [[row[metric]] for row in self._matrix]
+
+        columns, lower, upper = winsorized_columns(column_matrix, self._numpy)
+        column_ranks = rank_against(
+            columns, lower, upper, column_matrix,
+            [self.inverse_flags[metric]], self._numpy
+        )
+
+        self.columns[metric] = columns[0]
+        self.lower_bounds[metric] = lower[0]
+        self.upper_bounds[metric] = upper[0]
+        if self._numpy:
+            self.ranks[:, metric] = column_ranks[:, 0]
+        else:
+            for rank_row, (rank,) in zip(self.ranks, column_ranks):
+                rank_row[metric] = rank
@@ -0,0 +1,413 @@
+"""
+Mmap Store Modul
+
+Binäres Dateiformat für Finanzkennzahlen, das per mmap geöffnet wird.
+
+Statt die Daten bei jedem Prozessstart neu aufzubauen, schreibt
+write_mmap_file() sie einmal in eine Datei mit festem Layout:
+
+    Header          Magic, Version, Zeilen, Felder, Sektoren, Abschnitts-Offsets
+    Feldnamen       METRIC_FIELDS (UTF-8, durch \\n getrennt)
+    Kennzahlen      float64, Zeilen × Felder, zeilenweise
+    String-Offsets  uint64, pro Zeile Symbol, Name, last_updated; danach Sektoren
+    Sektor-Tabelle  uint64-Paare (erste Zeile, Anzahl) je Sektor
+    Symbol-Index    uint32-Zeilennummern, sortiert nach Symbol (groß)
+    String-Daten    UTF-8
+
+Die Zeilen sind nach Sektor sortiert, jeder Sektor ist also ein
+zusammenhängender Bereich. MmapDataSource liest beim Öffnen nur Header
+und Sektor-Tabelle; alles andere wird erst beim Zugriff aus den
+gemappten Seiten gelesen. Der Start kostet damit unabhängig von der
+Universumsgröße O(1), und mehrere Worker-Prozesse teilen sich denselben
+Page-Cache.
+
+Für Ranker und Scorer liefert get_financials_table() eine MmapTable mit
+der Lese-Schnittstelle einer FinancialsTable: Sektoren sind range-Objekte,
+die Kennzahlen eines Sektors eine memoryview auf den float64-Block (ohne
+Kopie und ohne CompanyFinancials-Objekte).
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import repeat
+import mmap
+import os
+import struct
+import sys
+
+from .data_loader import CompanyFinancials, DataSourceBase, FinancialsTable, METRIC_FIELDS
+
+
+# Dateiendung, an der DataLoader das Binärformat erkennt
+MMAP_EXTENSION = ".capsnap"
+
+_MAGIC = b"CAPSNAP\0"
+_VERSION = 1
+
+# Magic, Version, Zeilen, Felder, Sektoren, Länge der Feldnamen,
+# Offsets: Kennzahlen, String-Offsets, Sektor-Tabelle, Symbol-Index, String-Daten
+_HEADER = struct.Struct("<8sIQIIIQQQQQ")
+
+# Strings pro Zeile im String-Offset-Abschnitt: Symbol, Name, last_updated
+_ROW_STRINGS = 3
+
+
+def _align(offset: int) -> int:
+    """Rundet auf ein Vielfaches von 8 Bytes (für float64/uint64-Sichten)."""
+    return (offset + 7) & ~7
+
+
+def write_mmap_file(path: str, data: Union[FinancialsTable, Iterable[CompanyFinancials]]) -> int:
+    """
+    Schreibt Finanzkennzahlen in eine mmap-Datei.
+
+    Die Datei wird zunächst unter einem temporären Namen geschrieben und
+    dann atomar ersetzt; Prozesse, die die alte Datei gemappt haben,
+    lesen unverändert weiter.
+
+    Args:
+        path: Zieldatei (üblicherweise mit Endung MMAP_EXTENSION)
+        data: FinancialsTable oder CompanyFinancials-Objekte
+
+    Returns:
+        Anzahl geschriebener Zeilen
+    """
+    table = data if isinstance(data, FinancialsTable) else FinancialsTable.from_companies(data)
+    n_rows = len(table)
+    n_fields = len(METRIC_FIELDS)
+
+    # Nach Sektor (zusammenhängende Bereiche), innerhalb nach Symbol sortieren
+    order = sorted(range(n_rows), key=lambda row: (table.sectors[row], table.symbols[row].upper()))
+    sectors: List[str] = []
+    sector_ranges = array("Q")
+    for position, row in enumerate(order):
+        sector = table.sectors[row]
+        if not sectors or sectors[-1] != sector:
+            sectors.append(sector)
+            sector_ranges.extend((position, 0))
+        sector_ranges[-1] += 1
+
+    # String-Daten und Offsets (jeweils Start; der letzte Eintrag ist das Ende)
+    strings: List[str] = []
+    for row in order:
+        strings.extend((table.symbols[row], table.names[row], table.last_updated[row] or ""))
+    strings.extend(sectors)
+    encoded = [s.encode("utf-8") for s in strings]
+    string_offsets = array("Q", [0])
+    total = 0
+    for chunk in encoded:
+        total += len(chunk)
+        string_offsets.append(total)
+
+    by_symbol = sorted(range(n_rows), key=lambda position: table.symbols[order[position]].upper())
+    symbol_index = array("I", by_symbol)
+    metrics = table.metric_buffer(order)
+    field_names = "\n".join(METRIC_FIELDS).encode("utf-8")
+
+    metrics_offset = _align(_HEADER.size + len(field_names))
+    offsets_offset = metrics_offset + 8 * n_rows * n_fields
+    sectors_offset = offsets_offset + 8 * len(string_offsets)
+    index_offset = sectors_offset + 8 * len(sector_ranges)
+    strings_offset = index_offset + 4 * len(symbol_index)
+    header = _HEADER.pack(
+        _MAGIC, _VERSION, n_rows, n_fields, len(sectors), len(field_names),
+        metrics_offset, offsets_offset, sectors_offset, index_offset, strings_offset
+    )
+
+    if sys.byteorder != "little":
+        for section in (metrics, string_offsets, sector_ranges, symbol_index):
+            section.byteswap()
+
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "wb") as handle:
+        handle.write(header)
+        handle.write(field_names)
+        handle.write(bytes(metrics_offset - _HEADER.size - len(field_names)))
+        metrics.tofile(handle)
+        string_offsets.tofile(handle)
+        sector_ranges.tofile(handle)
+        symbol_index.tofile(handle)
+        handle.write(b"".join(encoded))
+    os.replace(tmp_path, path)
+    return n_rows
+
+
+class _SymbolKeys:
+    """Sequenz der großgeschriebenen Symbole in Index-Reihenfolge (für bisect)."""
+
+    __slots__ = ("_source",)
+
+    def __init__(self, source: "MmapDataSource"):
+        self._source = source
+
+    def __len__(self) -> int:
+        return len(self._source)
+
+    def __getitem__(self, position: int) -> str:
+        source = self._source
+        return source._string(_ROW_STRINGS * source._symbol_index[position]).upper()
+
+
+class _RowStrings(Sequence[str]):
+    """Ein String je Zeile (Symbol, Name oder last_updated), erst beim Zugriff dekodiert."""
+
+    __slots__ = ("_source", "_slot")
+
+    def __init__(self, source: "MmapDataSource", slot: int):
+        self._source = source
+        self._slot = slot
+
+    def __len__(self) -> int:
+        return len(self._source)
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[i] for i in range(*row.indices(len(self)))]
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        return self._source._string(_ROW_STRINGS * row + self._slot)
+
+
+class _RowSectors(Sequence[str]):
+    """Sektor je Zeile, abgeleitet aus den Sektor-Bereichen."""
+
+    __slots__ = ("_source",)
+
+    def __init__(self, source: "MmapDataSource"):
+        self._source = source
+
+    def __len__(self) -> int:
+        return len(self._source)
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[i] for i in range(*row.indices(len(self)))]
+        if row < 0:
+            row += len(self)
+        return self._source._sector_of_row(row)
+
+    def __iter__(self) -> Iterator[str]:
+        for sector, (first, end) in self._source._sectors.items():
+            yield from repeat(sector, end - first)
+
+
+class MmapTable:
+    """
+    Schreibgeschützte Tabellen-Sicht auf eine MmapDataSource.
+
+    Bietet die Lese-Schnittstelle von FinancialsTable, die Ranker, Scorer
+    und Prozess-Pool nutzen (symbols, sectors, row_of(), sector_rows(),
+    metric_buffer(), company()). Die Kennzahlen zusammenhängender Zeilen
+    kommen als memoryview direkt aus den gemappten Seiten.
+    """
+
+    __slots__ = ("_source", "symbols", "names", "sectors", "last_updated")
+
+    def __init__(self, source: "MmapDataSource"):
+        self._source = source
+        self.symbols = _RowStrings(source, 0)
+        self.names = _RowStrings(source, 1)
+        self.sectors = _RowSectors(source)
+        self.last_updated = _RowStrings(source, 2)
+
+    def __len__(self) -> int:
+        return len(self._source)
+
+    def __contains__(self, symbol: str) -> bool:
+        return self._source.row_of(symbol) is not None
+
+    def row_of(self, symbol: str) -> Optional[int]:
+        """Zeile eines Symbols (None wenn nicht vorhanden)."""
+        return self._source.row_of(symbol)
+
+    def company(self, row: int) -> CompanyFinancials:
+        """Erzeugt bei Bedarf ein CompanyFinancials-Objekt für eine Zeile."""
+        return self._source._company(row)
+
+    def get(self, symbol: str) -> Optional[CompanyFinancials]:
+        """Lädt ein Unternehmen per Symbol."""
+        return self._source.get_company_data(symbol)
+
+    def sector_rows(self, sector: str) -> range:
+        """Zeilen eines Sektors (zusammenhängender Bereich)."""
+        return range(*self._source._sectors.get(sector, (0, 0)))
+
+    def available_sectors(self) -> Tuple[str, ...]:
+        """Alle Sektoren in Datei-Reihenfolge."""
+        return tuple(self._source._sectors)
+
+    def metric_buffer(self, rows: Sequence[int]) -> Union[memoryview, array]:
+        """
+        Kennzahlen ausgewählter Zeilen als zeilenweiser float64-Puffer.
+
+        Zusammenhängende Bereiche (z.B. aus sector_rows()) werden ohne
+        Kopie als memoryview auf die Datei geliefert, sonst wird kopiert.
+
+        Args:
+            rows: Zeilenindizes
+
+        Returns:
+            memoryview bzw. array('d') mit len(rows) × len(METRIC_FIELDS) Werten
+        """
+        n_fields = len(METRIC_FIELDS)
+        metrics = self._source._metrics
+        if isinstance(rows, range) and rows.step == 1:
+            return metrics[rows.start * n_fields:rows.stop * n_fields]
+        buffer = array("d")
+        for row in rows:
+            buffer.frombytes(metrics[row * n_fields:(row + 1) * n_fields].cast("B"))
+        return buffer
+
+
+class MmapDataSource(DataSourceBase):
+    """
+    Schreibgeschützte Datenquelle auf einer mmap-Datei (siehe write_mmap_file()).
+
+    Symbol-Abfragen laufen per Binärsuche über den Symbol-Index, Sektoren
+    sind zusammenhängende Zeilenbereiche. CompanyFinancials-Objekte
+    entstehen erst bei der Abfrage.
+
+    Verwendung:
+        write_mmap_file("data/financials.capsnap", get_data_loader().get_all_companies())
+        source = MmapDataSource("data/financials.capsnap")
+        loader = DataLoader(data_source=source)
+    """
+
+    def __init__(self, path: str):
+        """
+        Öffnet die Datei (liest nur Header und Sektor-Tabelle).
+
+        Args:
+            path: Pfad zur mmap-Datei
+
+        Raises:
+            ValueError: Bei fremdem Dateiformat, anderer Version oder
+                abweichenden Kennzahlen-Feldern
+        """
+        if sys.byteorder != "little":
+            raise ValueError("mmap-Dateien werden nur auf Little-Endian-Systemen unterstützt")
+        self.path = path
+        with open(path, "rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        try:
+            (magic, version, n_rows, n_fields, n_sectors, names_length,
+             metrics_offset, offsets_offset, sectors_offset, index_offset,
+             strings_offset) = _HEADER.unpack_from(view)
+            if magic != _MAGIC or version != _VERSION:
+                raise ValueError(f"Keine mmap-Datei (Version {_VERSION}): {path}")
+            field_names = bytes(view[_HEADER.size:_HEADER.size + names_length]).decode("utf-8")
+            if field_names.split("\n") != METRIC_FIELDS:
+                raise ValueError(f"Kennzahlen-Felder in {path} passen nicht zu METRIC_FIELDS")
+        except (ValueError, struct.error):
+            view.release()
+            self._mmap.close()
+            raise
+
+        self._view = view
+        self._n_rows = n_rows
+        self._metrics = view[metrics_offset:offsets_offset].cast("d")
+        self._offsets = view[offsets_offset:sectors_offset].cast("Q")
+        self._symbol_index = view[index_offset:strings_offset].cast("I")
+        self._strings = view[strings_offset:]
+
+        sector_ranges = view[sectors_offset:index_offset].cast("Q")
+        self._sectors: Dict[str, Tuple[int, int]] = {}
+        for i in range(n_sectors):
+            name = self._string(_ROW_STRINGS * n_rows + i)
+            first, count = sector_ranges[2 * i], sector_ranges[2 * i + 1]
+            self._sectors[name] = (first, first + count)
+        sector_ranges.release()
+        # Sektoren liegen aufsteigend hintereinander: Zeile -> Sektor per bisect
+        self._sector_firsts = [first for first, _ in self._sectors.values()]
+        self._sector_names = list(self._sectors)
+        self._table = MmapTable(self)
+
+    def __len__(self) -> int:
+        return self._n_rows
+
+    def __enter__(self) -> "MmapDataSource":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Gibt die Abbildung frei; danach sind keine Abfragen mehr möglich.
+
+        Verweisen noch Matrizen auf die Seiten (z.B. gecachte NumPy-Indizes
+        eines Rankers), wird die Abbildung erst mit dem letzten Verweis frei.
+        """
+        if self._mmap.closed:
+            return
+        try:
+            for view in (self._metrics, self._offsets, self._symbol_index, self._strings, self._view):
+                view.release()
+            self._mmap.close()
+        except BufferError:
+            pass
+
+    def _string(self, i: int) -> str:
+        return str(self._strings[self._offsets[i]:self._offsets[i + 1]], "utf-8")
+
+    def _company(self, row: int) -> CompanyFinancials:
+        n_fields = len(METRIC_FIELDS)
+        metrics = self._metrics[row * n_fields:(row + 1) * n_fields].tolist()
+        base = _ROW_STRINGS * row
+        return CompanyFinancials(
+            symbol=self._string(base),
+            name=self._string(base + 1),
+            sector=self._sector_of_row(row),
+            last_updated=self._string(base + 2) or None,
+            **dict(zip(METRIC_FIELDS, metrics))
+        )
+
+    def _sector_of_row(self, row: int) -> str:
+        if not 0 <= row < self._n_rows:
+            raise IndexError(row)
+        return self._sector_names[bisect_right(self._sector_firsts, row) - 1]
+
+    def row_of(self, symbol: str) -> Optional[int]:
+        """Zeile eines Symbols per Binärsuche (None wenn nicht vorhanden)."""
+        key = symbol.upper()
+        keys = _SymbolKeys(self)
+        position = bisect_left(keys, key)
+        if position < self._n_rows and keys[position] == key:
+            return self._symbol_index[position]
+        return None
+
+    def get_company_data(self, symbol: str) -> Optional[CompanyFinancials]:
+        """Lädt Daten für ein einzelnes Unternehmen."""
+        row = self.row_of(symbol)
+        return None if row is None else self._company(row)
+
+    def get_companies(self, symbols: Iterable[str]) -> Dict[str, CompanyFinancials]:
+        """Lädt mehrere Unternehmen per Binärsuche im Symbol-Index."""
+        rows = (self.row_of(symbol) for symbol in symbols)
+        companies = (self._company(row) for row in dict.fromkeys(rows) if row is not None)
+        return {company.symbol: company for company in companies}
+
+    def get_sector_companies(self, sector: str) -> List[CompanyFinancials]:
+        """Lädt alle Unternehmen eines Sektors."""
+        first, end = self._sectors.get(sector, (0, 0))
+        return [self._company(row) for row in range(first, end)]
+
+    def get_all_companies(self) -> List[CompanyFinancials]:
+        """Lädt alle verfügbaren Unternehmen."""
+        return [self._company(row) for row in range(self._n_rows)]
+
+    def get_available_symbols(self) -> List[str]:
+        """Gibt alle verfügbaren Symbole zurück."""
+        return [self._string(_ROW_STRINGS * row) for row in range(self._n_rows)]
+
+    def get_available_sectors(self) -> List[str]:
+        """Gibt alle verfügbaren Sektoren zurück."""
+        return list(self._sectors)
+
+    def get_financials_table(self) -> MmapTable:
+        """Tabellen-Sicht auf die Datei (Kennzahlen ohne Kopie, siehe MmapTable)."""
+        return self._table
@@ -0,0 +1,182 @@
+"""
+Parallel Modul
+
+Verteilt das Scoring vieler Unternehmen auf mehrere Prozesse.
+
+Perzentile werden nie sektorübergreifend berechnet, daher ist jeder Sektor
+eine unabhängige Aufgabe. An die Worker werden nur spaltenorientierte
+Rohdaten übertragen (Symbole + Kennzahlen als array('d')), keine Listen
+von CompanyFinancials-Objekten.
+"""
+
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional
+from array import array
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from .data_loader import CompanyFinancials, FinancialsTable
+from .engine import matrix_from_buffer
+from .scorer import Scorer, ScoreResult, METRIC_FIELDS
+from .sector_ranker import rank_sector_results
+from .text_generator import TextGenerator
+from .api import build_scoring_output
+
+
+class SectorPayload(NamedTuple):
+    """Spaltenorientierte Rohdaten eines Sektors für einen Worker-Prozess."""
+    sector: str
+    symbols: List[str]
+    metrics: array          # Zeilenweise, len(symbols) × len(METRIC_FIELDS)
+    requested: List[str]    # Symbole, für die ein Output erzeugt wird
+
+
+def build_sector_payload(
+    scorer: Scorer,
+    sector: str,
+    companies: List[CompanyFinancials],
+    requested: List[str]
+) -> SectorPayload:
+    """
+    Packt die Unternehmen eines Sektors in ein kompaktes Payload.
+
+    Args:
+        scorer: Scorer für die Extraktion der Kennzahlen
+        sector: Name des Sektors
+        companies: Alle Unternehmen des Sektors
+        requested: Symbole, für die ein Output benötigt wird
+
+    Returns:
+        SectorPayload
+    """
+    metrics = array("d")
+    for row in scorer.extract_metric_matrix(companies):
+        metrics.extend(row)
+    return SectorPayload(sector, [c.symbol for c in companies], metrics, requested)
+
+
+def build_table_payload(
+    table: FinancialsTable,
+    sector: str,
+    requested: Optional[List[str]] = None
+) -> SectorPayload:
+    """
+    Packt einen Sektor direkt aus einer FinancialsTable in ein Payload.
+
+    Args:
+        table: Spaltenorientierte Kennzahlen
+        sector: Name des Sektors
+        requested: Symbole, für die ein Output benötigt wird (None = alle)
+
+    Returns:
+        SectorPayload
+    """
+    rows = table.sector_rows(sector)
+    symbols = [table.symbols[row] for row in rows]
+    metrics = table.metric_buffer(rows)
+    if not isinstance(metrics, array):
+        # Sicht auf gemappte Seiten (MmapTable): ein Block kopieren, um ihn zu übertragen
+        copy = array("d")
+        copy.frombytes(metrics.cast("B"))
+        metrics = copy
+    return SectorPayload(sector, symbols, metrics, requested or symbols)
+
+
+# Komponenten der Worker-Prozesse (über den Initializer gesetzt)
+_worker_scorer: Optional[Scorer] = None
+_worker_text_gen: Optional[TextGenerator] = None
+
+
+def _init_worker(scorer: Scorer, text_generator: TextGenerator):
+    """Initialisiert die Komponenten eines Worker-Prozesses."""
+    global _worker_scorer, _worker_text_gen
+    _worker_scorer = scorer
+    _worker_text_gen = text_generator
+
+
+def score_payload_results(
+    payload: SectorPayload,
+    scorer: Optional[Scorer] = None
+) -> Dict[str, ScoreResult]:
+    """
+    Berechnet die ScoreResults aller Unternehmen eines Payloads.
+
+    Args:
+        payload: Rohdaten des Sektors
+        scorer: Optional, sonst der Worker-Scorer
+
+    Returns:
+        Dict mit Symbol -> ScoreResult
+    """
+    scorer = scorer or _worker_scorer or Scorer()
+    matrix = matrix_from_buffer(payload.metrics, len(METRIC_FIELDS), scorer.use_numpy)
+    index = scorer.build_index_from_matrix(payload.sector, payload.symbols, matrix)
+    return scorer.score_index(index)
+
+
+def score_sector_payload(
+    payload: SectorPayload,
+    scorer: Optional[Scorer] = None,
+    text_generator: Optional[TextGenerator] = None
+) -> List[Dict[str, Any]]:
+    """
+    Berechnet die Outputs eines Sektors (läuft im Worker-Prozess).
+
+    Args:
+        payload: Rohdaten des Sektors
+        scorer: Optional, sonst der Worker-Scorer
+        text_generator: Optional, sonst der Worker-TextGenerator
+
+    Returns:
+        Output-Dicts der angeforderten Symbole
+    """
+    text_generator = text_generator or _worker_text_gen or TextGenerator()
+
+    results = score_payload_results(payload, scorer)
+    rankings = rank_sector_results(results)
+
+    return [
+        build_scoring_output(results[symbol], rankings[symbol], text_generator)
+        for symbol in payload.requested
+        if symbol in results
+    ]
+
+
+def score_sectors_parallel(
+    payloads: Iterable[SectorPayload],
+    workers: int,
+    scorer: Optional[Scorer] = None,
+    text_generator: Optional[TextGenerator] = None,
+    task: Callable[[SectorPayload], Any] = score_sector_payload
+) -> Iterator[Any]:
+    """
+    Berechnet mehrere Sektoren parallel in einem Prozess-Pool.
+
+    Payloads werden erst bei Bedarf erzeugt und es sind höchstens
+    2 × workers Sektoren gleichzeitig in Bearbeitung, damit der
+    Speicherbedarf auch bei sehr großen Universen begrenzt bleibt.
+
+    Args:
+        payloads: Ein Payload pro Sektor (auch als Generator)
+        workers: Anzahl der Worker-Prozesse
+        scorer: Scorer für die Worker (wird einmal je Prozess übertragen)
+        text_generator: TextGenerator für die Worker
+        task: Funktion je Payload (Modulebene, damit sie übertragbar ist);
+              Standard: Output-Dicts per score_sector_payload()
+
+    Yields:
+        Ergebnis von task je Sektor, in der Reihenfolge von payloads
+    """
+    max_pending = 2 * workers
+    pending: Deque[Future] = deque()
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(scorer or Scorer(), text_generator or TextGenerator())
+    ) as pool:
+        for payload in payloads:
+            pending.append(pool.submit(task, payload))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
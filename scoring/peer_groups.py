@@ -0,0 +1,133 @@
+"""
+Peer Groups Modul
+
+Definitionen von Vergleichsgruppen für das Perzentil-Ranking.
+
+Standard ist der Sektor. Daneben lassen sich Unterbranchen, Regionen,
+Größenklassen nach Marktkapitalisierung oder frei definierte Listen als
+Vergleichsgruppe verwenden. Ein Unternehmen kann dabei mehreren Gruppen
+angehören. Berechnet werden die Gruppen vom GroupRanker
+(siehe sector_ranker.py), der Index und Scores je Gruppe cacht.
+"""
+
+from typing import Dict, Iterable, List, Mapping, Sequence, Tuple, Union
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+
+from .config import MARKET_CAP_BANDS
+
+
+class PeerGroupDefinition(ABC):
+    """
+    Abstrakte Basisklasse für Vergleichsgruppen-Definitionen.
+
+    Die Zuordnung arbeitet nur mit Symbol und Sektor, damit sie direkt
+    auf den Spalten einer FinancialsTable laufen kann. Weitere Merkmale
+    (Region, Marktkapitalisierung, ...) werden der Definition übergeben.
+    """
+
+    name: str = "peer_group"
+
+    @abstractmethod
+    def groups_of(self, symbol: str, sector: str) -> List[str]:
+        """
+        Gruppen, denen ein Unternehmen angehört.
+
+        Args:
+            symbol: Aktiensymbol
+            sector: Sektor des Unternehmens
+
+        Returns:
+            Liste von Gruppennamen (leer = keiner Gruppe zugeordnet)
+        """
+        pass
+
+
+class SectorGroups(PeerGroupDefinition):
+    """Ein Unternehmen gehört genau zur Gruppe seines Sektors."""
+
+    name = "sector"
+
+    def groups_of(self, symbol: str, sector: str) -> List[str]:
+        return [sector]
+
+
+class AttributeGroups(PeerGroupDefinition):
+    """
+    Gruppen nach einem externen Merkmal, z.B. Unterbranche oder Region.
+
+    Verwendung:
+        regions = AttributeGroups("region", {"AAPL": "USA", "SAP": "Europa"})
+    """
+
+    def __init__(self, name: str, attributes: Mapping[str, Union[str, Sequence[str]]]):
+        """
+        Args:
+            name: Name der Definition
+            attributes: Symbol -> Gruppe oder Liste von Gruppen
+        """
+        self.name = name
+        self._attributes: Dict[str, List[str]] = {
+            symbol.upper(): [value] if isinstance(value, str) else list(value)
+            for symbol, value in attributes.items()
+        }
+
+    def groups_of(self, symbol: str, sector: str) -> List[str]:
+        return self._attributes.get(symbol.upper(), [])
+
+
+class BandGroups(PeerGroupDefinition):
+    """
+    Größenklassen nach einem numerischen Merkmal (z.B. Marktkapitalisierung).
+
+    Verwendung:
+        caps = BandGroups("market_cap", {"AAPL": 3.0e12, "ETSY": 7.5e9})
+    """
+
+    def __init__(
+        self,
+        name: str,
+        values: Mapping[str, float],
+        bands: Sequence[Tuple[str, float]] = MARKET_CAP_BANDS
+    ):
+        """
+        Args:
+            name: Name der Definition
+            values: Symbol -> Merkmalswert
+            bands: (Bezeichnung, Untergrenze), aufsteigend nach Untergrenze
+        """
+        self.name = name
+        self._values = {symbol.upper(): value for symbol, value in values.items()}
+        self._labels = [label for label, _ in bands]
+        self._lower_bounds = [lower for _, lower in bands]
+
+    def groups_of(self, symbol: str, sector: str) -> List[str]:
+        value = self._values.get(symbol.upper())
+        if value is None:
+            return []
+        pos = bisect_right(self._lower_bounds, value) - 1
+        return [self._labels[pos]] if pos >= 0 else []
+
+
+class CustomGroups(PeerGroupDefinition):
+    """
+    Frei definierte Vergleichsgruppen aus Symbol-Listen (dürfen sich überschneiden).
+
+    Verwendung:
+        custom = CustomGroups("themes", {"Halbleiter": ["NVDA", "AMD", "INTC"]})
+    """
+
+    def __init__(self, name: str, groups: Mapping[str, Iterable[str]]):
+        """
+        Args:
+            name: Name der Definition
+            groups: Gruppenname -> Symbole
+        """
+        self.name = name
+        self._membership: Dict[str, List[str]] = {}
+        for group, symbols in groups.items():
+            for symbol in symbols:
+                self._membership.setdefault(symbol.upper(), []).append(group)
+
+    def groups_of(self, symbol: str, sector: str) -> List[str]:
+        return self._membership.get(symbol.upper(), [])
@@ -0,0 +1,423 @@
+"""
+Szenario Modul
+
+Bewertet alternative Gewichtungen der Teil-Scores, ohne die
+Perzentil-Berechnung zu wiederholen, und prüft per Monte-Carlo-Analyse,
+wie robust Ampel und Sektor-Rang gegenüber Gewichtungsänderungen sind.
+
+Die vier Teil-Scores hängen nicht von SCORE_WEIGHTS ab und werden vom
+SectorRanker pro Sektor gecacht. Jedes Gewichtungs-Szenario ist danach
+nur noch eine gewichtete Summe, die für alle Szenarien gemeinsam als
+Matrix-Operation ausgewertet wird.
+"""
+
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+from dataclasses import dataclass
+from bisect import bisect_left
+import random
+
+from .config import SCORE_WEIGHTS, SENSITIVITY_CONFIG, TRAFFIC_LIGHT_THRESHOLDS
+from .engine import np, _use_numpy, round_like_python
+from .scorer import SCORE_DIMENSIONS
+from .sector_ranker import GroupRanker, get_sector_ranker
+from .text_generator import get_traffic_light
+
+
+WeightSet = Union[Mapping[str, float], Sequence[float]]
+
+# Ampelfarben nach aufsteigendem Code (siehe _light_codes)
+TRAFFIC_LIGHTS = ("red", "yellow", "green")
+
+
+@dataclass
+class SweepResult:
+    """
+    Ergebnis eines Gewichtungs-Sweeps.
+
+    Zeilen = Gewichtungs-Szenarien, Spalten = Unternehmen (wie in symbols).
+    Bei NumPy-Engine sind totals, sector_percentiles und traffic_lights
+    NumPy-Arrays, sonst Listen von Listen.
+    """
+    weight_sets: List[Dict[str, float]]
+    symbols: List[str]
+    sectors: List[str]
+    totals: Any
+    sector_percentiles: Any
+    traffic_lights: Any
+
+    def scenario(self, i: int) -> Dict[str, Dict[str, Any]]:
+        """
+        Ergebnisse eines einzelnen Szenarios pro Symbol.
+
+        Args:
+            i: Index des Gewichtungs-Szenarios
+
+        Returns:
+            Dict mit Symbol -> {"total_score", "sector_percentile", "traffic_light"}
+        """
+        totals = self.totals[i]
+        percentiles = self.sector_percentiles[i]
+        lights = self.traffic_lights[i]
+        return {
+            symbol: {
+                "total_score": float(totals[j]),
+                "sector_percentile": float(percentiles[j]),
+                "traffic_light": str(lights[j]),
+            }
+            for j, symbol in enumerate(self.symbols)
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class RatingSensitivity:
+    """
+    Robustheit eines Ratings gegenüber zufälligen Gewichtungsänderungen.
+
+    Die Raten geben an, in welchem Anteil der Stichproben Ampelfarbe bzw.
+    Sektor-Rang vom Ergebnis mit SCORE_WEIGHTS abweichen.
+    """
+    symbol: str
+    sector: str
+    traffic_light: str
+    rank: int
+    traffic_light_flip_rate: float
+    rank_flip_rate: float
+    best_rank: int
+    worst_rank: int
+
+    def is_fragile(self, threshold: float = SENSITIVITY_CONFIG["fragile_flip_rate"]) -> bool:
+        """Prüft, ob Ampel oder Rang zu häufig wechseln."""
+        return self.traffic_light_flip_rate >= threshold or self.rank_flip_rate >= threshold
+
+
+def normalize_weight_set(weights: WeightSet) -> Dict[str, float]:
+    """
+    Bringt eine Gewichtung in die Form von SCORE_WEIGHTS.
+
+    Args:
+        weights: Dict mit allen vier Dimensionen oder Sequenz in der
+                 Reihenfolge Qualität, Wachstum, Stabilität, Bewertung
+
+    Returns:
+        Dict mit Dimension -> Gewicht
+
+    Raises:
+        ValueError: Bei fehlenden oder unbekannten Dimensionen
+    """
+    if isinstance(weights, Mapping):
+        if set(weights) != set(SCORE_DIMENSIONS):
+            raise ValueError(f"Gewichtung benötigt genau die Dimensionen {SCORE_DIMENSIONS}")
+        return {dim: float(weights[dim]) for dim in SCORE_DIMENSIONS}
+    if len(weights) != len(SCORE_DIMENSIONS):
+        raise ValueError(f"Gewichtung benötigt {len(SCORE_DIMENSIONS)} Werte")
+    return {dim: float(w) for dim, w in zip(SCORE_DIMENSIONS, weights)}
+
+
+def sample_weight_sets(
+    samples: int,
+    spread: float = SENSITIVITY_CONFIG["spread"],
+    seed: Optional[int] = None,
+    base: Mapping[str, float] = SCORE_WEIGHTS
+) -> List[Dict[str, float]]:
+    """
+    Erzeugt zufällig gestörte Varianten einer Gewichtung.
+
+    Jedes Gewicht wird mit einem Faktor aus [1 - spread, 1 + spread]
+    multipliziert; anschließend wird auf die ursprüngliche Summe normiert.
+
+    Args:
+        samples: Anzahl der Gewichtungen
+        spread: Relative Störung je Gewicht
+        seed: Optional, Startwert für reproduzierbare Stichproben
+        base: Ausgangsgewichtung
+
+    Returns:
+        Liste von Gewichtungen im Format von SCORE_WEIGHTS
+    """
+    rng = random.Random(seed)
+    base_weights = [base[dim] for dim in SCORE_DIMENSIONS]
+    base_sum = sum(base_weights)
+    weight_sets = []
+    for _ in range(samples):
+        perturbed = [w * (1 + rng.uniform(-spread, spread)) for w in base_weights]
+        scale = base_sum / sum(perturbed)
+        weight_sets.append({dim: w * scale for dim, w in zip(SCORE_DIMENSIONS, perturbed)})
+    return weight_sets
+
+
+def _light_codes(totals: Any) -> Any:
+    """Ampel-Codes (Index in TRAFFIC_LIGHTS) für eine Score-Matrix."""
+    thresholds = [TRAFFIC_LIGHT_THRESHOLDS["yellow"], TRAFFIC_LIGHT_THRESHOLDS["green"]]
+    return np.searchsorted(thresholds, totals, side="right")
+
+
+def _sector_ranks(totals: Any) -> Any:
+    """
+    Sektor-Ränge je Zeile (1 = bester Score).
+
+    Stabile Sortierung wie rank_sector_results(): Bei gleichem Score
+    entscheidet die Reihenfolge im Sektor-Index. Die auf eine
+    Nachkommastelle gerundeten Scores passen als Zehntel in int16,
+    wofür NumPy eine Radix-Sortierung verwendet.
+    """
+    keys = -np.rint(totals * 10)
+    if keys.size and np.abs(keys).max() <= np.iinfo(np.int16).max:
+        keys = keys.astype(np.int16)
+    order = np.argsort(keys, axis=1, kind="stable")
+    ranks = np.empty_like(order)
+    positions = np.broadcast_to(np.arange(1, totals.shape[1] + 1), order.shape)
+    np.put_along_axis(ranks, order, positions, axis=1)
+    return ranks
+
+
+class WeightSweep:
+    """
+    Wertet viele Gewichtungs-Szenarien gegen gecachte Teil-Scores aus.
+
+    Verwendung:
+        sweep = WeightSweep()
+        result = sweep.evaluate([
+            {"quality": 0.4, "growth": 0.2, "stability": 0.2, "valuation": 0.2},
+            [0.25, 0.25, 0.25, 0.25],
+        ])
+        result.scenario(0)["AAPL"]["traffic_light"]
+    """
+
+    def __init__(self, sector_ranker: Optional[GroupRanker] = None, use_numpy: Optional[bool] = None):
+        """
+        Initialisiert den Sweep.
+
+        Args:
+            sector_ranker: Optional, SectorRanker (oder GroupRanker für
+                andere Vergleichsgruppen) mit Index-Cache
+            use_numpy: None = NumPy falls installiert, True/False erzwingt die Engine
+        """
+        self._ranker = sector_ranker or get_sector_ranker()
+        self._numpy = _use_numpy(use_numpy)
+
+    def get_sub_scores(self, sector: str) -> Tuple[List[str], Any]:
+        """
+        Teil-Scores eines Sektors (bzw. einer Gruppe) aus dem Cache des Rankers.
+
+        Returns:
+            (Symbole, Teil-Scores 4 × n in SCORE_DIMENSIONS-Reihenfolge)
+        """
+        symbols, sub_scores = self._ranker.get_group_sub_scores(sector)
+        if self._numpy and symbols:
+            sub_scores = np.array(sub_scores, dtype=np.float64)
+        return symbols, sub_scores
+
+    def evaluate(
+        self,
+        weight_sets: Sequence[WeightSet],
+        sectors: Optional[Sequence[str]] = None
+    ) -> SweepResult:
+        """
+        Berechnet Gesamt-Scores, Ampeln und Sektor-Perzentile für alle Szenarien.
+
+        Gesamt-Scores werden wie in Scorer.calculate_total_score() gebildet
+        und auf eine Nachkommastelle gerundet; mit SCORE_WEIGHTS ergeben sich
+        exakt die regulären Scores.
+
+        Args:
+            weight_sets: Gewichtungen (Dicts oder 4er-Sequenzen)
+            sectors: Optional, Sektoren; None = alle verfügbaren
+
+        Returns:
+            SweepResult
+        """
+        weights = [normalize_weight_set(w) for w in weight_sets]
+        if sectors is None:
+            sectors = sorted(self._ranker.get_groups())
+
+        symbols: List[str] = []
+        symbol_sectors: List[str] = []
+        totals_parts, percentile_parts, light_parts = [], [], []
+
+        for sector in sectors:
+            sector_symbols, sub_scores = self.get_sub_scores(sector)
+            if not sector_symbols:
+                continue
+            if self._numpy:
+                totals, percentiles, lights = self._evaluate_numpy(weights, sub_scores)
+            else:
+                totals, percentiles, lights = self._evaluate_python(weights, sub_scores)
+            symbols.extend(sector_symbols)
+            symbol_sectors.extend([sector] * len(sector_symbols))
+            totals_parts.append(totals)
+            percentile_parts.append(percentiles)
+            light_parts.append(lights)
+
+        if self._numpy:
+            k = len(weights)
+            totals = np.hstack(totals_parts) if totals_parts else np.empty((k, 0))
+            percentiles = np.hstack(percentile_parts) if percentile_parts else np.empty((k, 0))
+            lights = np.hstack(light_parts) if light_parts else np.empty((k, 0), dtype="<U6")
+        else:
+            totals = [sum((part[i] for part in totals_parts), []) for i in range(len(weights))]
+            percentiles = [sum((part[i] for part in percentile_parts), []) for i in range(len(weights))]
+            lights = [sum((part[i] for part in light_parts), []) for i in range(len(weights))]
+
+        return SweepResult(weights, symbols, symbol_sectors, totals, percentiles, lights)
+
+    @staticmethod
+    def _totals_numpy(weights: List[Dict[str, float]], sub_scores: Any) -> Any:
+        """Gerundete Gesamt-Scores aller Szenarien eines Sektors (k × n)."""
+        w = np.array([[ws[dim] for dim in SCORE_DIMENSIONS] for ws in weights])
+        q, g, s, v = sub_scores
+        # Summationsreihenfolge wie calculate_total_score()
+        raw = w[:, 0:1] * q + w[:, 1:2] * g + w[:, 2:3] * s + w[:, 3:4] * v
+        return round_like_python(raw, 1)
+
+    @staticmethod
+    def _totals_python(weights: Dict[str, float], sub_scores: Any) -> List[float]:
+        """Gerundete Gesamt-Scores eines Szenarios für einen Sektor."""
+        wq, wg, ws, wv = (weights[dim] for dim in SCORE_DIMENSIONS)
+        quality, growth, stability, valuation = sub_scores
+        return [
+            round(wq * q + wg * g + ws * s + wv * v, 1)
+            for q, g, s, v in zip(quality, growth, stability, valuation)
+        ]
+
+    def _evaluate_numpy(self, weights: List[Dict[str, float]], sub_scores: Any) -> Tuple[Any, Any, Any]:
+        """Alle Szenarien eines Sektors als Matrix-Operation (k × n)."""
+        totals = self._totals_numpy(weights, sub_scores)
+
+        n = totals.shape[1]
+        if n < 2:
+            percentiles = np.full(totals.shape, 50.0)
+        else:
+            sorted_totals = np.sort(totals, axis=1)
+            counts = np.empty(totals.shape)
+            for i in range(totals.shape[0]):
+                counts[i] = np.searchsorted(sorted_totals[i], totals[i], side="left")
+            percentiles = np.round((counts / n) * 100)
+
+        lights = np.where(
+            totals >= TRAFFIC_LIGHT_THRESHOLDS["green"], "green",
+            np.where(totals >= TRAFFIC_LIGHT_THRESHOLDS["yellow"], "yellow", "red")
+        )
+        return totals, percentiles, lights
+
+    def _evaluate_python(
+        self, weights: List[Dict[str, float]], sub_scores: Any
+    ) -> Tuple[List[List[float]], List[List[float]], List[List[str]]]:
+        """Reine Python-Variante von _evaluate_numpy()."""
+        n = len(sub_scores[0])
+        all_totals, all_percentiles, all_lights = [], [], []
+        for ws in weights:
+            totals = self._totals_python(ws, sub_scores)
+            sorted_totals = sorted(totals)
+            if n < 2:
+                percentiles = [50.0] * n
+            else:
+                percentiles = [
+                    round((bisect_left(sorted_totals, t) / n) * 100, 0) for t in totals
+                ]
+            all_totals.append(totals)
+            all_percentiles.append(percentiles)
+            all_lights.append([get_traffic_light(t) for t in totals])
+        return all_totals, all_percentiles, all_lights
+
+    def sensitivity(
+        self,
+        samples: int = SENSITIVITY_CONFIG["samples"],
+        spread: float = SENSITIVITY_CONFIG["spread"],
+        seed: Optional[int] = None,
+        sectors: Optional[Sequence[str]] = None
+    ) -> Dict[str, RatingSensitivity]:
+        """
+        Monte-Carlo-Analyse der Gewichtungs-Sensitivität.
+
+        Die Teil-Scores werden einmal pro Sektor berechnet, die Stichproben
+        blockweise (SENSITIVITY_CONFIG["chunk_size"]) als Matrix ausgewertet.
+
+        Args:
+            samples: Anzahl zufälliger Gewichtungen
+            spread: Relative Störung je Gewicht
+            seed: Optional, Startwert für reproduzierbare Ergebnisse
+            sectors: Optional, Sektoren; None = alle verfügbaren
+
+        Returns:
+            Dict mit Symbol -> RatingSensitivity
+        """
+        if samples < 1:
+            raise ValueError("Mindestens eine Stichprobe erforderlich")
+        weight_sets = sample_weight_sets(samples, spread, seed)
+        base = normalize_weight_set(SCORE_WEIGHTS)
+        if sectors is None:
+            sectors = sorted(self._ranker.get_groups())
+
+        report: Dict[str, RatingSensitivity] = {}
+        for sector in sectors:
+            symbols, sub_scores = self.get_sub_scores(sector)
+            if not symbols:
+                continue
+            if self._numpy:
+                stats = self._sensitivity_numpy(base, weight_sets, sub_scores)
+            else:
+                stats = self._sensitivity_python(base, weight_sets, sub_scores)
+            for symbol, light, rank, light_flips, rank_flips, best, worst in zip(symbols, *stats):
+                report[symbol] = RatingSensitivity(
+                    symbol=symbol,
+                    sector=sector,
+                    traffic_light=light,
+                    rank=rank,
+                    traffic_light_flip_rate=light_flips / samples,
+                    rank_flip_rate=rank_flips / samples,
+                    best_rank=best,
+                    worst_rank=worst
+                )
+        return report
+
+    def _sensitivity_numpy(
+        self, base: Dict[str, float], weight_sets: List[Dict[str, float]], sub_scores: Any
+    ) -> Tuple[List[Any], ...]:
+        """Zählt Ampel- und Rangwechsel eines Sektors blockweise (NumPy)."""
+        base_totals = self._totals_numpy([base], sub_scores)
+        base_lights = _light_codes(base_totals)[0]
+        base_ranks = _sector_ranks(base_totals)[0]
+        light_flips = np.zeros(base_ranks.shape, dtype=np.int64)
+        rank_flips = np.zeros(base_ranks.shape, dtype=np.int64)
+        best, worst = base_ranks.copy(), base_ranks.copy()
+
+        chunk_size = SENSITIVITY_CONFIG["chunk_size"]
+        for start in range(0, len(weight_sets), chunk_size):
+            totals = self._totals_numpy(weight_sets[start:start + chunk_size], sub_scores)
+            light_flips += (_light_codes(totals) != base_lights).sum(axis=0)
+            ranks = _sector_ranks(totals)
+            rank_flips += (ranks != base_ranks).sum(axis=0)
+            best = np.minimum(best, ranks.min(axis=0))
+            worst = np.maximum(worst, ranks.max(axis=0))
+
+        return (
+            [TRAFFIC_LIGHTS[code] for code in base_lights], base_ranks.tolist(),
+            light_flips.tolist(), rank_flips.tolist(), best.tolist(), worst.tolist()
+        )
+
+    def _sensitivity_python(
+        self, base: Dict[str, float], weight_sets: List[Dict[str, float]], sub_scores: Any
+    ) -> Tuple[List[Any], ...]:
+        """Reine Python-Variante von _sensitivity_numpy()."""
+        def lights_and_ranks(weights: Dict[str, float]) -> Tuple[List[str], List[int]]:
+            totals = self._totals_python(weights, sub_scores)
+            ranks = [0] * len(totals)
+            order = sorted(range(len(totals)), key=totals.__getitem__, reverse=True)
+            for rank, j in enumerate(order, start=1):
+                ranks[j] = rank
+            return [get_traffic_light(t) for t in totals], ranks
+
+        base_lights, base_ranks = lights_and_ranks(base)
+        n = len(base_ranks)
+        light_flips, rank_flips = [0] * n, [0] * n
+        best, worst = list(base_ranks), list(base_ranks)
+
+        for weights in weight_sets:
+            lights, ranks = lights_and_ranks(weights)
+            for j in range(n):
+                light_flips[j] += lights[j] != base_lights[j]
+                rank_flips[j] += ranks[j] != base_ranks[j]
+                best[j] = min(best[j], ranks[j])
+                worst[j] = max(worst[j], ranks[j])
+
+        return base_lights, base_ranks, light_flips, rank_flips, best, worst
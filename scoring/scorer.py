@@ -8,15 +8,37 @@ WICHTIG: Die Berechnung erfolgt relativ zum Sektor (Perzentil-basiert).
 Einzelne Finanzkennzahlen werden NIEMALS ausgegeben.
 """
 
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 from dataclasses import dataclass
-import statistics
+from bisect import bisect_left
 
-from .data_loader import CompanyFinancials
-from .config import SCORE_WEIGHTS, WINSORIZE_PERCENTILES
+from .data_loader import CompanyFinancials, FinancialsTable, METRIC_FIELDS
+from .config import SCORE_WEIGHTS, SCORE_METRICS, SKETCH_CONFIG, WINSORIZE_PERCENTILES
+from .engine import percentile_ranks, group_means, matrix_from_buffer
+from .metric_index import SectorMetricIndex
+from .sketch import KLLSketch, MetricSketches
 
 
-@dataclass
+# Spaltenlayout der Kennzahlen-Matrix eines Sektors
+SCORE_DIMENSIONS = list(SCORE_METRICS)
+METRIC_INVERSE_FLAGS = [inverse for dim in SCORE_DIMENSIONS for _, inverse in SCORE_METRICS[dim]]
+
+
+def _metric_groups() -> List[Tuple[int, int]]:
+    """Spaltenbereiche (start, stop) je Teil-Score."""
+    groups = []
+    start = 0
+    for dim in SCORE_DIMENSIONS:
+        stop = start + len(SCORE_METRICS[dim])
+        groups.append((start, stop))
+        start = stop
+    return groups
+
+
+METRIC_GROUPS = _metric_groups()
+
+
+@dataclass(frozen=True, slots=True)
 class ScoreResult:
     """
     Internes Score-Ergebnis mit numerischen Werten.
@@ -99,6 +121,30 @@ def calculate_percentile_score(value: float, all_values: List[float], inverse: b
     return percentile
 
 
+def calculate_percentile_scores(all_values: Sequence[float], inverse: bool = False) -> List[float]:
+    """
+    Berechnet die Perzentil-Scores aller Werte einer Gruppe in einem Durchlauf.
+    
+    Liefert dieselben Ergebnisse wie calculate_percentile_score() für jeden
+    einzelnen Wert, winsorisiert und sortiert die Gruppe aber nur einmal.
+    
+    Args:
+        all_values: Alle Werte der Vergleichsgruppe
+        inverse: Wenn True, ist ein niedrigerer Wert besser (z.B. KGV)
+    
+    Returns:
+        Perzentil-Scores (0-100) in der Reihenfolge von all_values
+    """
+    return percentile_ranks(list(all_values), inverse=inverse)
+
+
+def _mean_score(scores: List[float]) -> float:
+    """Mittelwert der Metrik-Scores einer Dimension (50 ohne Metriken)."""
+    # Nur für die Einzel-Scores benötigt; der Paketimport lädt statistics nicht
+    import statistics
+    return statistics.mean(scores) if scores else 50.0
+
+
 class Scorer:
     """
     Berechnet Scores für Unternehmen basierend auf Finanzkennzahlen.
@@ -107,8 +153,21 @@ class Scorer:
     Die internen Kennzahlen werden NIEMALS nach außen gegeben.
     """
     
-    def __init__(self):
+    def __init__(self, use_numpy: Optional[bool] = None):
+        """
+        Initialisiert den Scorer.
+        
+        Args:
+            use_numpy: None = NumPy-Engine falls installiert,
+                       True/False erzwingt die jeweilige Engine
+        """
         self._weights = SCORE_WEIGHTS
+        self._use_numpy = use_numpy
+    
+    @property
+    def use_numpy(self) -> Optional[bool]:
+        """Gewählte Engine (None = NumPy, falls installiert)."""
+        return self._use_numpy
     
     def _extract_quality_metrics(self, company: CompanyFinancials) -> List[float]:
         """Extrahiert Qualitätsmetriken für die Score-Berechnung."""
@@ -152,6 +211,15 @@ class Scorer:
             company.fcf_multiple
         ]
     
+    def _extract_metric_row(self, company: CompanyFinancials) -> List[float]:
+        """Extrahiert alle Metriken in der Spaltenreihenfolge der Kennzahlen-Matrix."""
+        return (
+            self._extract_quality_metrics(company)
+            + self._extract_growth_metrics(company)
+            + self._extract_stability_metrics(company)[0]
+            + self._extract_valuation_metrics(company)
+        )
+    
     def calculate_quality_score(
         self, 
         company: CompanyFinancials, 
@@ -170,7 +238,7 @@ class Scorer:
             score = calculate_percentile_score(metric, sector_values, inverse=False)
             scores.append(score)
         
-        return statistics.mean(scores) if scores else 50.0
+        return _mean_score(scores)
     
     def calculate_growth_score(
         self, 
@@ -190,7 +258,7 @@ class Scorer:
             score = calculate_percentile_score(metric, sector_values, inverse=False)
             scores.append(score)
         
-        return statistics.mean(scores) if scores else 50.0
+        return _mean_score(scores)
     
     def calculate_stability_score(
         self, 
@@ -211,7 +279,7 @@ class Scorer:
             score = calculate_percentile_score(metric, sector_values, inverse=inverse)
             scores.append(score)
         
-        return statistics.mean(scores) if scores else 50.0
+        return _mean_score(scores)
     
     def calculate_valuation_score(
         self, 
@@ -233,7 +301,7 @@ class Scorer:
             score = calculate_percentile_score(metric, sector_values, inverse=True)
             scores.append(score)
         
-        return statistics.mean(scores) if scores else 50.0
+        return _mean_score(scores)
     
     def calculate_total_score(
         self,
@@ -278,45 +346,275 @@ class Scorer:
         
         return round(percentile, 0)
     
-    def score_company(
-        self, 
-        company: CompanyFinancials, 
-        sector_companies: List[CompanyFinancials]
+    def extract_metric_matrix(self, companies: List[CompanyFinancials]) -> List[List[float]]:
+        """Kennzahlen-Matrix (Zeilen = Unternehmen, Spalten = METRIC_FIELDS)."""
+        return [self._extract_metric_row(c) for c in companies]
+    
+    def build_sector_index(self, companies: List[CompanyFinancials]) -> SectorMetricIndex:
+        """
+        Baut den Kennzahlen-Index eines Sektors auf.
+        
+        Args:
+            companies: Alle Unternehmen des Sektors
+        
+        Returns:
+            SectorMetricIndex mit sortierten, winsorisierten Kennzahlen
+        """
+        return self.build_index_from_matrix(
+            companies[0].sector if companies else "",
+            [c.symbol for c in companies],
+            self.extract_metric_matrix(companies)
+        )
+    
+    def build_index_from_matrix(
+        self,
+        sector: str,
+        symbols: Sequence[str],
+        matrix: Any
+    ) -> SectorMetricIndex:
+        """
+        Baut den Kennzahlen-Index direkt aus spaltengetreuen Rohdaten auf.
+        
+        Args:
+            sector: Name des Sektors
+            symbols: Symbole in Zeilenreihenfolge
+            matrix: Kennzahlen-Matrix mit Spalten in METRIC_FIELDS-Reihenfolge
+        
+        Returns:
+            SectorMetricIndex
+        """
+        return SectorMetricIndex(
+            sector=sector,
+            symbols=symbols,
+            matrix=matrix,
+            inverse_flags=METRIC_INVERSE_FLAGS,
+            use_numpy=self._use_numpy
+        )
+    
+    def build_index_from_table(
+        self,
+        table: FinancialsTable,
+        sector: str
+    ) -> Optional[SectorMetricIndex]:
+        """
+        Baut den Kennzahlen-Index eines Sektors direkt aus einer FinancialsTable.
+        
+        Die Kennzahlen werden aus den Spalten der Tabelle gelesen, ohne
+        CompanyFinancials-Objekte zu erzeugen.
+        
+        Args:
+            table: Spaltenorientierte Kennzahlen
+            sector: Name des Sektors
+        
+        Returns:
+            SectorMetricIndex oder None wenn der Sektor leer ist
+        """
+        rows = table.sector_rows(sector)
+        if not rows:
+            return None
+        matrix = matrix_from_buffer(table.metric_buffer(rows), len(METRIC_FIELDS), self._use_numpy)
+        return self.build_index_from_matrix(sector, [table.symbols[row] for row in rows], matrix)
+    
+    def score_table(self, table: FinancialsTable, sector: str) -> Dict[str, ScoreResult]:
+        """
+        Berechnet alle Scores eines Sektors direkt aus einer FinancialsTable.
+        
+        Args:
+            table: Spaltenorientierte Kennzahlen
+            sector: Name des Sektors
+        
+        Returns:
+            Dict mit Symbol -> ScoreResult Mapping
+        """
+        index = self.build_index_from_table(table, sector)
+        return self.score_index(index) if index is not None else {}
+    
+    def update_sector_index(self, index: SectorMetricIndex, company: CompanyFinancials) -> List[int]:
+        """
+        Überträgt geänderte Kennzahlen eines Unternehmens in den Sektor-Index.
+        
+        Args:
+            index: Index des Sektors (muss company.symbol enthalten)
+            company: Unternehmen mit aktualisierten Kennzahlen
+        
+        Returns:
+            Spaltenindizes der geänderten Metriken
+        """
+        return index.update_row(company.symbol, self._extract_metric_row(company))
+    
+    def sub_scores(self, index: SectorMetricIndex) -> List[List[float]]:
+        """
+        Ungerundete Teil-Scores aller Unternehmen eines Sektor-Index.
+        
+        Returns:
+            [Qualität, Wachstum, Stabilität, Bewertung], je eine Liste
+            in Zeilenreihenfolge des Index
+        """
+        return group_means(index.ranks, METRIC_GROUPS)
+    
+    def score_index(self, index: SectorMetricIndex) -> Dict[str, ScoreResult]:
+        """
+        Berechnet alle Scores eines Sektors aus seinem Kennzahlen-Index.
+        
+        Args:
+            index: Vorberechneter Index des Sektors
+        
+        Returns:
+            Dict mit Symbol -> ScoreResult Mapping
+        """
+        if not len(index):
+            return {}
+        
+        quality, growth, stability, valuation = self.sub_scores(index)
+        
+        totals = [
+            self.calculate_total_score(q, g, s, v)
+            for q, g, s, v in zip(quality, growth, stability, valuation)
+        ]
+        
+        # Sektor-Perzentil: Anteil der Unternehmen mit niedrigerem Gesamt-Score
+        sorted_totals = sorted(totals)
+        n = len(totals)
+        
+        results = {}
+        for i, symbol in enumerate(index.symbols):
+            if n < 2:
+                sector_percentile = 50.0
+            else:
+                sector_percentile = round((bisect_left(sorted_totals, totals[i]) / n) * 100, 0)
+            
+            results[symbol] = ScoreResult(
+                symbol=symbol,
+                sector=index.sector,
+                quality_score=round(quality[i], 1),
+                growth_score=round(growth[i], 1),
+                stability_score=round(stability[i], 1),
+                valuation_score=round(valuation[i], 1),
+                total_score=totals[i],
+                sector_percentile=sector_percentile
+            )
+        
+        return results
+    
+    def score_sector(
+        self,
+        companies: List[CompanyFinancials],
+        index: Optional[SectorMetricIndex] = None
+    ) -> Dict[str, ScoreResult]:
+        """
+        Berechnet alle Scores für sämtliche Unternehmen eines Sektors.
+        
+        Jede Kennzahl wird pro Sektor nur einmal winsorisiert und sortiert;
+        Teil-Scores, Gesamt-Scores und Sektor-Perzentile entstehen in einem
+        einzigen Durchlauf statt einmal pro Vergleichsunternehmen.
+        
+        Args:
+            companies: Alle Unternehmen des Sektors
+            index: Optional, bereits aufgebauter Index für companies
+        
+        Returns:
+            Dict mit Symbol -> ScoreResult Mapping
+        """
+        if not companies:
+            return {}
+        return self.score_index(index or self.build_sector_index(companies))
+    
+    def build_metric_sketches(
+        self,
+        companies: Iterable[CompanyFinancials],
+        error: float = SKETCH_CONFIG["error"]
+    ) -> MetricSketches:
+        """
+        Streamt Unternehmen in Quantil-Sketches (ein Sketch pro Metrik).
+        
+        Args:
+            companies: Vergleichsgruppe, auch als Generator
+            error: Relativer Rangfehler je Metrik
+        
+        Returns:
+            MetricSketches; mit merge() um weitere Shards erweiterbar
+        """
+        sketches = MetricSketches(METRIC_INVERSE_FLAGS, error)
+        sketches.extend(self._extract_metric_row(company) for company in companies)
+        return sketches
+    
+    def score_against_sketch(
+        self,
+        company: CompanyFinancials,
+        sketches: MetricSketches,
+        totals_sketch: Optional[KLLSketch] = None
     ) -> ScoreResult:
         """
-        Berechnet alle Scores für ein Unternehmen.
+        Näherungsweise Bewertung gegen eine sehr große Vergleichsgruppe.
+        
+        Winsorizing-Grenzen und Ränge stammen aus den Sketches statt aus
+        den sortierten Originalwerten.
         
         Args:
             company: Das zu bewertende Unternehmen
-            sector_companies: Alle Unternehmen im gleichen Sektor (inkl. company)
+            sketches: Kennzahlen-Sketches der Vergleichsgruppe
+            totals_sketch: Optional, Sketch der Gesamt-Scores der Gruppe
+                           (sonst ist das Sektor-Perzentil 50)
         
         Returns:
-            ScoreResult mit allen berechneten Scores
+            ScoreResult des Unternehmens
+        """
+        ranks = [sketches.rank_row(self._extract_metric_row(company))]
+        (quality,), (growth,), (stability,), (valuation,) = group_means(ranks, METRIC_GROUPS)
+        total = self.calculate_total_score(quality, growth, stability, valuation)
+        
+        if totals_sketch is None or len(totals_sketch) < 2:
+            sector_percentile = 50.0
+        else:
+            sector_percentile = round((totals_sketch.rank(total) / len(totals_sketch)) * 100, 0)
+        
+        return ScoreResult(
+            symbol=company.symbol,
+            sector=company.sector,
+            quality_score=round(quality, 1),
+            growth_score=round(growth, 1),
+            stability_score=round(stability, 1),
+            valuation_score=round(valuation, 1),
+            total_score=total,
+            sector_percentile=sector_percentile
+        )
+    
+    def score_what_if(
+        self,
+        company: CompanyFinancials,
+        index: SectorMetricIndex,
+        sorted_sector_totals: Sequence[float],
+        previous_total: Optional[float] = None
+    ) -> ScoreResult:
         """
-        # Teil-Scores berechnen
-        quality = self.calculate_quality_score(company, sector_companies)
-        growth = self.calculate_growth_score(company, sector_companies)
-        stability = self.calculate_stability_score(company, sector_companies)
-        valuation = self.calculate_valuation_score(company, sector_companies)
+        Bewertet ein (hypothetisches) Unternehmen gegen einen bestehenden Sektor-Index.
+        
+        Die Vergleichsgruppe bleibt unverändert; jede Metrik wird per
+        Binärsuche gerankt.
         
-        # Gesamt-Score berechnen
+        Args:
+            company: Das zu bewertende Unternehmen
+            index: Index der Vergleichsgruppe
+            sorted_sector_totals: Aufsteigend sortierte Gesamt-Scores des Sektors
+            previous_total: Bisheriger Gesamt-Score, falls das Unternehmen
+                            bereits in sorted_sector_totals enthalten ist
+        
+        Returns:
+            ScoreResult des Unternehmens
+        """
+        ranks = [index.rank_row(self._extract_metric_row(company))]
+        (quality,), (growth,), (stability,), (valuation,) = group_means(ranks, METRIC_GROUPS)
         total = self.calculate_total_score(quality, growth, stability, valuation)
         
-        # Sektor-Perzentil berechnen
-        # Dafür müssen wir die Total-Scores aller Sektor-Unternehmen berechnen
-        all_sector_totals = []
-        for c in sector_companies:
-            if c.symbol == company.symbol:
-                all_sector_totals.append(total)
-            else:
-                c_quality = self.calculate_quality_score(c, sector_companies)
-                c_growth = self.calculate_growth_score(c, sector_companies)
-                c_stability = self.calculate_stability_score(c, sector_companies)
-                c_valuation = self.calculate_valuation_score(c, sector_companies)
-                c_total = self.calculate_total_score(c_quality, c_growth, c_stability, c_valuation)
-                all_sector_totals.append(c_total)
+        count_below = bisect_left(sorted_sector_totals, total)
+        n = len(sorted_sector_totals)
+        if previous_total is None:
+            n += 1
+        elif previous_total < total:
+            # Bisherigen Gesamt-Score des Unternehmens nicht mitzählen
+            count_below -= 1
         
-        sector_percentile = self.calculate_sector_percentile(total, all_sector_totals)
+        sector_percentile = 50.0 if n < 2 else round((count_below / n) * 100, 0)
         
         return ScoreResult(
             symbol=company.symbol,
@@ -328,6 +626,28 @@ class Scorer:
             total_score=total,
             sector_percentile=sector_percentile
         )
+    
+    def score_company(
+        self, 
+        company: CompanyFinancials, 
+        sector_companies: List[CompanyFinancials]
+    ) -> ScoreResult:
+        """
+        Berechnet alle Scores für ein Unternehmen.
+        
+        Für mehrere Unternehmen desselben Sektors ist score_sector()
+        deutlich effizienter.
+        
+        Args:
+            company: Das zu bewertende Unternehmen
+            sector_companies: Alle Unternehmen im gleichen Sektor (inkl. company)
+        
+        Returns:
+            ScoreResult mit allen berechneten Scores
+        """
+        peers = [c for c in sector_companies if c.symbol != company.symbol]
+        peers.append(company)
+        return self.score_sector(peers)[company.symbol]
 
 
 # Singleton-Instanz
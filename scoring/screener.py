@@ -0,0 +1,277 @@
+"""
+Screener Modul
+
+Top-k-Abfragen mit Filtern auf Ampel und qualitative Labels
+(z.B. "grün, Qualität mindestens hoch, beste 20").
+
+Pro Sektor und für das gesamte Universum werden die Unternehmen einmal je
+Dimension (Gesamt-Score und Teil-Scores) absteigend sortiert. Ein Filter
+auf ein Mindest-Label entspricht dann einem Präfix dieser Reihenfolge, der
+per Binärsuche gefunden wird. Aus dem kleinsten Kandidatenbereich werden
+die besten Treffer mit einem Heap ausgewählt, statt alle Ergebnisse zu
+sortieren.
+"""
+
+from typing import Dict, List, Optional, Set, Tuple
+from dataclasses import dataclass
+from bisect import bisect_right
+from itertools import islice
+from operator import ge
+import heapq
+
+from .config import QUALITY_LABELS, VALUATION_LABELS, TRAFFIC_LIGHT_THRESHOLDS
+from .scorer import ScoreResult, SCORE_DIMENSIONS
+from .sector_ranker import GroupRanker, get_sector_ranker
+from .text_generator import (
+    QUALITY_FALLBACK_LABEL, VALUATION_FALLBACK_LABEL, TextGenerator, get_text_generator, get_traffic_light
+)
+
+
+# Reihenfolge der Sortierungen: Gesamt-Score, dann Teil-Scores
+_ORDERINGS = ("total",) + tuple(SCORE_DIMENSIONS)
+
+
+def _label_levels(labels: Dict[Tuple[int, int], str], fallback: str) -> Dict[str, Tuple[int, Optional[int]]]:
+    """
+    Label -> (Stufe, Untergrenze); höhere Stufe = besseres Label.
+
+    Scores zwischen den Bereichen erhalten das Ersatz-Label. Erfüllt es die
+    Mindest-Stufe, kommt jeder Score in Frage: Untergrenze None.
+    """
+    levels = {label: level for level, (_, label) in enumerate(sorted(labels.items()))}
+    return {
+        label: (level, None if levels[fallback] >= level else low)
+        for level, ((low, _), label) in enumerate(sorted(labels.items()))
+    }
+
+
+_LABEL_LEVELS = {
+    dim: (
+        _label_levels(VALUATION_LABELS, VALUATION_FALLBACK_LABEL) if dim == "valuation"
+        else _label_levels(QUALITY_LABELS, QUALITY_FALLBACK_LABEL)
+    )
+    for dim in SCORE_DIMENSIONS
+}
+
+# Score-Bereiche [untere Grenze, obere Grenze) je Ampelfarbe
+_TRAFFIC_LIGHT_RANGES = {
+    "green": (TRAFFIC_LIGHT_THRESHOLDS["green"], None),
+    "yellow": (TRAFFIC_LIGHT_THRESHOLDS["yellow"], TRAFFIC_LIGHT_THRESHOLDS["green"]),
+    "red": (None, TRAFFIC_LIGHT_THRESHOLDS["yellow"]),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class _Entry:
+    """Vorberechnete Filter- und Sortierwerte eines Unternehmens."""
+    result: ScoreResult
+    values: Tuple[float, ...]    # in _ORDERINGS-Reihenfolge
+    levels: Tuple[int, ...]      # Label-Stufen in SCORE_DIMENSIONS-Reihenfolge
+    traffic_light: str
+
+
+def _sort_key(ordering: int):
+    # Höchster Score zuerst, bei Gleichstand nach Symbol (wie GlobalLeaderboard)
+    return lambda entry: (-entry.values[ordering], entry.result.symbol)
+
+
+_TOTAL_KEY = _sort_key(0)
+
+
+class _ScopeIndex:
+    """Absteigende Reihenfolgen eines Sektors (oder aller Sektoren) je Dimension."""
+
+    __slots__ = ("orders", "negated")
+
+    def __init__(self, orders: List[List[_Entry]]):
+        self.orders = orders
+        # Negierte Scores sind aufsteigend sortiert und damit per bisect durchsuchbar
+        self.negated = [[-entry.values[i] for entry in order] for i, order in enumerate(orders)]
+
+    def __len__(self) -> int:
+        return len(self.orders[0])
+
+    def score_range(self, ordering: int, low: Optional[float], high: Optional[float]) -> Tuple[int, int]:
+        """Positionen [start, end) mit low <= Score < high in einer Reihenfolge."""
+        negated = self.negated[ordering]
+        start = 0 if high is None else bisect_right(negated, -high)
+        end = len(negated) if low is None else bisect_right(negated, -low)
+        return start, end
+
+
+class Screener:
+    """
+    Filtert und rankt Unternehmen über vorsortierte Reihenfolgen.
+
+    Hängt sich als Beobachter an einen SectorRanker; neu berechnete oder
+    verworfene Sektoren werden bei der nächsten Abfrage neu einsortiert.
+
+    Verwendung:
+        screener = Screener(get_sector_ranker())
+        screener.screen(traffic_light="green", min_labels={"quality": "hoch"}, limit=20)
+    """
+
+    def __init__(
+        self,
+        sector_ranker: Optional[GroupRanker] = None,
+        text_generator: Optional[TextGenerator] = None
+    ):
+        """
+        Initialisiert den Screener (sortiert wird erst bei der ersten Abfrage).
+
+        Args:
+            sector_ranker: Optional, SectorRanker mit Score-Cache
+            text_generator: Optional, TextGenerator für die Labels
+        """
+        self._ranker = sector_ranker or get_sector_ranker()
+        self._text_gen = text_generator or get_text_generator()
+        self._entries: Dict[str, _Entry] = {}
+        self._sectors: Dict[str, _ScopeIndex] = {}
+        self._universe: Optional[_ScopeIndex] = None
+        self._dirty: Set[str] = set()
+        self._complete = False
+        self._ranker.add_listener(self._on_scores)
+
+    def _on_scores(self, sector: Optional[str], results: Optional[Dict[str, ScoreResult]]):
+        """Listener des Rankers (siehe GroupRanker.add_listener())."""
+        if sector is None:
+            self._entries.clear()
+            self._sectors.clear()
+            self._dirty.clear()
+            self._complete = False
+        else:
+            self._dirty.add(sector)
+        self._universe = None
+
+    def _entry(self, result: ScoreResult) -> _Entry:
+        labels = self._text_gen.generate_score_labels(result)
+        return _Entry(
+            result=result,
+            values=(
+                result.total_score,
+                result.quality_score,
+                result.growth_score,
+                result.stability_score,
+                result.valuation_score,
+            ),
+            levels=tuple(_LABEL_LEVELS[dim][labels[dim]][0] for dim in SCORE_DIMENSIONS),
+            traffic_light=get_traffic_light(result.total_score)
+        )
+
+    def _load_sector(self, sector: str):
+        """Übernimmt die aktuellen Scores eines Sektors und sortiert ihn neu."""
+        previous = self._sectors.pop(sector, None)
+        if previous is not None:
+            for old in previous.orders[0]:
+                symbol = old.result.symbol
+                # Inzwischen in einen anderen Sektor gewechselte Einträge behalten
+                if self._entries.get(symbol) is old:
+                    del self._entries[symbol]
+        results = self._ranker.get_group_scores(sector)
+        if not results:
+            return
+        new_entries = [self._entry(result) for result in results.values()]
+        for entry in new_entries:
+            self._entries[entry.result.symbol] = entry
+        self._sectors[sector] = _ScopeIndex(
+            [sorted(new_entries, key=_sort_key(i)) for i in range(len(_ORDERINGS))]
+        )
+
+    def refresh(self):
+        """Sortiert fehlende und geänderte Sektoren ein."""
+        if not self._complete:
+            self._dirty.update(s for s in self._ranker.get_groups() if s not in self._sectors)
+            self._complete = True
+        for sector in list(self._dirty):
+            self._load_sector(sector)
+        self._dirty.clear()
+        if self._universe is None:
+            orders = []
+            for i in range(len(_ORDERINGS)):
+                # Bereits sortierte Sektor-Läufe: sort() führt sie zusammen
+                merged = [entry for scope in self._sectors.values() for entry in scope.orders[i]]
+                merged.sort(key=_sort_key(i))
+                orders.append(merged)
+            self._universe = _ScopeIndex(orders)
+
+    def screen(
+        self,
+        sector: Optional[str] = None,
+        traffic_light: Optional[str] = None,
+        min_labels: Optional[Dict[str, str]] = None,
+        limit: int = 20
+    ) -> List[ScoreResult]:
+        """
+        Beste Unternehmen nach Gesamt-Score, die alle Filter erfüllen.
+
+        Args:
+            sector: Optional, nur dieser Sektor; None = alle Sektoren
+            traffic_light: Optional, "green", "yellow" oder "red"
+            min_labels: Optional, Mindest-Label je Dimension,
+                z.B. {"quality": "hoch", "valuation": "fair"}
+            limit: Maximale Anzahl Treffer
+
+        Returns:
+            ScoreResults nach Gesamt-Score absteigend (Gleichstand nach Symbol)
+
+        Raises:
+            ValueError: Bei unbekannter Ampelfarbe, Dimension oder Label
+        """
+        if traffic_light is not None and traffic_light not in _TRAFFIC_LIGHT_RANGES:
+            raise ValueError(f"Unbekannte Ampelfarbe '{traffic_light}'")
+        min_levels = [0] * len(SCORE_DIMENSIONS)
+        min_scores: Dict[int, float] = {}
+        for dim, label in (min_labels or {}).items():
+            if dim not in _LABEL_LEVELS:
+                raise ValueError(f"Unbekannte Dimension '{dim}'")
+            if label not in _LABEL_LEVELS[dim]:
+                raise ValueError(f"Unbekanntes Label '{label}' für '{dim}'")
+            level, low = _LABEL_LEVELS[dim][label]
+            i = SCORE_DIMENSIONS.index(dim)
+            min_levels[i] = level
+            if low is not None:
+                min_scores[i] = low
+        if limit <= 0:
+            return []
+
+        self.refresh()
+        scope = self._universe if sector is None else self._sectors.get(sector)
+        if scope is None:
+            return []
+
+        low, high = _TRAFFIC_LIGHT_RANGES[traffic_light] if traffic_light else (None, None)
+        total_start, total_end = scope.score_range(0, low, high)
+
+        # Kleinster Kandidatenbereich über die Label-Untergrenzen (Obermenge
+        # der Treffer, die Label-Stufe wird danach exakt geprüft)
+        best: Optional[Tuple[int, int]] = None
+        for i, min_score in min_scores.items():
+            _, end = scope.score_range(i + 1, min_score, None)
+            if best is None or end < best[1]:
+                best = (i + 1, end)
+
+        levels = tuple(min_levels)
+        light = traffic_light
+
+        # Der Bereich in Gesamt-Score-Reihenfolge ist bereits sortiert: Abbruch
+        # nach limit Treffern. Der Scan wird aufgegeben, sobald er länger als
+        # der kleinste Label-Bereich wird; dann wählt ein Heap über diesen
+        # Bereich die besten Treffer aus.
+        budget = None if best is None else best[1]
+        hits = []
+        for visited, entry in enumerate(islice(scope.orders[0], total_start, total_end)):
+            if budget is not None and visited >= budget:
+                break
+            if (light is None or entry.traffic_light == light) and all(map(ge, entry.levels, levels)):
+                hits.append(entry.result)
+                if len(hits) == limit:
+                    return hits
+        else:
+            return hits
+
+        ordering, end = best
+        candidates = (
+            entry for entry in islice(scope.orders[ordering], end)
+            if (light is None or entry.traffic_light == light) and all(map(ge, entry.levels, levels))
+        )
+        return [entry.result for entry in heapq.nsmallest(limit, candidates, key=_TOTAL_KEY)]
@@ -1,19 +1,30 @@
 """
 Sector Ranker Modul
 
-Verwaltet Branchenvergleiche und Ranking innerhalb von Sektoren.
+Verwaltet Branchenvergleiche und Ranking innerhalb von Sektoren
+und weiteren Vergleichsgruppen (siehe peer_groups.py).
 Berechnet Perzentile und relative Positionierung.
 """
 
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from collections import defaultdict
+from bisect import bisect_left, bisect_right
+import heapq
 
-from .data_loader import DataLoader, CompanyFinancials, get_data_loader
+from .data_loader import DataLoader, CompanyFinancials, METRIC_FIELDS, get_data_loader
 from .scorer import Scorer, ScoreResult, get_scorer
+from .metric_index import SectorMetricIndex
+from .engine import matrix_from_buffer
+from .peer_groups import PeerGroupDefinition, SectorGroups
 
 
-@dataclass
+# Wird mit (Gruppe, neue Scores) aufgerufen; Scores None = Gruppe verworfen,
+# Gruppe None = alle Gruppen verworfen
+ScoresListener = Callable[[Optional[str], Optional[Dict[str, "ScoreResult"]]], None]
+
+
+@dataclass(frozen=True, slots=True)
 class SectorRanking:
     """Ranking-Informationen eines Unternehmens innerhalb seines Sektors."""
     symbol: str
@@ -24,85 +35,263 @@ class SectorRanking:
     position_description: str    # z.B. "oberes Drittel"
 
 
-class SectorRanker:
+@dataclass(frozen=True, slots=True)
+class ScoreChange:
+    """Geändertes Score-Ergebnis nach einer Datenaktualisierung."""
+    symbol: str
+    old: Optional[ScoreResult]   # None = neu im Sektor
+    new: Optional[ScoreResult]   # None = nicht mehr im Sektor
+
+
+class GroupRanker:
     """
-    Berechnet und verwaltet Rankings innerhalb von Sektoren.
+    Berechnet und verwaltet Rankings innerhalb beliebiger Vergleichsgruppen.
     
-    Alle Vergleiche erfolgen nur innerhalb desselben Sektors,
-    um faire und aussagekräftige Einordnungen zu ermöglichen.
+    Welche Unternehmen miteinander verglichen werden, legt eine
+    PeerGroupDefinition fest (Sektor, Unterbranche, Region, Größenklasse,
+    eigene Listen). Kennzahlen-Index, Scores und Teil-Scores werden je
+    Gruppe genau einmal berechnet und gecacht; ein Unternehmen kann
+    mehreren Gruppen angehören.
     """
     
-    def __init__(self, data_loader: Optional[DataLoader] = None, scorer: Optional[Scorer] = None):
+    # Schlüssel des Gruppennamens in get_group_overview()
+    _overview_key = "group"
+    
+    def __init__(
+        self,
+        definition: PeerGroupDefinition,
+        data_loader: Optional[DataLoader] = None,
+        scorer: Optional[Scorer] = None
+    ):
         """
-        Initialisiert den SectorRanker.
+        Initialisiert den GroupRanker.
         
         Args:
+            definition: Definition der Vergleichsgruppen
             data_loader: Optional, DataLoader-Instanz
             scorer: Optional, Scorer-Instanz
         """
+        self._definition = definition
         self._loader = data_loader or get_data_loader()
         self._scorer = scorer or get_scorer()
-        self._sector_scores_cache: Dict[str, Dict[str, ScoreResult]] = {}
+        self._group_scores_cache: Dict[str, Dict[str, ScoreResult]] = {}
+        self._group_index_cache: Dict[str, SectorMetricIndex] = {}
+        self._sorted_totals_cache: Dict[str, List[float]] = {}
+        self._sub_scores_cache: Dict[str, Tuple[List[str], List[List[float]]]] = {}
+        self._members: Optional[Dict[str, List[str]]] = None
+        self._listeners: List[ScoresListener] = []
+    
+    @property
+    def definition(self) -> PeerGroupDefinition:
+        """Die verwendete Gruppen-Definition."""
+        return self._definition
     
-    def _get_sector_scores(self, sector: str) -> Dict[str, ScoreResult]:
+    def add_listener(self, listener: ScoresListener):
         """
-        Berechnet alle Scores für Unternehmen eines Sektors (gecacht).
+        Registriert einen Beobachter für neu berechnete oder verworfene Gruppen.
+        
+        Damit lassen sich abgeleitete Strukturen (z.B. GlobalLeaderboard)
+        aktualisieren, ohne alle Gruppen erneut abzufragen.
+        
+        Args:
+            listener: Aufruf mit (Gruppe, Scores); Scores None = verworfen,
+                Gruppe None = alle Gruppen verworfen
+        """
+        self._listeners.append(listener)
+    
+    def _notify(self, group: Optional[str], results: Optional[Dict[str, ScoreResult]]):
+        for listener in self._listeners:
+            listener(group, results)
+    
+    def get_groups(self) -> List[str]:
+        """Gibt alle Gruppen mit mindestens einem Unternehmen zurück."""
+        return list(self._get_members())
+    
+    def get_groups_of(self, company: CompanyFinancials) -> List[str]:
+        """Gruppen, denen ein Unternehmen laut Definition angehört."""
+        return self._definition.groups_of(company.symbol, company.sector)
+    
+    def get_group_members(self, group: str) -> List[str]:
+        """Symbole aller Unternehmen einer Gruppe (in Reihenfolge der Datenquelle)."""
+        return self._get_members().get(group, [])
+    
+    def _get_members(self) -> Dict[str, List[str]]:
+        """Gruppe -> Symbole, einmal über alle Unternehmen ermittelt (gecacht)."""
+        if self._members is None:
+            members: Dict[str, List[str]] = defaultdict(list)
+            table = self._loader.get_financials_table()
+            if table is not None:
+                pairs = zip(table.symbols, table.sectors)
+            else:
+                pairs = ((c.symbol, c.sector) for c in self._loader.get_all_companies())
+            for symbol, sector in pairs:
+                for group in self._definition.groups_of(symbol, sector):
+                    members[group].append(symbol)
+            self._members = dict(members)
+        return self._members
+    
+    def _build_group_index(self, group: str) -> Optional[SectorMetricIndex]:
+        """Baut den Kennzahlen-Index einer Gruppe aus der Datenquelle auf."""
+        symbols = self.get_group_members(group)
+        if not symbols:
+            return None
+        
+        table = self._loader.get_financials_table()
+        if table is not None:
+            rows = [table.row_of(symbol) for symbol in symbols]
+            matrix = matrix_from_buffer(
+                table.metric_buffer(rows), len(METRIC_FIELDS), self._scorer.use_numpy
+            )
+        else:
+            loaded = self._loader.get_companies(symbols)
+            companies = [loaded.get(symbol) for symbol in symbols]
+            matrix = self._scorer.extract_metric_matrix(companies)
+        return self._scorer.build_index_from_matrix(group, symbols, matrix)
+    
+    def get_group_index(self, group: str) -> Optional[SectorMetricIndex]:
+        """
+        Liefert den Kennzahlen-Index einer Gruppe (gecacht).
+        
+        Returns:
+            SectorMetricIndex oder None wenn die Gruppe leer ist
+        """
+        if group in self._group_index_cache:
+            return self._group_index_cache[group]
+        
+        index = self._build_group_index(group)
+        
+        if index is None:
+            return None
+        
+        self._group_index_cache[group] = index
+        return index
+    
+    def get_group_scores(self, group: str) -> Dict[str, ScoreResult]:
+        """
+        Berechnet alle Scores für Unternehmen einer Gruppe (gecacht).
+        
+        Die gesamte Gruppe wird in einem Durchlauf aus ihrem
+        Kennzahlen-Index berechnet. ScoreResult.sector enthält dabei
+        den Gruppennamen, sector_percentile das Perzentil in der Gruppe.
         
         Returns:
             Dict mit Symbol -> ScoreResult Mapping
         """
-        if sector in self._sector_scores_cache:
-            return self._sector_scores_cache[sector]
+        if group in self._group_scores_cache:
+            return self._group_scores_cache[group]
         
-        sector_companies = self._loader.get_sector_companies(sector)
+        index = self.get_group_index(group)
         
-        if not sector_companies:
+        if index is None:
             return {}
         
-        results = {}
-        for company in sector_companies:
-            score_result = self._scorer.score_company(company, sector_companies)
-            results[company.symbol] = score_result
+        results = self._scorer.score_index(index)
         
-        self._sector_scores_cache[sector] = results
+        self._group_scores_cache[group] = results
+        self._notify(group, results)
         return results
     
-    def get_sector_ranking(self, symbol: str) -> Optional[SectorRanking]:
+    def get_group_sub_scores(self, group: str) -> Tuple[List[str], List[List[float]]]:
         """
-        Ermittelt das Ranking eines Unternehmens in seinem Sektor.
+        Ungerundete Teil-Scores aller Unternehmen einer Gruppe (gecacht).
+        
+        Die Teil-Scores hängen nicht von SCORE_WEIGHTS ab und können für
+        beliebige Gewichtungen wiederverwendet werden (siehe scenarios.py).
+        
+        Returns:
+            (Symbole, Teil-Scores je Dimension in SCORE_DIMENSIONS-Reihenfolge)
+        """
+        if group not in self._sub_scores_cache:
+            index = self.get_group_index(group)
+            if index is None:
+                return [], []
+            self._sub_scores_cache[group] = (list(index.symbols), self._scorer.sub_scores(index))
+        return self._sub_scores_cache[group]
+    
+    def _get_sorted_totals(self, group: str) -> List[float]:
+        """Aufsteigend sortierte Gesamt-Scores einer Gruppe (gecacht)."""
+        if group not in self._sorted_totals_cache:
+            self._sorted_totals_cache[group] = sorted(
+                s.total_score for s in self.get_group_scores(group).values()
+            )
+        return self._sorted_totals_cache[group]
+    
+    def _resolve_group(self, company: CompanyFinancials, group: Optional[str]) -> Optional[str]:
+        """Angegebene Gruppe oder die erste Gruppe des Unternehmens."""
+        if group is not None:
+            return group
+        groups = self.get_groups_of(company)
+        return groups[0] if groups else None
+    
+    def what_if(
+        self,
+        company: CompanyFinancials,
+        group: Optional[str] = None
+    ) -> Optional[ScoreResult]:
+        """
+        Bewertet hypothetische Kennzahlen gegen die aktuelle Gruppe.
+        
+        Nutzt den gecachten Gruppen-Index, jede Metrik kostet nur eine
+        Binärsuche. Die Vergleichsgruppe selbst bleibt unverändert.
+        
+        Args:
+            company: Unternehmen mit hypothetischen Kennzahlen
+            group: Optional, Vergleichsgruppe; None = erste Gruppe des Unternehmens
+        
+        Returns:
+            ScoreResult oder None wenn die Gruppe unbekannt ist
+        """
+        group = self._resolve_group(company, group)
+        index = self.get_group_index(group) if group is not None else None
+        if index is None:
+            return None
+        
+        previous = self.get_group_scores(group).get(company.symbol)
+        return self._scorer.score_what_if(
+            company,
+            index,
+            self._get_sorted_totals(group),
+            previous_total=previous.total_score if previous else None
+        )
+    
+    def get_group_ranking(self, symbol: str, group: Optional[str] = None) -> Optional[SectorRanking]:
+        """
+        Ermittelt das Ranking eines Unternehmens in einer Gruppe.
         
         Args:
             symbol: Aktiensymbol
+            group: Optional, Vergleichsgruppe; None = erste Gruppe des Unternehmens
         
         Returns:
-            SectorRanking oder None wenn nicht gefunden
+            SectorRanking (sector = Gruppenname) oder None wenn nicht gefunden
         """
         company = self._loader.get_company_data(symbol)
         if not company:
             return None
         
-        sector = company.sector
-        sector_scores = self._get_sector_scores(sector)
-        
-        if symbol not in sector_scores:
+        group = self._resolve_group(company, group)
+        if group is None:
             return None
+        group_scores = self.get_group_scores(group)
         
-        company_score = sector_scores[symbol]
-        
-        # Alle Total-Scores sortieren (absteigend)
-        sorted_scores = sorted(
-            sector_scores.values(),
-            key=lambda x: x.total_score,
-            reverse=True
-        )
-        
-        # Rang ermitteln
-        rank = next(
-            (i + 1 for i, s in enumerate(sorted_scores) if s.symbol == symbol),
-            len(sorted_scores)
-        )
+        if symbol not in group_scores:
+            return None
         
-        total_in_sector = len(sorted_scores)
+        company_score = group_scores[symbol]
+        total = company_score.total_score
+        
+        # Rang per Binärsuche in den gecachten, sortierten Gesamt-Scores;
+        # bei Gleichstand zählt die Reihenfolge der Gruppe (wie eine stabile Sortierung)
+        sorted_totals = self._get_sorted_totals(group)
+        rank = len(sorted_totals) - bisect_right(sorted_totals, total) + 1
+        if bisect_right(sorted_totals, total) - bisect_left(sorted_totals, total) > 1:
+            for other in group_scores:
+                if other == symbol:
+                    break
+                if group_scores[other].total_score == total:
+                    rank += 1
+        
+        total_in_group = len(sorted_totals)
         percentile = company_score.sector_percentile
         
         # Position beschreiben
@@ -110,14 +299,15 @@ class SectorRanker:
         
         return SectorRanking(
             symbol=symbol,
-            sector=sector,
+            sector=group,
             rank=rank,
-            total_in_sector=total_in_sector,
+            total_in_sector=total_in_group,
             percentile=percentile,
             position_description=position_description
         )
     
-    def _describe_position(self, percentile: float) -> str:
+    @staticmethod
+    def _describe_position(percentile: float) -> str:
         """
         Erzeugt eine qualitative Beschreibung der Position.
         
@@ -142,38 +332,33 @@ class SectorRanker:
         else:
             return "unteres Viertel"
     
-    def get_sector_overview(self, sector: str) -> Dict[str, any]:
+    def get_group_overview(self, group: str) -> Dict[str, any]:
         """
-        Gibt einen Überblick über alle Unternehmen eines Sektors.
+        Gibt einen Überblick über alle Unternehmen einer Gruppe.
         
         Args:
-            sector: Name des Sektors
+            group: Name der Gruppe
         
         Returns:
-            Dict mit Sektor-Statistiken
+            Dict mit Gruppen-Statistiken
         """
-        sector_scores = self._get_sector_scores(sector)
+        group_scores = self.get_group_scores(group)
         
-        if not sector_scores:
+        if not group_scores:
             return {
-                "sector": sector,
+                self._overview_key: group,
                 "company_count": 0,
                 "average_score": 0,
                 "top_performers": [],
                 "score_distribution": {}
             }
         
-        scores = [s.total_score for s in sector_scores.values()]
+        scores = [s.total_score for s in group_scores.values()]
         
-        # Sortiere nach Score
-        sorted_companies = sorted(
-            sector_scores.values(),
-            key=lambda x: x.total_score,
-            reverse=True
-        )
-        
-        # Top 3 Performer (nur Symbole, keine Scores offenlegen)
-        top_performers = [s.symbol for s in sorted_companies[:3]]
+        # Top 3 Performer (nur Symbole, keine Scores offenlegen);
+        # nlargest ist stabil wie sorted(..., reverse=True)[:3]
+        top_companies = heapq.nlargest(3, group_scores.values(), key=lambda x: x.total_score)
+        top_performers = [s.symbol for s in top_companies]
         
         # Score-Verteilung in Kategorien (ohne genaue Zahlen)
         distribution = {
@@ -183,18 +368,19 @@ class SectorRanker:
         }
         
         return {
-            "sector": sector,
-            "company_count": len(sector_scores),
+            self._overview_key: group,
+            "company_count": len(group_scores),
             "top_performers": top_performers,
             "score_distribution": distribution
         }
     
-    def compare_to_sector(self, symbol: str) -> Dict[str, str]:
+    def compare_to_group(self, symbol: str, group: Optional[str] = None) -> Dict[str, str]:
         """
-        Vergleicht ein Unternehmen qualitativ mit seinem Sektor.
+        Vergleicht ein Unternehmen qualitativ mit einer Gruppe.
         
         Args:
             symbol: Aktiensymbol
+            group: Optional, Vergleichsgruppe; None = erste Gruppe des Unternehmens
         
         Returns:
             Dict mit qualitativen Vergleichsaussagen
@@ -203,19 +389,19 @@ class SectorRanker:
         if not company:
             return {}
         
-        sector = company.sector
-        sector_scores = self._get_sector_scores(sector)
+        group = self._resolve_group(company, group)
+        group_scores = self.get_group_scores(group) if group is not None else {}
         
-        if symbol not in sector_scores:
+        if symbol not in group_scores:
             return {}
         
-        company_score = sector_scores[symbol]
+        company_score = group_scores[symbol]
         
-        # Vergleiche jede Dimension mit dem Sektor-Median
-        all_quality = [s.quality_score for s in sector_scores.values()]
-        all_growth = [s.growth_score for s in sector_scores.values()]
-        all_stability = [s.stability_score for s in sector_scores.values()]
-        all_valuation = [s.valuation_score for s in sector_scores.values()]
+        # Vergleiche jede Dimension mit dem Gruppen-Median
+        all_quality = [s.quality_score for s in group_scores.values()]
+        all_growth = [s.growth_score for s in group_scores.values()]
+        all_stability = [s.stability_score for s in group_scores.values()]
+        all_valuation = [s.valuation_score for s in group_scores.values()]
         
         import statistics
         
@@ -259,9 +445,194 @@ class SectorRanker:
         
         return comparisons
     
+    def update_company(self, company: CompanyFinancials) -> List[ScoreChange]:
+        """
+        Übernimmt aktualisierte Kennzahlen und berechnet nur die betroffenen Gruppen neu.
+        
+        Bleiben die Gruppen des Unternehmens gleich, werden in den gecachten
+        Indizes nur die Metriken mit geänderten Werten neu gerankt. Neue
+        Unternehmen und Gruppenwechsel bauen die betroffenen Gruppen neu auf.
+        
+        Args:
+            company: Unternehmen mit aktualisierten Kennzahlen
+        
+        Returns:
+            Alle Score-Ergebnisse, die sich dadurch geändert haben
+            (ein Eintrag je Unternehmen und betroffener Gruppe)
+        """
+        previous = self._loader.get_company_data(company.symbol)
+        old_groups = self.get_groups_of(previous) if previous else []
+        new_groups = self.get_groups_of(company)
+        groups = old_groups + [group for group in new_groups if group not in old_groups]
+        
+        old_scores = {group: self.get_group_scores(group) for group in groups}
+        
+        self._loader.upsert_company(company)
+        
+        if previous is not None and old_groups == new_groups:
+            for group in groups:
+                index = self._group_index_cache.get(group)
+                if index is None or company.symbol not in index:
+                    self.invalidate_group(group)
+                elif self._scorer.update_sector_index(index, company):
+                    self._group_scores_cache.pop(group, None)
+                    self._sorted_totals_cache.pop(group, None)
+                    self._sub_scores_cache.pop(group, None)
+                    self._notify(group, None)
+        else:
+            self._members = None
+            for group in groups:
+                self.invalidate_group(group)
+        
+        changes = []
+        for group in groups:
+            old = old_scores[group]
+            new = self.get_group_scores(group)
+            for symbol in list(old) + [s for s in new if s not in old]:
+                if old.get(symbol) != new.get(symbol):
+                    changes.append(ScoreChange(symbol, old.get(symbol), new.get(symbol)))
+        return changes
+    
+    def invalidate_for(self, *companies: Optional[CompanyFinancials]):
+        """
+        Verwirft die Gruppen der angegebenen Unternehmen.
+        
+        Für Daten, die an diesem Ranker vorbei aktualisiert wurden (z.B.
+        durch einen anderen Ranker mit demselben DataLoader). Übergeben
+        werden alter und neuer Stand; None-Einträge werden übersprungen.
+        Jede Gruppe wird nur einmal verworfen, auch bei vielen Unternehmen.
+        """
+        self._members = None
+        groups = {}
+        for company in companies:
+            if company is not None:
+                groups.update(dict.fromkeys(self.get_groups_of(company)))
+        for group in groups:
+            self.invalidate_group(group)
+    
+    def invalidate_group(self, group: str):
+        """Verwirft Index und Scores einer Gruppe nach Datenänderungen."""
+        self._group_index_cache.pop(group, None)
+        self._group_scores_cache.pop(group, None)
+        self._sorted_totals_cache.pop(group, None)
+        self._sub_scores_cache.pop(group, None)
+        self._notify(group, None)
+    
     def clear_cache(self):
         """Leert den internen Cache für Neuberechnungen."""
-        self._sector_scores_cache.clear()
+        self._group_index_cache.clear()
+        self._group_scores_cache.clear()
+        self._sorted_totals_cache.clear()
+        self._sub_scores_cache.clear()
+        self._members = None
+        self._notify(None, None)
+
+
+class SectorRanker(GroupRanker):
+    """
+    Berechnet und verwaltet Rankings innerhalb von Sektoren.
+    
+    Alle Vergleiche erfolgen nur innerhalb desselben Sektors,
+    um faire und aussagekräftige Einordnungen zu ermöglichen.
+    """
+    
+    _overview_key = "sector"
+    
+    def __init__(self, data_loader: Optional[DataLoader] = None, scorer: Optional[Scorer] = None):
+        """
+        Initialisiert den SectorRanker.
+        
+        Args:
+            data_loader: Optional, DataLoader-Instanz
+            scorer: Optional, Scorer-Instanz
+        """
+        super().__init__(SectorGroups(), data_loader, scorer)
+    
+    def get_groups(self) -> List[str]:
+        """Gibt alle Sektoren der Datenquelle zurück."""
+        return self._loader.get_available_sectors()
+    
+    def _build_group_index(self, sector: str) -> Optional[SectorMetricIndex]:
+        """Baut den Sektor-Index ohne Mitgliederliste direkt aus der Datenquelle auf."""
+        # Spaltenorientierte Quellen direkt verarbeiten
+        table = self._loader.get_financials_table()
+        if table is not None:
+            return self._scorer.build_index_from_table(table, sector)
+        sector_companies = self._loader.get_sector_companies(sector)
+        return self._scorer.build_sector_index(sector_companies) if sector_companies else None
+    
+    def get_available_sectors(self) -> List[str]:
+        """Gibt alle Sektoren der Datenquelle zurück."""
+        return self.get_groups()
+    
+    def get_sector_index(self, sector: str) -> Optional[SectorMetricIndex]:
+        """Kennzahlen-Index eines Sektors (siehe get_group_index())."""
+        return self.get_group_index(sector)
+    
+    def get_sector_scores(self, sector: str) -> Dict[str, ScoreResult]:
+        """Alle Scores eines Sektors (siehe get_group_scores())."""
+        return self.get_group_scores(sector)
+    
+    def get_sector_sub_scores(self, sector: str) -> Tuple[List[str], List[List[float]]]:
+        """Ungerundete Teil-Scores eines Sektors (siehe get_group_sub_scores())."""
+        return self.get_group_sub_scores(sector)
+    
+    def get_sector_ranking(self, symbol: str) -> Optional[SectorRanking]:
+        """
+        Ermittelt das Ranking eines Unternehmens in seinem Sektor.
+        
+        Args:
+            symbol: Aktiensymbol
+        
+        Returns:
+            SectorRanking oder None wenn nicht gefunden
+        """
+        return self.get_group_ranking(symbol)
+    
+    def get_sector_overview(self, sector: str) -> Dict[str, any]:
+        """Überblick über alle Unternehmen eines Sektors (siehe get_group_overview())."""
+        return self.get_group_overview(sector)
+    
+    def compare_to_sector(self, symbol: str) -> Dict[str, str]:
+        """Vergleicht ein Unternehmen qualitativ mit seinem Sektor."""
+        return self.compare_to_group(symbol)
+    
+    def invalidate_sector(self, sector: str):
+        """Verwirft Index und Scores eines Sektors nach Datenänderungen."""
+        self.invalidate_group(sector)
+
+
+def rank_sector_results(sector_scores: Dict[str, ScoreResult]) -> Dict[str, SectorRanking]:
+    """
+    Ermittelt die Rankings aller Unternehmen eines Sektors mit einer Sortierung.
+    
+    Liefert dieselben Ränge wie SectorRanker.get_sector_ranking(),
+    benötigt aber weder DataLoader noch Cache (z.B. in Worker-Prozessen).
+    
+    Args:
+        sector_scores: Dict mit Symbol -> ScoreResult eines Sektors
+    
+    Returns:
+        Dict mit Symbol -> SectorRanking
+    """
+    sorted_scores = sorted(
+        sector_scores.values(),
+        key=lambda x: x.total_score,
+        reverse=True
+    )
+    total_in_sector = len(sorted_scores)
+    
+    rankings = {}
+    for rank, score in enumerate(sorted_scores, start=1):
+        rankings[score.symbol] = SectorRanking(
+            symbol=score.symbol,
+            sector=score.sector,
+            rank=rank,
+            total_in_sector=total_in_sector,
+            percentile=score.sector_percentile,
+            position_description=SectorRanker._describe_position(score.sector_percentile)
+        )
+    return rankings
 
 
 # Singleton-Instanz
@@ -0,0 +1,263 @@
+"""
+Sketch Modul
+
+Näherungsweise Perzentile für sehr große oder gestreamte Vergleichsgruppen.
+
+Ein KLL-Sketch (Karnin, Lang, Liberty 2016) hält statt aller Werte nur
+O(k) gewichtete Stichprobenwerte. Ränge und Quantile sind bis auf einen
+konfigurierbaren relativen Rangfehler genau; Sketches mehrerer Shards
+lassen sich verlustarm zusammenführen.
+
+MetricSketches bildet damit die Semantik von calculate_percentile_score()
+nach: Winsorizing-Grenzen über Quantile, danach Rang gegen die
+winsorisierte Verteilung.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from math import ceil
+import random
+
+from .config import SKETCH_CONFIG
+from .engine import winsorize_indices
+
+
+def k_for_error(error: float) -> int:
+    """
+    Sketch-Größe k für einen gewünschten relativen Rangfehler.
+
+    Näherung aus der Apache-DataSketches-Dokumentation
+    (Rangfehler ≈ 2.296 / k^0.9723 bei 99% Konfidenz).
+
+    Args:
+        error: Relativer Rangfehler (z.B. 0.01 = 1% der Gruppengröße)
+
+    Returns:
+        Parameter k
+    """
+    if not 0 < error < 1:
+        raise ValueError("Fehlerschranke muss zwischen 0 und 1 liegen")
+    return max(8, ceil((2.296 / error) ** (1 / 0.9723)))
+
+
+class KLLSketch:
+    """
+    Mergebarer Quantil-Sketch für einen Strom von Zahlen.
+
+    Verwendung:
+        sketch = KLLSketch(error=0.01)
+        sketch.extend(values)
+        sketch.rank(42.0)        # ≈ Anzahl Werte < 42.0
+        sketch.quantile(0.95)
+    """
+
+    # Verhältnis der Kapazitäten benachbarter Ebenen
+    _C = 2 / 3
+
+    def __init__(self, error: float = SKETCH_CONFIG["error"], seed: Optional[int] = 0):
+        """
+        Initialisiert einen leeren Sketch.
+
+        Args:
+            error: Relativer Rangfehler, bestimmt die Sketch-Größe
+            seed: Startwert für die Kompaktierung (None = zufällig)
+        """
+        self.error = error
+        self.k = k_for_error(error)
+        self.count = 0
+        self._levels: List[List[float]] = [[]]
+        self._retained = 0
+        self._max_retained = self._max_size()
+        self._rng = random.Random(seed)
+        self._view: Optional[Tuple[List[float], List[int]]] = None
+
+    def __len__(self) -> int:
+        """Anzahl der bisher aufgenommenen Werte."""
+        return self.count
+
+    @property
+    def retained(self) -> int:
+        """Anzahl der tatsächlich gespeicherten Werte."""
+        return self._retained
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return max(2, ceil(self.k * self._C ** depth))
+
+    def _max_size(self) -> int:
+        return sum(self._capacity(level) for level in range(len(self._levels)))
+
+    def update(self, value: float):
+        """Nimmt einen Wert auf."""
+        self._levels[0].append(value)
+        self.count += 1
+        self._retained += 1
+        self._view = None
+        if self._retained >= self._max_retained:
+            self._compress()
+
+    def extend(self, values: Iterable[float]):
+        """Nimmt mehrere Werte auf."""
+        for value in values:
+            self.update(value)
+
+    def merge(self, other: "KLLSketch"):
+        """
+        Führt einen zweiten Sketch (z.B. eines anderen Shards) hinzu.
+
+        Args:
+            other: Sketch mit gleicher oder ähnlicher Fehlerschranke
+        """
+        while len(self._levels) < len(other._levels):
+            self._levels.append([])
+        self._max_retained = self._max_size()
+        for level, items in enumerate(other._levels):
+            self._levels[level].extend(items)
+        self.count += other.count
+        self._retained += other._retained
+        self._view = None
+        self._compress()
+
+    def _compress(self):
+        """Kompaktiert volle Ebenen, bis der Sketch wieder in sein Budget passt."""
+        while self._retained >= self._max_retained:
+            for level, items in enumerate(self._levels):
+                if len(items) >= self._capacity(level):
+                    break
+            else:
+                return
+            if level + 1 == len(self._levels):
+                self._levels.append([])
+                self._max_retained = self._max_size()
+            items.sort()
+            # Bei ungerader Anzahl bleibt der größte Wert auf der Ebene
+            keep = [items.pop()] if len(items) % 2 else []
+            offset = self._rng.randrange(2)
+            promoted = items[offset::2]
+            self._levels[level + 1].extend(promoted)
+            self._levels[level] = keep
+            self._retained -= len(items) - len(promoted)
+
+    def _sorted_view(self) -> Tuple[List[float], List[int]]:
+        """Sortierte Werte und kumulierte Gewichte (gecacht bis zur nächsten Änderung)."""
+        if self._view is None:
+            weighted = sorted(
+                (value, 1 << level)
+                for level, items in enumerate(self._levels)
+                for value in items
+            )
+            values = [value for value, _ in weighted]
+            cumulative = [0] + list(accumulate(weight for _, weight in weighted))
+            self._view = (values, cumulative)
+        return self._view
+
+    def rank(self, value: float) -> int:
+        """Geschätzte Anzahl aufgenommener Werte kleiner als value."""
+        values, cumulative = self._sorted_view()
+        return cumulative[bisect_left(values, value)]
+
+    def value_at_rank(self, rank: int) -> float:
+        """
+        Geschätzter Wert an Position rank der sortierten Gesamtmenge.
+
+        Args:
+            rank: 0-basierte Position (0 bis len - 1)
+        """
+        values, cumulative = self._sorted_view()
+        if not values:
+            raise ValueError("Leerer Sketch")
+        pos = bisect_right(cumulative, rank) - 1
+        return values[min(max(pos, 0), len(values) - 1)]
+
+    def quantile(self, q: float) -> float:
+        """Geschätztes q-Quantil (0 ≤ q ≤ 1)."""
+        return self.value_at_rank(min(int(q * self.count), self.count - 1))
+
+
+class MetricSketches:
+    """
+    Ein KLL-Sketch pro Metrik einer Vergleichsgruppe.
+
+    Liefert Perzentil-Ränge mit derselben Schnittstelle wie
+    SectorMetricIndex.rank() / rank_row(), aber mit konstantem Speicher
+    unabhängig von der Gruppengröße.
+    """
+
+    def __init__(
+        self,
+        inverse_flags: Sequence[bool],
+        error: float = SKETCH_CONFIG["error"],
+        seed: Optional[int] = 0
+    ):
+        """
+        Initialisiert leere Sketches.
+
+        Args:
+            inverse_flags: Pro Metrik, ob ein niedrigerer Wert besser ist
+            error: Relativer Rangfehler je Sketch
+            seed: Startwert für die Kompaktierung
+        """
+        self.inverse_flags: List[bool] = list(inverse_flags)
+        self.sketches = [
+            KLLSketch(error, None if seed is None else seed + j)
+            for j in range(len(self.inverse_flags))
+        ]
+        self._bounds: Dict[int, Tuple[float, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self.sketches[0]) if self.sketches else 0
+
+    def update(self, values: Sequence[float]):
+        """Nimmt eine Kennzahlen-Zeile (ein Unternehmen) auf."""
+        for sketch, value in zip(self.sketches, values):
+            sketch.update(value)
+        self._bounds.clear()
+
+    def extend(self, rows: Iterable[Sequence[float]]):
+        """Nimmt mehrere Kennzahlen-Zeilen auf (auch als Stream)."""
+        for row in rows:
+            self.update(row)
+
+    def merge(self, other: "MetricSketches"):
+        """Führt die Sketches eines anderen Shards hinzu."""
+        for sketch, other_sketch in zip(self.sketches, other.sketches):
+            sketch.merge(other_sketch)
+        self._bounds.clear()
+
+    def bounds(self, metric: int) -> Tuple[float, float]:
+        """
+        Geschätzte Winsorizing-Grenzen einer Metrik.
+
+        Positionen wie winsorize(): WINSORIZE_PERCENTILES der Gruppengröße.
+        """
+        if metric not in self._bounds:
+            sketch = self.sketches[metric]
+            lower_idx, upper_idx = winsorize_indices(len(sketch))
+            self._bounds[metric] = (sketch.value_at_rank(lower_idx), sketch.value_at_rank(upper_idx))
+        return self._bounds[metric]
+
+    def rank(self, metric: int, value: float) -> float:
+        """
+        Näherungsweiser Perzentil-Rang eines Wertes (0-100).
+
+        Werte bis zur unteren Grenze haben Rang 0, da alle kleineren
+        Werte beim Winsorizing auf die Grenze angehoben werden. Darüber
+        entspricht der Rang dem Anteil kleinerer Originalwerte.
+        """
+        sketch = self.sketches[metric]
+        n = len(sketch)
+        if n < 2:
+            return 50.0
+        lower, upper = self.bounds(metric)
+        # Erst begrenzen, dann vergleichen (bei lower == upper ist jeder Wert die Grenze)
+        bounded = min(max(value, lower), upper)
+        count_below = 0 if bounded <= lower else sketch.rank(bounded)
+        percentile = (count_below / n) * 100
+        if self.inverse_flags[metric]:
+            percentile = 100 - percentile
+        return float(percentile)
+
+    def rank_row(self, values: Sequence[float]) -> List[float]:
+        """Näherungsweise Perzentil-Ränge einer kompletten Kennzahlen-Zeile."""
+        return [self.rank(metric, value) for metric, value in enumerate(values)]
@@ -0,0 +1,464 @@
+"""
+Synthetic Modul
+
+Deterministische, synthetische Universen für Last- und Skalierungstests.
+
+Die Mock-Daten reichen für Skalierungsfragen nicht aus. SyntheticDataSource
+erzeugt beliebig viele Unternehmen (1.000 bis über 1.000.000) mit
+sektortypischen, korrelierten Kennzahlen:
+
+    Wert = Median × exp(Streuung × z)   (log-normal, z.B. Multiples)
+    Wert = Median + Streuung × z        (normal, z.B. Margen)
+
+    z = Ladungen · (Qualität, Wachstum, Risiko) + Rest × ε
+
+Die drei latenten Faktoren je Unternehmen koppeln die Kennzahlen wie in
+echten Daten: profitable Unternehmen wachsen eher und sind höher bewertet,
+riskante sind höher verschuldet und schwanken stärker. Einzelne
+Unternehmen erhalten einen extremen Wert (Winsorizing wird also
+tatsächlich beansprucht).
+
+Jeder Sektor belegt einen zusammenhängenden Bereich von Unternehmen, die
+Daten entstehen blockweise (chunk_size) aus einem eigenen Startwert je
+Block. Jeder Block ist damit für sich reproduzierbar: Einzelabfragen
+erzeugen nur ihren Block, Sektorabfragen nur die Blöcke ihres Bereichs,
+iter_chunks() streamt das Universum mit konstantem Speicherbedarf.
+Die komplette FinancialsTable entsteht nur auf ausdrücklichen Wunsch
+(materialize()) oder für Änderungen (upsert_company/delete_company).
+"""
+
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+from array import array
+from dataclasses import dataclass, replace
+from math import cos, exp, log, pi, sin, sqrt
+import random
+
+from .config import SYNTHETIC_CONFIG
+from .data_loader import (
+    CompanyFinancials, DataSourceBase, FinancialsTable, METRIC_FIELDS, TableDataSource
+)
+
+
+@dataclass(frozen=True, slots=True)
+class MetricDistribution:
+    """Verteilung einer Kennzahl innerhalb eines Sektors."""
+    center: float                   # Median
+    spread: float                   # Standardabweichung (log-normal: des Logarithmus)
+    log: bool = False               # log-normal (positiv, rechtsschief) statt normal
+    lower: Optional[float] = None   # Optionale Untergrenze
+    upper: Optional[float] = None   # Optionale Obergrenze
+
+
+# Ladungen je Kennzahl auf die Faktoren (Qualität, Wachstum, Risiko)
+FACTOR_LOADINGS: Dict[str, Tuple[float, float, float]] = {
+    "operating_margin": (0.80, 0.20, -0.10),
+    "net_margin": (0.85, 0.15, -0.20),
+    "roic": (0.75, 0.25, -0.10),
+    "fcf_margin": (0.70, 0.10, -0.10),
+    "revenue_growth_3y": (0.20, 0.85, 0.10),
+    "earnings_growth_3y": (0.25, 0.80, 0.15),
+    "fcf_growth_3y": (0.20, 0.70, 0.10),
+    "debt_to_equity": (-0.30, 0.00, 0.80),
+    "interest_coverage": (0.50, 0.00, -0.70),
+    "cashflow_volatility": (-0.30, 0.20, 0.60),
+    "earnings_stability": (0.40, -0.10, -0.60),
+    "pe_ratio": (0.30, 0.60, 0.00),
+    "ev_ebitda": (0.30, 0.55, 0.00),
+    "fcf_multiple": (0.25, 0.55, 0.05),
+}
+
+# Verteilungen über alle Sektoren
+BASE_DISTRIBUTIONS: Dict[str, MetricDistribution] = {
+    "operating_margin": MetricDistribution(0.15, 0.10),
+    "net_margin": MetricDistribution(0.10, 0.08),
+    "roic": MetricDistribution(0.12, 0.10),
+    "fcf_margin": MetricDistribution(0.10, 0.08),
+    "revenue_growth_3y": MetricDistribution(0.06, 0.08),
+    "earnings_growth_3y": MetricDistribution(0.07, 0.12),
+    "fcf_growth_3y": MetricDistribution(0.06, 0.12),
+    "debt_to_equity": MetricDistribution(0.8, 0.6, log=True),
+    "interest_coverage": MetricDistribution(10.0, 0.8, log=True),
+    "cashflow_volatility": MetricDistribution(0.2, 0.4, log=True),
+    "earnings_stability": MetricDistribution(0.75, 0.12, lower=0.0, upper=1.0),
+    "pe_ratio": MetricDistribution(18.0, 0.35, log=True),
+    "ev_ebitda": MetricDistribution(12.0, 0.35, log=True),
+    "fcf_multiple": MetricDistribution(20.0, 0.4, log=True),
+}
+
+# Sektortypische Mediane (Abweichungen von BASE_DISTRIBUTIONS)
+SECTOR_PROFILES: Dict[str, Dict[str, float]] = {
+    "Technology": {
+        "operating_margin": 0.25, "net_margin": 0.18, "roic": 0.20, "fcf_margin": 0.20,
+        "revenue_growth_3y": 0.12, "earnings_growth_3y": 0.15, "debt_to_equity": 0.5,
+        "pe_ratio": 28.0, "ev_ebitda": 20.0, "fcf_multiple": 30.0,
+    },
+    "Healthcare": {
+        "operating_margin": 0.20, "net_margin": 0.14, "revenue_growth_3y": 0.07,
+        "debt_to_equity": 0.6, "pe_ratio": 24.0, "ev_ebitda": 16.0,
+    },
+    "Financials": {
+        "operating_margin": 0.30, "net_margin": 0.20, "roic": 0.10,
+        "debt_to_equity": 2.5, "interest_coverage": 4.0,
+        "pe_ratio": 12.0, "ev_ebitda": 9.0, "fcf_multiple": 12.0,
+    },
+    "Consumer Discretionary": {
+        "operating_margin": 0.10, "net_margin": 0.07, "revenue_growth_3y": 0.08, "pe_ratio": 22.0,
+    },
+    "Consumer Staples": {
+        "revenue_growth_3y": 0.04, "cashflow_volatility": 0.12, "earnings_stability": 0.85,
+        "pe_ratio": 22.0,
+    },
+    "Industrials": {
+        "operating_margin": 0.13, "net_margin": 0.09, "revenue_growth_3y": 0.05,
+    },
+    "Energy": {
+        "revenue_growth_3y": 0.04, "cashflow_volatility": 0.4, "earnings_stability": 0.6,
+        "pe_ratio": 11.0, "ev_ebitda": 6.0,
+    },
+    "Materials": {
+        "operating_margin": 0.14, "cashflow_volatility": 0.35, "pe_ratio": 14.0,
+    },
+    "Real Estate": {
+        "operating_margin": 0.35, "net_margin": 0.20, "roic": 0.05, "revenue_growth_3y": 0.05,
+        "debt_to_equity": 1.5, "pe_ratio": 30.0, "ev_ebitda": 18.0,
+    },
+    "Utilities": {
+        "operating_margin": 0.20, "roic": 0.06, "revenue_growth_3y": 0.03,
+        "debt_to_equity": 1.6, "interest_coverage": 3.5, "cashflow_volatility": 0.12,
+        "earnings_stability": 0.85, "pe_ratio": 17.0,
+    },
+    "Communication Services": {
+        "operating_margin": 0.20, "net_margin": 0.13, "revenue_growth_3y": 0.07, "pe_ratio": 20.0,
+    },
+}
+
+# Faktor, um den der Restterm eines Ausreißer-Werts gestreckt wird
+_OUTLIER_SCALE = 6.0
+
+_SYMBOL_PREFIX = "SYN"
+
+_TWO_PI = 2.0 * pi
+
+# Erzeugter Block: Symbole, Namen, Sektoren, Kennzahlen zeilenweise
+_Block = Tuple[List[str], List[str], List[str], array]
+
+
+def _sector_distributions(
+    sector: str,
+    overrides: Optional[Mapping[str, MetricDistribution]] = None
+) -> Dict[str, MetricDistribution]:
+    """Verteilungen eines Sektors: Basis, Sektorprofil, dann eigene Vorgaben."""
+    distributions = {
+        field: replace(BASE_DISTRIBUTIONS[field], center=center)
+        for field, center in SECTOR_PROFILES.get(sector, {}).items()
+    }
+    distributions = {**BASE_DISTRIBUTIONS, **distributions, **(overrides or {})}
+    unknown = set(distributions) - set(METRIC_FIELDS)
+    if unknown:
+        raise ValueError(f"Unbekannte Kennzahlen: {', '.join(sorted(unknown))}")
+    return distributions
+
+
+def _standard_normals(rng: random.Random, count: int) -> List[float]:
+    """count standardnormalverteilte Zufallszahlen (Box-Muller, je zwei aus zwei Gleichverteilten)."""
+    rand = rng.random
+    values: List[float] = []
+    extend = values.extend
+    for _ in range((count + 1) // 2):
+        radius = sqrt(-2.0 * log(1.0 - rand()))
+        angle = _TWO_PI * rand()
+        extend((radius * cos(angle), radius * sin(angle)))
+    del values[count:]
+    return values
+
+
+def _allocate(n: int, weights: Sequence[float]) -> List[int]:
+    """Teilt n nach Gewichten auf (Methode des größten Rests, Summe exakt n)."""
+    total = sum(weights)
+    quotas = [n * w / total for w in weights]
+    counts = [int(q) for q in quotas]
+    by_remainder = sorted(range(len(weights)), key=lambda i: counts[i] - quotas[i])
+    for i in by_remainder[:n - sum(counts)]:
+        counts[i] += 1
+    return counts
+
+
+class SyntheticDataSource(DataSourceBase):
+    """
+    Reproduzierbares synthetisches Universum beliebiger Größe.
+
+    Symbole haben die Form SYN0000042 (Index des Unternehmens); gleiche
+    Parameter liefern immer dieselben Daten, unabhängig von Abfragereihenfolge
+    und Engine.
+
+    Verwendung:
+        source = SyntheticDataSource(100_000, seed=7)
+        api = ScoringAPI(data_loader=DataLoader(data_source=source))
+
+        for chunk in SyntheticDataSource(1_000_000).iter_chunks():
+            ...  # FinancialsTable mit chunk_size Zeilen
+
+    Solange das Universum nicht materialisiert ist, liefert
+    get_financials_table() None: Ranker und API lesen dann nur die Blöcke
+    der angefragten Sektoren.
+    """
+
+    def __init__(
+        self,
+        n_companies: int,
+        sector_mix: Optional[Mapping[str, float]] = None,
+        distributions: Optional[Mapping[str, Mapping[str, MetricDistribution]]] = None,
+        seed: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        outlier_rate: Optional[float] = None
+    ):
+        """
+        Legt das Universum fest, ohne Daten zu erzeugen.
+
+        Args:
+            n_companies: Anzahl Unternehmen
+            sector_mix: Sektor -> Anteil (Standard: SYNTHETIC_CONFIG["sector_mix"]);
+                die Anteile werden normiert
+            distributions: Sektor -> Kennzahl -> MetricDistribution; ersetzt
+                einzelne Verteilungen aus BASE_DISTRIBUTIONS/SECTOR_PROFILES
+            seed: Startwert (Standard: SYNTHETIC_CONFIG["seed"])
+            chunk_size: Unternehmen je Block (Standard: SYNTHETIC_CONFIG)
+            outlier_rate: Anteil Unternehmen mit einem Ausreißer-Wert
+
+        Raises:
+            ValueError: Bei negativer Anzahl, leerem oder negativem Sektor-Mix,
+                unbekannten Kennzahlen oder chunk_size <= 0
+        """
+        if n_companies < 0:
+            raise ValueError("n_companies darf nicht negativ sein")
+        mix = dict(sector_mix if sector_mix is not None else SYNTHETIC_CONFIG["sector_mix"])
+        if not mix or any(w < 0 for w in mix.values()) or sum(mix.values()) <= 0:
+            raise ValueError("sector_mix braucht mindestens einen positiven Anteil")
+        self._chunk_size = chunk_size if chunk_size is not None else SYNTHETIC_CONFIG["chunk_size"]
+        if self._chunk_size <= 0:
+            raise ValueError("chunk_size muss größer als 0 sein")
+        self._n = n_companies
+        self._seed = SYNTHETIC_CONFIG["seed"] if seed is None else seed
+        self._outlier_rate = (
+            SYNTHETIC_CONFIG["outlier_rate"] if outlier_rate is None else outlier_rate
+        )
+        self._width = max(7, len(str(max(n_companies - 1, 0))))
+
+        # Zusammenhängende Bereiche je Sektor: (Sektor, erster Index, Ende)
+        self._ranges: List[Tuple[str, int, int]] = []
+        first = 0
+        for sector, count in zip(mix, _allocate(n_companies, list(mix.values()))):
+            self._ranges.append((sector, first, first + count))
+            first += count
+
+        # Pro Sektor und Kennzahl: (Median, Streuung, log, unten, oben, Ladungen, Rest)
+        distributions = distributions or {}
+        self._params: Dict[str, List[tuple]] = {}
+        for sector in mix:
+            sector_distributions = _sector_distributions(sector, distributions.get(sector))
+            params = []
+            for field in METRIC_FIELDS:
+                dist = sector_distributions[field]
+                loadings = FACTOR_LOADINGS[field]
+                rest = sqrt(max(0.0, 1.0 - sum(l * l for l in loadings)))
+                params.append((dist.center, dist.spread, dist.log, dist.lower, dist.upper, loadings, rest))
+            self._params[sector] = params
+
+        self._table: Optional[TableDataSource] = None
+        self._cached_chunk: Optional[Tuple[int, FinancialsTable]] = None
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def chunk_size(self) -> int:
+        """Unternehmen je Block."""
+        return self._chunk_size
+
+    @property
+    def n_chunks(self) -> int:
+        """Anzahl der Blöcke."""
+        return -(-self._n // self._chunk_size)
+
+    @property
+    def sector_counts(self) -> Dict[str, int]:
+        """Sektor -> Anzahl Unternehmen (ohne Daten zu erzeugen)."""
+        return {sector: end - first for sector, first, end in self._ranges}
+
+    def symbol(self, index: int) -> str:
+        """Symbol des Unternehmens mit dem Index index."""
+        return f"{_SYMBOL_PREFIX}{index:0{self._width}d}"
+
+    def index_of(self, symbol: str) -> Optional[int]:
+        """Index eines Symbols (None wenn es nicht zum Universum gehört)."""
+        key = symbol.upper()
+        digits = key[len(_SYMBOL_PREFIX):]
+        if not key.startswith(_SYMBOL_PREFIX) or len(digits) != self._width or not digits.isdigit():
+            return None
+        index = int(digits)
+        return index if index < self._n else None
+
+    def _generate(self, first: int, end: int, chunk: int) -> _Block:
+        """Erzeugt die Unternehmen first..end-1 mit dem Startwert des Blocks (spaltenweise)."""
+        rng = random.Random(f"{self._seed}/{chunk}")
+        n_fields = len(METRIC_FIELDS)
+        symbols, names, sectors = [], [], []
+        buffer = array("d")
+        for sector, sector_first, sector_end in self._ranges:
+            lo, hi = max(first, sector_first), min(end, sector_end)
+            if lo >= hi:
+                continue
+            count = hi - lo
+            quality = _standard_normals(rng, count)
+            growth = _standard_normals(rng, count)
+            risk = _standard_normals(rng, count)
+            # Ausreißer: je betroffenem Unternehmen eine zufällige Kennzahl
+            outliers: Dict[int, List[int]] = {}
+            for row in range(count):
+                if rng.random() < self._outlier_rate:
+                    outliers.setdefault(int(rng.random() * n_fields), []).append(row)
+
+            segment = array("d", bytes(8 * count * n_fields))
+            for j, (center, spread, lognormal, lower, upper, (lq, lg, lr), rest) in enumerate(self._params[sector]):
+                noise = _standard_normals(rng, count)
+                for row in outliers.get(j, ()):
+                    noise[row] *= _OUTLIER_SCALE
+                z = [lq * q + lg * g + lr * r + rest * e for q, g, r, e in zip(quality, growth, risk, noise)]
+                if lognormal:
+                    values = [center * exp(spread * v) for v in z]
+                else:
+                    values = [center + spread * v for v in z]
+                if lower is not None:
+                    values = [v if v > lower else lower for v in values]
+                if upper is not None:
+                    values = [v if v < upper else upper for v in values]
+                segment[j::n_fields] = array("d", values)
+
+            buffer.extend(segment)
+            symbols.extend(map(self.symbol, range(lo, hi)))
+            names.extend(f"Synthetic {sector} {index}" for index in range(lo, hi))
+            sectors.extend([sector] * count)
+        return symbols, names, sectors, buffer
+
+    def chunk(self, chunk: int) -> FinancialsTable:
+        """
+        Erzeugt einen Block als eigenständige FinancialsTable.
+
+        Args:
+            chunk: Blocknummer (0 bis n_chunks - 1)
+
+        Raises:
+            IndexError: Bei unbekannter Blocknummer
+        """
+        if not 0 <= chunk < self.n_chunks:
+            raise IndexError(chunk)
+        if self._cached_chunk is not None and self._cached_chunk[0] == chunk:
+            return self._cached_chunk[1]
+        first = chunk * self._chunk_size
+        table = FinancialsTable()
+        symbols, names, sectors, buffer = self._generate(first, min(first + self._chunk_size, self._n), chunk)
+        table.extend_rows(symbols, names, sectors, buffer)
+        # Ein Block bleibt gecacht (aufeinanderfolgende Einzelabfragen)
+        self._cached_chunk = (chunk, table)
+        return table
+
+    def iter_chunks(self) -> Iterator[FinancialsTable]:
+        """Erzeugt das Universum Block für Block (Speicherbedarf: ein Block)."""
+        for chunk in range(self.n_chunks):
+            yield self.chunk(chunk)
+
+    def iter_companies(self) -> Iterator[CompanyFinancials]:
+        """Alle Unternehmen als Objekte, blockweise erzeugt."""
+        for table in self.iter_chunks():
+            yield from map(table.company, range(len(table)))
+
+    def _materialized(self) -> TableDataSource:
+        """Komplette Tabelle, beim ersten Bedarf Block für Block aufgebaut."""
+        if self._table is None:
+            table = FinancialsTable()
+            for chunk in range(self.n_chunks):
+                first = chunk * self._chunk_size
+                table.extend_rows(*self._generate(first, min(first + self._chunk_size, self._n), chunk))
+            self._table = TableDataSource(table)
+            self._cached_chunk = None
+        return self._table
+
+    def get_company_data(self, symbol: str) -> Optional[CompanyFinancials]:
+        """Lädt ein Unternehmen (erzeugt nur dessen Block)."""
+        if self._table is not None:
+            return self._table.get_company_data(symbol)
+        index = self.index_of(symbol)
+        if index is None:
+            return None
+        return self.chunk(index // self._chunk_size).get(symbol)
+
+    def get_companies(self, symbols: Iterable[str]) -> Dict[str, CompanyFinancials]:
+        """Lädt mehrere Unternehmen (jeder benötigte Block wird einmal erzeugt)."""
+        if self._table is not None:
+            return self._table.get_companies(symbols)
+        by_chunk: Dict[int, List[str]] = {}
+        for symbol in dict.fromkeys(symbol.upper() for symbol in symbols):
+            index = self.index_of(symbol)
+            if index is not None:
+                by_chunk.setdefault(index // self._chunk_size, []).append(symbol)
+        companies = {}
+        for chunk in sorted(by_chunk):
+            table = self.chunk(chunk)
+            for symbol in by_chunk[chunk]:
+                companies[symbol] = table.get(symbol)
+        return companies
+
+    def get_sector_companies(self, sector: str) -> List[CompanyFinancials]:
+        """Lädt alle Unternehmen eines Sektors (erzeugt nur die betroffenen Blöcke)."""
+        if self._table is not None:
+            return self._table.get_sector_companies(sector)
+        companies = []
+        for name, first, end in self._ranges:
+            if name != sector or first == end:
+                continue
+            for chunk in range(first // self._chunk_size, (end - 1) // self._chunk_size + 1):
+                table = self.chunk(chunk)
+                companies.extend(table.company(row) for row in table.sector_rows(sector))
+        return companies
+
+    def get_all_companies(self) -> List[CompanyFinancials]:
+        """Lädt alle Unternehmen."""
+        if self._table is not None:
+            return self._table.get_all_companies()
+        return list(self.iter_companies())
+
+    def get_available_symbols(self) -> List[str]:
+        """Gibt alle Symbole zurück (ohne Daten zu erzeugen)."""
+        if self._table is not None:
+            return self._table.get_available_symbols()
+        return [self.symbol(index) for index in range(self._n)]
+
+    def get_available_sectors(self) -> Sequence[str]:
+        """Gibt alle Sektoren mit mindestens einem Unternehmen zurück."""
+        if self._table is not None:
+            return self._table.get_available_sectors()
+        return tuple(sector for sector, first, end in self._ranges if end > first)
+
+    def upsert_company(self, company: CompanyFinancials) -> None:
+        """Überschreibt ein Unternehmen (baut dafür die komplette Tabelle auf)."""
+        self._materialized().upsert_company(company)
+
+    def delete_company(self, symbol: str) -> bool:
+        """Entfernt ein Unternehmen (baut dafür die komplette Tabelle auf)."""
+        return self._materialized().delete_company(symbol)
+
+    def materialize(self) -> FinancialsTable:
+        """Erzeugt die komplette Tabelle (einmalig) und bedient danach alle Abfragen daraus."""
+        return self._materialized().get_financials_table()
+
+    def get_financials_table(self) -> Optional[FinancialsTable]:
+        """
+        Komplette Tabelle, falls bereits materialisiert.
+
+        Returns:
+            FinancialsTable oder None (dann arbeiten Abnehmer sektorweise
+            über get_sector_companies())
+        """
+        if self._table is None:
+            return None
+        return self._table.get_financials_table()
@@ -5,9 +5,43 @@ Testet alle Module auf korrekte Funktionalität.
 """
 
 import unittest
-from scoring.data_loader import DataLoader, MockDataSource, get_data_loader
-from scoring.scorer import Scorer, get_scorer, calculate_percentile_score, winsorize
-from scoring.sector_ranker import SectorRanker, get_sector_ranker
+import json
+import random
+import os
+import subprocess
+import sys
+import tempfile
+import asyncio
+import threading
+import warnings
+import gc
+import time
+from array import array
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit, parse_qs
+from dataclasses import FrozenInstanceError, asdict, replace
+from scoring.data_loader import (
+    DataLoader, MockDataSource, FileDataSource, CachingDataSource, CompanyFinancials,
+    FinancialsTable, METRIC_FIELDS, get_data_loader
+)
+from scoring.scorer import (
+    Scorer, ScoreResult, get_scorer, calculate_percentile_score, calculate_percentile_scores, winsorize
+)
+from scoring.engine import HAS_NUMPY, rank_matrix, group_means
+from scoring.metric_index import SectorMetricIndex
+from scoring.sector_ranker import SectorRanker, GroupRanker, get_sector_ranker
+from scoring.async_source import AsyncDataSourceBase, AsyncSourceAdapter
+from scoring.http_source import HttpDataSource, HttpSourceError, LatencyHistogram, TokenBucket
+from scoring.mmap_store import MmapDataSource, write_mmap_file
+from scoring.synthetic import MetricDistribution, SyntheticDataSource
+from scoring.peer_groups import AttributeGroups, BandGroups, CustomGroups, SectorGroups
+from scoring.leaderboard import GlobalLeaderboard
+from scoring.screener import Screener
+from scoring.scenarios import WeightSweep, sample_weight_sets
+from scoring.history import SnapshotStore, HistoricalScorer
+from scoring.sketch import KLLSketch, MetricSketches, k_for_error
+from scoring.changes import ChangeLog, ChangeSet
+from scoring.config import SCORE_WEIGHTS
 from scoring.text_generator import TextGenerator, get_text_generator, get_traffic_light
 from scoring.api import ScoringAPI, get_scoring_api, score_company
 
@@ -47,6 +81,780 @@ class TestDataLoader(unittest.TestCase):
         """Test: Alle Unternehmen laden."""
         all_companies = self.loader.get_all_companies()
         self.assertGreater(len(all_companies), 10)
+    
+    def test_delete_company(self):
+        """Test: Gelöschte Unternehmen verschwinden aus Symbol- und Sektorabfragen."""
+        self.assertTrue(self.loader.delete_company("aapl"))
+        self.assertIsNone(self.loader.get_company_data("AAPL"))
+        self.assertNotIn("AAPL", [c.symbol for c in self.loader.get_sector_companies("Technology")])
+        self.assertNotIn("AAPL", self.loader.get_available_symbols())
+        self.assertFalse(self.loader.delete_company("AAPL"))
+    
+    def test_source_built_on_first_use(self):
+        """Test: Die Mock-Quelle entsteht erst beim ersten Zugriff, mit einem Zeitstempel."""
+        loader = DataLoader(use_mock=True)
+        self.assertIsNone(loader._source)
+        companies = loader.get_all_companies()
+        self.assertIsInstance(loader._source, MockDataSource)
+        self.assertEqual(len({c.last_updated for c in companies}), 1)
+    
+    def test_get_companies(self):
+        """Test: Sammelabfrage (case-insensitive, Duplikate und unbekannte Symbole)."""
+        companies = self.loader.get_companies(["aapl", "MSFT", "AAPL", "NONEXISTENT"])
+        self.assertEqual(list(companies), ["AAPL", "MSFT"])
+        self.assertEqual(companies["MSFT"], self.loader.get_company_data("MSFT"))
+        self.assertEqual(self.loader.get_companies([]), {})
+
+
+class TestFinancialsTable(unittest.TestCase):
+    """Tests für die spaltenorientierte Kennzahlen-Tabelle."""
+    
+    def setUp(self):
+        self.companies = DataLoader(use_mock=True).get_all_companies()
+        self.table = FinancialsTable.from_companies(self.companies)
+    
+    def test_roundtrip(self):
+        """Test: Zeilen ergeben wieder identische CompanyFinancials."""
+        self.assertEqual(len(self.table), len(self.companies))
+        for company in self.companies:
+            self.assertEqual(self.table.get(company.symbol.lower()), company)
+    
+    def test_upsert_overwrites_row(self):
+        """Test: Upsert überschreibt eine bestehende Zeile."""
+        updated = replace(self.companies[0], roic=1.23)
+        row = self.table.upsert(updated)
+        self.assertEqual(row, self.table.row_of(updated.symbol))
+        self.assertEqual(len(self.table), len(self.companies))
+        self.assertEqual(self.table.columns["roic"][row], 1.23)
+    
+    def test_sector_index_follows_updates(self):
+        """Test: Sektor-Index bleibt bei Sektorwechsel und Löschen konsistent."""
+        def scanned(sector):
+            return tuple(row for row, s in enumerate(self.table.sectors) if s == sector)
+        
+        rows = self.table.sector_rows("Technology")
+        self.assertIsInstance(rows, tuple)
+        self.assertIs(self.table.sector_rows("Technology"), rows)
+        
+        moved = replace(self.companies[0], sector="Energy")
+        self.table.upsert(moved)
+        self.assertTrue(self.table.delete(self.companies[3].symbol))
+        self.assertFalse(self.table.delete("NONEXISTENT"))
+        self.assertEqual(len(self.table), len(self.companies) - 1)
+        self.assertIsNone(self.table.row_of(self.companies[3].symbol))
+        for sector in set(self.table.sectors):
+            self.assertEqual(self.table.sector_rows(sector), scanned(sector))
+        for company in self.companies[4:]:
+            self.assertEqual(self.table.get(company.symbol), company)
+        
+        for company in self.companies:
+            if company.sector == "Consumer Staples":
+                self.table.delete(company.symbol)
+        self.assertNotIn("Consumer Staples", self.table.available_sectors())
+        self.assertEqual(self.table.sector_rows("Consumer Staples"), ())
+    
+    def test_score_table_matches_score_sector(self):
+        """Test: Scoring direkt aus der Tabelle entspricht dem Objekt-Scoring."""
+        scorer = Scorer()
+        sector_companies = [c for c in self.companies if c.sector == "Healthcare"]
+        self.assertEqual(
+            scorer.score_table(self.table, "Healthcare"),
+            scorer.score_sector(sector_companies)
+        )
+        self.assertEqual(scorer.score_table(self.table, "Unknown"), {})
+
+
+class TestFileDataSource(unittest.TestCase):
+    """Tests für die Datei-Datenquelle (CSV/JSONL)."""
+    
+    def setUp(self):
+        self.companies = [c for c in DataLoader(use_mock=True).get_all_companies()
+                          if c.sector in ("Technology", "Healthcare")]
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+    
+    def _write(self, name, text):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(text)
+        return path
+    
+    def _csv(self, companies, extra_lines=()):
+        header = ["symbol", "name", "sector"] + METRIC_FIELDS + ["last_updated"]
+        lines = [",".join(header)]
+        for c in companies:
+            values = [c.symbol, c.name, c.sector] + [repr(getattr(c, f)) for f in METRIC_FIELDS]
+            lines.append(",".join(values + [c.last_updated or ""]))
+        return "\n".join(lines + list(extra_lines)) + "\n"
+    
+    def test_csv_roundtrip(self):
+        """Test: CSV-Zeilen ergeben identische CompanyFinancials und Scores."""
+        source = FileDataSource(self._write("data.csv", self._csv(self.companies)))
+        self.assertEqual(source.errors, [])
+        self.assertEqual(source.get_all_companies(), self.companies)
+        self.assertEqual(sorted(source.get_available_sectors()), ["Healthcare", "Technology"])
+        scorer = Scorer()
+        self.assertEqual(
+            scorer.score_sector(source.get_sector_companies("Technology")),
+            scorer.score_sector([c for c in self.companies if c.sector == "Technology"])
+        )
+    
+    def test_jsonl_matches_csv(self):
+        """Test: JSONL liefert dieselben Daten wie CSV."""
+        lines = [json.dumps(asdict(c)) for c in self.companies]
+        source = FileDataSource(self._write("data.jsonl", "\n".join(lines) + "\n\n"))
+        self.assertEqual(source.errors, [])
+        self.assertEqual(source.get_all_companies(), self.companies)
+        self.assertEqual(source.get_company_data("aapl"), self.companies[0])
+    
+    def test_malformed_rows_reported(self):
+        """Test: Fehlerhafte Zeilen werden mit Zeilennummer übersprungen."""
+        n = len(self.companies)
+        bad = [
+            "BAD1,Kaputt,Technology," + ",".join(["x"] * len(METRIC_FIELDS)) + ",",
+            "BAD2,Zu kurz,Technology,1.0",
+            ",Ohne Symbol,Technology," + ",".join(["1.0"] * len(METRIC_FIELDS)) + ",",
+            "BAD3,Unendlich,Technology," + ",".join(["inf"] * len(METRIC_FIELDS)) + ",",
+        ]
+        source = FileDataSource(self._write("data.csv", self._csv(self.companies, bad)))
+        self.assertEqual([e.line for e in source.errors], [n + 2, n + 3, n + 4, n + 5])
+        self.assertEqual(len(source.get_available_symbols()), n)
+        
+        jsonl = self._write("data.jsonl", '{"symbol": "X"\n[1, 2]\n')
+        self.assertEqual([e.line for e in FileDataSource(jsonl).errors], [1, 2])
+    
+    def _small_blocks(self, rows):
+        import scoring.data_loader as data_loader
+        self.addCleanup(setattr, data_loader, "_LOAD_CHUNK_ROWS", data_loader._LOAD_CHUNK_ROWS)
+        data_loader._LOAD_CHUNK_ROWS = rows
+    
+    def test_blocks_with_quotes_and_errors(self):
+        """Test: Blockweises Laden mit Anführungszeichen, Zeilenumbrüchen in Feldern und Fehlern in späteren Blöcken."""
+        self._small_blocks(4)
+        companies = list(self.companies)
+        companies[2] = replace(companies[2], name="Komma, Inc.")
+        companies[3] = replace(companies[3], name="Zwei\nZeilen")
+        text = self._csv(companies).replace(companies[2].name, f'"{companies[2].name}"')
+        text = text.replace(companies[3].name, f'"{companies[3].name}"')
+        bad = "BAD,Kaputt,Technology," + ",".join(["x"] * len(METRIC_FIELDS)) + ","
+        source = FileDataSource(self._write("data.csv", text + bad + "\n"))
+        # Kopfzeile + Unternehmen, eines davon über zwei Zeilen
+        self.assertEqual([e.line for e in source.errors], [len(companies) + 3])
+        self.assertEqual(source.get_all_companies(), companies)
+        
+        lines = [json.dumps(asdict(c)) for c in self.companies]
+        lines[5:5] = ["", '{"symbol": "X"}']
+        source = FileDataSource(self._write("data.jsonl", "\n".join(lines) + "\n"))
+        self.assertEqual([e.line for e in source.errors], [7])
+        self.assertEqual(source.get_all_companies(), self.companies)
+    
+    def test_duplicates_keep_last_row(self):
+        """Test: Doppelte Symbole überschreiben die frühere Zeile, auch bei Sektorwechsel."""
+        moved = replace(self.companies[0], sector="Healthcare", roic=1.5)
+        source = FileDataSource(self._write("data.csv", self._csv(self.companies + [moved])))
+        self.assertEqual(len(source.get_available_symbols()), len(self.companies))
+        self.assertEqual(source.get_company_data(moved.symbol), moved)
+        self.assertIn(moved, source.get_sector_companies("Healthcare"))
+        self.assertNotIn(moved.symbol, [c.symbol for c in source.get_sector_companies("Technology")])
+    
+    def test_invalid_format_and_missing_columns(self):
+        """Test: Unbekannte Formate und fehlende Spalten werden abgelehnt."""
+        with self.assertRaises(ValueError):
+            FileDataSource(self._write("data.xml", ""))
+        with self.assertRaises(ValueError):
+            FileDataSource(self._write("data.csv", "symbol,name,sector\nA,B,Technology\n"))
+    
+    def test_data_loader_uses_configured_file(self):
+        """Test: DataLoader(use_mock=False) lädt die konfigurierte Datei."""
+        from scoring.config import DATA_SOURCE_CONFIG
+        path = self._write("data.csv", self._csv(self.companies))
+        original = DATA_SOURCE_CONFIG["file_path"]
+        self.addCleanup(DATA_SOURCE_CONFIG.__setitem__, "file_path", original)
+        DATA_SOURCE_CONFIG["file_path"] = path
+        loader = DataLoader(use_mock=False)
+        self.assertEqual(len(loader.get_available_symbols()), len(self.companies))
+        DATA_SOURCE_CONFIG["file_path"] = None
+        with self.assertRaises(NotImplementedError):
+            DataLoader(use_mock=False)
+
+
+class TestMmapStore(unittest.TestCase):
+    """Tests für das binäre mmap-Format."""
+    
+    def setUp(self):
+        self.companies = DataLoader(use_mock=True).get_all_companies()
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = os.path.join(tmpdir.name, "financials.capsnap")
+        write_mmap_file(self.path, self.companies)
+        self.source = MmapDataSource(self.path)
+        self.addCleanup(self.source.close)
+    
+    def test_roundtrip(self):
+        """Test: Alle Unternehmen kommen unverändert zurück."""
+        by_symbol = lambda c: c.symbol
+        self.assertEqual(len(self.source), len(self.companies))
+        self.assertEqual(
+            sorted(self.source.get_all_companies(), key=by_symbol),
+            sorted(self.companies, key=by_symbol)
+        )
+        self.assertEqual(sorted(self.source.get_available_symbols()), sorted(map(by_symbol, self.companies)))
+    
+    def test_lookups(self):
+        """Test: Symbol-Suche (case-insensitive) und Sektoren."""
+        for company in self.companies:
+            self.assertEqual(self.source.get_company_data(company.symbol.lower()), company)
+        self.assertIsNone(self.source.get_company_data("NONEXISTENT"))
+        self.assertEqual(
+            sorted(self.source.get_available_sectors()),
+            sorted({c.sector for c in self.companies})
+        )
+        tech = [c for c in self.companies if c.sector == "Technology"]
+        self.assertCountEqual(self.source.get_sector_companies("Technology"), tech)
+        self.assertEqual(self.source.get_sector_companies("Unknown"), [])
+        self.assertEqual(
+            self.source.get_companies(["msft", "AAPL", "NONEXISTENT"]),
+            {"MSFT": self.source.get_company_data("MSFT"), "AAPL": self.source.get_company_data("AAPL")}
+        )
+    
+    def test_scores_match_mock(self):
+        """Test: Scores über die mmap-Datei entsprechen den Mock-Scores."""
+        api = ScoringAPI(data_loader=DataLoader(data_source=self.source))
+        mock_api = ScoringAPI(data_loader=DataLoader(use_mock=True))
+        for symbol in ("AAPL", "JNJ", "XOM"):
+            self.assertEqual(api.get_company_score(symbol), mock_api.get_company_score(symbol))
+    
+    def test_table_view(self):
+        """Test: Tabellen-Sicht mit Sektor-Bereichen und Kennzahlen ohne Kopie."""
+        table = self.source.get_financials_table()
+        companies = self.source.get_all_companies()
+        self.assertEqual(list(table.symbols), [c.symbol for c in companies])
+        self.assertEqual(list(table.sectors), [c.sector for c in companies])
+        self.assertEqual(table.sectors[-1], companies[-1].sector)
+        rows = table.sector_rows("Technology")
+        self.assertIsInstance(rows, range)
+        buffer = table.metric_buffer(rows)
+        self.assertIsInstance(buffer, memoryview)
+        n_fields = len(METRIC_FIELDS)
+        for row in rows:
+            expected = [getattr(companies[row], field) for field in METRIC_FIELDS]
+            first = (row - rows.start) * n_fields
+            self.assertEqual(buffer[first:first + n_fields].tolist(), expected)
+        swapped = table.metric_buffer([rows[1], rows[0]])
+        self.assertEqual(list(swapped), list(buffer[n_fields:2 * n_fields]) + list(buffer[:n_fields]))
+        
+        from scoring.parallel import build_table_payload
+        payload = build_table_payload(table, "Technology")
+        reference = build_table_payload(FinancialsTable.from_companies(self.companies), "Technology")
+        self.assertIsInstance(payload.metrics, array)
+        as_rows = lambda p: {s: list(p.metrics[i * n_fields:(i + 1) * n_fields]) for i, s in enumerate(p.symbols)}
+        self.assertEqual(as_rows(payload), as_rows(reference))
+    
+    def test_ranking_builds_no_objects(self):
+        """Test: Ranking und Gruppen lesen den Kennzahlen-Block, nicht einzelne Objekte."""
+        calls = []
+        company = self.source._company
+        self.source._company = lambda row: calls.append(row) or company(row)
+        ranker = SectorRanker(data_loader=DataLoader(data_source=self.source), scorer=Scorer())
+        for sector in ranker.get_available_sectors():
+            ranker.get_sector_scores(sector)
+        self.assertIn("AAPL", ranker.get_group_members("Technology"))
+        themes = GroupRanker(CustomGroups("themes", {"Chips": ["NVDA", "AAPL"]}), DataLoader(data_source=self.source))
+        self.assertEqual(len(themes.get_group_scores("Chips")), 2)
+        self.assertEqual(calls, [])
+    
+    def test_rejects_foreign_file(self):
+        """Test: Andere Dateien werden abgelehnt."""
+        other = self.path + ".csv"
+        with open(other, "wb") as handle:
+            handle.write(b"symbol,name,sector\n" * 10)
+        with self.assertRaises(ValueError):
+            MmapDataSource(other)
+    
+    def test_data_loader_opens_mmap_file(self):
+        """Test: DataLoader(use_mock=False) erkennt die Dateiendung."""
+        from scoring.config import DATA_SOURCE_CONFIG
+        original = DATA_SOURCE_CONFIG["file_path"]
+        self.addCleanup(DATA_SOURCE_CONFIG.__setitem__, "file_path", original)
+        DATA_SOURCE_CONFIG["file_path"] = self.path
+        loader = DataLoader(use_mock=False)
+        self.assertIsInstance(loader.source, MmapDataSource)
+        self.assertEqual(loader.get_company_data("AAPL"), self.source.get_company_data("AAPL"))
+        loader.source.close()
+
+
+class _CountingSource(MockDataSource):
+    """Mock-Datenquelle, die Abfragen je Methode zählt."""
+    
+    def __init__(self):
+        super().__init__()
+        self.calls = {}
+    
+    def _count(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+    
+    def get_company_data(self, symbol):
+        self._count("company")
+        return super().get_company_data(symbol)
+    
+    def get_companies(self, symbols):
+        self._count("companies")
+        return super().get_companies(symbols)
+    
+    def get_sector_companies(self, sector):
+        self._count("sector")
+        return super().get_sector_companies(sector)
+
+
+class _RowSource(_CountingSource):
+    """Zählende Datenquelle ohne spaltenorientierte Sicht."""
+    
+    def get_financials_table(self):
+        return None
+
+
+class TestCachingDataSource(unittest.TestCase):
+    """Tests für den Cache vor einer Datenquelle."""
+    
+    def setUp(self):
+        self.now = 0.0
+        self.inner = _CountingSource()
+        self.source = CachingDataSource(
+            self.inner, ttl_hours=1, max_entries=3, clock=lambda: self.now
+        )
+    
+    def test_hits_within_ttl(self):
+        """Test: Innerhalb der TTL wird die Quelle nur einmal je Schlüssel gefragt."""
+        for _ in range(3):
+            self.assertEqual(self.source.get_company_data("aapl").symbol, "AAPL")
+            self.source.get_sector_companies("Technology")
+        self.assertEqual(self.inner.calls, {"company": 1, "sector": 1})
+        stats = self.source.stats
+        self.assertEqual((stats.hits, stats.misses), (4, 2))
+        
+        self.now = 3601.0
+        self.source.get_company_data("AAPL")
+        self.assertEqual(self.inner.calls["company"], 2)
+        self.assertEqual(self.source.stats.expirations, 1)
+    
+    def test_lru_eviction_and_negative_cache(self):
+        """Test: Größenbegrenzung verdrängt den ältesten Eintrag; unbekannte Symbole werden gecacht."""
+        for symbol in ("AAPL", "MSFT", "NONEXISTENT"):
+            self.source.get_company_data(symbol)
+        self.source.get_company_data("AAPL")      # AAPL wieder frisch
+        self.source.get_company_data("JNJ")       # verdrängt MSFT
+        self.assertEqual(self.source.stats.evictions, 1)
+        self.assertIsNone(self.source.get_company_data("NONEXISTENT"))
+        self.source.get_company_data("MSFT")
+        self.assertEqual(self.inner.calls["company"], 5)
+        
+        uncached = CachingDataSource(self.inner, negative_cache=False)
+        uncached.get_company_data("NONEXISTENT")
+        uncached.get_company_data("NONEXISTENT")
+        self.assertEqual(self.inner.calls["company"], 7)
+    
+    def test_upsert_invalidates(self):
+        """Test: Aktualisierungen verwerfen Symbol- und Sektor-Einträge."""
+        company = self.source.get_company_data("AAPL")
+        self.source.get_sector_companies("Technology")
+        updated = replace(company, roic=1.23)
+        self.source.upsert_company(updated)
+        self.assertEqual(self.source.get_company_data("AAPL"), updated)
+        self.assertIn(updated, self.source.get_sector_companies("Technology"))
+        self.assertEqual(self.inner.calls, {"company": 2, "sector": 2})
+    
+    def test_get_companies_loads_misses_in_one_call(self):
+        """Test: Sammelabfragen laden nur nicht gecachte Symbole, gesammelt in einem Aufruf."""
+        self.source.get_company_data("AAPL")
+        companies = self.source.get_companies(["AAPL", "MSFT", "NONEXISTENT"])
+        self.assertEqual(list(companies), ["AAPL", "MSFT"])
+        self.assertEqual(self.inner.calls, {"company": 1, "companies": 1})
+        self.source.get_companies(["msft", "NONEXISTENT"])
+        self.assertIsNotNone(self.source.get_company_data("MSFT"))
+        self.assertEqual(self.inner.calls, {"company": 1, "companies": 1})
+
+
+class _StubMarketServer:
+    """Lokaler HTTP-Server mit Mock-Daten, künstlicher Latenz und Fehlerantworten."""
+    
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.fail_next = []      # Statuscodes für die nächsten Anfragen (z.B. 429, 503)
+        self.connections = 0
+        self.requests = 0
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+        self.source = MockDataSource()
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+            
+            def log_message(self, *args):
+                pass
+            
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+            
+            def do_GET(self):
+                status, body = stub.handle(self.path)
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                if status == 429:
+                    self.send_header("Retry-After", "0")
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+        
+        class Server(ThreadingHTTPServer):
+            daemon_threads = True
+            request_queue_size = 128   # viele gleichzeitige Verbindungsaufbauten
+        
+        self._server = Server(("127.0.0.1", 0), Handler)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+    
+    def handle(self, path):
+        with self._lock:
+            self.requests += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            with self._lock:
+                failure = self.fail_next.pop(0) if self.fail_next else None
+            if failure is not None:
+                return failure, {"error": "simulated"}
+            url = urlsplit(path)
+            parts = [unquote(part) for part in url.path.strip("/").split("/")]
+            if parts == ["sectors"]:
+                return 200, list(self.source.get_available_sectors())
+            if len(parts) == 2 and parts[0] == "sectors":
+                companies = self.source.get_sector_companies(parts[1])
+                return (200, [c.symbol for c in companies]) if companies else (404, {})
+            if parts == ["companies"]:
+                symbols = parse_qs(url.query).get("symbols", [""])[0].split(",")
+                found = (self.source.get_company_data(symbol) for symbol in symbols if symbol)
+                return 200, [asdict(c) for c in found if c is not None]
+            if len(parts) == 2 and parts[0] == "company":
+                company = self.source.get_company_data(parts[1])
+                if company is not None:
+                    return 200, asdict(company)
+            return 404, {"error": "not found"}
+        finally:
+            with self._lock:
+                self.active -= 1
+    
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class _StubAsyncSource(AsyncDataSourceBase):
+    """Asynchrone Quelle für den Stub-Server (eine Verbindung pro Anfrage)."""
+    
+    def __init__(self, port, max_concurrency=16):
+        self.port = port
+        self.max_concurrency = max_concurrency
+    
+    async def _get(self, path):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: stub\r\nConnection: close\r\n\r\n".encode())
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        await writer.wait_closed()
+        head, _, body = response.partition(b"\r\n\r\n")
+        status = int(head.split()[1])
+        return json.loads(body) if status == 200 else None
+    
+    async def get_company_data(self, symbol):
+        data = await self._get(f"/company/{symbol.upper()}")
+        return None if data is None else CompanyFinancials(**data)
+    
+    async def get_sector_symbols(self, sector):
+        return await self._get(f"/sectors/{sector.replace(' ', '%20')}") or []
+    
+    async def get_available_sectors(self):
+        return await self._get("/sectors")
+
+
+class TestAsyncDataSource(unittest.TestCase):
+    """Tests für asynchrone Datenquellen gegen einen lokalen HTTP-Server."""
+    
+    def setUp(self):
+        self.server = _StubMarketServer()
+        self.addCleanup(self.server.close)
+        self.adapter = AsyncSourceAdapter(_StubAsyncSource(self.server.port))
+        self.addCleanup(self.adapter.close)
+    
+    def test_adapter_matches_mock(self):
+        """Test: Der Adapter liefert dieselben Daten wie die Mock-Quelle."""
+        mock = self.server.source
+        self.assertEqual(self.adapter.get_company_data("aapl"), mock.get_company_data("AAPL"))
+        self.assertIsNone(self.adapter.get_company_data("NONEXISTENT"))
+        self.assertCountEqual(self.adapter.get_available_sectors(), mock.get_available_sectors())
+        self.assertCountEqual(self.adapter.get_all_companies(), mock.get_all_companies())
+    
+    def test_closed_adapter_leaves_no_coroutine(self):
+        """Test: Aufrufe nach close() hinterlassen keine nie abgewartete Coroutine."""
+        self.adapter.close()
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            with self.assertRaises(RuntimeError):
+                self.adapter.get_company_data("AAPL")
+            gc.collect()
+        self.assertEqual([w for w in caught if issubclass(w.category, RuntimeWarning)], [])
+    
+    def test_cold_sector_latency(self):
+        """Test: Ein kalter Sektor kostet etwa die langsamste Anfrage, nicht die Summe."""
+        symbols = [c.symbol for c in self.server.source.get_sector_companies("Technology")]
+        self.assertGreaterEqual(len(symbols), 4)
+        self.server.delay = 0.05
+        start = time.perf_counter()
+        companies = self.adapter.get_sector_companies("Technology")
+        elapsed = time.perf_counter() - start
+        self.assertCountEqual([c.symbol for c in companies], symbols)
+        # Sequenziell: (1 + len(symbols)) × 50 ms
+        self.assertLess(elapsed, (1 + len(symbols)) * 0.05 * 0.6)
+    
+    def test_bounded_concurrency(self):
+        """Test: max_concurrency begrenzt die gleichzeitigen Anfragen."""
+        self.server.delay = 0.01
+        with AsyncSourceAdapter(_StubAsyncSource(self.server.port, max_concurrency=2)) as adapter:
+            companies = adapter.get_all_companies()
+        self.assertEqual(len(companies), len(self.server.source.get_all_companies()))
+        self.assertLessEqual(self.server.peak, 2)
+    
+    def test_scoring_api_with_adapter(self):
+        """Test: ScoringAPI arbeitet über den Adapter wie mit Mock-Daten."""
+        api = ScoringAPI(data_loader=DataLoader(data_source=self.adapter))
+        mock_api = ScoringAPI(data_loader=DataLoader(data_source=self.server.source))
+        self.assertEqual(api.get_company_score("MSFT"), mock_api.get_company_score("MSFT"))
+
+
+class TestHttpDataSource(unittest.TestCase):
+    """Ende-zu-Ende-Tests der HTTP-Datenquelle gegen einen lokalen Stub-Server."""
+    
+    def setUp(self):
+        self.server = _StubMarketServer()
+        self.addCleanup(self.server.close)
+    
+    def _adapter(self, **options):
+        options.setdefault("backoff_s", 0.001)
+        options.setdefault("rate_per_second", 1000)
+        adapter = AsyncSourceAdapter(
+            HttpDataSource(f"http://127.0.0.1:{self.server.port}/", **options)
+        )
+        self.addCleanup(adapter.close)
+        return adapter
+    
+    def test_batches_over_pooled_connections(self):
+        """Test: Symbole werden gebündelt, Verbindungen wiederverwendet."""
+        adapter = self._adapter(batch_size=4, pool_size=2)
+        expected = self.server.source.get_all_companies()
+        self.assertCountEqual(adapter.get_all_companies(), expected)
+        self.assertCountEqual(adapter.get_sector_companies("Healthcare"),
+                              self.server.source.get_sector_companies("Healthcare"))
+        self.assertEqual(adapter.get_sector_companies("Unknown"), [])
+        self.assertIsNone(adapter.get_company_data("NONEXISTENT"))
+        
+        stats = adapter.source.stats
+        histogram = adapter.source.latency["companies"]
+        self.assertGreaterEqual(histogram.count, -(-len(expected) // 4))
+        self.assertLess(histogram.count, len(expected))
+        self.assertLessEqual(stats.connections, 2)
+        self.assertLessEqual(self.server.connections, 2)
+        self.assertLess(stats.connections, stats.requests)
+    
+    def test_retries_rate_limit_and_server_errors(self):
+        """Test: 429 und 5xx werden mit Backoff wiederholt, andere Fehler nicht."""
+        adapter = self._adapter(max_retries=2)
+        self.server.fail_next = [429, 503]
+        self.assertEqual(adapter.get_company_data("AAPL").symbol, "AAPL")
+        stats = adapter.source.stats
+        self.assertEqual((stats.retries, stats.rate_limited, stats.failures), (2, 1, 0))
+        
+        self.server.fail_next = [503, 503, 503]
+        with self.assertRaises(HttpSourceError):
+            adapter.get_company_data("AAPL")
+        self.server.fail_next = [400]
+        with self.assertRaises(HttpSourceError) as context:
+            adapter.get_company_data("AAPL")
+        self.assertEqual(context.exception.status, 400)
+        self.assertEqual(adapter.source.stats.failures, 2)
+    
+    def test_token_bucket_limits_rate(self):
+        """Test: Der Token-Bucket hält die mittlere Rate ein."""
+        async def drain():
+            bucket = TokenBucket(rate=100, burst=2)
+            start = time.perf_counter()
+            for _ in range(12):
+                await bucket.acquire()
+            return time.perf_counter() - start
+        
+        # 2 Token sofort, 10 weitere mit 100 pro Sekunde
+        self.assertGreaterEqual(asyncio.run(drain()), 0.09)
+    
+    def test_latency_histogram(self):
+        """Test: Perzentile liegen an den Bucket-Grenzen."""
+        histogram = LatencyHistogram()
+        for ms in [3] * 90 + [40] * 9 + [15000]:
+            histogram.record(ms)
+        self.assertEqual(histogram.percentile(50), 5)
+        self.assertEqual(histogram.percentile(95), 50)
+        self.assertEqual(histogram.percentile(100), 15000)
+        self.assertEqual(histogram.to_dict()["buckets"], {"<=5": 90, "<=50": 9, ">10000": 1})
+    
+    def test_scoring_api_over_http(self):
+        """Test: DataLoader(use_mock=False) nutzt die konfigurierte Markt-API."""
+        from scoring.config import DATA_SOURCE_CONFIG
+        original = DATA_SOURCE_CONFIG["base_url"]
+        self.addCleanup(DATA_SOURCE_CONFIG.__setitem__, "base_url", original)
+        DATA_SOURCE_CONFIG["base_url"] = f"http://127.0.0.1:{self.server.port}"
+        loader = DataLoader(use_mock=False)
+        self.addCleanup(loader.close)
+        api = ScoringAPI(data_loader=loader)
+        mock_api = ScoringAPI(data_loader=DataLoader(data_source=self.server.source))
+        self.assertEqual(api.get_company_score("JNJ"), mock_api.get_company_score("JNJ"))
+        
+        adapter = loader.source._source
+        loader.close()
+        with self.assertRaises(RuntimeError):
+            adapter.get_company_data("JNJ")
+    
+    def test_cancelled_request_closes_connection(self):
+        """Test: Eine abgebrochene Anfrage schließt ihre Verbindung statt sie zu verlieren."""
+        async def cancel():
+            source = HttpDataSource(f"http://127.0.0.1:{self.server.port}/", rate_per_second=1000)
+            await source.get_company_data("AAPL")
+            writer = source._pool._idle[0][1]
+            self.server.delay = 0.3
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(source.get_company_data("AAPL"), 0.05)
+            idle = list(source._pool._idle)
+            await source.aclose()
+            return writer.is_closing(), idle
+        
+        closed, idle = asyncio.run(cancel())
+        self.assertTrue(closed)
+        self.assertEqual(idle, [])
+    
+    def test_slow_reused_connection_not_reopened(self):
+        """Test: Ein Timeout auf einer wiederverwendeten Verbindung löst keinen Sofort-Neuaufbau aus."""
+        adapter = self._adapter(timeout_s=0.05, max_retries=0)
+        self.assertEqual(adapter.get_company_data("AAPL").symbol, "AAPL")
+        self.server.delay = 0.2
+        with self.assertRaises(HttpSourceError):
+            adapter.get_company_data("MSFT")
+        self.assertEqual(adapter.source.stats.connections, 1)
+        self.assertEqual(self.server.requests, 2)
+
+
+class TestSyntheticDataSource(unittest.TestCase):
+    """Tests für das synthetische Universum."""
+    
+    def setUp(self):
+        self.source = SyntheticDataSource(2000, seed=3, chunk_size=300)
+    
+    def test_deterministic_and_chunk_independent(self):
+        """Test: Gleicher Startwert, gleiche Daten - unabhängig von Reihenfolge und Materialisierung."""
+        symbol = self.source.symbol(1234)
+        lazy = self.source.get_company_data(symbol)
+        other = SyntheticDataSource(2000, seed=3, chunk_size=300)
+        other.get_company_data(other.symbol(5))
+        self.assertEqual(other.get_company_data(symbol.lower()), lazy)
+        self.assertIsNone(other.get_financials_table())
+        self.assertEqual(other.materialize().get(symbol), lazy)
+        self.assertIs(other.get_financials_table(), other.materialize())
+        self.assertEqual(sum(len(chunk) for chunk in self.source.iter_chunks()), 2000)
+        self.assertNotEqual(SyntheticDataSource(2000, seed=4, chunk_size=300).get_company_data(symbol), lazy)
+    
+    def test_sector_mix_and_symbols(self):
+        """Test: Sektoranteile, Symbole und Mehrfachabfrage."""
+        source = SyntheticDataSource(1000, sector_mix={"Technology": 3, "Energy": 1}, chunk_size=128)
+        self.assertEqual(source.sector_counts, {"Technology": 750, "Energy": 250})
+        energy = source.get_sector_companies("Energy")
+        self.assertEqual(len(energy), 250)
+        self.assertTrue(all(c.sector == "Energy" for c in energy))
+        self.assertEqual(source.index_of("syn0000999"), 999)
+        self.assertIsNone(source.index_of("SYN0001000"))
+        self.assertIsNone(source.get_company_data("AAPL"))
+        companies = source.get_companies(["SYN0000001", "syn0000900", "AAPL"])
+        self.assertEqual(sorted(companies), ["SYN0000001", "SYN0000900"])
+        self.assertEqual(len(source.get_available_symbols()), 1000)
+    
+    def test_metrics_are_correlated(self):
+        """Test: Margen hängen über den Qualitätsfaktor zusammen, Grenzen werden eingehalten."""
+        companies = SyntheticDataSource(3000, sector_mix={"Industrials": 1}).get_all_companies()
+        margins = [c.operating_margin for c in companies]
+        net = [c.net_margin for c in companies]
+        mean_m, mean_n = sum(margins) / len(margins), sum(net) / len(net)
+        covariance = sum((m - mean_m) * (n - mean_n) for m, n in zip(margins, net))
+        self.assertGreater(covariance, 0)
+        self.assertTrue(all(0.0 <= c.earnings_stability <= 1.0 for c in companies))
+        self.assertTrue(all(c.pe_ratio > 0 for c in companies))
+    
+    def test_custom_distributions_and_validation(self):
+        """Test: Eigene Verteilungen; ungültige Parameter werfen ValueError."""
+        source = SyntheticDataSource(
+            50, sector_mix={"Energy": 1},
+            distributions={"Energy": {"pe_ratio": MetricDistribution(5.0, 0.0, log=True)}}
+        )
+        self.assertTrue(all(abs(c.pe_ratio - 5.0) < 1e-9 for c in source.get_all_companies()))
+        with self.assertRaises(ValueError):
+            SyntheticDataSource(10, sector_mix={})
+        with self.assertRaises(ValueError):
+            SyntheticDataSource(10, distributions={"Energy": {"ebit": MetricDistribution(1.0, 0.1)}})
+    
+    def test_scoring_through_api(self):
+        """Test: Das synthetische Universum lässt sich wie echte Daten scoren."""
+        api = ScoringAPI(data_loader=DataLoader(data_source=self.source))
+        result = api.get_company_score(self.source.symbol(42))
+        self.assertIsNotNone(result)
+        self.assertEqual(result["symbol"], self.source.symbol(42))
+    
+    def test_sector_ranking_generates_only_its_chunks(self):
+        """Test: Ein Sektor-Ranking erzeugt nur die Blöcke dieses Sektors, keine Gesamttabelle."""
+        generated = []
+        source = SyntheticDataSource(2000, sector_mix={"Technology": 1, "Energy": 1}, chunk_size=300)
+        generate = source._generate
+        source._generate = lambda first, end, chunk: generated.append(chunk) or generate(first, end, chunk)
+        
+        scores = SectorRanker(data_loader=DataLoader(data_source=source)).get_sector_scores("Energy")
+        self.assertEqual(len(scores), 1000)
+        self.assertIsNone(source._table)
+        # Energy belegt die Unternehmen 1000-1999, also die Blöcke 3 bis 6
+        self.assertEqual(sorted(set(generated)), [3, 4, 5, 6])
+        
+        materialized = SyntheticDataSource(2000, sector_mix={"Technology": 1, "Energy": 1}, chunk_size=300)
+        materialized.materialize()
+        self.assertEqual(SectorRanker(data_loader=DataLoader(data_source=materialized)).get_sector_scores("Energy"), scores)
+
+
+class TestRecords(unittest.TestCase):
+    """Tests für die kompakten Datensätze (__slots__)."""
+    
+    def test_records_are_slotted(self):
+        """Test: Datensätze haben kein __dict__ pro Instanz."""
+        company = DataLoader(use_mock=True).get_company_data("AAPL")
+        result = Scorer().score_company(company, [company])
+        self.assertFalse(hasattr(company, "__dict__"))
+        self.assertFalse(hasattr(result, "__dict__"))
+    
+    def test_results_are_frozen(self):
+        """Test: Score-Ergebnisse sind unveränderlich, asdict funktioniert."""
+        company = DataLoader(use_mock=True).get_company_data("AAPL")
+        result = Scorer().score_company(company, [company])
+        with self.assertRaises(FrozenInstanceError):
+            result.total_score = 100
+        self.assertEqual(json.loads(json.dumps(asdict(result)))["symbol"], "AAPL")
 
 
 class TestScorer(unittest.TestCase):
@@ -109,6 +917,189 @@ class TestScorer(unittest.TestCase):
         # Bei gleichen Teil-Scores sollte Total = Teil-Scores sein
         total = self.scorer.calculate_total_score(50, 50, 50, 50)
         self.assertEqual(total, 50)
+    
+    def test_calculate_percentile_scores_matches_single(self):
+        """Test: Batch-Perzentile entsprechen den Einzelberechnungen."""
+        values = [3.0, -1.0, 7.5, 7.5, 120.0, 0.2, 4.4, 9.0, 2.0, 2.0, 55.0]
+        for inverse in (False, True):
+            batch = calculate_percentile_scores(values, inverse=inverse)
+            single = [calculate_percentile_score(v, values, inverse=inverse) for v in values]
+            self.assertEqual(batch, single)
+    
+    def test_score_sector(self):
+        """Test: Sektor-Scoring entspricht dem Einzel-Scoring."""
+        sector_companies = self.loader.get_sector_companies("Technology")
+        results = self.scorer.score_sector(sector_companies)
+        
+        self.assertEqual(set(results), {c.symbol for c in sector_companies})
+        for company in sector_companies:
+            self.assertEqual(
+                results[company.symbol],
+                self.scorer.score_company(company, sector_companies)
+            )
+
+
+class TestEngine(unittest.TestCase):
+    """Tests für die Scoring-Engine."""
+    
+    def setUp(self):
+        rng = random.Random(42)
+        # Gerundete Werte erzeugen bewusst Gleichstände
+        self.matrix = [[round(rng.gauss(0, 10), 1) for _ in range(5)] for _ in range(60)]
+        self.flags = [False, True, False, True, False]
+    
+    def test_python_engine_matches_single_values(self):
+        """Test: Python-Engine entspricht calculate_percentile_score()."""
+        ranks = rank_matrix(self.matrix, self.flags, use_numpy=False)
+        for j, inverse in enumerate(self.flags):
+            column = [row[j] for row in self.matrix]
+            for i, value in enumerate(column):
+                self.assertEqual(
+                    ranks[i][j], calculate_percentile_score(value, column, inverse=inverse)
+                )
+    
+    @unittest.skipUnless(HAS_NUMPY, "NumPy nicht installiert")
+    def test_numpy_engine_matches_python_engine(self):
+        """Test: NumPy- und Python-Engine liefern identische Ergebnisse."""
+        python_ranks = rank_matrix(self.matrix, self.flags, use_numpy=False)
+        numpy_ranks = rank_matrix(self.matrix, self.flags, use_numpy=True)
+        self.assertEqual(numpy_ranks.tolist(), python_ranks)
+        
+        groups = [(0, 2), (2, 5)]
+        self.assertEqual(
+            group_means(numpy_ranks, groups), group_means(python_ranks, groups)
+        )
+    
+    def test_sector_scores_match_single_scores(self):
+        """Test: Teil- und Gesamt-Scores beider Engines entsprechen calculate_*_score() auf Zufallssektoren."""
+        engines = [False, True] if HAS_NUMPY else [False]
+        for seed in range(40):
+            size = random.Random(seed).randint(3, 40)
+            companies = SyntheticDataSource(size, sector_mix={"Industrials": 1}, seed=seed).get_all_companies()
+            single = Scorer(use_numpy=False)
+            expected = {
+                c.symbol: [
+                    single.calculate_quality_score(c, companies),
+                    single.calculate_growth_score(c, companies),
+                    single.calculate_stability_score(c, companies),
+                    single.calculate_valuation_score(c, companies),
+                ]
+                for c in companies
+            }
+            for use_numpy in engines:
+                scorer = Scorer(use_numpy=use_numpy)
+                index = scorer.build_sector_index(companies)
+                sub_scores = scorer.sub_scores(index)
+                results = scorer.score_sector(companies)
+                for row, symbol in enumerate(index.symbols):
+                    self.assertEqual([dimension[row] for dimension in sub_scores], expected[symbol])
+                    result = results[symbol]
+                    self.assertEqual(result.total_score, single.calculate_total_score(*expected[symbol]))
+                    self.assertEqual(result.stability_score, round(expected[symbol][2], 1))
+    
+    @unittest.skipUnless(HAS_NUMPY, "NumPy nicht installiert")
+    def test_score_sector_engines_identical(self):
+        """Test: Sektor-Scoring ist unabhängig von der Engine."""
+        companies = DataLoader(use_mock=True).get_sector_companies("Technology")
+        self.assertEqual(
+            Scorer(use_numpy=True).score_sector(companies),
+            Scorer(use_numpy=False).score_sector(companies)
+        )
+
+
+class TestSectorMetricIndex(unittest.TestCase):
+    """Tests für den Sektor-Kennzahlen-Index."""
+    
+    def setUp(self):
+        self.values = [4.0, 1.0, 9.0, 9.0, 2.5, 30.0, 3.0, 7.0, 0.5, 6.0]
+        self.index = SectorMetricIndex(
+            "Test", [f"S{i}" for i in range(len(self.values))],
+            [[v, v] for v in self.values], [False, True]
+        )
+    
+    def test_rank_matches_percentile_score(self):
+        """Test: Index-Lookup entspricht calculate_percentile_score()."""
+        for value in self.values + [-5.0, 3.5, 100.0]:
+            self.assertEqual(
+                self.index.rank(0, value),
+                calculate_percentile_score(value, self.values)
+            )
+            self.assertEqual(
+                self.index.rank(1, value),
+                calculate_percentile_score(value, self.values, inverse=True)
+            )
+    
+    def test_own_rows_ranked(self):
+        """Test: Ränge der Sektor-Unternehmen werden beim Aufbau berechnet."""
+        row = self.index.row_of("S5")
+        self.assertEqual(list(self.index.ranks[row]), self.index.rank_row([30.0, 30.0]))
+        self.assertIsNone(self.index.row_of("UNKNOWN"))
+
+
+class TestSketch(unittest.TestCase):
+    """Tests für näherungsweise Perzentile mit KLL-Sketches."""
+    
+    def test_small_groups_exact(self):
+        """Test: Solange der Sketch alle Werte hält, entspricht er dem exakten Modus."""
+        scorer = Scorer()
+        companies = DataLoader(use_mock=True).get_sector_companies("Technology")
+        sketches = scorer.build_metric_sketches(companies)
+        index = scorer.build_sector_index(companies)
+        exact = scorer.score_index(index)
+        
+        totals = KLLSketch()
+        totals.extend(result.total_score for result in exact.values())
+        for company, row in zip(companies, scorer.extract_metric_matrix(companies)):
+            self.assertEqual(sketches.rank_row(row), index.rank_row(row))
+            self.assertEqual(scorer.score_against_sketch(company, sketches, totals), exact[company.symbol])
+    
+    def test_equal_bounds_exact(self):
+        """Test: Fallen beide Winsorizing-Grenzen zusammen, entspricht der Rang dem exakten Modus."""
+        values = [0.0] + [5.0] * 20
+        sketches = MetricSketches([False, True])
+        for value in values:
+            sketches.update([value, value])
+        index = SectorMetricIndex("Test", [f"S{i}" for i in range(len(values))],
+                                  [[v, v] for v in values], [False, True])
+        self.assertEqual(sketches.bounds(0), (5.0, 5.0))
+        for value in (-1.0, 0.0, 5.0, 10.0):
+            self.assertEqual(sketches.rank_row([value, value]), index.rank_row([value, value]))
+        self.assertEqual(sketches.rank(0, 10.0), 0.0)
+    
+    def test_rank_error_bound(self):
+        """Test: Geschätzte Ränge liegen innerhalb der Fehlerschranke."""
+        rng = random.Random(4)
+        values = [rng.lognormvariate(0, 1) for _ in range(20000)]
+        sketch = KLLSketch(error=0.02)
+        sketch.extend(values)
+        
+        self.assertLess(sketch.retained, len(values) // 10)
+        sorted_values = sorted(values)
+        for q in (0.05, 0.25, 0.5, 0.75, 0.95):
+            value = sorted_values[int(q * len(values))]
+            self.assertLessEqual(abs(sketch.rank(value) - int(q * len(values))), 0.02 * len(values))
+    
+    def test_merge_shards(self):
+        """Test: Zusammengeführte Shard-Sketches decken den gesamten Strom ab."""
+        rng = random.Random(8)
+        rows = [[rng.gauss(0, 1), rng.gauss(5, 2)] for _ in range(9000)]
+        shards = [MetricSketches([False, True], error=0.02, seed=i) for i in range(3)]
+        for i, row in enumerate(rows):
+            shards[i % 3].update(row)
+        merged = shards[0]
+        merged.merge(shards[1])
+        merged.merge(shards[2])
+        
+        self.assertEqual(len(merged), len(rows))
+        exact = rank_matrix(rows, [False, True], use_numpy=False)
+        errors = [abs(a - e) for row, ranks in zip(rows, exact) for a, e in zip(merged.rank_row(row), ranks)]
+        self.assertLess(sorted(errors)[int(len(errors) * 0.99)], 2.0)
+    
+    def test_invalid_error(self):
+        """Test: Ungültige Fehlerschranken werden abgelehnt."""
+        with self.assertRaises(ValueError):
+            k_for_error(0)
+        self.assertGreater(k_for_error(0.005), k_for_error(0.05))
 
 
 class TestSectorRanker(unittest.TestCase):
@@ -117,6 +1108,62 @@ class TestSectorRanker(unittest.TestCase):
     def setUp(self):
         self.ranker = SectorRanker()
     
+    def test_what_if_unchanged_company(self):
+        """Test: Was-wäre-wenn mit unveränderten Daten liefert den Ist-Score."""
+        company = DataLoader(use_mock=True).get_company_data("AAPL")
+        self.assertEqual(
+            self.ranker.what_if(company),
+            self.ranker.get_sector_scores("Technology")["AAPL"]
+        )
+    
+    def test_what_if_better_margins(self):
+        """Test: Höhere Margen verbessern den hypothetischen Qualitäts-Score."""
+        company = DataLoader(use_mock=True).get_company_data("AAPL")
+        improved = replace(company, operating_margin=0.9, net_margin=0.9, roic=0.9, fcf_margin=0.9)
+        current = self.ranker.get_sector_scores("Technology")["AAPL"]
+        self.assertGreater(
+            self.ranker.what_if(improved).quality_score, current.quality_score
+        )
+    
+    def test_update_company_incremental(self):
+        """Test: Inkrementelle Aktualisierung entspricht einer Neuberechnung."""
+        loader = DataLoader(use_mock=True)
+        ranker = SectorRanker(data_loader=loader, scorer=Scorer())
+        ranker.get_sector_scores("Technology")
+        
+        updated = replace(loader.get_company_data("AAPL"), roic=0.9, pe_ratio=15.0)
+        changes = ranker.update_company(updated)
+        
+        changed_symbols = {c.symbol for c in changes}
+        self.assertIn("AAPL", changed_symbols)
+        
+        fresh = Scorer().score_sector(loader.get_sector_companies("Technology"))
+        self.assertEqual(ranker.get_sector_scores("Technology"), fresh)
+        for change in changes:
+            self.assertEqual(change.new, fresh[change.symbol])
+            self.assertNotEqual(change.old, change.new)
+    
+    def test_update_company_sector_change(self):
+        """Test: Sektorwechsel aktualisiert alten und neuen Sektor."""
+        loader = DataLoader(use_mock=True)
+        ranker = SectorRanker(data_loader=loader, scorer=Scorer())
+        
+        moved = replace(loader.get_company_data("XOM"), sector="Technology")
+        changes = ranker.update_company(moved)
+        
+        self.assertNotIn("XOM", ranker.get_sector_scores("Energy"))
+        self.assertIn("XOM", ranker.get_sector_scores("Technology"))
+        xom = [c for c in changes if c.symbol == "XOM"]
+        self.assertEqual(len(xom), 2)
+    
+    def test_invalidate_sector(self):
+        """Test: Invalidierung verwirft Index und Scores eines Sektors."""
+        index = self.ranker.get_sector_index("Technology")
+        self.ranker.get_sector_scores("Energy")
+        self.ranker.invalidate_sector("Technology")
+        self.assertIsNot(self.ranker.get_sector_index("Technology"), index)
+        self.assertIn("Energy", self.ranker._group_scores_cache)
+    
     def test_get_sector_ranking(self):
         """Test: Sektor-Ranking abrufen."""
         ranking = self.ranker.get_sector_ranking("AAPL")
@@ -138,6 +1185,364 @@ class TestSectorRanker(unittest.TestCase):
         self.assertIn("score_distribution", overview)
 
 
+class TestGroupRanker(unittest.TestCase):
+    """Tests für Vergleichsgruppen jenseits des Sektors."""
+    
+    def setUp(self):
+        self.loader = DataLoader(use_mock=True)
+        self.scorer = Scorer()
+        self.themes = CustomGroups("themes", {
+            "Chips": ["NVDA", "INTC", "AAPL"],
+            "Plattformen": ["AAPL", "MSFT", "GOOGL", "META", "AMZN"],
+        })
+        self.ranker = GroupRanker(self.themes, data_loader=self.loader, scorer=self.scorer)
+    
+    def test_overlapping_groups(self):
+        """Test: Ein Unternehmen wird in jeder seiner Gruppen separat bewertet."""
+        aapl = self.loader.get_company_data("AAPL")
+        self.assertEqual(self.ranker.get_groups_of(aapl), ["Chips", "Plattformen"])
+        
+        chips = self.ranker.get_group_scores("Chips")
+        expected = self.scorer.score_sector(
+            [self.loader.get_company_data(s) for s in ["AAPL", "NVDA", "INTC"]]
+        )
+        self.assertEqual(set(chips), {"AAPL", "NVDA", "INTC"})
+        self.assertEqual(chips["AAPL"].total_score, expected["AAPL"].total_score)
+        self.assertEqual(chips["AAPL"].sector, "Chips")
+        self.assertEqual(self.ranker.get_group_ranking("AAPL", "Plattformen").total_in_sector, 5)
+    
+    def test_groups_computed_once(self):
+        """Test: Index und Scores einer Gruppe werden nur einmal berechnet."""
+        scores = self.ranker.get_group_scores("Plattformen")
+        index = self.ranker.get_group_index("Plattformen")
+        self.assertIs(self.ranker.get_group_scores("Plattformen"), scores)
+        self.assertIs(self.ranker.get_group_index("Plattformen"), index)
+        self.assertNotIn("Chips", self.ranker._group_scores_cache)
+    
+    def test_row_source_loads_group_in_one_call(self):
+        """Test: Ohne Tabelle wird eine Gruppe mit einem Sammelaufruf geladen."""
+        source = _RowSource()
+        ranker = GroupRanker(self.themes, data_loader=DataLoader(data_source=source), scorer=self.scorer)
+        scores = ranker.get_group_scores("Plattformen")
+        self.assertEqual(scores, self.ranker.get_group_scores("Plattformen"))
+        self.assertEqual(source.calls, {"companies": 1})
+    
+    def test_band_and_attribute_groups(self):
+        """Test: Größenklassen und Merkmale ordnen Unternehmen zu."""
+        caps = BandGroups("market_cap", {"AAPL": 3.0e12, "INTC": 1.5e11, "SBUX": 1.0e9})
+        self.assertEqual(caps.groups_of("AAPL", "Technology"), ["Mega Cap"])
+        self.assertEqual(caps.groups_of("intc", "Technology"), ["Large Cap"])
+        self.assertEqual(caps.groups_of("SBUX", "Consumer Discretionary"), ["Small Cap"])
+        self.assertEqual(caps.groups_of("XOM", "Energy"), [])
+        
+        regions = AttributeGroups("region", {"AAPL": "USA", "MSFT": ["USA", "Global"]})
+        ranker = GroupRanker(regions, data_loader=self.loader, scorer=self.scorer)
+        self.assertEqual(ranker.get_groups(), ["USA", "Global"])
+        self.assertEqual(ranker.get_group_members("USA"), ["AAPL", "MSFT"])
+    
+    def test_sector_groups_match_sector_ranker(self):
+        """Test: Sektor-Definition im generischen Ranker entspricht dem SectorRanker."""
+        generic = GroupRanker(SectorGroups(), data_loader=self.loader, scorer=self.scorer)
+        ranker = SectorRanker(data_loader=self.loader, scorer=self.scorer)
+        for sector in ranker.get_available_sectors():
+            self.assertEqual(generic.get_group_scores(sector), ranker.get_sector_scores(sector))
+    
+    def test_update_company(self):
+        """Test: Aktualisierung berechnet alle Gruppen des Unternehmens neu."""
+        self.ranker.get_group_scores("Chips")
+        self.ranker.get_group_scores("Plattformen")
+        
+        updated = replace(self.loader.get_company_data("AAPL"), roic=-50.0, operating_margin=-50.0)
+        changes = self.ranker.update_company(updated)
+        
+        self.assertEqual({c.new.sector for c in changes if c.symbol == "AAPL"}, {"Chips", "Plattformen"})
+        fresh = GroupRanker(self.themes, data_loader=self.loader, scorer=self.scorer)
+        for group in ["Chips", "Plattformen"]:
+            self.assertEqual(self.ranker.get_group_scores(group), fresh.get_group_scores(group))
+
+
+class TestGlobalLeaderboard(unittest.TestCase):
+    """Tests für das sektorübergreifende Ranking."""
+    
+    def setUp(self):
+        self.loader = DataLoader(use_mock=True)
+        self.ranker = SectorRanker(data_loader=self.loader, scorer=Scorer())
+        self.leaderboard = GlobalLeaderboard(self.ranker)
+    
+    def _full_sort(self):
+        results = [
+            r for sector in self.ranker.get_available_sectors()
+            for r in self.ranker.get_sector_scores(sector).values()
+        ]
+        return [r.symbol for r in sorted(results, key=lambda r: (-r.total_score, r.symbol))]
+    
+    def test_matches_full_sort(self):
+        """Test: Reihenfolge, Rang und Slices entsprechen einer vollständigen Sortierung."""
+        expected = self._full_sort()
+        self.assertEqual(len(self.leaderboard), len(self.loader.get_all_companies()))
+        self.assertEqual([e.symbol for e in self.leaderboard.top(5)], expected[:5])
+        self.assertEqual([e.symbol for e in self.leaderboard.bottom(3)], expected[-3:])
+        for position, symbol in enumerate(expected, start=1):
+            self.assertEqual(self.leaderboard.rank(symbol), position)
+        self.assertIsNone(self.leaderboard.rank("XXXX"))
+        self.assertEqual(self.leaderboard.entry(expected[0]).rank, 1)
+    
+    def test_follows_updates(self):
+        """Test: Neu berechnete Sektoren und Sektorwechsel werden übernommen."""
+        self.leaderboard.top(1)
+        self.ranker.update_company(
+            replace(self.loader.get_company_data("INTC"), roic=90.0, operating_margin=90.0)
+        )
+        self.ranker.update_company(replace(self.loader.get_company_data("XOM"), sector="Technology"))
+        
+        self.assertEqual([e.symbol for e in self.leaderboard.top(len(self.leaderboard))], self._full_sort())
+        self.assertEqual(self.leaderboard.entry("XOM").sector, "Technology")
+    
+    def test_clear_cache(self):
+        """Test: Nach clear_cache() wird das Ranking neu aufgebaut."""
+        before = [e.symbol for e in self.leaderboard.top(10)]
+        self.ranker.clear_cache()
+        self.assertEqual([e.symbol for e in self.leaderboard.top(10)], before)
+        self.assertEqual(len(self.leaderboard), len(self.loader.get_all_companies()))
+
+
+class TestScreener(unittest.TestCase):
+    """Tests für den Top-k-Screener."""
+    
+    def setUp(self):
+        self.loader = DataLoader(use_mock=True)
+        self.ranker = SectorRanker(data_loader=self.loader, scorer=Scorer())
+        self.screener = Screener(self.ranker)
+        self.text_gen = get_text_generator()
+    
+    def _expected(self, sector=None, light=None, min_quality=None, limit=20):
+        order = ["sehr schwach", "schwach", "moderat", "solide", "hoch", "sehr hoch", "hervorragend"]
+        results = [
+            r for s in self.ranker.get_available_sectors()
+            for r in self.ranker.get_sector_scores(s).values()
+            if (sector is None or s == sector)
+            and (light is None or get_traffic_light(r.total_score) == light)
+            and (min_quality is None or order.index(
+                self.text_gen.generate_score_labels(r)["quality"]) >= order.index(min_quality))
+        ]
+        return [r.symbol for r in sorted(results, key=lambda r: (-r.total_score, r.symbol))][:limit]
+    
+    def test_matches_filter_and_sort(self):
+        """Test: Treffer entsprechen Filtern und vollständiger Sortierung."""
+        cases = [
+            {}, {"sector": "Technology"}, {"light": "red"}, {"light": "yellow", "limit": 3},
+            {"min_quality": "hoch"}, {"sector": "Healthcare", "min_quality": "solide", "limit": 2},
+        ]
+        for case in cases:
+            hits = self.screener.screen(
+                case.get("sector"), case.get("light"),
+                {"quality": case["min_quality"]} if "min_quality" in case else None,
+                case.get("limit", 20)
+            )
+            self.assertEqual([r.symbol for r in hits], self._expected(**case), case)
+    
+    def test_invalid_filters(self):
+        """Test: Unbekannte Labels und Ampelfarben werden abgelehnt."""
+        with self.assertRaises(ValueError):
+            self.screener.screen(traffic_light="blue")
+        with self.assertRaises(ValueError):
+            self.screener.screen(min_labels={"quality": "günstig"})
+        self.assertEqual(self.screener.screen(sector="Unbekannt"), [])
+    
+    def test_follows_updates(self):
+        """Test: Aktualisierte Sektoren werden neu einsortiert."""
+        self.screener.screen()
+        company = self.loader.get_company_data("INTC")
+        self.ranker.update_company(replace(company, roic=90.0, operating_margin=90.0, net_margin=90.0))
+        hits = self.screener.screen(sector="Technology", limit=20)
+        self.assertEqual([r.symbol for r in hits], self._expected(sector="Technology"))
+    
+    def test_gap_scores_on_heap_path(self):
+        """Test: Scores zwischen den Label-Bereichen (Ersatz-Label) auch im Heap-Pfad."""
+        rows = [  # Symbol, Qualität, Bewertung, Gesamt
+            ("A", 95.0, 0.0, 90.0), ("B", 95.0, 5.0, 85.0), ("C", 95.0, 9.5, 80.0),
+            ("D", 24.5, 70.0, 75.0), ("E", 80.0, 70.0, 50.0), ("F", 70.0, 65.0, 40.0),
+            ("G", 59.5, 70.0, 30.0),
+        ]
+        results = {
+            symbol: ScoreResult(symbol, "Test", quality, 50.0, 50.0, valuation, total, 50.0)
+            for symbol, quality, valuation, total in rows
+        }
+        
+        class _StubRanker:
+            def add_listener(self, listener):
+                pass
+            def get_groups(self):
+                return ["Test"]
+            def get_group_scores(self, group):
+                return results
+        
+        screener = Screener(_StubRanker())
+        # 9.5 ergibt Bewertung "fair", 24.5 und 59.5 Qualität "moderat"
+        cases = [
+            ({"valuation": "fair"}, ["C", "D", "E", "F", "G"]),
+            ({"quality": "moderat"}, ["A", "B", "C", "D", "E", "F", "G"]),
+            ({"quality": "hoch"}, ["A", "B", "C", "E", "F"]),
+            # Qualitäts-Bereich (A, B, C, E) ist kürzer als der Scan: Heap-Pfad
+            ({"valuation": "fair", "quality": "sehr hoch"}, ["C", "E"]),
+        ]
+        for min_labels, expected in cases:
+            hits = screener.screen(min_labels=min_labels, limit=10)
+            self.assertEqual([r.symbol for r in hits], expected, min_labels)
+
+
+class TestWeightSweep(unittest.TestCase):
+    """Tests für Gewichtungs-Szenarien."""
+    
+    def setUp(self):
+        self.loader = DataLoader(use_mock=True)
+        self.scorer = Scorer()
+        self.ranker = SectorRanker(data_loader=self.loader, scorer=self.scorer)
+    
+    def test_default_weights_match_scores(self):
+        """Test: SCORE_WEIGHTS reproduziert die regulären Scores exakt."""
+        engines = [False, True] if HAS_NUMPY else [False]
+        for use_numpy in engines:
+            result = WeightSweep(self.ranker, use_numpy=use_numpy).evaluate([SCORE_WEIGHTS])
+            scenario = result.scenario(0)
+            self.assertEqual(len(scenario), len(self.loader.get_all_companies()))
+            for symbol, values in scenario.items():
+                score = self.ranker.get_sector_scores(result.sectors[result.symbols.index(symbol)])[symbol]
+                self.assertEqual(values["total_score"], score.total_score)
+                self.assertEqual(values["sector_percentile"], score.sector_percentile)
+                self.assertEqual(values["traffic_light"], get_traffic_light(score.total_score))
+    
+    @unittest.skipUnless(HAS_NUMPY, "NumPy nicht installiert")
+    def test_engines_identical(self):
+        """Test: NumPy- und Python-Sweep liefern identische Ergebnisse."""
+        rng = random.Random(7)
+        weight_sets = [[rng.random() for _ in range(4)] for _ in range(50)]
+        fast = WeightSweep(self.ranker, use_numpy=True).evaluate(weight_sets)
+        slow = WeightSweep(self.ranker, use_numpy=False).evaluate(weight_sets)
+        self.assertEqual(fast.symbols, slow.symbols)
+        self.assertEqual(fast.totals.tolist(), slow.totals)
+        self.assertEqual(fast.sector_percentiles.tolist(), slow.sector_percentiles)
+        self.assertEqual(fast.traffic_lights.tolist(), slow.traffic_lights)
+    
+    def test_follows_updates(self):
+        """Test: Nach update_company() werden neue Teil-Scores verwendet."""
+        sweep = WeightSweep(self.ranker)
+        before = sweep.evaluate([SCORE_WEIGHTS], ["Technology"]).scenario(0)["AAPL"]
+        
+        company = self.loader.get_company_data("AAPL")
+        self.ranker.update_company(replace(company, operating_margin=-50.0, roic=-30.0))
+        after = sweep.evaluate([SCORE_WEIGHTS], ["Technology"]).scenario(0)["AAPL"]
+        
+        self.assertLess(after["total_score"], before["total_score"])
+        self.assertEqual(
+            after["total_score"], self.ranker.get_sector_scores("Technology")["AAPL"].total_score
+        )
+    
+    def test_sensitivity(self):
+        """Test: Sensitivitätsanalyse nutzt die regulären Ränge und Ampeln."""
+        report = WeightSweep(self.ranker).sensitivity(samples=300, seed=1)
+        ranking = self.ranker.get_sector_ranking("AAPL")
+        aapl = report["AAPL"]
+        
+        self.assertEqual(aapl.rank, ranking.rank)
+        self.assertEqual(
+            aapl.traffic_light,
+            get_traffic_light(self.ranker.get_sector_scores("Technology")["AAPL"].total_score)
+        )
+        self.assertLessEqual(aapl.best_rank, aapl.rank)
+        self.assertGreaterEqual(aapl.worst_rank, aapl.rank)
+        for entry in report.values():
+            self.assertGreaterEqual(entry.traffic_light_flip_rate, 0.0)
+            self.assertLessEqual(entry.rank_flip_rate, 1.0)
+        
+        # Ohne Störung wechselt nichts
+        stable = WeightSweep(self.ranker).sensitivity(samples=20, spread=0.0)
+        self.assertFalse(any(entry.is_fragile() for entry in stable.values()))
+    
+    @unittest.skipUnless(HAS_NUMPY, "NumPy nicht installiert")
+    def test_sensitivity_engines_identical(self):
+        """Test: NumPy- und Python-Sensitivität liefern identische Ergebnisse."""
+        fast = WeightSweep(self.ranker, use_numpy=True).sensitivity(samples=400, seed=5)
+        slow = WeightSweep(self.ranker, use_numpy=False).sensitivity(samples=400, seed=5)
+        self.assertEqual(fast, slow)
+    
+    def test_sample_weight_sets(self):
+        """Test: Gestörte Gewichtungen sind reproduzierbar und normiert."""
+        weight_sets = sample_weight_sets(100, spread=0.3, seed=9)
+        self.assertEqual(weight_sets, sample_weight_sets(100, spread=0.3, seed=9))
+        for weights in weight_sets:
+            self.assertAlmostEqual(sum(weights.values()), sum(SCORE_WEIGHTS.values()))
+            for dim, weight in weights.items():
+                self.assertLessEqual(abs(weight - SCORE_WEIGHTS[dim]), SCORE_WEIGHTS[dim] * 0.7)
+    
+    def test_invalid_weights(self):
+        """Test: Unvollständige Gewichtungen werden abgelehnt."""
+        sweep = WeightSweep(self.ranker)
+        with self.assertRaises(ValueError):
+            sweep.evaluate([{"quality": 1.0}])
+        with self.assertRaises(ValueError):
+            sweep.evaluate([[0.5, 0.5]])
+
+
+class TestHistory(unittest.TestCase):
+    """Tests für Point-in-Time-Scoring über mehrere Stichtage."""
+    
+    def setUp(self):
+        self.companies = DataLoader(use_mock=True).get_all_companies()
+        self.store = SnapshotStore()
+        self.store.add_snapshot("2024-03-31", self.companies)
+        # Q2: nur ein Technologie-Unternehmen ändert sich
+        self.store.add_snapshot("2024-06-30", [
+            replace(c, roic=-50.0) if c.symbol == "AAPL" else c
+            for c in self.companies
+        ])
+        self.scorer = Scorer()
+    
+    def test_point_in_time(self):
+        """Test: Ein Stichtag nutzt den jüngsten Snapshot davor."""
+        self.assertIsNone(self.store.table_as_of("2024-01-01"))
+        self.assertEqual(str(self.store.snapshot_as_of("2024-05-15")), "2024-03-31")
+        self.assertEqual(str(self.store.snapshot_as_of("2024-06-30")), "2024-06-30")
+    
+    def test_matches_direct_scoring(self):
+        """Test: Historische Scores entsprechen dem Scoring des Snapshots."""
+        history = HistoricalScorer(self.store, self.scorer).score_history(
+            ["aapl", "XOM"], ["2024-01-01", "2024-03-31", "2024-06-30"]
+        )
+        self.assertEqual([str(d) for d, _ in history["AAPL"]], ["2024-03-31", "2024-06-30"])
+        for as_of, result in history["AAPL"] + history["XOM"]:
+            expected = self.scorer.score_table(self.store.table(as_of), result.sector)
+            self.assertEqual(result, expected[result.symbol])
+        self.assertNotEqual(history["AAPL"][0][1], history["AAPL"][1][1])
+    
+    def test_unchanged_sectors_reused(self):
+        """Test: Unveränderte Sektoren werden nicht erneut berechnet."""
+        historical = HistoricalScorer(self.store, self.scorer)
+        historical.score_history(["AAPL", "XOM"])
+        # Technology zweimal (geändert), Energy nur einmal
+        self.assertEqual(historical.sector_states, 3)
+        
+        historical.score_history(["AAPL", "XOM"], ["2024-04-15", "2024-07-01"])
+        self.assertEqual(historical.sector_states, 3)
+    
+    def test_fingerprint_separates_sector_and_symbols(self):
+        """Test: Sektorname und erstes Symbol können nicht ineinander übergehen."""
+        from scoring.history import _fingerprint
+        from scoring.parallel import SectorPayload
+        metrics = array("d", [1.0] * len(METRIC_FIELDS))
+        self.assertNotEqual(
+            _fingerprint(SectorPayload("Tech", ["ABC"], metrics, [])),
+            _fingerprint(SectorPayload("TechA", ["BC"], metrics, [])),
+        )
+    
+    def test_parallel_history(self):
+        """Test: Parallele Berechnung liefert dieselbe Historie."""
+        symbols = ["AAPL", "XOM", "JNJ"]
+        sequential = HistoricalScorer(self.store, self.scorer).score_history(symbols)
+        parallel = HistoricalScorer(self.store, self.scorer).score_history(symbols, workers=2)
+        self.assertEqual(parallel, sequential)
+
+
 class TestTextGenerator(unittest.TestCase):
     """Tests für den TextGenerator."""
     
@@ -266,6 +1671,96 @@ class TestScoringAPI(unittest.TestCase):
             self.assertIn("symbol", result)
             self.assertIn("score_total", result)
     
+    def test_batch_score_fetches_each_sector_once(self):
+        """Test: batch_score() löst Symbole gesammelt auf und lädt jeden Sektor einmal."""
+        source = _RowSource()
+        api = ScoringAPI(data_loader=DataLoader(data_source=source))
+        symbols = [c.symbol for c in source.get_all_companies()] + ["aapl", "UNKNOWN"]
+        source.calls.clear()
+        
+        results = api.batch_score(symbols)
+        
+        self.assertEqual(results, [r for r in map(api.get_company_score, symbols) if r])
+        self.assertEqual(source.calls["companies"], 1)
+        self.assertEqual(source.calls["sector"], len(source.get_available_sectors()))
+    
+    def test_batch_score_parallel(self):
+        """Test: Paralleles Batch-Scoring entspricht dem sequentiellen."""
+        symbols = ["AAPL", "xom", "JNJ", "UNKNOWN", "MSFT"]
+        self.assertEqual(
+            self.api.batch_score(symbols, workers=2),
+            self.api.batch_score(symbols)
+        )
+    
+    def test_iter_scores(self):
+        """Test: Streaming liefert dieselben Ergebnisse wie batch_score()."""
+        symbols = self.api.get_available_symbols()
+        expected = {r["symbol"]: r for r in self.api.batch_score(symbols)}
+        
+        stream = self.api.iter_scores()
+        self.assertFalse(isinstance(stream, list))
+        self.assertEqual({r["symbol"]: r for r in stream}, expected)
+        
+        subset = list(self.api.iter_scores(["msft", "XOM", "UNKNOWN"]))
+        self.assertEqual([r["symbol"] for r in subset], ["MSFT", "XOM"])
+    
+    def test_score_history(self):
+        """Test: Score-Verlauf über die API."""
+        store = SnapshotStore()
+        store.add_snapshot("2023-12-31", DataLoader(use_mock=True).get_all_companies())
+        history = self.api.score_history(store, ["AAPL"], ["2023-12-31", "2024-03-31"])
+        
+        self.assertEqual([p["as_of"] for p in history["AAPL"]], ["2023-12-31", "2024-03-31"])
+        self.assertEqual(history["AAPL"][0]["score_total"], self.api.get_company_score("AAPL")["score_total"])
+    
+    def test_weight_sweep(self):
+        """Test: Gewichtungs-Sweep über die API."""
+        result = self.api.weight_sweep([SCORE_WEIGHTS, [1, 0, 0, 0]], sectors=["Technology"])
+        aapl = self.api.get_company_score("AAPL")
+        
+        self.assertEqual(len(result.weight_sets), 2)
+        self.assertEqual(round(result.scenario(0)["AAPL"]["total_score"]), aapl["score_total"])
+        self.assertEqual(set(result.sectors), {"Technology"})
+    
+    def test_peer_group_scores(self):
+        """Test: Scoring in zusätzlichen Vergleichsgruppen über die API."""
+        api = ScoringAPI(data_loader=DataLoader(use_mock=True), scorer=Scorer())
+        api.add_peer_groups(CustomGroups("themes", {"Chips": ["NVDA", "INTC", "AAPL"]}))
+        
+        outputs = api.get_peer_group_scores("AAPL")["themes"]
+        self.assertEqual(len(outputs), 1)
+        self.assertEqual(outputs[0]["peer_group"], "Chips")
+        self.assertEqual(outputs[0]["sector"], "Technology")
+        
+        company = api._loader.get_company_data("NVDA")
+        api.update_company(replace(company, roic=-50.0, operating_margin=-50.0, net_margin=-50.0))
+        updated = api.get_peer_group_scores("AAPL")["themes"][0]
+        self.assertGreaterEqual(updated["sector_percentile"], outputs[0]["sector_percentile"])
+    
+    def test_leaderboard(self):
+        """Test: Globales Ranking über die API."""
+        top = self.api.get_leaderboard(3)
+        bottom = self.api.get_leaderboard(2, bottom=True)
+        
+        self.assertEqual([e["rank"] for e in top], [1, 2, 3])
+        self.assertGreaterEqual(top[0]["score_total"], bottom[-1]["score_total"])
+        self.assertEqual(self.api.get_global_rank(top[0]["symbol"]), 1)
+        self.assertEqual(set(top[0]), {
+            "rank", "symbol", "sector", "score_total", "sector_percentile", "traffic_light"
+        })
+    
+    def test_screen(self):
+        """Test: Screener über die API liefert nur qualitative Labels."""
+        hits = self.api.screen(sector="Technology", min_quality="solide", limit=3)
+        
+        self.assertLessEqual(len(hits), 3)
+        for hit in hits:
+            self.assertEqual(hit["sector"], "Technology")
+            self.assertIn(hit["score_quality"], ["solide", "hoch", "sehr hoch", "hervorragend"])
+            self.assertNotIn("quality_score", hit)
+        with self.assertRaises(ValueError):
+            self.api.screen(min_quality="unbekannt")
+    
     def test_convenience_function(self):
         """Test: Convenience-Funktion score_company()."""
         result = score_company("AAPL")
@@ -274,6 +1769,135 @@ class TestScoringAPI(unittest.TestCase):
         self.assertEqual(result["symbol"], "AAPL")
 
 
+class TestChangeFeed(unittest.TestCase):
+    """Tests für Delta-Übernahme und Änderungs-Feed."""
+    
+    def setUp(self):
+        self.loader = DataLoader(use_mock=True)
+        self.api = ScoringAPI(data_loader=self.loader, scorer=Scorer())
+    
+    def test_versions_and_feed(self):
+        """Test: Jeder Satz vergibt eine Version, der Feed liefert den letzten Stand je Symbol."""
+        aapl = self.loader.get_company_data("AAPL")
+        self.assertEqual(self.api.data_version, 0)
+        v1 = self.api.apply_changes(ChangeSet(upserts=[replace(aapl, roic=0.9)], deletes=["XOM"]))
+        v2 = self.api.apply_changes(ChangeSet(deletes=["aapl", "UNKNOWN"]))
+        self.assertEqual((v1, v2), (1, 2))
+        self.assertEqual(self.api.apply_changes(ChangeSet(deletes=["UNKNOWN"])), 2)
+        
+        feed = self.api.changes_since(0)
+        self.assertEqual(feed["version"], 2)
+        self.assertEqual(feed["upserted"], [])
+        self.assertEqual(feed["deleted"], ["XOM", "AAPL"])
+        self.assertEqual(feed["sectors"], ["Energy", "Technology"])
+        self.assertEqual(self.api.changes_since(1)["sectors"], ["Technology"])
+        self.assertEqual(self.api.changes_since(2)["deleted"], [])
+        with self.assertRaises(ValueError):
+            self.api.changes_since(3)
+    
+    def test_only_affected_sectors_invalidated(self):
+        """Test: Unbeteiligte Sektoren bleiben gecacht, betroffene entsprechen einer Neuberechnung."""
+        ranker = self.api._ranker
+        for sector in self.api.get_available_sectors():
+            ranker.get_sector_scores(sector)
+        self.api.get_leaderboard(3)
+        technology = ranker.get_sector_scores("Technology")
+        
+        xom = self.loader.get_company_data("XOM")
+        self.api.apply_changes(ChangeSet(upserts=[
+            replace(xom, sector="Healthcare"), replace(self.loader.get_company_data("CVX"), roic=0.5)
+        ]))
+        self.assertIs(ranker.get_sector_scores("Technology"), technology)
+        self.assertNotIn("Energy", ranker._group_scores_cache)
+        self.assertNotIn("Healthcare", ranker._group_scores_cache)
+        self.assertEqual(self.api.changes_since(0)["sectors"], ["Energy", "Healthcare"])
+        
+        fresh = ScoringAPI(data_loader=self.loader, scorer=Scorer())
+        self.assertEqual(self.api.get_company_score("XOM"), fresh.get_company_score("XOM"))
+        self.assertEqual(self.api.get_leaderboard(40), fresh.get_leaderboard(40))
+    
+    def test_duplicate_symbols_rejected(self):
+        """Test: Mehrfach vorkommende Symbole werfen ValueError, nichts wird übernommen."""
+        aapl = self.loader.get_company_data("AAPL")
+        with self.assertRaises(ValueError):
+            self.api.apply_changes(ChangeSet(upserts=[replace(aapl, roic=0.9)], deletes=["aapl"]))
+        self.assertEqual(self.loader.get_company_data("AAPL"), aapl)
+        self.assertEqual(self.api.data_version, 0)
+    
+    def test_update_company_and_incremental_export(self):
+        """Test: update_company() erhöht die Version, Export nur der geänderten Sektoren."""
+        self.api.update_company(replace(self.loader.get_company_data("JNJ"), roic=0.5))
+        feed = self.api.changes_since(0)
+        self.assertEqual((feed["version"], feed["upserted"], feed["sectors"]), (1, ["JNJ"], ["Healthcare"]))
+        
+        exported = list(self.api.iter_scores(sectors=feed["sectors"]))
+        expected = [o for o in self.api.iter_scores() if o["sector"] == "Healthcare"]
+        self.assertEqual(exported, expected)
+        self.assertEqual(list(self.api.iter_scores(["JNJ", "AAPL"], sectors=["Energy"])), [])
+    
+    def test_change_log_reuses_symbol_entries(self):
+        """Test: Das ChangeLog hält je Symbol nur den letzten Stand."""
+        log = ChangeLog()
+        for _ in range(100):
+            log.record(["AAPL"], [], ["Technology"])
+        log.record([], ["MSFT"], ["Technology"])
+        self.assertEqual(len(log._symbols), 2)
+        self.assertEqual(log.changes_since(99).upserted, ("AAPL",))
+        self.assertEqual(log.changes_since(100).deleted, ("MSFT",))
+
+
+class TestLazyImports(unittest.TestCase):
+    """Tests für den Import in frischen Interpreter-Prozessen."""
+    
+    def _loaded_modules(self, code, prefix="scoring", pythonpath=None):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ)
+        if pythonpath is not None:
+            env["PYTHONPATH"] = os.pathsep.join([pythonpath, root])
+        probe = code + f"\nimport sys; print(' '.join(sorted(m for m in sys.modules if m.startswith({prefix!r}))))"
+        run = subprocess.run(
+            [sys.executable, "-c", probe], cwd=root, env=env, capture_output=True, text=True, check=True
+        )
+        return run.stdout.split()
+    
+    def test_package_import_loads_no_submodules(self):
+        """Test: import scoring lädt keine Untermodule, öffentliche Namen kommen bei Bedarf."""
+        self.assertEqual(self._loaded_modules("import scoring"), ["scoring"])
+        loaded = self._loaded_modules("from scoring import score_company\nassert score_company('AAPL')")
+        self.assertIn("scoring.api", loaded)
+    
+    def test_api_defers_optional_modules(self):
+        """Test: Leaderboard, Screener, Szenarien und Änderungsprotokoll werden erst bei Nutzung geladen."""
+        loaded = self._loaded_modules("import scoring.api")
+        optional = ("scoring.leaderboard", "scoring.screener", "scoring.scenarios", "scoring.history", "scoring.changes")
+        for module in optional:
+            self.assertNotIn(module, loaded)
+    
+    def test_python_engine_does_not_load_numpy(self):
+        """Test: Die reine Python-Engine fasst NumPy nicht an."""
+        code = (
+            "from scoring.data_loader import MockDataSource\n"
+            "from scoring.scorer import Scorer\n"
+            "assert Scorer(use_numpy=False).score_sector(MockDataSource().get_sector_companies('Technology'))"
+        )
+        self.assertEqual(self._loaded_modules(code, prefix="numpy"), [])
+    
+    def test_broken_numpy_falls_back_to_python(self):
+        """Test: Eine defekte NumPy-Installation führt zur reinen Python-Engine."""
+        with tempfile.TemporaryDirectory() as directory:
+            os.mkdir(os.path.join(directory, "numpy"))
+            with open(os.path.join(directory, "numpy", "__init__.py"), "w") as handle:
+                handle.write("raise ImportError('defekte Installation')\n")
+            code = (
+                "from scoring.engine import HAS_NUMPY, has_numpy\n"
+                "from scoring.api import ScoringAPI\n"
+                "assert not HAS_NUMPY and not has_numpy()\n"
+                "assert ScoringAPI(use_mock_data=True).get_company_score('AAPL')"
+            )
+            loaded = self._loaded_modules(code, prefix="numpy", pythonpath=directory)
+        self.assertEqual(loaded, [])
+
+
 class TestLegalCompliance(unittest.TestCase):
     """Tests für rechtliche Compliance."""
     
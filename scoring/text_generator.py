@@ -14,6 +14,11 @@ from .sector_ranker import SectorRanking
 from .config import QUALITY_LABELS, VALUATION_LABELS, TRAFFIC_LIGHT_THRESHOLDS
 
 
+# Labels für Scores zwischen den Bereichen (z.B. 9.5 oder 74.5)
+QUALITY_FALLBACK_LABEL = "moderat"
+VALUATION_FALLBACK_LABEL = "fair"
+
+
 def _get_quality_label(score: float) -> str:
     """
     Wandelt einen numerischen Score in ein qualitatives Label um.
@@ -27,7 +32,7 @@ def _get_quality_label(score: float) -> str:
     for (low, high), label in QUALITY_LABELS.items():
         if low <= score <= high:
             return label
-    return "moderat"
+    return QUALITY_FALLBACK_LABEL
 
 
 def _get_valuation_label(score: float) -> str:
@@ -44,7 +49,7 @@ def _get_valuation_label(score: float) -> str:
     for (low, high), label in VALUATION_LABELS.items():
         if low <= score <= high:
             return label
-    return "fair"
+    return VALUATION_FALLBACK_LABEL
 
 
 def get_traffic_light(total_score: float) -> str: